@@ -0,0 +1,45 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	BENCHMARKS
+	Micro-benchmarks for rigbot hot paths. Each module runs on its own, from the folder containing rigbot:
+
+		mayapy -m rigbot.benchmarks.colours
+
+	Benchmarks that only need data / scene code also run in a plain python interpreter.
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+import timeit
+
+
+def bench(label, func, number=10000, repeat=5):
+	"""
+	Time a callable, best of repeat runs.
+
+	:param label: `str` Name to print
+	:param func: callable to time
+	:param number: `int` Calls per run
+	:param repeat: `int` Runs
+	:return: `float` best time per call in microseconds
+	"""
+	best = min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+	print('{:<48}{:>12.3f} us'.format(label, best))
+	return best
+# end def bench():
+
+
+def compare(label, baseline, candidate, **kwargs):
+	"""
+	Time baseline and candidate callables and print the speed up.
+
+	:return: `float` speed up factor
+	"""
+	print('\n' + label)
+	old = bench('  before', baseline, **kwargs)
+	new = bench('  after', candidate, **kwargs)
+	speed_up = old / new if new else float('inf')
+	print('  {:.1f}x'.format(speed_up))
+	return speed_up
+# end def compare():
@@ -0,0 +1,149 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	BUILD.PY
+	Build scaling. Generates scaffolds of increasing size in a fresh memory scene, then times Scaffold.make,
+	getModules and batchBuild and counts the nodes they leave in the scene. Times that grow faster than the node
+	count between sizes point at super-linear code.
+
+		python -m rigbot.benchmarks.build
+		python -m rigbot.benchmarks.build 10 100 1000
+
+	Rigs:
+		wide	:	modules cycling through SimpleFk, SpaceSwitchChain and SimpleIkArm, all socketed to the root
+		tail	:	one SimpleFk module with a long joint chain
+		nested	:	SimpleFk modules each socketed to the end of the previous one
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+import sys
+import timeit
+
+from .. import scene, user, utils
+from ..rig import builder, profiler
+
+
+# module type, chain length
+_WIDE_TYPES = [('SimpleFk', 4), ('SpaceSwitchChain', 4), ('SimpleIkArm', 3)]
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# 												scaffold generators
+# ----------------------------------------------------------------------------------------------------------------------
+def wideRig(count):
+	"""
+	:param count:  `int` Number of modules.
+	"""
+	root = utils.makeRoot()
+	for i in range(count):
+		module_type, length = _WIDE_TYPES[i % len(_WIDE_TYPES)]
+		builder.Scaffold.make(n='wide{:04d}'.format(i), l=length, mt=module_type, s=root)
+# end def wideRig():
+
+
+def tailRig(length):
+	"""
+	:param length:  `int` Number of joints in the tail.
+	"""
+	builder.Scaffold.make(n='tail', l=length, mt='SimpleFk', s=utils.makeRoot())
+# end def tailRig():
+
+
+def nestedRig(depth):
+	"""
+	:param depth:  `int` Number of modules, each one socketed to the end joint of the last.
+	"""
+	socket = utils.makeRoot()
+	for i in range(depth):
+		mod_root = builder.Scaffold.make(n='nest{:04d}'.format(i), l=2, mt='SimpleFk', s=socket)
+		socket = mod_root.getChildren(type='joint')[0]
+# end def nestedRig():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def _timed(func, *args):
+	start = timeit.default_timer()
+	result = func(*args)
+	return timeit.default_timer() - start, result
+# end def _timed():
+
+
+def measure(generator, size):
+	"""
+	Generate and build a rig in a fresh memory scene.
+	:param generator:  Scaffold generator, eg; wideRig.
+	:param size:  `int` Size passed to the generator.
+	:return:  `Dict` of timings in seconds and node counts.
+	"""
+	backend = scene.setBackend('memory', fresh=True)
+
+	make_time = _timed(generator, size)[0]
+	scaffold_nodes = len(backend.scene)
+
+	modules_time, modules = _timed(builder.getModules)
+
+	with profiler.BuildProfiler() as prof:
+		build_time = _timed(builder.batchBuild)[0]
+
+	return {
+		'make': make_time,
+		'getModules': modules_time,
+		'batchBuild': build_time,
+		'modules': len(modules),
+		'scaffoldNodes': scaffold_nodes,
+		'nodes': len(backend.scene),
+		'created': prof.totals()['nodes'],
+	}
+# end def measure():
+
+
+def run(sizes=(10, 100, 1000), tail_lengths=(50, 500), depths=(10, 100)):
+	"""
+	Measure every rig at each size and print a table.
+	"""
+	debug, user.debug = user.debug, False
+	stdout = sys.stdout
+
+	line = '{:<8}{:>7}{:>9}{:>10}{:>12}{:>14}{:>14}{:>10}'
+	print(line.format('rig', 'size', 'modules', 'nodes', 'make (s)', 'getModules', 'batchBuild', 'us/node'))
+	print('-' * 84)
+
+	cases = [(wideRig, 'wide', s) for s in sizes]
+	cases += [(tailRig, 'tail', s) for s in tail_lengths]
+	cases += [(nestedRig, 'nested', s) for s in depths]
+	try:
+		for generator, label, size in cases:
+			# batchBuild prints its progress, keep the table readable
+			sys.stdout = _Quiet()
+			try:
+				result = measure(generator, size)
+			finally:
+				sys.stdout = stdout
+			print(line.format(
+				label, size, result['modules'], result['nodes'],
+				'{:.3f}'.format(result['make']), '{:.4f}'.format(result['getModules']),
+				'{:.3f}'.format(result['batchBuild']),
+				'{:.1f}'.format(result['batchBuild'] / max(result['created'], 1) * 1e6)))
+	finally:
+		user.debug = debug
+# end def run():
+
+
+class _Quiet(object):
+
+	def write(self, text):
+		pass
+	# end def write():
+
+	def flush(self):
+		pass
+	# end def flush():
+# end class _Quiet():
+
+
+if __name__ == '__main__':
+	if len(sys.argv) > 1:
+		run(sizes=[int(arg) for arg in sys.argv[1:]])
+	else:
+		run()
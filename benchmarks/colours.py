@@ -0,0 +1,94 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	COLOURS.PY
+	Colour lookup and conversion, per space tables against the original scan and per element conversion.
+
+		python -m rigbot.benchmarks.colours
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+import copy
+import random
+
+from . import compare
+from .. import data
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# 												original implementation
+# ----------------------------------------------------------------------------------------------------------------------
+def _scanRgbValue(colour):
+	for item in data.Colours._colourRGB:
+		if item == colour:
+			return data.Colours._colourRGB[item]
+	raise ValueError('%s is not an available colour!' % colour)
+# end def _scanRgbValue():
+
+
+def _scanLinearValue(colour):
+	rgb_colour = copy.copy(_scanRgbValue(colour))
+	for index, clr in enumerate(rgb_colour):
+		clr = min(max(clr, 0.0), 1.0)
+		if clr <= 0.04045:
+			rgb_colour[index] = clr / 12.92
+		else:
+			rgb_colour[index] = ((clr + 0.055) / 1.055) ** 2.4
+	return rgb_colour
+# end def _scanLinearValue():
+
+
+def _elementConvert(rgb_values):
+	result = []
+	for rgb in rgb_values:
+		converted = list(rgb)
+		for index, clr in enumerate(converted):
+			clr = min(max(clr, 0.0), 1.0)
+			converted[index] = clr / 12.92 if clr <= 0.04045 else ((clr + 0.055) / 1.055) ** 2.4
+		result.append(converted)
+	return result
+# end def _elementConvert():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def run():
+	names = sorted(data.Colours._colourRGB)
+	last = names[-1]
+	data.Colours.warm()
+
+	for name in (names[0], last):
+		assert all(
+			abs(a - b) < 1e-9 for a, b in zip(_scanLinearValue(name), data.Colours.get_linear_value(name))), name
+
+	compare(
+		'sRGB lookup ({})'.format(last),
+		lambda: _scanRgbValue(last),
+		lambda: data.Colours.get_value(last),
+	)
+	compare(
+		'linear lookup ({})'.format(last),
+		lambda: _scanLinearValue(last),
+		lambda: data.Colours.get_value(last, space='linear'),
+	)
+
+	nodes = [random.choice(names) for _ in range(1000)]
+	compare(
+		'linear lookup, 1000 nodes',
+		lambda: [_scanLinearValue(name) for name in nodes],
+		lambda: data.Colours.get_values(nodes, space='linear'),
+		number=20,
+	)
+
+	rgb_values = [[random.random() for _ in range(3)] for _ in range(10000)]
+	compare(
+		'convert 10000 arbitrary rgb values to linear',
+		lambda: _elementConvert(rgb_values),
+		lambda: data.Colours.convert(rgb_values, space='linear'),
+		number=5,
+	)
+# end def run():
+
+
+if __name__ == '__main__':
+	run()
@@ -0,0 +1,285 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	IK.PY
+	SimpleIkArm against the reference solver in rig.ik. Arms pointing down X and -X are built in a fresh memory
+	scene, random control poses are evaluated through the built network with scene.evaluator and solved with
+	rig.ik.solveTwoBone(), then the joint matrices are compared. Fails when they differ by more than the tolerance.
+
+	Poses move the arm controls and the global and cog controls above them, stretch and spaceBlend take every
+	value in between too. The reference only gets those channels, the scaffold joints from before the build and
+	scene values of controls that aren't driven, so the two only agree when the network does the maths right.
+
+		python -m rigbot.benchmarks.ik
+		python -m rigbot.benchmarks.ik 100000		# number of poses
+
+	Timings are the baseline for other ik set ups: network is the evaluated node graph, reference the numpy solve.
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+import collections
+import sys
+import timeit
+
+from .. import scene, user, utils
+from ..rig import builder, ik
+from ..scene import evaluator, mmath
+from .build import _Quiet
+
+
+class IkMismatchException(Exception):
+	pass
+
+
+POSES = 10000
+
+TOLERANCE = 1e-6
+
+# arm name: translateX of its elbow and wrist joints, the sign picks the axis SimpleIkArm builds with
+ARMS = [('L_arm', 10.0), ('R_arm', -10.0)]
+
+# control channel: (low, high) of the uniform random values it is sampled from
+_RANGES = [
+	('ik_ctrl.translate', (-25.0, 25.0)),
+	('ik_ctrl.rotate', (-180.0, 180.0)),
+	('ik_ctrl.spaceBlend', (0.0, 1.0)),
+	('ik_ctrl.stretch', (0.0, 1.0)),
+	('pv_ctrl.translate', (-10.0, 10.0)),
+	('base_ctrl.translate', (-5.0, 5.0)),
+]
+
+# rig control pref, channel: (low, high), moves the global plug and the module socket
+_RIG_RANGES = [
+	('root2-ctrl-name', 'translate', (-10.0, 10.0)),
+	('root2-ctrl-name', 'rotate', (-180.0, 180.0)),
+	('root2-ctrl-name', 'scale', (0.5, 2.0)),
+	('cog-ctrl-name', 'translate', (-5.0, 5.0)),
+	('cog-ctrl-name', 'rotate', (-45.0, 45.0)),
+]
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def buildArms(arms=ARMS):
+	"""
+	Build SimpleIkArm modules in a fresh memory scene.
+	:param arms:  `List` of (name, joint translateX).
+	:return:  `OrderedDict` of arm name: (3, 4, 4) world matrices of its scaffold joints before the build.
+	"""
+	np = mmath.numpyModule()
+	scene.setBackend('memory', fresh=True)
+	backend = scene.getBackend()
+	root = utils.makeRoot()
+	chains = collections.OrderedDict()
+	for i, (name, length) in enumerate(arms):
+		mod_root = builder.Scaffold.make(n=name, l=3, mt='SimpleIkArm', s=root)
+		mod_root.translate.set(length, 20.0, 5.0 * i)
+		for jnt in mod_root.listRelatives(ad=True, type='joint'):
+			jnt.translateX.set(length)
+		chains[name] = [str(mod_root)]
+		while len(chains[name]) < 3:
+			chains[name].append(backend.listRelatives(chains[name][-1], type='joint')[0])
+
+	rest = collections.OrderedDict()
+	for name, chain in chains.items():
+		rest[name] = np.array([backend.getAttr('{}.worldMatrix[0]'.format(jnt)) for jnt in chain]).reshape(3, 4, 4)
+
+	debug, user.debug = user.debug, False
+	stdout, sys.stdout = sys.stdout, _Quiet()
+	try:
+		builder.batchBuild()
+	finally:
+		sys.stdout = stdout
+		user.debug = debug
+	return rest
+# end def buildArms():
+
+
+def rigControls():
+	"""
+	:return:  (global control, socket control) names, the sources of the global plug and socket of SimpleIkArm.
+	"""
+	return tuple('{}_{}'.format(user.prefs[pref], user.prefs['ctrl-suffix']) for pref in (
+		'root2-ctrl-name', 'pivot-ctrl-name'))
+# end def rigControls():
+
+
+def samplePoses(name, count, seed=0):
+	"""
+	Random control values of an arm and the rig controls above it. Scale is uniform, stretch and spaceBlend are
+	sampled across their whole range.
+	:param name:  `str` Arm name.
+	:param count:  `int` Number of poses.
+	:return:  `Dict` of plug: (count, ...) array.
+	"""
+	np = mmath.numpyModule()
+	random = np.random.RandomState(seed)
+	channels = [('{}_{}'.format(name, channel), limits) for channel, limits in _RANGES]
+	channels += [('{}_{}.{}'.format(user.prefs[pref], user.prefs['ctrl-suffix'], channel), limits) for
+				 pref, channel, limits in _RIG_RANGES]
+
+	poses = {}
+	for plug, (low, high) in channels:
+		if plug.endswith('.scale'):
+			poses[plug] = np.repeat(random.uniform(low, high, (count, 1)), 3, axis=1)
+		elif plug.endswith(('.translate', '.rotate')):
+			poses[plug] = random.uniform(low, high, (count, 3))
+		else:
+			poses[plug] = random.uniform(low, high, count)
+	return poses
+# end def samplePoses():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+class ArmComparison(object):
+	"""
+	Evaluates a built arm and the reference solve for the same poses. The reference is given control channels,
+	the scaffold before the build and static scene values of the rig controls, nothing the arm built.
+	"""
+
+	def __init__(self, name, rest):
+		"""
+		:param name:  `str` Name of a built SimpleIkArm module.
+		:param rest:  (3, 4, 4) world matrices of its scaffold joints before the build, see buildArms().
+		"""
+		np = mmath.numpyModule()
+		self.name = name
+		self.backend = scene.getBackend()
+		self.axis = 'X' if rest[1, 3, 0] - rest[0, 3, 0] >= 0.0 else '-X'
+		self.blendMatrix = user.prefs['blend-matrix'] and self.backend.nodeTypeExists('blendMatrix')
+		self.globalControl, self.socketControl = rigControls()
+
+		ik_ctrl = '{}_ik_ctrl'.format(name)
+		self.humerus = self.backend.getAttr('{}.humerus'.format(ik_ctrl))
+		self.radius = self.backend.getAttr('{}.radius'.format(ik_ctrl))
+
+		# control nulls at rest, in the space of the module controls which follow the socket
+		socket_inverse = np.linalg.inv(self.world(self.socketControl))
+		self.ikRest = rest[2]
+		self.ikNull = np.matmul(rest[2], socket_inverse)
+		self.baseNull = np.matmul(rest[0], socket_inverse)
+		self.poleNull = self.matrix('{}_pv_ctrl_null'.format(name))
+
+		self.outputs = ['{}_output.RB_Output[{}]'.format(name, i) for i in range(3)]
+		inputs = list(samplePoses(name, 1))
+		self.network = evaluator.GraphEvaluator(self.outputs, inputs=inputs)
+	# end def __init__():
+
+	def matrix(self, node, poses=None):
+		"""
+		:return:  Local matrix of a node, composed from its channels when any of them are sampled.
+		"""
+		np = mmath.numpyModule()
+		channels = ['{}.{}'.format(node, channel) for channel in ('translate', 'rotate', 'scale')]
+		if not any(plug in (poses or {}) for plug in channels):
+			return np.reshape(self.backend.getAttr('{}.matrix'.format(node)), (4, 4))
+		return ik.composeMatrix(*[
+			poses[plug] if plug in poses else self.backend.getAttr(plug) for plug in channels])
+	# end def matrix():
+
+	def world(self, node, poses=None):
+		"""
+		:return:  World matrix of a node that isn't driven by the rig, eg; a rig control.
+		"""
+		np = mmath.numpyModule()
+		matrix = np.eye(4)
+		while node:
+			matrix = np.matmul(matrix, self.matrix(node, poses))
+			node = (self.backend.listRelatives(node, parent=True) or [None])[0]
+		return matrix
+	# end def world():
+
+	def evaluate(self, poses):
+		"""
+		:param poses:  `Dict` of control plug: values, see samplePoses().
+		:return:  (count, 3, 4, 4) joint matrices from the built network.
+		"""
+		np = mmath.numpyModule()
+		result = self.network.evaluate(poses)
+		return np.stack([result[plug] for plug in self.network.outputs], axis=-3)
+	# end def evaluate():
+
+	def inputs(self, poses):
+		"""
+		Reference solver inputs, eg; the ik control's world matrix from its channels and space blend.
+		:param poses:  `Dict` of control plug: values, see samplePoses().
+		:return:  `Dict` of solveTwoBone() argument: values.
+		"""
+		np = mmath.numpyModule()
+		channel = lambda plug: poses['{}_{}'.format(self.name, plug)]
+		socket = self.world(self.socketControl, poses)
+
+		space = ik.spaceBlend(
+			ik.globalSpace(self.ikRest, self.world(self.globalControl, poses), socket), self.ikNull,
+			channel('ik_ctrl.spaceBlend'), self.blendMatrix)
+		null_scale = np.linalg.norm(self.ikNull[:3, :3], axis=-1)
+		base = np.matmul(np.matmul(ik.composeMatrix(channel('base_ctrl.translate')), self.baseNull), socket)
+		pole = np.matmul(np.matmul(ik.composeMatrix(channel('pv_ctrl.translate')), self.poleNull), socket)
+
+		return {
+			'base': base[..., 3, :3],
+			'target': ik.spaceControl(
+				channel('ik_ctrl.translate'), channel('ik_ctrl.rotate'), space, socket, null_scale),
+			'pole': pole[..., 3, :3],
+			'humerus': self.humerus,
+			'radius': self.radius,
+			'stretch': channel('ik_ctrl.stretch'),
+			'scale': ik.socketScale(socket),
+			'axis': self.axis,
+		}
+	# end def inputs():
+
+	def solve(self, inputs):
+		"""
+		:param inputs:  `Dict` from inputs().
+		:return:  (count, 3, 4, 4) joint matrices from the reference solver.
+		"""
+		return ik.solveTwoBone(**inputs)
+	# end def solve():
+# end class ArmComparison():
+
+
+def _timed(func, *args):
+	start = timeit.default_timer()
+	result = func(*args)
+	return timeit.default_timer() - start, result
+# end def _timed():
+
+
+def run(count=POSES, tolerance=TOLERANCE):
+	"""
+	Compare every arm and print a table.
+	:param count:  `int` Number of poses per arm.
+	:param tolerance:  `float` Largest allowed difference of any matrix element.
+	:return:  `Dict` of arm name: largest difference.
+	"""
+	line = '{:<10}{:>6}{:>9}{:>16}{:>16}{:>14}'
+	print(line.format('arm', 'axis', 'poses', 'network (us)', 'reference (us)', 'max error'))
+	print('-' * 71)
+
+	errors = {}
+	failures = []
+	for name, rest in buildArms().items():
+		comparison = ArmComparison(name, rest)
+		poses = samplePoses(name, count)
+		network_time, network = _timed(comparison.evaluate, poses)
+		reference_time, reference = _timed(comparison.solve, comparison.inputs(poses))
+
+		errors[name] = float(abs(network - reference).max())
+		print(line.format(
+			name, comparison.axis, count, '{:.3f}'.format(network_time / count * 1e6),
+			'{:.3f}'.format(reference_time / count * 1e6), '{:.2e}'.format(errors[name])))
+		if not errors[name] <= tolerance:
+			failures.append('{} differs by {:.2e}, tolerance is {:.0e}'.format(name, errors[name], tolerance))
+
+	if failures:
+		raise IkMismatchException('--SimpleIkArm does not match the reference solve:\n{}'.format('\n'.join(failures)))
+	return errors
+# end def run():
+
+
+if __name__ == '__main__':
+	if len(sys.argv) > 1:
+		run(count=int(sys.argv[1]))
+	else:
+		run()
@@ -0,0 +1,107 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	IMPORTS.PY
+	Import time of rigbot entry points, each one imported in a fresh interpreter so nothing is already loaded. Fails
+	when an import takes longer than the budget or loads a dependency that should only load on first use.
+
+		python -m rigbot.benchmarks.imports
+		python -m rigbot.benchmarks.imports 100		# budget in ms
+
+	The best of a few runs is kept, the first run also writes .pyc files.
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+import ast
+import os
+import subprocess
+import sys
+
+
+class ImportBudgetException(Exception):
+	pass
+
+
+ENTRY_POINTS = [
+	'rigbot',
+	'rigbot.scene',
+	'rigbot.utils',
+	'rigbot.modules',
+	'rigbot.rig.builder',
+	'rigbot.rig.controls',
+]
+
+# top level packages that are only imported on first use
+DEFERRED = ('numpy', 'pymel', 'maya')
+
+BUDGET_MS = 100
+
+_SCRIPT = """
+import sys, timeit
+loaded = set(sys.modules)
+start = timeit.default_timer()
+{}
+end = timeit.default_timer()
+print(repr((end - start, sorted(set(m.split('.')[0] for m in set(sys.modules) - loaded if sys.modules[m] is not None)))))
+"""
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def measure(module, repeat=3, interpreter=None):
+	"""
+	Import a module in fresh interpreters.
+	:param module:  `str` Module import path.
+	:param repeat:  `int` Number of interpreters, the fastest import is kept.
+	:param interpreter:  `str` Python executable, this one if None.
+	:return:  (`float` seconds, `List` of top level packages the import loaded)
+	"""
+	# the folder containing rigbot, not resolved so a linked rigbot folder keeps its name
+	path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+	env = dict(os.environ)
+	env['PYTHONPATH'] = os.pathsep.join(p for p in [path, env.get('PYTHONPATH')] if p)
+
+	results = []
+	for _ in range(repeat):
+		output = subprocess.check_output(
+			[interpreter or sys.executable, '-c', _SCRIPT.format('import ' + module)], env=env)
+		results.append(ast.literal_eval(output.decode().strip().splitlines()[-1]))
+	return min(results)
+# end def measure():
+
+
+def run(budget_ms=BUDGET_MS, modules=None):
+	"""
+	Measure every entry point and print a table.
+	:param budget_ms:  `float` Slowest allowed import in milliseconds.
+	:param modules:  `List` of modules to import, ENTRY_POINTS if None.
+	:return:  `Dict` of module: milliseconds.
+	"""
+	line = '{:<24}{:>12}{:>10}  {}'
+	print(line.format('module', 'import (ms)', 'packages', 'deferred'))
+	print('-' * 64)
+
+	times = {}
+	failures = []
+	for module in modules or ENTRY_POINTS:
+		seconds, loaded = measure(module)
+		times[module] = seconds * 1e3
+		deferred = [p for p in loaded if p in DEFERRED]
+		print(line.format(module, '{:.1f}'.format(times[module]), len(loaded), ', '.join(deferred)))
+
+		if times[module] > budget_ms:
+			failures.append('{} took {:.1f} ms, budget is {} ms'.format(module, times[module], budget_ms))
+		if deferred:
+			failures.append('{} imported {}'.format(module, ', '.join(deferred)))
+
+	if failures:
+		raise ImportBudgetException('--Import time regressed:\n{}'.format('\n'.join(failures)))
+	return times
+# end def run():
+
+
+if __name__ == '__main__':
+	if len(sys.argv) > 1:
+		run(budget_ms=float(sys.argv[1]))
+	else:
+		run()
@@ -7,7 +7,67 @@
 """
 # ----------------------------------------------------------------------------------------------------------------------
 
-import copy
+import array
+import collections
+import math
+import os
+import struct
+import sys
+
+from . import user
+from .scene import mmath
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# colour space converters work on a single [r, g, b] or on a (n, 3) numpy array
+
+def _isArray(rgb):
+	# an array means numpy is already imported, single colours don't import it
+	numpy = sys.modules.get('numpy')
+	return numpy is not None and isinstance(rgb, numpy.ndarray)
+# end def _isArray():
+
+
+def _toLinear(rgb):
+	"""
+	Stored colours are sRGB encoded, decode them with the sRGB transfer function.
+	"""
+	if _isArray(rgb):
+		numpy = mmath.numpyModule()
+		rgb = numpy.clip(rgb, 0.0, 1.0)
+		return numpy.where(rgb <= 0.04045, rgb / 12.92, numpy.power((rgb + 0.055) / 1.055, 2.4))
+	return [_decode(min(max(c, 0.0), 1.0)) for c in rgb]
+# end def _toLinear():
+
+
+def _decode(c):
+	return c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4
+# end def _decode():
+
+
+# linear sRGB primaries to ACEScg (AP1), bradford adapted D65 to D60
+_ACESCG_MATRIX = (
+	(0.6130974024, 0.3395231462, 0.0473794514),
+	(0.0701937225, 0.9163538791, 0.0134523985),
+	(0.0206155929, 0.1095697729, 0.8698146342),
+)
+
+
+def _toACEScg(rgb):
+	# the matrix works on linear values
+	rgb = _toLinear(rgb)
+	if _isArray(rgb):
+		return rgb.dot(mmath.numpyModule().array(_ACESCG_MATRIX).T)
+	return [sum(m * c for m, c in zip(row, rgb)) for row in _ACESCG_MATRIX]
+# end def _toACEScg():
+
+
+# name: converter from the stored values, None keeps values as they are. Add entries here for more spaces.
+colourSpaces = {
+	'sRGB': None,
+	'linear': _toLinear,
+	'ACEScg': _toACEScg,
+}
 
 
 class Colours:
@@ -29,6 +89,9 @@ class Colours:
 		"pink":			[1.0,	0.038, 	0.229],
 	}
 
+	# colour tables per space, built on first lookup
+	_tables = {}
+
 	@staticmethod
 	def get_rgb_value(colour):
 		"""
@@ -37,10 +100,10 @@ class Colours:
 		:param colour: string name of colour
 		:return: rgb 0-1 of colour
 		"""
-		for item in Colours._colourRGB:
-			if item == colour:
-				return Colours._colourRGB[item]
-		raise ValueError('%s is not an available colour!' % colour)
+		try:
+			return Colours._colourRGB[colour]
+		except KeyError:
+			raise ValueError('%s is not an available colour!' % colour)
 	# end def get_rgb_value():
 
 	@staticmethod
@@ -51,28 +114,83 @@ class Colours:
 		:param colour: string name of colour
 		:return: rgb 0-1 of colour converted to linear space
 		"""
-		rgb_colour = copy.copy(Colours.get_rgb_value(colour))
-		for index, clr in enumerate(rgb_colour):
-			shifted_value = (1.055 * (clr ** (1.0 / 2.4)) - 0.055)
-			if 0 > shifted_value:
-				rgb_colour[ index ] = 0.0
-			elif 1 < shifted_value:
-				rgb_colour[ index ] = 1.0
-			else:
-				rgb_colour[ index ] = shifted_value
-		return rgb_colour
+		return Colours.get_value(colour, space='linear')
 	# end def get_linear_value():
 
 	@staticmethod
 	def get_value(colour, space='sRGB'):
-		if space == 'sRGB':
-			return Colours.get_rgb_value(colour)
-		elif space == 'linear':
-			return Colours.get_linear_value(colour)
-		else:
-			raise ValueError('--Unknown colour space: {}.'.format(space))
+		table = Colours._tables.get(space) or Colours.table(space)
+		try:
+			return table[colour]
+		except KeyError:
+			raise ValueError('%s is not an available colour!' % colour)
 	# end def get_value():
 
+	@staticmethod
+	def get_values(colours, space='sRGB'):
+		"""
+		Look up many colours at once.
+
+		:param colours: list of colour names
+		:param space: colour space
+		:return: list of rgb values
+		"""
+		table = Colours._tables.get(space) or Colours.table(space)
+		try:
+			return [table[colour] for colour in colours]
+		except KeyError:
+			raise ValueError('%s is not an available colour!' % [c for c in colours if c not in table][0])
+	# end def get_values():
+
+	@staticmethod
+	def table(space='sRGB'):
+		"""
+		Every named colour in a colour space, all colours are converted in one go the first time a space is used.
+
+		:param space: colour space, see colourSpaces
+		:return: dict of colour name: [r, g, b], shared so treat values as read only
+		"""
+		table = Colours._tables.get(space)
+		if table is None:
+			names = list(Colours._colourRGB)
+			values = Colours.convert([Colours._colourRGB[name] for name in names], space=space)
+			table = Colours._tables[space] = dict(zip(names, values))
+		return table
+	# end def table():
+
+	@staticmethod
+	def convert(rgb_values, space='linear'):
+		"""
+		Convert rgb values to a colour space as one array operation.
+
+		:param rgb_values: list of [R,G,B] 0-1
+		:param space: colour space, see colourSpaces
+		:return: list of [r, g, b]
+		"""
+		if space not in colourSpaces:
+			raise ValueError('--Unknown colour space: {}.'.format(space))
+		if not len(rgb_values):
+			return []
+
+		converter = colourSpaces[space]
+		if converter is None:
+			return [[float(v) for v in rgb] for rgb in rgb_values]
+
+		numpy = mmath.numpyModule()
+		if numpy is not None:
+			return converter(numpy.asarray(rgb_values, dtype=float)).tolist()
+		return [converter(rgb) for rgb in rgb_values]
+	# end def convert():
+
+	@staticmethod
+	def warm():
+		"""
+		Build tables for sRGB, linear and user.prefs['viewport-colour-space'] up front.
+		"""
+		for space in ('sRGB', 'linear', user.prefs['viewport-colour-space']):
+			Colours.table(space)
+	# end def warm():
+
 	@staticmethod
 	def list():
 		print('\nAvailable colours are:')
@@ -82,7 +200,7 @@ class Colours:
 # end class Colours:
 
 
-controllerShapes = {
+_controllerShapePoints = {
 	'locator':	[
 		[0.0, 0.0, 10.0], [0.0, 0.0, -10.0],
 		[0.0, 0.0, 0.0], [10.0, 0.0, 0.0],
@@ -247,4 +365,194 @@ controllerShapes = {
 		[-2.5666479854058664, 0.0, 3.623370206814978],
 		[-1.2325869843739377, 0.0, 4.265819908538256],
 	]
-}
\ No newline at end of file
+}
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+class ShapeLibraryException(Exception):
+	pass
+
+
+class ShapeLibrary(object):
+	"""
+	Controller shapes stored as flat float arrays. Scaled and rotated variants are computed once and kept in an LRU
+	cache so controllers can be created with their final points.
+
+	Shapes can also come from shape files (see save()), registered files are only read the first time a shape that
+	is not already known is asked for. Files in user.prefs['controller-shape-files'] are registered on first use.
+
+	Indexing returns a fresh nested list the same as the old controllerShapes dictionary:
+
+		pm.curve(d=1, p=data.controllerShapes['cube'])
+		pm.curve(d=1, p=data.controllerShapes.points('cube', size=2, rotation=90, axis=[0, 0, 1]))
+	"""
+
+	_MAGIC = b'RBSH'
+	_HEADER = struct.Struct('<4sI')
+	_ENTRY = struct.Struct('<HI')
+
+	def __init__(self, shapes=None, cache_size=None):
+		"""
+		:param shapes:  `dict` of shape name: `List` of [x, y, z] points.
+		:param cache_size:  `int` Max number of cached variants, default is user.prefs['shape-cache-size'].
+		"""
+		self._shapes = {}
+		self._files = []
+		self._prefsLoaded = False
+		self._cache = collections.OrderedDict()
+		self.cacheSize = user.prefs['shape-cache-size'] if cache_size is None else cache_size
+
+		for name, points in (shapes or {}).items():
+			self.add(name, points)
+	# end def __init__():
+
+	def __getitem__(self, name):
+		flat = self._get(name)
+		return [list(flat[i:i + 3]) for i in range(0, len(flat), 3)]
+	# end def __getitem__():
+
+	def __contains__(self, name):
+		try:
+			self._get(name)
+		except KeyError:
+			return False
+		return True
+	# end def __contains__():
+
+	def __iter__(self):
+		return iter(self.keys())
+	# end def __iter__():
+
+	def keys(self):
+		self._loadFiles()
+		return sorted(self._shapes)
+	# end def keys():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	def add(self, name, points):
+		"""
+		Add or replace a shape, cached variants of it are dropped.
+		:param name:  `str` Shape name.
+		:param points:  `List` of [x, y, z] or flat `List` of floats.
+		:return:  None
+		"""
+		flat = array.array('d', mmath._flatten(points))
+		if len(flat) % 3:
+			raise ShapeLibraryException('--Shape points must have 3 values each: {}'.format(name))
+		self._shapes[name] = flat
+		for key in [k for k in self._cache if k[0] == name]:
+			del self._cache[key]
+	# end def add():
+
+	def _get(self, name):
+		flat = self._shapes.get(name)
+		if flat is None:
+			self._loadFiles()
+			flat = self._shapes.get(name)
+			if flat is None:
+				raise KeyError('--Unknown controller shape: {}'.format(name))
+		return flat
+	# end def _get():
+
+	def points(self, name, size=1.0, rotation=0.0, axis=(1, 0, 0)):
+		"""
+		Shape points scaled by size then rotated around axis, the same result as scaleCtrlShapes followed by
+		rotateCtrlShapes. Results are cached, treat them as read only.
+		:param name:  `str` Shape name.
+		:param size:  `float` Scale factor.
+		:param rotation:  `float` Degrees to rotate.
+		:param axis:  `List` Rotate around these axis.
+		:return:  `tuple` of (x, y, z) tuples.
+		"""
+		key = (name, float(size), float(rotation), tuple(float(a) for a in axis))
+		points = self._cache.pop(key, None)
+		if points is None:
+			flat = self._get(name)
+			points = [flat[i:i + 3] for i in range(0, len(flat), 3)]
+			if key[1] != 1.0 or key[2]:
+				matrix = mmath.compose(rotate=[math.radians(a * rotation) for a in key[3]], scale=[key[1]] * 3)
+				points = mmath.transformPoints(points, matrix)
+			points = tuple(tuple(p) for p in points)
+
+			while self.cacheSize and len(self._cache) >= self.cacheSize:
+				self._cache.popitem(last=False)
+		self._cache[key] = points
+		return points
+	# end def points():
+
+	def clearCache(self):
+		self._cache.clear()
+	# end def clearCache():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	def addFile(self, path):
+		"""
+		Register a shape file, it is read the first time an unknown shape is asked for.
+		:param path:  `str` File path.
+		:return:  None
+		"""
+		if path not in self._files:
+			self._files.append(path)
+	# end def addFile():
+
+	def _loadFiles(self):
+		if not self._prefsLoaded:
+			self._prefsLoaded = True
+			for path in user.prefs['controller-shape-files']:
+				self.addFile(path)
+
+		files, self._files = self._files, []
+		for path in files:
+			self.load(path)
+	# end def _loadFiles():
+
+	def load(self, path):
+		"""
+		Read every shape in a shape file, existing shapes with the same name are replaced.
+		:param path:  `str` File path.
+		:return:  `List` of loaded shape names.
+		"""
+		names = []
+		with open(path, 'rb') as f:
+			magic, count = self._HEADER.unpack(f.read(self._HEADER.size))
+			if magic != self._MAGIC:
+				raise ShapeLibraryException('--Not a controller shape file: {}'.format(path))
+			for _ in range(count):
+				name_length, num_points = self._ENTRY.unpack(f.read(self._ENTRY.size))
+				name = f.read(name_length).decode('utf-8')
+				flat = array.array('d')
+				flat.fromfile(f, num_points * 3)
+				if sys.byteorder == 'big':
+					flat.byteswap()
+				self.add(name, flat)
+				names.append(name)
+		return names
+	# end def load():
+
+	def save(self, path, names=None):
+		"""
+		Write shapes to a shape file, little endian doubles with a small header per shape.
+		:param path:  `str` File path.
+		:param names:  `List` of shape names to write, default all.
+		:return:  None
+		"""
+		names = self.keys() if names is None else names
+		directory = os.path.dirname(path)
+		if directory and not os.path.isdir(directory):
+			os.makedirs(directory)
+
+		with open(path, 'wb') as f:
+			f.write(self._HEADER.pack(self._MAGIC, len(names)))
+			for name in names:
+				flat = array.array('d', self._get(name))
+				if sys.byteorder == 'big':
+					flat.byteswap()
+				encoded = name.encode('utf-8')
+				f.write(self._ENTRY.pack(len(encoded), len(flat) // 3))
+				f.write(encoded)
+				flat.tofile(f)
+	# end def save():
+# end class ShapeLibrary():
+
+
+controllerShapes = ShapeLibrary(_controllerShapePoints)
@@ -7,9 +7,10 @@
 """
 # ----------------------------------------------------------------------------------------------------------------------
 
-import pymel.core as pm
+import json
 
-from .. import user, utils
+from .. import user, utils, scene
+from ..scene import pm, traverse
 
 
 # ----------------------------------------------------------------------------------------------------------------------
@@ -17,6 +18,14 @@ class ModuleBaseException(Exception):
 	pass
 
 
+# how postBuild drives the chain joints from the module output, see user.prefs['joint-output-mode']
+OUTPUT_DECOMPOSE = 'decompose'
+OUTPUT_OFFSET_PARENT = 'offsetParentMatrix'
+OUTPUT_MODES = (OUTPUT_DECOMPOSE, OUTPUT_OFFSET_PARENT)
+
+_IDENTITY = (1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0)
+
+
 class ModuleBase(object):
 
 	# TODO: add extra prefs dict for modules? eg; ctrl shapes, ctrl colours ? anything 'hard coded'
@@ -36,6 +45,7 @@ class ModuleBase(object):
 		self.socket = scaffold_obj.socket
 		self.includeEndJoint = scaffold_obj.includeEndJoint
 		self.socketDcmp = None
+		self.outputMode = user.prefs['joint-output-mode']
 
 		# get rig globals
 		if pm.objExists(user.prefs['module-group-name']):
@@ -48,6 +58,9 @@ class ModuleBase(object):
 
 		# module attributes
 		self.controllers = {}
+
+		# every node created while the build phases run, see builder._runPhase()
+		self.registry = scene.NodeRegistry()
 	# end def __init__():
 
 	def __str__(self):
@@ -75,6 +88,10 @@ class ModuleBase(object):
 			errors.append('Chain does not exist.')
 		if not pm.pluginInfo('matrixNodes', query=True, loaded=True):
 			errors.append('This component requires matrixNodes plugin to be loaded.')
+		if self.outputMode not in OUTPUT_MODES:
+			errors.append('Unknown joint output mode: {}'.format(self.outputMode))
+		elif self.outputMode == OUTPUT_OFFSET_PARENT and self.chain and not self.chain[0].hasAttr('offsetParentMatrix'):
+			errors.append('Joint output mode {} requires maya 2020 or later.'.format(self.outputMode))
 		return errors
 	# end validateChain():
 
@@ -90,6 +107,7 @@ class ModuleBase(object):
 		)
 
 		pm.parent(self.modGlobals['modRoot'], self.rigModuleGrp)
+		self._storeScaffoldAttrs()
 
 		utils.makeAttr(self.modGlobals['modOutput'], name='RB_Output', at='matrix', multi=True)
 
@@ -101,23 +119,27 @@ class ModuleBase(object):
 
 		utils.makeAttr(self.modGlobals['modInput'], name='RB_Socket', at='matrix')
 
+		graph = self.graph
+		mod_input = graph.node(self.modGlobals['modInput'])
+		mod_ctrls = graph.node(self.modGlobals['modCtrls'])
+
 		# make connections
 		if self.socket.shortName() == user.prefs['root-joint']:
 			pivot_name = '{}_{}'.format(user.prefs['pivot-ctrl-name'], user.prefs['ctrl-suffix'])
 			if pm.objExists(pivot_name):
-				pm.PyNode(pivot_name).worldMatrix[0] >> self.modGlobals['modInput'].RB_Socket
+				graph.node(pivot_name).worldMatrix[0] >> mod_input.RB_Socket
 			else:
 				raise ModuleBaseException('--Pivot ctrl does not exist: {}'.format(pivot_name))
 		else:
-			self.socket.worldMatrix[0] >> self.modGlobals['modInput'].RB_Socket
+			graph.node(self.socket).worldMatrix[0] >> mod_input.RB_Socket
 
-		self.socketDcmp = pm.createNode('decomposeMatrix', n=self.name + '_socket_dcmpM')
+		self.socketDcmp = graph.createNode('decomposeMatrix', n=self.name + '_socket_dcmpM')
 
-		self.modGlobals['modInput'].attr(self._controls_driver) >> self.socketDcmp.inputMatrix
+		mod_input.attr(self._controls_driver) >> self.socketDcmp.inputMatrix
 
-		self.socketDcmp.outputTranslate >> self.modGlobals['modCtrls'].translate
-		self.socketDcmp.outputRotate >> self.modGlobals['modCtrls'].rotate
-		self.socketDcmp.outputScale >> self.modGlobals['modCtrls'].scale
+		self.socketDcmp.outputTranslate >> mod_ctrls.translate
+		self.socketDcmp.outputRotate >> mod_ctrls.rotate
+		self.socketDcmp.outputScale >> mod_ctrls.scale
 
 		if self._has_dag_rig:
 			self.modGlobals['transformGrp'] = pm.group(n=self.name + '_transform', em=True)
@@ -127,9 +149,10 @@ class ModuleBase(object):
 			)
 			pm.parent(rig_dag_grp, self.modGlobals['modRoot'])
 
-			self.socketDcmp.outputTranslate >> self.modGlobals['transformGrp'].translate
-			self.socketDcmp.outputRotate >> self.modGlobals['transformGrp'].rotate
-			self.socketDcmp.outputScale >> self.modGlobals['transformGrp'].scale
+			transform_grp = graph.node(self.modGlobals['transformGrp'])
+			self.socketDcmp.outputTranslate >> transform_grp.translate
+			self.socketDcmp.outputRotate >> transform_grp.rotate
+			self.socketDcmp.outputScale >> transform_grp.scale
 	# end registerModule():
 
 	# ------------------------------------------------------------------------------------------------------------------
@@ -156,11 +179,17 @@ class ModuleBase(object):
 			pm.delete(root_shape)
 		self.root.useOutlinerColor.set(0)
 
+		graph = self.graph
 		for i, jnt in enumerate(self.chain):
-			multm = pm.createNode('multMatrix', n='{}_out_multM'.format(jnt))
-			dcmp = pm.createNode('decomposeMatrix', n='{}_out_dcmpM'.format(jnt))
+			if self.outputMode == OUTPUT_OFFSET_PARENT:
+				self._driveJoint(graph, jnt, self.outputPlug[i])
+				continue
 
-			self.outputPlug[i] >> multm.matrixIn[0]
+			multm = graph.createNode('multMatrix', n='{}_out_multM'.format(jnt))
+			dcmp = graph.createNode('decomposeMatrix', n='{}_out_dcmpM'.format(jnt))
+			jnt = graph.node(jnt)
+
+			graph.connectAttr(self.outputPlug[i], multm.matrixIn[0])
 			jnt.parentInverseMatrix >> multm.matrixIn[1]
 			multm.matrixSum >> dcmp.inputMatrix
 
@@ -169,11 +198,25 @@ class ModuleBase(object):
 			# TODO: maybe, scale connection could be class global variable possible _connect_scale = False
 	# end def postBuild():
 
+	@staticmethod
+	def _driveJoint(graph, jnt, output_plug):
+		"""
+		Drive a joint with a world matrix through its offset parent matrix, no dg nodes needed. The joint does not
+		inherit its parent transform and its translate and rotate are zeroed, so its world matrix is the output. Joint
+		orients are already cleaned in preBuild.
+		"""
+		jnt = graph.node(jnt)
+		graph.setAttr(jnt.translate, 0.0, 0.0, 0.0)
+		graph.setAttr(jnt.rotate, 0.0, 0.0, 0.0)
+		graph.setAttr(jnt.inheritsTransform, False)
+		graph.connectAttr(output_plug, jnt.offsetParentMatrix)
+	# end def _driveJoint():
+
 	# ------------------------------------------------------------------------------------------------------------------
 	def encapsulate(self):
 		contain = pm.createNode('container', name=self.name)
 
-		contain.addNode(utils.getModuleNodes(self.modGlobals['modRoot']))
+		contain.addNode([node for node in self.registry.names() if node != str(contain)])
 
 		publish_count = 1
 		for control in self.controllers.values():
@@ -190,15 +233,149 @@ class ModuleBase(object):
 
 				publish_count += 1
 
+	# ------------------------------------------------------------------------------------------------------------------
+	def getNodes(self, type=None):
+		"""
+		Nodes of the built module. Recorded on the registry during a build, afterwards the container holds them.
+		:param type:  `str` or `List` of node types to keep, inherited types match.
+		:return:  `List` of names.
+		"""
+		if len(self.registry):
+			return self.registry.names(type=type)
+
+		backend = scene.getBackend()
+		if not (backend.objExists(self.name) and backend.nodeType(self.name) == 'container'):
+			return []
+		nodes = [str(node) for node in pm.PyNode(self.name).getNodeList()] + [self.name]
+		return backend.ls(nodes, type=type) if type is not None else nodes
+	# end def getNodes():
+
+	def selectNodes(self):
+		"""
+		Select every node of the built module.
+		:return:  None
+		"""
+		scene.getBackend().select(*self.getNodes())
+	# end def selectNodes():
+
 	# ------------------------------------------------------------------------------------------------------------------
 	def dismantle(self):
+		"""
+		Delete the built rig of this module so it can be built again, the scaffold chain is kept and restored. See
+		dismantleModules() to dismantle many modules at once.
+		:return:  None
+		"""
 		# deconstruct destroy, discombobulate, derig, delete.
-		# can hopefully figure out a nice way to make this work for every module.
-		# if containerized, decontainerize
-		# uhh should this just be function somewhere.. hard to remake this class maybe?
-		pass
+		dismantleModules([self])
 	# end def dismantle():
 
+	def _dismantleEdits(self, backend):
+		"""
+		What dismantling this module takes, without changing the scene.
+		:return:  (`List` of (source, destination) connections driving the chain, `List` of nodes to delete,
+					`List` of (joint, world matrix) for joints driven through their offset parent matrix)
+		"""
+		connections = []
+		nodes = []
+		poses = []
+
+		# joint output nodes from postBuild, disconnected first so the joints keep their pose
+		for jnt in self.chain:
+			drivers = set()
+			for plug, source in backend.listConnections(
+					jnt, destination=False, connections=True, type='decomposeMatrix'):
+				connections.append((source, plug))
+				dcmp = source.split('.', 1)[0]
+				drivers.add(dcmp)
+				drivers.update(backend.listConnections(dcmp, destination=False, type='multMatrix'))
+			for plug, destination in backend.listConnections(
+					jnt, source=False, connections=True, type='multMatrix'):
+				if destination.split('.', 1)[0] in drivers:
+					connections.append((plug, destination))
+			nodes += drivers
+
+			# joints driven in offsetParentMatrix mode keep the pose they have now
+			for plug, source in backend.listConnections(
+					'{}.offsetParentMatrix'.format(jnt), source=True, destination=False, connections=True):
+				connections.append((source, plug))
+				poses.append((str(jnt), backend.xform(jnt, query=True, matrix=True, worldSpace=True)))
+
+		nodes += self.getNodes()
+
+		# rigs encapsulated before modules kept a node registry miss dg nodes only driven by controls
+		mod_root = self.name + '_mod'
+		if backend.objExists(mod_root):
+			dag = backend.listRelatives(mod_root, allDescendents=True) + [mod_root]
+			nodes += traverse.iterGraph(dag, prune_type=['dagNode', 'container'])
+			nodes.append(mod_root)
+
+		return connections, nodes, poses
+	# end def _dismantleEdits():
+
+	def scaffoldAttrs(self):
+		"""
+		RB_* attributes of the scaffold chain as they are now.
+		:return:  `List` of [joint, attribute, value, locked].
+		"""
+		backend = scene.getBackend()
+		attrs = []
+		for jnt in self.chain:
+			for attr in sorted(str(a) for a in backend.listAttr(jnt, userDefined=True)):
+				if attr.startswith('RB_'):
+					plug = '{}.{}'.format(jnt, attr)
+					attrs.append([str(jnt), attr, backend.getAttr(plug), backend.getAttr(plug, lock=True)])
+		return attrs
+	# end def scaffoldAttrs():
+
+	def _storeScaffoldAttrs(self):
+		# kept on the module root so a dismantle in a later session can still put them back
+		backend = scene.getBackend()
+		mod_root = str(self.modGlobals['modRoot'])
+		backend.addAttr(mod_root, longName='RB_scaffold', dataType='string')
+		backend.setAttr(mod_root + '.RB_scaffold', json.dumps(self.scaffoldAttrs()), type='string')
+	# end def _storeScaffoldAttrs():
+
+	def builtScaffoldAttrs(self):
+		"""
+		RB_* attributes of the scaffold chain when the module was built.
+		:return:  `List` like scaffoldAttrs(), [] if the module is not built.
+		"""
+		backend = scene.getBackend()
+		mod_root = self.name + '_mod'
+		if backend.objExists(mod_root) and backend.attributeExists(mod_root, 'RB_scaffold'):
+			return json.loads(backend.getAttr(mod_root + '.RB_scaffold') or '[]')
+		return []
+	# end def builtScaffoldAttrs():
+
+	def restoreScaffold(self, attrs=None, display=True):
+		"""
+		Put back what the build took from the scaffold: RB_* attribute values and locks, the display shape and
+		outliner colour of the module root.
+		:param attrs:  `List` from builtScaffoldAttrs(), read before the module is deleted. Attributes removed since
+						are not added back.
+		:param display:  `bool` Restore the display, can be skipped when the module is built again right away.
+		:return:  None
+		"""
+		backend = scene.getBackend()
+		for jnt, attr, value, locked in attrs or []:
+			if not (backend.objExists(jnt) and backend.attributeExists(jnt, attr)):
+				continue
+			plug = '{}.{}'.format(jnt, attr)
+			for source in backend.listConnections(plug, destination=False, plugs=True):
+				backend.disconnectAttr(source, plug)
+			backend.setAttr(plug, lock=False)
+			if isinstance(value, basestring):
+				backend.setAttr(plug, value, type='string')
+			elif isinstance(value, list):
+				backend.setAttr(plug, *value)
+			else:
+				backend.setAttr(plug, value)
+			backend.setAttr(plug, lock=locked)
+
+		if display and self.root is not None and not self.root.getShape():
+			utils.makeScaffoldDisplay(self.root, self.name)
+	# end def restoreScaffold():
+
 	@property
 	def root(self):
 		if self.chain:
@@ -207,6 +384,15 @@ class ModuleBase(object):
 			return None
 	# end def root():
 
+	@property
+	def graph(self):
+		"""
+		Graph modifier to record nodes and connections into, committed in bulk at the end of each build phase.
+		:return:  `GraphModifier`
+		"""
+		return scene.current()
+	# end def graph():
+
 	@property
 	def socketPlug(self):
 		return self.modGlobals['modInput'].attr('RB_Socket')
@@ -261,7 +447,7 @@ class ModuleBase(object):
 		utils.makeAttr(self.modGlobals['modInput'], name='RB_World', at='matrix')
 		rig_global_ctrl = pm.PyNode('{}_{}'.format(user.prefs['root2-ctrl-name'], user.prefs['ctrl-suffix']))
 
-		rig_global_ctrl.worldMatrix[0] >> self.modGlobals['modInput'].RB_World
+		self.graph.connectAttr(rig_global_ctrl.worldMatrix[0], self.modGlobals['modInput'].RB_World)
 	# end def makeGlobalSocket():
 
 	def _makeCogSocket(self):
@@ -272,6 +458,46 @@ class ModuleBase(object):
 		utils.makeAttr(self.modGlobals['modInput'], name='RB_Cog', at='matrix')
 		cog_pivot_ctrl = pm.PyNode('{}_{}'.format(user.prefs['pivot-ctrl-name'], user.prefs['ctrl-suffix']))
 
-		cog_pivot_ctrl.worldMatrix[0] >> self.modGlobals['modInput'].RB_Cog
+		self.graph.connectAttr(cog_pivot_ctrl.worldMatrix[0], self.modGlobals['modInput'].RB_Cog)
 	# end def makeCogSocket():
 # end class ModuleBase():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def dismantleModules(modules, restore=True):
+	"""
+	Dismantle built modules together. Joint drivers are disconnected, the nodes of every module are removed in one
+	bulk delete and the scaffold of each module is restored, see ModuleBase.restoreScaffold().
+	:param modules:  `List` of module instances.
+	:param restore:  `bool` Restore scaffold display, can be skipped when the modules are built again right away.
+						RB_* attributes are always restored.
+	:return:  `int` number of nodes deleted.
+	"""
+	backend = scene.getBackend()
+
+	nodes = set()
+	poses = []
+	# the snapshots are kept on module roots, which are deleted with the rest
+	scaffold_attrs = [module.builtScaffoldAttrs() for module in modules]
+	for module in modules:
+		connections, module_nodes, module_poses = module._dismantleEdits(backend)
+		for source, destination in connections:
+			backend.disconnectAttr(source, destination)
+		nodes.update(module_nodes)
+		poses += module_poses
+
+	# parents first, so children are placed under their final parent transform
+	for jnt, matrix in poses:
+		backend.setAttr(jnt + '.offsetParentMatrix', *_IDENTITY, type='matrix')
+		backend.setAttr(jnt + '.inheritsTransform', True)
+		backend.xform(jnt, matrix=matrix, worldSpace=True)
+
+	nodes = backend.ls(list(nodes))
+	backend.delete(*nodes)
+
+	for module, attrs in zip(modules, scaffold_attrs):
+		module.registry.clear()
+		module.restoreScaffold(attrs, display=restore)
+
+	return len(nodes)
+# end def dismantleModules():
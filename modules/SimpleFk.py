@@ -10,8 +10,7 @@
 from .ModuleBase import ModuleBase
 
 from ..rig import controls as ctrl
-
-import pymel.core as pm
+from ..scene import pm
 
 
 class SimpleFk(ModuleBase):
@@ -32,7 +31,8 @@ class SimpleFk(ModuleBase):
 	# end def makeBind():
 
 	def build(self):
+		graph = self.graph
 		for i, this_ctrl in enumerate(self.controllers.values()):
-			this_ctrl.ctrl.worldMatrix[0] >> self.outputPlug[i]
+			graph.connectAttr(this_ctrl.ctrl.worldMatrix[0], self.outputPlug[i])
 	# end def build():
 # end class SingleChain():
@@ -11,8 +11,7 @@ from .ModuleBase import ModuleBase
 
 from ..rig import controls as ctrl
 from .. import utils
-
-import pymel.core as pm
+from ..scene import pm
 
 
 class SimpleIkArm(ModuleBase):
@@ -78,8 +77,10 @@ class SimpleIkArm(ModuleBase):
 
 		pm.xform(self.controllers['pv_ctrl'].null, t=pole_vector_position, ws=True)
 
-		base_inv_m = pm.createNode('inverseMatrix', n='{0}_cog_invM'.format(self.name))
-		self.cogPlug >> base_inv_m.inputMatrix
+		graph = self.graph
+
+		base_inv_m = graph.createNode('inverseMatrix', n='{0}_cog_invM'.format(self.name))
+		graph.connectAttr(self.cogPlug, base_inv_m.inputMatrix)
 
 		utils.matrixConstraint(
 								self.socketPlug,
@@ -88,24 +89,25 @@ class SimpleIkArm(ModuleBase):
 								ss='xyz'
 		)
 
-		global_mm = pm.createNode('multMatrix', n='{0}_ik_global_multM'.format(self.name))
+		global_mm = graph.createNode('multMatrix', n='{0}_ik_global_multM'.format(self.name))
 		global_mm.matrixIn[0].set(self.controllers['ik_ctrl'].wMatrix)
 
-		self.globalPlug >> global_mm.matrixIn[1]
-		self.modGlobals['modCtrls'].inverseMatrix >> global_mm.matrixIn[2]
+		graph.connectAttr(self.globalPlug, global_mm.matrixIn[1])
+		graph.connectAttr(self.modGlobals['modCtrls'].inverseMatrix, global_mm.matrixIn[2])
 
-		wt_add = \
+		space_blend = \
 			utils.matrixBlend(
 						global_mm.matrixSum,
 						self.controllers['ik_ctrl'].null.matrix.get(),
 						self.controllers['ik_ctrl'].ctrl.spaceBlend,
 						name='{}_ik_space'.format(self.name)
 		)
-		dcmp = pm.createNode('decomposeMatrix', n='{0}_ik_space_dcmpM'.format(self.name))
+		dcmp = graph.createNode('decomposeMatrix', n='{0}_ik_space_dcmpM'.format(self.name))
 
-		wt_add.matrixSum >> dcmp.inputMatrix
-		dcmp.outputRotate >> self.controllers['ik_ctrl'].null.rotate
-		dcmp.outputTranslate >> self.controllers['ik_ctrl'].null.translate
+		ik_null = graph.node(self.controllers['ik_ctrl'].null)
+		space_blend >> dcmp.inputMatrix
+		dcmp.outputRotate >> ik_null.rotate
+		dcmp.outputTranslate >> ik_null.translate
 	# end def preBuild():
 
 	def build(self):
@@ -150,51 +152,56 @@ class SimpleIkArm(ModuleBase):
 		if self.chain[1].translateX.get() < 0:
 			axis = '-X'
 
-		stretchLimiter_clmp = pm.createNode('clamp', n='{}_stretchLimiter_clmp'.format(self.name))
-		radiusStretch_mdl = pm.createNode('multDoubleLinear', n='{}_radiusStretch_mdl'.format(self.name))
-		base_ctrl_dcmpM = pm.createNode('decomposeMatrix', n='{}_base_ctrl_dcmpM'.format(self.name))
-		ik_rotations_compM = pm.createNode('composeMatrix', n='{}_ik_rotations_compM'.format(self.name))
-		dist_scale_md = pm.createNode('multiplyDivide', n='{}_dist_scale_md'.format(self.name))
-		stretch_blndA = pm.createNode('blendTwoAttr', n='{}_stretch_blndA'.format(self.name))
-		stretchPercent_md = pm.createNode('multiplyDivide', n='{}_stretchPercent_md'.format(self.name))
-		zVec_vecMtxProd = pm.createNode('vectorProduct', n='{}_03_zVec_vecMtxProd'.format(self.name))
-		ctrl_distB = pm.createNode('distanceBetween', n='{}_ctrl_distB'.format(self.name))
-		rot_inv_trnpM = pm.createNode('transposeMatrix', n='{}_02_trnpM'.format(self.name))
-		local_output_03_fourM = pm.createNode('fourByFourMatrix', n='{}_03_result_fourM'.format(self.name))
-		baseLength_scale_mdl = pm.createNode('multDoubleLinear', n='{}_baseLength_scale_mdl'.format(self.name))
-		output_02_compM = pm.createNode('composeMatrix', n='{}_02_BIND_compM'.format(self.name))
-		pv_ctrl_dcmpM = pm.createNode('decomposeMatrix', n='{}_pv_ctrl_dcmpM'.format(self.name))
-		ctrl_dcmpM = pm.createNode('decomposeMatrix', n='{}_ctrl_dcmpM'.format(self.name))
-		baseLength_adl = pm.createNode('addDoubleLinear', n='{}_baseLength_adl'.format(self.name))
-		localVec_norm = pm.createNode('vectorProduct', n='{}_localVec_normalize'.format(self.name))
-		base_aim_zVec_crsP = pm.createNode('vectorProduct', n='{}_base_aim_zVec_crsP'.format(self.name))
-		world_02_multM = pm.createNode('multMatrix', n='{}_02_worldSpace_multM'.format(self.name))
-		limited_vec_clmp = pm.createNode('clamp', n='{}_limited_vec_clmp'.format(self.name))
-		xVec_vecMtxProd = pm.createNode('vectorProduct', n='{}_03_xVec_vecMtxProd'.format(self.name))
-		output_01_multM = pm.createNode('multMatrix', n='{}_01_result_multM'.format(self.name))
-		humerusStretch_mdl = pm.createNode('multDoubleLinear', n='{}_humerusStretch_mdl'.format(self.name))
-		base_aim_matrix = pm.createNode('fourByFourMatrix', n='{}_base_aim_matrix'.format(self.name))
-		localRot_03_multM = pm.createNode('multMatrix', n='{}_03_localRot_multM'.format(self.name))
-		pv_localVec_pma = pm.createNode('plusMinusAverage', n='{}_pv_localVec_pma'.format(self.name))
-		yVec_vecMtxProd = pm.createNode('vectorProduct', n='{}_03_yVec_vecMtxProd'.format(self.name))
-		base_aim_yVec_crsP = pm.createNode('vectorProduct', n='{}_base_aim_yVec_crsP'.format(self.name))
-		localVec_pma = pm.createNode('plusMinusAverage', n='{}_localVec_pma'.format(self.name))
-		elbow_rot_min180_animBlend = pm.createNode('animBlendNodeAdditiveDA', n='{}_elbow_min180_ab'.format(self.name))
-		elbow_triAngle_acos = pm.createNode('math_Acos', n='{}_elbow_triAngle_acos'.format(self.name))
-		elbow_incos_md = pm.createNode('multiplyDivide', n='{}_elbow_incos_md'.format(self.name))
-		shoulder_incos_md = pm.createNode('multiplyDivide', n='{}_shoulder_incos_md'.format(self.name))
-		add_b_c_sqr_adl = pm.createNode('addDoubleLinear', n='{}_add_b_c_sqr_adl'.format(self.name))
-		minus_a_pma = pm.createNode('plusMinusAverage', n='{}_minus_a_pma'.format(self.name))
-		shoulder_angle_acos = pm.createNode('math_Acos', n='{}_shoulder_angle_acos'.format(self.name))
-		minus_c_pma = pm.createNode('plusMinusAverage', n='{}_minus_c_pma'.format(self.name))
-		a_b_prod_mdl = pm.createNode('multDoubleLinear', n='{}_a_b_prod_mdl'.format(self.name))
-		dist_c_sqr_mdl = pm.createNode('multDoubleLinear', n='{}_dist_c_sqr_mdl'.format(self.name))
-		humerus_b_sqr_mdl = pm.createNode('multDoubleLinear', n='{}_humerus_b_sqr_mdl'.format(self.name))
-		add_a_b_sqr_adl = pm.createNode('addDoubleLinear', n='{}_add_a_b_sqr_adl'.format(self.name))
-		b_double_prod_mdl = pm.createNode('multDoubleLinear', n='{}_b_double_prod_mdl'.format(self.name))
-		b_c_prod_mdl = pm.createNode('multDoubleLinear', n='{}_b_c_prod_mdl'.format(self.name))
-		radius_a_sqr_mdl = pm.createNode('multDoubleLinear', n='{}_radius_a_sqr_mdl'.format(self.name))
-		output_03_multM = pm.createNode('multMatrix', n='{}_03_worldSpace_multM'.format(self.name))
+		graph = self.graph
+		ik_ctrl = graph.node(self.controllers['ik_ctrl'].ctrl)
+		base_ctrl = graph.node(self.controllers['base_ctrl'].ctrl)
+		pv_ctrl = graph.node(self.controllers['pv_ctrl'].ctrl)
+
+		stretchLimiter_clmp = graph.createNode('clamp', n='{}_stretchLimiter_clmp'.format(self.name))
+		radiusStretch_mdl = graph.createNode('multDoubleLinear', n='{}_radiusStretch_mdl'.format(self.name))
+		base_ctrl_dcmpM = graph.createNode('decomposeMatrix', n='{}_base_ctrl_dcmpM'.format(self.name))
+		ik_rotations_compM = graph.createNode('composeMatrix', n='{}_ik_rotations_compM'.format(self.name))
+		dist_scale_md = graph.createNode('multiplyDivide', n='{}_dist_scale_md'.format(self.name))
+		stretch_blndA = graph.createNode('blendTwoAttr', n='{}_stretch_blndA'.format(self.name))
+		stretchPercent_md = graph.createNode('multiplyDivide', n='{}_stretchPercent_md'.format(self.name))
+		zVec_vecMtxProd = graph.createNode('vectorProduct', n='{}_03_zVec_vecMtxProd'.format(self.name))
+		ctrl_distB = graph.createNode('distanceBetween', n='{}_ctrl_distB'.format(self.name))
+		rot_inv_trnpM = graph.createNode('transposeMatrix', n='{}_02_trnpM'.format(self.name))
+		local_output_03_fourM = graph.createNode('fourByFourMatrix', n='{}_03_result_fourM'.format(self.name))
+		baseLength_scale_mdl = graph.createNode('multDoubleLinear', n='{}_baseLength_scale_mdl'.format(self.name))
+		output_02_compM = graph.createNode('composeMatrix', n='{}_02_BIND_compM'.format(self.name))
+		pv_ctrl_dcmpM = graph.createNode('decomposeMatrix', n='{}_pv_ctrl_dcmpM'.format(self.name))
+		ctrl_dcmpM = graph.createNode('decomposeMatrix', n='{}_ctrl_dcmpM'.format(self.name))
+		baseLength_adl = graph.createNode('addDoubleLinear', n='{}_baseLength_adl'.format(self.name))
+		localVec_norm = graph.createNode('vectorProduct', n='{}_localVec_normalize'.format(self.name))
+		base_aim_zVec_crsP = graph.createNode('vectorProduct', n='{}_base_aim_zVec_crsP'.format(self.name))
+		world_02_multM = graph.createNode('multMatrix', n='{}_02_worldSpace_multM'.format(self.name))
+		limited_vec_clmp = graph.createNode('clamp', n='{}_limited_vec_clmp'.format(self.name))
+		xVec_vecMtxProd = graph.createNode('vectorProduct', n='{}_03_xVec_vecMtxProd'.format(self.name))
+		output_01_multM = graph.createNode('multMatrix', n='{}_01_result_multM'.format(self.name))
+		humerusStretch_mdl = graph.createNode('multDoubleLinear', n='{}_humerusStretch_mdl'.format(self.name))
+		base_aim_matrix = graph.createNode('fourByFourMatrix', n='{}_base_aim_matrix'.format(self.name))
+		localRot_03_multM = graph.createNode('multMatrix', n='{}_03_localRot_multM'.format(self.name))
+		pv_localVec_pma = graph.createNode('plusMinusAverage', n='{}_pv_localVec_pma'.format(self.name))
+		yVec_vecMtxProd = graph.createNode('vectorProduct', n='{}_03_yVec_vecMtxProd'.format(self.name))
+		base_aim_yVec_crsP = graph.createNode('vectorProduct', n='{}_base_aim_yVec_crsP'.format(self.name))
+		localVec_pma = graph.createNode('plusMinusAverage', n='{}_localVec_pma'.format(self.name))
+		elbow_rot_min180_animBlend = graph.createNode('animBlendNodeAdditiveDA', n='{}_elbow_min180_ab'.format(self.name))
+		elbow_triAngle_acos = graph.createNode('math_Acos', n='{}_elbow_triAngle_acos'.format(self.name))
+		elbow_incos_md = graph.createNode('multiplyDivide', n='{}_elbow_incos_md'.format(self.name))
+		shoulder_incos_md = graph.createNode('multiplyDivide', n='{}_shoulder_incos_md'.format(self.name))
+		add_b_c_sqr_adl = graph.createNode('addDoubleLinear', n='{}_add_b_c_sqr_adl'.format(self.name))
+		minus_a_pma = graph.createNode('plusMinusAverage', n='{}_minus_a_pma'.format(self.name))
+		shoulder_angle_acos = graph.createNode('math_Acos', n='{}_shoulder_angle_acos'.format(self.name))
+		minus_c_pma = graph.createNode('plusMinusAverage', n='{}_minus_c_pma'.format(self.name))
+		a_b_prod_mdl = graph.createNode('multDoubleLinear', n='{}_a_b_prod_mdl'.format(self.name))
+		dist_c_sqr_mdl = graph.createNode('multDoubleLinear', n='{}_dist_c_sqr_mdl'.format(self.name))
+		humerus_b_sqr_mdl = graph.createNode('multDoubleLinear', n='{}_humerus_b_sqr_mdl'.format(self.name))
+		add_a_b_sqr_adl = graph.createNode('addDoubleLinear', n='{}_add_a_b_sqr_adl'.format(self.name))
+		b_double_prod_mdl = graph.createNode('multDoubleLinear', n='{}_b_double_prod_mdl'.format(self.name))
+		b_c_prod_mdl = graph.createNode('multDoubleLinear', n='{}_b_c_prod_mdl'.format(self.name))
+		radius_a_sqr_mdl = graph.createNode('multDoubleLinear', n='{}_radius_a_sqr_mdl'.format(self.name))
+		output_03_multM = graph.createNode('multMatrix', n='{}_03_worldSpace_multM'.format(self.name))
 
 		elbow_rot_min180_animBlend.setAttr('inputB', -180.0)
 		elbow_incos_md.setAttr('operation', 2)
@@ -237,25 +244,25 @@ class SimpleIkArm(ModuleBase):
 		add_a_b_sqr_adl.output >> minus_c_pma.input1D[0]
 		dist_c_sqr_mdl.output >> minus_c_pma.input1D[1]
 		b_double_prod_mdl.output >> a_b_prod_mdl.input1
-		self.controllers['ik_ctrl'].ctrl.radius >> a_b_prod_mdl.input2
+		ik_ctrl.radius >> a_b_prod_mdl.input2
 		dist_scale_md.outputX >> dist_c_sqr_mdl.input1
 		dist_scale_md.outputX >> dist_c_sqr_mdl.input2
-		self.controllers['ik_ctrl'].ctrl.humerus >> humerus_b_sqr_mdl.input1
-		self.controllers['ik_ctrl'].ctrl.humerus >> humerus_b_sqr_mdl.input2
+		ik_ctrl.humerus >> humerus_b_sqr_mdl.input1
+		ik_ctrl.humerus >> humerus_b_sqr_mdl.input2
 		radius_a_sqr_mdl.output >> add_a_b_sqr_adl.input1
 		humerus_b_sqr_mdl.output >> add_a_b_sqr_adl.input2
-		self.controllers['ik_ctrl'].ctrl.humerus >> b_double_prod_mdl.input1
+		ik_ctrl.humerus >> b_double_prod_mdl.input1
 		dist_scale_md.outputX >> b_c_prod_mdl.input1
 		b_double_prod_mdl.output >> b_c_prod_mdl.input2
-		self.controllers['ik_ctrl'].ctrl.radius >> radius_a_sqr_mdl.input1
-		self.controllers['ik_ctrl'].ctrl.radius >> radius_a_sqr_mdl.input2
+		ik_ctrl.radius >> radius_a_sqr_mdl.input1
+		ik_ctrl.radius >> radius_a_sqr_mdl.input2
 		stretchPercent_md.outputX >> stretchLimiter_clmp.inputR
 		stretch_blndA.output >> stretchLimiter_clmp.maxR
-		self.controllers['ik_ctrl'].ctrl.radius >> radiusStretch_mdl.input1
-		self.controllers['base_ctrl'].ctrl.worldMatrix[0] >> base_ctrl_dcmpM.inputMatrix
+		ik_ctrl.radius >> radiusStretch_mdl.input1
+		base_ctrl.worldMatrix[0] >> base_ctrl_dcmpM.inputMatrix
 		limited_vec_clmp.outputR >> dist_scale_md.input1X
 		self.socketDcmp.outputScaleX >> dist_scale_md.input2X
-		self.controllers['ik_ctrl'].ctrl.stretch >> stretch_blndA.attributesBlender
+		ik_ctrl.stretch >> stretch_blndA.attributesBlender
 		base_aim_matrix.output >> output_01_multM.matrixIn[1]
 		baseLength_scale_mdl.output >> stretchPercent_md.input2X
 		ctrl_distB.distance >> stretchPercent_md.input1X
@@ -278,17 +285,17 @@ class SimpleIkArm(ModuleBase):
 		baseLength_adl.output >> baseLength_scale_mdl.input1
 		self.socketDcmp.outputScaleX >> baseLength_scale_mdl.input2
 		humerusStretch_mdl.output >> output_02_compM.inputTranslateX
-		self.controllers['pv_ctrl'].ctrl.worldMatrix[0] >> pv_ctrl_dcmpM.inputMatrix
-		self.controllers['ik_ctrl'].ctrl.worldMatrix[0] >> ctrl_dcmpM.inputMatrix
-		self.controllers['ik_ctrl'].ctrl.humerus >> baseLength_adl.input1
-		self.controllers['ik_ctrl'].ctrl.radius >> baseLength_adl.input2
+		pv_ctrl.worldMatrix[0] >> pv_ctrl_dcmpM.inputMatrix
+		ik_ctrl.worldMatrix[0] >> ctrl_dcmpM.inputMatrix
+		ik_ctrl.humerus >> baseLength_adl.input1
+		ik_ctrl.radius >> baseLength_adl.input2
 		output_02_compM.outputMatrix >> world_02_multM.matrixIn[0]
 		output_01_multM.matrixSum >> world_02_multM.matrixIn[1]
 		ctrl_distB.distance >> limited_vec_clmp.inputR
 		baseLength_scale_mdl.output >> limited_vec_clmp.maxR
 		localRot_03_multM.matrixSum >> xVec_vecMtxProd.matrix
 		ik_rotations_compM.outputMatrix >> output_01_multM.matrixIn[0]
-		self.controllers['ik_ctrl'].ctrl.humerus >> humerusStretch_mdl.input1
+		ik_ctrl.humerus >> humerusStretch_mdl.input1
 		localVec_pma.output3D >> localVec_norm.input1
 		localVec_norm.outputX >> base_aim_matrix.in00
 		localVec_norm.outputY >> base_aim_matrix.in01
@@ -302,7 +309,7 @@ class SimpleIkArm(ModuleBase):
 		base_ctrl_dcmpM.outputTranslateX >> base_aim_matrix.in30
 		base_ctrl_dcmpM.outputTranslateY >> base_aim_matrix.in31
 		base_ctrl_dcmpM.outputTranslateZ >> base_aim_matrix.in32
-		self.controllers['ik_ctrl'].ctrl.worldMatrix[0] >> localRot_03_multM.matrixIn[0]
+		ik_ctrl.worldMatrix[0] >> localRot_03_multM.matrixIn[0]
 		rot_inv_trnpM.outputMatrix >> localRot_03_multM.matrixIn[1]
 		localRot_03_multM.matrixSum >> yVec_vecMtxProd.matrix
 		shoulder_angle_acos.output >> ik_rotations_compM.inputRotateY
@@ -320,7 +327,7 @@ class SimpleIkArm(ModuleBase):
 			localVec_pma.output3D >> base_aim_yVec_crsP.input1
 			pv_localVec_pma.output3D >> base_aim_yVec_crsP.input2
 		else:
-			negate_stretch_mdl = pm.createNode('multDoubleLinear', n='{}_negateStretch_mdl'.format(self.name))
+			negate_stretch_mdl = graph.createNode('multDoubleLinear', n='{}_negateStretch_mdl'.format(self.name))
 			negate_stretch_mdl.output >> radiusStretch_mdl.input2
 			negate_stretch_mdl.output >> humerusStretch_mdl.input2
 			stretchLimiter_clmp.outputR >> negate_stretch_mdl.input1
@@ -11,8 +11,7 @@ from .SimpleFk import SimpleFk
 
 from ..rig import controls as ctrl
 from .. import utils
-
-import pymel.core as pm
+from ..scene import pm
 
 # head component is:
 # - chain of one or more joints
@@ -41,38 +40,40 @@ class SpaceSwitchChain(SimpleFk):
 	def build(self):
 		super(SpaceSwitchChain, self).build()
 
-		global_mm = pm.createNode('multMatrix', n='{}_global_multM'.format(self.name))
+		graph = self.graph
+
+		global_mm = graph.createNode('multMatrix', n='{}_global_multM'.format(self.name))
 
 		global_mm.matrixIn[0].set(self.ctrlList[-1].wMatrix)
-		self.globalPlug >> global_mm.matrixIn[1]
-		self.ctrlList[-2].ctrl.worldInverseMatrix[0] >> global_mm.matrixIn[2]
+		graph.connectAttr(self.globalPlug, global_mm.matrixIn[1])
+		graph.connectAttr(self.ctrlList[-2].ctrl.worldInverseMatrix[0], global_mm.matrixIn[2])
 
 		local_offset_mtx = self.ctrlList[-1].wMatrix * self.ctrlList[-2].wInvMatrix
 
-		wt_add = utils.matrixBlend(
+		space_blend = utils.matrixBlend(
 							global_mm.matrixSum,
 							local_offset_mtx,
 							self.ctrlList[-1].ctrl.spaceBlend,
 							name='{}_space'.format(self.name)
 		)
 
-		global_dm = pm.createNode('decomposeMatrix', n='{}_space_dcmpM'.format(self.name))
-		wt_add.matrixSum >> global_dm.inputMatrix
-		global_dm.outputRotate >> self.ctrlList[-1].null.rotate
+		global_dm = graph.createNode('decomposeMatrix', n='{}_space_dcmpM'.format(self.name))
+		space_blend >> global_dm.inputMatrix
+		global_dm.outputRotate >> graph.node(self.ctrlList[-1].null).rotate
 
 		if len(self) > 2:
-			inv_mm = pm.createNode('multMatrix', n='{}_invCtrl01_multM'.format(self.name))
-			wt_add = pm.createNode('wtAddMatrix', n='{}_distributeSpace_wtAdM'.format(self.name))
-			blend_two = pm.createNode('blendTwoAttr', n='{}_blend_two'.format(self.name))
-			subtract = pm.createNode('plusMinusAverage', n='{}_min_pma'.format(self.name))
+			inv_mm = graph.createNode('multMatrix', n='{}_invCtrl01_multM'.format(self.name))
+			wt_add = graph.createNode('wtAddMatrix', n='{}_distributeSpace_wtAdM'.format(self.name))
+			blend_two = graph.createNode('blendTwoAttr', n='{}_blend_two'.format(self.name))
+			subtract = graph.createNode('plusMinusAverage', n='{}_min_pma'.format(self.name))
 
 			inv_mm.matrixSum >> wt_add.wtMatrix[0].m
 			blend_two.output >> wt_add.wtMatrix[0].w
 			subtract.output1D >> wt_add.wtMatrix[1].w
 			blend_two.output >> subtract.input1D[1]
-			self.ctrlList[-1].ctrl.spaceBlend >> blend_two.attributesBlender
-			self.globalPlug >> inv_mm.matrixIn[0]
-			self.ctrlList[0].ctrl.worldInverseMatrix[0] >> inv_mm.matrixIn[1]
+			graph.connectAttr(self.ctrlList[-1].ctrl.spaceBlend, blend_two.attributesBlender)
+			graph.connectAttr(self.globalPlug, inv_mm.matrixIn[0])
+			graph.connectAttr(self.ctrlList[0].ctrl.worldInverseMatrix[0], inv_mm.matrixIn[1])
 
 			inv_mm.matrixIn[2].set(self.ctrlList[0].wMatrix)
 			subtract.setAttr('operation', 2)
@@ -82,8 +83,8 @@ class SpaceSwitchChain(SimpleFk):
 			blend_two.input[1].set(0)
 
 			for i in range(1, (len(self) - 1)):
-				this_mm = pm.createNode('multMatrix', n='{0}_null{1:02d}_const_multM'.format(self.name, (i + 1)))
-				this_dm = pm.createNode('decomposeMatrix', n='{0}_null{1:02d}_const_dcmpM'.format(self.name, (i + 1)))
+				this_mm = graph.createNode('multMatrix', n='{0}_null{1:02d}_const_multM'.format(self.name, (i + 1)))
+				this_dm = graph.createNode('decomposeMatrix', n='{0}_null{1:02d}_const_dcmpM'.format(self.name, (i + 1)))
 
 				this_mm.matrixIn[0].set((
 					pm.dt.TransformationMatrix(
@@ -93,6 +94,6 @@ class SpaceSwitchChain(SimpleFk):
 				wt_add.matrixSum >> this_mm.matrixIn[1]
 				this_mm.matrixSum >> this_dm.inputMatrix
 				# wt_add.matrixSum >> this_dm.inputMatrix
-				this_dm.outputRotate >> self.ctrlList[i].null.rotate
+				this_dm.outputRotate >> graph.node(self.ctrlList[i].null).rotate
 	# end def build():
 # end class SpaceSwitchChain():
@@ -12,8 +12,7 @@ from .ModuleBase import ModuleBase
 
 from ..rig import controls as ctrl
 from .. import utils, user, data
-
-import pymel.core as pm
+from ..scene import pm
 
 
 class _Root(ModuleBase):
@@ -34,7 +33,9 @@ class _Root(ModuleBase):
 				name=user.prefs['cog-ctrl-name'],
 				shape='circle',
 				colour='pink',
-				size=5.5)
+				size=5.5,
+				rotate=90,
+				axis=[0, 0, 1])
 
 		self.controllers['cogPivot'] = \
 			ctrl.control(
@@ -43,8 +44,6 @@ class _Root(ModuleBase):
 				colour='purple',
 				size=5)
 
-		self.controllers['cog'].rotateCtrlShapes(rotate=90, axis=[0,0,1])
-
 		self.controllers['cog'].makeAttr(name='Pivot_Visibility', at='bool', k=False) \
 			>> self.controllers['cogPivot'].shape.visibility
 
@@ -82,11 +81,10 @@ class _Root(ModuleBase):
 			pm.delete(root_shape)
 		self.root.useOutlinerColor.set(0)
 
-		utils.setOverrideColour(self.controllers['root'], colour='grey')
 		utils.scaleCtrlShapes(self.controllers['root'], scale_mult=45, line_width=-1)
-
 		utils.scaleCtrlShapes(self.controllers['root2'], scale_mult=10.2, line_width=2)
-		utils.setOverrideColour(self.controllers['root2'], colour='light-orange')
+
+		utils.setColours(override={self.controllers['root']: 'grey', self.controllers['root2']: 'light-orange'})
 
 		pm.delete(self.chain[1])
 	# end def postBuild():
@@ -1,6 +1,167 @@
-from os.path import dirname, basename, isfile, join
-import glob
-modules = glob.glob(join(dirname(__file__), "*.py"))
-__all__ = [basename(f)[:-3] for f in modules if isfile(f) and not f.endswith('__init__.py')]
+# ----------------------------------------------------------------------------------------------------------------------
+"""
 
-from . import *
+	MODULES
+	Rig module types. Each module type is a file named after the ModuleBase subclass it holds, eg; SimpleFk.py holds
+	class SimpleFk. Types are discovered from file names once and a module file is only imported when a scaffold of
+	its type is built:
+
+		modules.registry.moduleTypes()			# ['SimpleFk', 'SimpleIkArm', 'SpaceSwitchChain']
+		modules.registry.getClass('SimpleFk')	# imports SimpleFk.py
+
+	Module types from other packages are found the same way, register them with registry.addPackage() or list them
+	in user.prefs['module-packages']. Packages added later override module types with the same name.
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+import collections
+import importlib
+import os
+
+from .. import user
+
+
+class ModulesException(Exception):
+	pass
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+class ModuleRegistry(object):
+
+	# module type of scaffolds without a rig module, built with ModuleBase itself
+	GENERIC = ' '
+
+	def __init__(self, packages=None):
+		"""
+		:param packages:  `List` of package import paths to find module types in.
+		"""
+		self._packages = list(packages or [])
+		self._prefsLoaded = False
+		# module type: import path, filled on first query
+		self._sources = None
+		self._registered = collections.OrderedDict()
+		self._classes = {}
+	# end def __init__():
+
+	def __contains__(self, module_type):
+		return self.isModuleType(module_type, private=True)
+	# end def __contains__():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												sources
+	# ------------------------------------------------------------------------------------------------------------------
+	def addPackage(self, package):
+		"""
+		Find module types in another package, its files follow the same naming rules as rigbot.modules.
+		:param package:  `str` Package import path, eg; 'studio.rigmodules'.
+		:return:  None
+		"""
+		if package not in self._packages:
+			self._packages.append(package)
+			self._sources = None
+			# the new package may override imported module types
+			self._classes = dict(self._registered)
+	# end def addPackage():
+
+	def register(self, module_class, module_type=None):
+		"""
+		Register a module class directly, eg; one defined in a tool.
+		:param module_class:  ModuleBase subclass.
+		:param module_type:  `str` Module type name, the class name if None.
+		:return:  None
+		"""
+		module_type = module_type or module_class.__name__
+		self._registered[module_type] = module_class
+		self._classes[module_type] = module_class
+	# end def register():
+
+	def refresh(self):
+		"""
+		Find module types again, eg; after adding a module file. Imported module classes are kept.
+		:return:  None
+		"""
+		self._sources = None
+	# end def refresh():
+
+	def _scan(self):
+		if self._sources is not None:
+			return
+		if not self._prefsLoaded:
+			self._prefsLoaded = True
+			for package in user.prefs.get('module-packages', []):
+				self.addPackage(package)
+
+		sources = collections.OrderedDict()
+		for package in self._packages:
+			# only the package itself is imported, not its modules
+			package_dir = os.path.dirname(os.path.abspath(importlib.import_module(package).__file__))
+			for file_name in sorted(os.listdir(package_dir)):
+				module_type, ext = os.path.splitext(file_name)
+				if ext != '.py' or module_type == '__init__' or module_type.endswith('Base'):
+					continue
+				sources[module_type] = '{}.{}'.format(package, module_type)
+
+		for module_type in self._registered:
+			sources[module_type] = None
+		self._sources = sources
+	# end def _scan():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												queries
+	# ------------------------------------------------------------------------------------------------------------------
+	def moduleTypes(self, private=False):
+		"""
+		:param private:  `bool` Include private module types, eg; _Root.
+		:return:  `List` of module type names, sorted.
+		"""
+		self._scan()
+		return sorted(t for t in self._sources if private or not t.startswith('_'))
+	# end def moduleTypes():
+
+	def isModuleType(self, module_type, private=False):
+		"""
+		:param module_type:  `str` Module type name.
+		:param private:  `bool` Private module types count.
+		:return:  `bool` True if module_type can be built, the generic module type is not included.
+		"""
+		self._scan()
+		return module_type in self._sources and (private or not module_type.startswith('_'))
+	# end def isModuleType():
+
+	def getClass(self, module_type):
+		"""
+		Module class of a module type, its file is imported the first time it is asked for.
+		:param module_type:  `str` Module type name, GENERIC for ModuleBase.
+		:return:  ModuleBase subclass.
+		"""
+		module_class = self._classes.get(module_type)
+		if module_class is not None:
+			return module_class
+
+		if module_type == self.GENERIC:
+			from .ModuleBase import ModuleBase as module_class
+		else:
+			self._scan()
+			if module_type not in self._sources:
+				raise ModulesException('--Module type is not available: {}'.format(module_type))
+			module = importlib.import_module(self._sources[module_type])
+			module_class = getattr(module, module_type, None)
+			if module_class is None:
+				raise ModulesException(
+					'--Module file does not define a class named after it: {}'.format(self._sources[module_type]))
+
+		self._classes[module_type] = module_class
+		return module_class
+	# end def getClass():
+
+	def loaded(self):
+		"""
+		:return:  `List` of module types whose classes are imported.
+		"""
+		return sorted(self._classes)
+	# end def loaded():
+# end class ModuleRegistry():
+
+
+registry = ModuleRegistry([__name__])
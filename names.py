@@ -0,0 +1,219 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	NAMES.PY
+	Unique name allocation. Scene names are indexed once, names created, renamed or deleted afterwards are updated
+	from scene events and names handed out are reserved straight away, so asking for the Nth 'arm' control costs the
+	same as the first. Freed names are handed out again, a dismantled module is rebuilt with the same names.
+
+		names.allocator().unique('L_arm', '_ctrl')		# 'L_arm', then 'L_arm1', 'L_arm2' ...
+
+	Suffixes follow objExists patterns: an exact suffix like '_ctrl' or '_*' for a name followed by anything after
+	an underscore. Other wildcard patterns work but are matched against every indexed name.
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+import fnmatch
+
+from . import scene
+
+
+_ALLOCATOR = []
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def allocator():
+	"""
+	Name allocator of the active scene backend, made when first asked for or when the backend changes.
+	:return:  `NameAllocator`
+	"""
+	backend = scene.getBackend()
+	if _ALLOCATOR and _ALLOCATOR[0].backend is backend:
+		return _ALLOCATOR[0]
+	if _ALLOCATOR:
+		_ALLOCATOR[0].detach()
+	_ALLOCATOR[:] = [NameAllocator(backend)]
+	return _ALLOCATOR[0]
+# end def allocator():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+class NameAllocator(object):
+
+	def __init__(self, backend=None):
+		"""
+		:param backend:  Scene backend to allocate names in, the active one if None.
+		"""
+		self.backend = backend if backend is not None else scene.getBackend()
+
+		self._names = None
+		# every part of a name that is followed by an underscore, 'L_arm_ctrl' -> 'L', 'L_arm': number of names
+		self._stems = {}
+		# next number to try per name and suffix, {name: {suffix: number}}, every number below it is taken
+		self._next = {}
+		self._callbacks = []
+	# end def __init__():
+
+	def __contains__(self, name):
+		self._index()
+		return name in self._names
+	# end def __contains__():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												index
+	# ------------------------------------------------------------------------------------------------------------------
+	def _index(self):
+		if self._names is not None:
+			return
+		self._names = set()
+		self._stems = {}
+		for name in self.backend.ls():
+			self._add(name)
+		self.attach()
+	# end def _index():
+
+	def _add(self, name):
+		if name is None:
+			return
+		name = name.rsplit('|', 1)[-1]
+		# reserved names are added again when their node is made
+		if name in self._names:
+			return
+		self._names.add(name)
+		for stem in self._stemsOf(name):
+			self._stems[stem] = self._stems.get(stem, 0) + 1
+	# end def _add():
+
+	def _removed(self, name):
+		if name is None:
+			return
+		name = name.rsplit('|', 1)[-1]
+		if name not in self._names:
+			return
+		self._names.remove(name)
+		for stem in self._stemsOf(name):
+			self._stems[stem] -= 1
+			if not self._stems[stem]:
+				del self._stems[stem]
+		self._freed(name)
+	# end def _removed():
+
+	def _freed(self, name):
+		"""
+		Count again from the number of a freed name for every name and suffix it could have been handed out for,
+		eg; 'L_arm2_ctrl' frees number 2 of ('L_arm', '_ctrl') and ('L_arm', '_*').
+		"""
+		for i in range(1, len(name) + 1):
+			suffixes = self._next.get(name[:i])
+			if not suffixes:
+				continue
+			rest = name[i:]
+			tail = rest.lstrip('0123456789')
+			number = rest[:len(rest) - len(tail)]
+			if number.startswith('0'):
+				continue
+			number = int(number or 0)
+			for suffix, next_number in suffixes.items():
+				if number < next_number and fnmatch.fnmatchcase(tail, suffix):
+					suffixes[suffix] = number
+	# end def _freed():
+
+	@staticmethod
+	def _stemsOf(name):
+		i = name.find('_')
+		while i != -1:
+			yield name[:i]
+			i = name.find('_', i + 1)
+	# end def _stemsOf():
+
+	def attach(self):
+		"""
+		Keep the index up to date with scene events.
+		:return:  None
+		"""
+		if self._callbacks:
+			return
+		for event in ('nodeAdded', 'nameChanged'):
+			self._callbacks.append(self.backend.addCallback(event, self._add))
+		for event in ('nodeRemoved', 'nameReleased'):
+			self._callbacks.append(self.backend.addCallback(event, self._removed))
+		self._callbacks.append(self.backend.addCallback('sceneChanged', lambda name: self.reset()))
+	# end def attach():
+
+	def detach(self):
+		for callback_id in self._callbacks:
+			self.backend.removeCallback(callback_id)
+		self._callbacks = []
+		self.reset()
+	# end def detach():
+
+	def reset(self):
+		"""
+		Forget the index and reservations, the scene is indexed again on next use.
+		:return:  None
+		"""
+		self._names = None
+		self._stems = {}
+		self._next = {}
+	# end def reset():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												allocation
+	# ------------------------------------------------------------------------------------------------------------------
+	def exists(self, name, suffix=''):
+		"""
+		Index equivalent of objExists(name + suffix).
+		:param name:  `str` Name.
+		:param suffix:  `str` Suffix or pattern, eg; '_ctrl', '_*'.
+		:return:  `bool`
+		"""
+		self._index()
+		if '*' not in suffix and '?' not in suffix:
+			return name + suffix in self._names
+		if suffix == '_*':
+			return name in self._stems
+		pattern = name + suffix
+		return any(fnmatch.fnmatchcase(other, pattern) for other in self._names)
+	# end def exists():
+
+	def unique(self, name, suffix='_*'):
+		"""
+		Unique name the same way utils.makeNameUnique numbers them: name, name1, name2 ... The result is reserved.
+		:param name:  `str` Name to pad with a number.
+		:param suffix:  `str` Suffix or pattern the name is checked with, eg; '_ctrl', '_*'.
+		:return:  `str` name without suffix.
+		"""
+		suffixes = self._next.setdefault(name, {})
+		i = suffixes.get(suffix, 0)
+		new_name = name if i == 0 else '{}{}'.format(name, i)
+		while self.exists(new_name, suffix):
+			i += 1
+			new_name = '{}{}'.format(name, i)
+		suffixes[suffix] = i + 1
+
+		self.reserve(new_name + suffix.rstrip('*?'))
+		return new_name
+	# end def unique():
+
+	def allocate(self, name, suffix='_*', count=1):
+		"""
+		Reserve a batch of unique names, eg; every control of a module.
+		:param name:  `str` Name to pad with a number.
+		:param suffix:  `str` Suffix or pattern the names are checked with.
+		:param count:  `int` Number of names.
+		:return:  `List` of names without suffix.
+		"""
+		return [self.unique(name, suffix) for _ in range(count)]
+	# end def allocate():
+
+	def reserve(self, *names):
+		"""
+		Mark names as taken before the nodes are made, eg; for nodes recorded on a GraphModifier.
+		:return:  None
+		"""
+		self._index()
+		for name in names:
+			self._add(name)
+	# end def reserve():
+# end class NameAllocator():
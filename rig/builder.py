@@ -7,11 +7,15 @@
 """
 # ----------------------------------------------------------------------------------------------------------------------
 
-import pymel.core as pm
+import collections
+import hashlib
 
-from .. import user, utils, data
+from .. import user, utils, data, scene, skeleton
+from ..scene import pm, optimize
 
 from .. import modules as mod
+from ..modules import ModuleBase
+from . import profiler
 
 
 
@@ -25,8 +29,6 @@ class ValidationException(Exception):
 
 class Scaffold(object):
 
-	_available_modules = utils.getFilteredDir('modules', ignore_private=False) + [' ']
-
 	# TODO - add matrix position property and setter with world/local flags ?
 	# TODO - how to easily make templates on chain indices
 
@@ -64,10 +66,26 @@ class Scaffold(object):
 		if not module_root.hasAttr('RB_MODULE_ROOT'):
 			raise TypeError('--"{}" is not a module root.'.format(module_root))
 
-		self.chain = utils.getModuleChildren(module_root)
+		self._load(module_root, utils.getModuleChildren(module_root))
+	# end def __init__():
+
+	@classmethod
+	def fromChain(cls, chain):
+		"""
+		Scaffold from an already walked module chain, see utils.getModuleChains().
+		:param chain:  `List` of joints starting with the module root.
+		:return:  `Scaffold`
+		"""
+		scaffold = cls.__new__(cls)
+		scaffold._load(chain[0], chain)
+		return scaffold
+	# end def fromChain():
+
+	def _load(self, module_root, chain):
+		self.chain = chain
 
 		self._moduleType = module_root.getAttr('RB_module_type', asString=True)
-		if self._moduleType not in self._available_modules:
+		if self._moduleType != mod.registry.GENERIC and self._moduleType not in mod.registry:
 			raise ScaffoldException('Module type: {} is not in list of available modules.'.format(self._moduleType))
 
 		if module_root.hasAttr('RB_include_end_joint'):
@@ -82,7 +100,7 @@ class Scaffold(object):
 			self._socket = module_root.listRelatives(parent=True)[0]
 		else:
 			self._socket = None
-	# end def __init__():
+	# end def _load():
 
 	def __str__(self):
 		return 'rb.{}({})'.format(self.__class__.__name__, self.name)
@@ -179,6 +197,38 @@ class Scaffold(object):
 			return self._length
 	# end def length():
 
+	# ------------------------------------------------------------------------------------------------------------------
+	def poseHash(self):
+		"""
+		Hash of chain joint local matrices. Only meaningful while the chain is not driven by a built rig.
+		:return:  `str` hex digest
+		"""
+		backend = scene.getBackend()
+		# + 0.0 so -0.0 and 0.0 hash the same
+		matrices = [[round(v, 5) + 0.0 for v in backend.xform(jnt, query=True, matrix=True)] for jnt in self.chain]
+		return hashlib.md5(repr(matrices).encode('utf-8')).hexdigest()
+	# end def poseHash():
+
+	def fingerprint(self, upstream=None, pose=None):
+		"""
+		Hash of everything a build of this scaffold depends on: module type, include end joint, socket, chain joint
+		names, local matrices and RB_* attributes.
+		:param upstream:  `str` Fingerprint of the module this scaffold is socketed to.
+		:param pose:  `str` poseHash() to use instead of reading the chain, for chains driven by a built rig.
+		:return:  `str` hex digest
+		"""
+		backend = scene.getBackend()
+
+		items = [self.moduleType, int(self.includeEndJoint), str(self.socket), upstream, pose or self.poseHash()]
+		for jnt in self.chain:
+			items.append(str(jnt))
+			for attr in sorted(str(a) for a in backend.listAttr(jnt, userDefined=True)):
+				if attr.startswith('RB_'):
+					items.append((attr, backend.getAttr('{}.{}'.format(jnt, attr))))
+
+		return hashlib.md5(repr(items).encode('utf-8')).hexdigest()
+	# end def fingerprint():
+
 	# ------------------------------------------------------------------------------------------------------------------
 	# .											static utility functions
 	# ------------------------------------------------------------------------------------------------------------------
@@ -225,7 +275,7 @@ class Scaffold(object):
 		if kwargs:
 			raise ValueError('--Unknown argument(s): {}'.format(kwargs))
 
-		if module_type not in utils.getFilteredDir('modules') and module_type != ' ':
+		if module_type != mod.registry.GENERIC and not mod.registry.isModuleType(module_type):
 			raise TypeError('--Module type is invalid or not yet implemented.')
 
 		if isinstance(socket, basestring):
@@ -242,21 +292,18 @@ class Scaffold(object):
 		pm.matchTransform(chain[0], socket)
 		pm.parent(chain[0], socket)
 
-		curv = pm.curve(d=1, p=data.controllerShapes['locator'], n=(name + '_display'))
-		utils.scaleCtrlShapes(curv, scale_mult=0.5, line_width=3)
+		display = utils.makeScaffoldDisplay(chain[0], name)
 
-		shape = curv.getChildren()[0]
-		pm.parent(shape, chain[0], r=True, s=True)
-		pm.delete(curv)
+		# setting colours, the display shape keeps its own colour the same as restored scaffolds
+		utils.setColours(
+			override=[
+				(chain, user.prefs['default-jnt-colour']),
+				(chain[0], user.prefs['module-root-colour']),
+				(display, user.prefs['default-jnt-colour']),
+			]
+		)
 
-		# setting colours
-		utils.setOverrideColour(chain, c=user.prefs['default-jnt-colour'])
-		utils.setOverrideColour(chain[0], c=user.prefs['module-root-colour'])
-		utils.setOutlinerColour(chain[0], c=user.prefs['module-root-colour'])
-		utils.setOverrideColour(shape, c=user.prefs['default-jnt-colour'])
-
-		all_modules = utils.getFilteredDir('modules')
-		all_modules.append(' ')
+		all_modules = mod.registry.moduleTypes() + [mod.registry.GENERIC]
 
 		default_tags = [
 			{'name': 'RB_MODULE_ROOT', 'at': 'enum', 'en': ' ', 'k': 0, 'l': 1},
@@ -266,6 +313,7 @@ class Scaffold(object):
 		]
 		for tag in default_tags:
 			utils.makeAttr(chain[0], **tag)
+		skeleton.invalidate()
 
 		return chain[0]
 	# end def make(self):
@@ -273,107 +321,422 @@ class Scaffold(object):
 
 
 # ----------------------------------------------------------------------------------------------------------------------
-def batchBuild(scaffolds=None):
+class ModuleGraph(object):
+	"""
+	Module dependency graph from scaffold sockets, a module depends on the module whose chain its socket joint is in.
+	"""
+
+	def __init__(self, scaffolds):
+		"""
+		:param scaffolds:  `List` of Scaffold objects.
+		"""
+		self.scaffolds = collections.OrderedDict((s.name, s) for s in scaffolds)
+
+		owners = {}
+		for scaffold in scaffolds:
+			for jnt in scaffold.chain:
+				owners[str(jnt)] = scaffold.name
+
+		self.upstream = {}
+		self.downstream = collections.OrderedDict((name, []) for name in self.scaffolds)
+		for name, scaffold in self.scaffolds.items():
+			owner = owners.get(str(scaffold.socket))
+			if owner == name:
+				owner = None
+			self.upstream[name] = owner
+			if owner is not None:
+				self.downstream[owner].append(name)
+	# end def __init__():
+
+	def __contains__(self, name):
+		return name in self.scaffolds
+	# end def __contains__():
+
+	def __iter__(self):
+		return iter(self.order())
+	# end def __iter__():
+
+	def __len__(self):
+		return len(self.scaffolds)
+	# end def __len__():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	def _check(self, names):
+		missing = [name for name in names if name not in self.scaffolds]
+		if missing:
+			raise ScaffoldException('--Modules do not exist: {}'.format(missing))
+	# end def _check():
+
+	def dependencies(self, names):
+		"""
+		Modules plus every module they depend on, directly or not.
+		:param names:  `List` of module names.
+		:return:  `set` of module names.
+		"""
+		self._check(names)
+		result = set()
+		for name in names:
+			while name is not None and name not in result:
+				result.add(name)
+				name = self.upstream[name]
+		return result
+	# end def dependencies():
+
+	def dependents(self, names):
+		"""
+		Modules plus every module that depends on them, directly or not.
+		:param names:  `List` of module names.
+		:return:  `set` of module names.
+		"""
+		self._check(names)
+		result = set()
+		stack = list(names)
+		while stack:
+			name = stack.pop()
+			if name not in result:
+				result.add(name)
+				stack += self.downstream[name]
+		return result
+	# end def dependents():
+
+	def order(self, names=None):
+		"""
+		Topological order, every module comes after the module it depends on. Modules that do not depend on each
+		other keep scaffold order.
+		:param names:  `List` of module names to order, default all.
+		:return:  `List` of module names.
+		"""
+		names = list(self.scaffolds) if names is None else names
+		self._check(names)
+		subset = set(names)
+
+		pending = dict((name, int(self.upstream[name] in subset)) for name in subset)
+		ready = collections.deque(name for name in self.scaffolds if name in subset and not pending[name])
+
+		result = []
+		while ready:
+			name = ready.popleft()
+			result.append(name)
+			for child in self.downstream[name]:
+				if child in subset:
+					pending[child] -= 1
+					if not pending[child]:
+						ready.append(child)
+
+		if len(result) != len(subset):
+			raise ScaffoldException('--Cyclic socket dependency between: {}'.format(sorted(subset - set(result))))
+		return result
+	# end def order():
+# end class ModuleGraph():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def batchBuild(scaffolds=None, incremental=False):
 	"""
 	Batch rig all modules or pass modules to rig
 
 	:param modules: list of scaffold objects to rig, if not specified attempts to batch rig every module in scene.
+	:param incremental: only rebuild modules whose fingerprint changed since they were built, changed modules are
+						dismantled first. _Root is only built if the rig does not exist yet. Modules built without
+						a fingerprint are always rebuilt, full builds only store one with the store-fingerprints pref.
 	:return: None
 	"""
-	errors = []
-
-	if not scaffolds:
-		scaffolds = getModules()
-
-	root = next((s for s in scaffolds if s.moduleType == '_Root'), None)
-	if root is not None:
-		scaffolds.pop(scaffolds.index(root))
-		root_module = getattr(mod, root.moduleType)
-		root_class = getattr(root_module, root.moduleType)
-		root_instance = root_class(root)
-		root_instance.registerModule()
-		root_instance.preBuild()
-		root_instance.build()
-		root_instance.postBuild()
-		root_instance.encapsulate()
-
-	print('>> Batch Build: Validating Scaffolds...')
-	# TODO: something more concrete than just checking moduleType exists here?
-	# TODO: potentially this should be implemented in in module classes as well eg;
-	# TODO: 		validateJointChain()
-	# TODO: 		if biped arm > 3 joints pass errors back, report, default to ' ' module type.
-	# tODO: 		Need to validate if includeEnd is checked up there is a component socketed to end joint. -
-	# TODO:				Maybe just scrap lol.
-
-	modules = []
-	for scaffold in scaffolds:
-		if scaffold.moduleType in utils.getFilteredDir('modules', ignore_private=False):
-			mod_module = getattr(mod, scaffold.moduleType)
-			mod_class = getattr(mod_module, scaffold.moduleType)
-			modules.append(mod_class(scaffold))
-		elif scaffold.moduleType == ' ':
-			modules.append(mod.ModuleBase(scaffold))
-		else:
-			print(
-				'// Warning: Skipping {}, module type does not appear to be implemented or is missing source code.'.
-					format(scaffold.moduleType)
-			)
+	# colours from every phase are applied together once the build is done
+	with utils.colourBatch():
+		errors = []
+
+		all_scaffolds = getModules()
+		graph = ModuleGraph(all_scaffolds)
+		if not scaffolds:
+			scaffolds = all_scaffolds
+
+		# upstream modules are built first in every phase
+		known = [s.name for s in scaffolds if s.name in graph]
+		scaffolds = [graph.scaffolds[name] for name in graph.order(known)] + \
+			[s for s in scaffolds if s.name not in graph]
+
+		# before anything is built, _Root deletes part of its own chain
+		fingerprints = {}
+		if incremental or user.prefs['store-fingerprints']:
+			fingerprints = fingerprintScaffolds(all_scaffolds, graph=graph)
+
+		root = next((s for s in scaffolds if s.moduleType == '_Root'), None)
+		if root is not None:
+			scaffolds.remove(root)
+			root_ctrl = '{}_{}'.format(user.prefs['root-ctrl-name'], user.prefs['ctrl-suffix'])
+			if not (incremental and pm.objExists(root_ctrl)):
+				root_instance = mod.registry.getClass(root.moduleType)(root)
+				for phase in ['registerModule', 'preBuild', 'build', 'postBuild', 'encapsulate']:
+					_runPhase([root_instance], phase)
+
+		print('>> Batch Build: Validating Scaffolds...')
+		# TODO: something more concrete than just checking moduleType exists here?
+		# TODO: potentially this should be implemented in in module classes as well eg;
+		# TODO: 		validateJointChain()
+		# TODO: 		if biped arm > 3 joints pass errors back, report, default to ' ' module type.
+		# tODO: 		Need to validate if includeEnd is checked up there is a component socketed to end joint. -
+		# TODO:				Maybe just scrap lol.
+
+		modules = []
+		for scaffold in scaffolds:
+			module = _makeModule(scaffold)
+			if module is not None:
+				modules.append(module)
+			else:
+				print(
+					'// Warning: Skipping {}, module type does not appear to be implemented or is missing source code.'.
+						format(scaffold.moduleType)
+				)
 
 
-	for module in modules:
-		errors += module.validateChain()
+		if incremental:
+			dirty = [m for m in modules if getBuiltFingerprint(m.name) != fingerprints.get(m.name)]
+			print('>> Batch Build: {} of {} modules changed.'.format(len(dirty), len(modules)))
+			modules = dirty
 
-	if errors:
-		raise ValidationException('--Errors while validating chain:\n{}'.format(errors))
+		for module in modules:
+			errors += module.validateChain()
 
-	print('>> Batch Build: Build Starting...')
-	for module in modules:
-		module.registerModule()
+		if errors:
+			raise ValidationException('--Errors while validating chain:\n{}'.format(errors))
 
-	print('>> Batch Build: Pre Building...')
-	for module in modules:
-		module.preBuild()
+		if incremental:
+			# postBuild removes the scaffold display again
+			ModuleBase.dismantleModules(modules, restore=False)
 
-	print('>> Batch Build: Building...')
-	for module in modules:
-		module.build()
+		print('>> Batch Build: Build Starting...')
+		_runPhase(modules, 'registerModule')
 
-	print('>> Batch Build: Post Building...')
-	for module in modules:
-		module.postBuild()
+		print('>> Batch Build: Pre Building...')
+		_runPhase(modules, 'preBuild')
 
-	print('>> Batch Build: Encapsulating...')
-	for module in modules:
-		module.encapsulate()
+		print('>> Batch Build: Building...')
+		_runPhase(modules, 'build')
+
+		print('>> Batch Build: Post Building...')
+		_runPhase(modules, 'postBuild')
+
+		if user.prefs['optimize-graph']:
+			print('>> Batch Build: Optimizing...')
+			optimizeModules(modules, graph=graph)
+
+		if user.prefs['fold-constants']:
+			print('>> Batch Build: Folding Constants...')
+			foldModules(modules)
+
+		print('>> Batch Build: Encapsulating...')
+		_runPhase(modules, 'encapsulate')
+
+		for module in modules:
+			_storeFingerprint(module, fingerprints.get(module.name))
 
 	print('>> Batch Build: Completed.')
 # end def batchBuild():
 
 
+# ----------------------------------------------------------------------------------------------------------------------
+def buildModules(names, incremental=True):
+	"""
+	Build modules and only the modules they depend on, upstream modules that are already built and unchanged are
+	skipped when incremental.
+
+	:param names: `List` of module names, eg; ['L_arm'].
+	:param incremental: see batchBuild().
+	:return: None
+	"""
+	graph = ModuleGraph(getModules())
+	batchBuild([graph.scaffolds[name] for name in graph.order(graph.dependencies(names))], incremental=incremental)
+# end def buildModules():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def dismantleModules(names=None):
+	"""
+	Dismantle built modules in one bulk delete, their scaffolds are restored so they can be edited and built again.
+
+	:param names: `List` of module names, every module except _Root if None.
+	:return: `int` number of nodes deleted.
+	"""
+	scaffolds = [s for s in getModules() if s.moduleType != '_Root' and (names is None or s.name in names)]
+	modules = [m for m in map(_makeModule, scaffolds) if m is not None]
+	return ModuleBase.dismantleModules(modules)
+# end def dismantleModules():
+
+
+def optimizeModules(modules, graph=None):
+	"""
+	Merge duplicate utility nodes of built modules, see scene.optimize.mergeDuplicates(). Nodes of a module only
+	stand in for nodes of the same module or of modules socketed below it, so dismantling a module can't break a
+	module that isn't rebuilt with it.
+
+	:param modules: `List` of built module instances, upstream modules first.
+	:param graph: `ModuleGraph` the modules are part of, made from the scene if None.
+	:return: `OrderedDict` of module name: number of nodes removed.
+	"""
+	if graph is None:
+		graph = ModuleGraph(getModules())
+
+	owners = {}
+	nodes = []
+	for module in modules:
+		for node in module.registry.names():
+			owners.setdefault(node, module.name)
+			nodes.append(node)
+
+	def share(keep, duplicate):
+		keep_module, module = owners[keep], owners[duplicate]
+		if keep_module == module:
+			return True
+		return module in graph and keep_module in graph.dependencies([module])
+	# end def share():
+
+	removed = optimize.mergeDuplicates(nodes, share=share)
+
+	counts = collections.OrderedDict((module.name, 0) for module in modules)
+	for node in removed:
+		counts[owners[node]] += 1
+	for name, count in counts.items():
+		if count:
+			print('>> Batch Build: Optimized {}, {} duplicate nodes removed.'.format(name, count))
+	return counts
+# end def optimizeModules():
+
+
+def foldModules(modules):
+	"""
+	Bake constant nodes of built modules into the attributes they drive and remove nodes that drive nothing, see
+	scene.optimize.foldConstants() and removeDeadNodes(). Node counts before and after are printed per module.
+	Scene backends that don't evaluate nodes can only remove dead nodes.
+
+	:param modules: `List` of built module instances.
+	:return: `OrderedDict` of module name: (`int` nodes before, `int` nodes after).
+	"""
+	backend = scene.getBackend()
+	if not backend.evaluates:
+		print('// Warning: {} scene backend does not evaluate nodes, only removing dead nodes.'.format(backend.name))
+
+	counts = collections.OrderedDict()
+	for module in modules:
+		nodes = module.registry.names()
+		if backend.evaluates:
+			optimize.foldConstants(nodes)
+		optimize.removeDeadNodes(nodes)
+		counts[module.name] = (len(nodes), len(module.registry.names()))
+
+	line = '{:<24}{:>8}{:>8}'
+	print(line.format('module', 'before', 'after'))
+	print('-' * 40)
+	for name, (before, after) in counts.items():
+		print(line.format(name, before, after))
+	print(line.format('total', sum(c[0] for c in counts.values()), sum(c[1] for c in counts.values())))
+	return counts
+# end def foldModules():
+
+
+def _makeModule(scaffold):
+	"""
+	Module instance for a scaffold.
+	:param scaffold:  `Scaffold`
+	:return:  Module instance or None if the module type is not implemented.
+	"""
+	if scaffold.moduleType == mod.registry.GENERIC or scaffold.moduleType in mod.registry:
+		return mod.registry.getClass(scaffold.moduleType)(scaffold)
+	return None
+# end def _makeModule():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def _runPhase(modules, phase):
+	"""
+	Run a build phase on every module, graph edits recorded by the modules are committed in bulk once all of them
+	have run. Nodes created by each module are recorded on its registry.
+	:param modules:  `List` of module instances.
+	:param phase:  `str` Name of phase method, eg; 'build'.
+	:return:  None
+	"""
+	prof = profiler.active()
+	if prof is None:
+		with scene.GraphModifier():
+			for module in modules:
+				with module.registry:
+					getattr(module, phase)()
+		return
+
+	with scene.GraphModifier() as graph:
+		for module in modules:
+			with prof.measure(module.name, phase), module.registry:
+				getattr(module, phase)()
+		with prof.measure(profiler.COMMIT, phase):
+			graph.doIt()
+# end def _runPhase():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def fingerprintScaffolds(scaffolds, graph=None):
+	"""
+	Fingerprint scaffolds, each fingerprint includes the fingerprint of the module it is socketed to so changes
+	dirty everything downstream.
+
+	Chains of built modules are driven by their rig, so their pose hash is the one stored when they were built. A
+	chain can only be moved after its module is dismantled.
+
+	:param scaffolds:  `List` of Scaffold objects, should include upstream scaffolds.
+	:param graph:  `ModuleGraph` of scaffolds if already made.
+	:return:  `dict` of module name: (pose hash, fingerprint), _Root is not fingerprinted.
+	"""
+	graph = graph or ModuleGraph(scaffolds)
+
+	fingerprints = {}
+	for name in graph.order([s.name for s in scaffolds]):
+		scaffold = graph.scaffolds[name]
+		if scaffold.moduleType == '_Root':
+			continue
+		upstream_print = fingerprints.get(graph.upstream[name], (None, None))[1]
+		pose = getBuiltFingerprint(name)[0] or scaffold.poseHash()
+		fingerprints[name] = (pose, scaffold.fingerprint(upstream=upstream_print, pose=pose))
+
+	return fingerprints
+# end def fingerprintScaffolds():
+
+
+def getBuiltFingerprint(module_name):
+	"""
+	Fingerprint stored on a built module.
+	:param module_name:  `str` Module name.
+	:return:  `tuple` of (pose hash, fingerprint), (None, None) if the module is not built.
+	"""
+	backend = scene.getBackend()
+	mod_root = module_name + '_mod'
+	if backend.objExists(mod_root) and backend.attributeExists(mod_root, 'RB_fingerprint'):
+		value = backend.getAttr(mod_root + '.RB_fingerprint') or ''
+		if value.count(':') == 1:
+			return tuple(value.split(':'))
+	return None, None
+# end def getBuiltFingerprint():
+
+
+def _storeFingerprint(module, fingerprint):
+	mod_root = module.modGlobals.get('modRoot')
+	if mod_root is None or fingerprint is None:
+		return
+	backend = scene.getBackend()
+	if not backend.attributeExists(mod_root, 'RB_fingerprint'):
+		backend.addAttr(mod_root, longName='RB_fingerprint', dataType='string')
+	backend.setAttr('{}.RB_fingerprint'.format(mod_root), ':'.join(fingerprint), type='string')
+# end def _storeFingerprint():
+
+
 # ----------------------------------------------------------------------------------------------------------------------
 def getModules():
 	"""
-	Get all of the current modules under the root joint
+	Get all of the current modules under the root joint, the skeleton is walked once for every module.
 	:return: `List` of rigbot Module/Scaffold objects
 	"""
 	if user.debug:
 		print('>>Fetching modules.')
 
-	if pm.objExists(user.prefs['root-joint']):
-		root_jnt = pm.PyNode(user.prefs['root-joint'])
-	else:
+	if not pm.objExists(user.prefs['root-joint']):
 		return []
 
-	flattened_jnts = root_jnt.getChildren(ad=True, type='joint')
-	flattened_jnts.append(root_jnt)
-
-	def isModRoot(jnt):
-		return jnt.hasAttr('RB_MODULE_ROOT')
-	# end def isModRoot(jnt):
-
-	module_roots = filter(isModRoot, flattened_jnts)
-
-	modules_ls = map(lambda mod_root: Scaffold(mod_root), module_roots)
-
-	return modules_ls
+	return [Scaffold.fromChain(chain) for chain in utils.getModuleChains()]
 # end def getModules():
@@ -7,9 +7,8 @@
 """
 # ----------------------------------------------------------------------------------------------------------------------
 
-import pymel.core as pm
-
 from .. import utils, user, data
+from ..scene import pm
 
 
 # TODO: L / R auto colouring
@@ -17,7 +16,7 @@ from .. import utils, user, data
 class control(object):
 	def __init__(
 				self, name='control', shape='circle', size=1, line_width=user.prefs['default-line-width'],
-				offsets=user.prefs['num-offset-ctrls'], colour='dark-blue'):
+				offsets=user.prefs['num-offset-ctrls'], colour='dark-blue', rotate=0.0, axis=(1, 0, 0)):
 		"""
 		Create controller and offset groups
 		:param name: (string) Name of controller
@@ -25,6 +24,8 @@ class control(object):
 		:param size: (float, int) Scale factor of control
 		:param line_width: (float, int) line width
 		:param offsets: amount of offset locators to make
+		:param rotate: (float) degrees to rotate shape around axis
+		:param axis: (list) rotate around these axis
 		"""
 
 		self.name = utils.makeNameUnique(name, '_%s' % user.prefs['ctrl-suffix'])
@@ -32,12 +33,11 @@ class control(object):
 		self.ctrl = \
 			pm.curve(
 				d=1,
-				p=data.controllerShapes[shape],
+				p=data.controllerShapes.points(shape, size=size, rotation=rotate, axis=axis),
 				n=(self.name + '_' + user.prefs['ctrl-suffix']))
 
-		utils.setOverrideColour(self.ctrl, c=colour)
-
-		utils.scaleCtrlShapes(self.ctrl, scale_mult=size, line_width=line_width)
+		# points are already in their final form, only line width is left to set
+		utils.transformCtrlShapes(self.ctrl, line_width=line_width)
 
 		self.null = pm.group(n=self.ctrl + '_null', em=True)
 
@@ -46,7 +46,7 @@ class control(object):
 			num = '{:02d}'.format(i+1) if offsets > 1 else ''
 			self.offsets.append(pm.spaceLocator(n=self.ctrl + '_offset%s_loc' % num))
 
-			utils.setOverrideColour(self.offsets, 'purple')
+		utils.setColours(override=[(self.ctrl, colour), (self.offsets, 'purple')])
 
 		utils.parentByList([self.ctrl, self.offsets, self.null])
 	# end def __init__():
@@ -0,0 +1,373 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	IK.PY
+	Reference two bone ik, the solve SimpleIkArm builds out of utility nodes written out in numpy. Whole arrays of
+	poses are solved in one call, to check the built network or to compare other ik set ups against:
+
+		# (N, 3, 4, 4) world matrices of the shoulder, elbow and wrist
+		chain = ik.solveTwoBone(base, target, pole, humerus=10.0, radius=10.0, stretch=1.0)
+
+	The ik control's world matrix comes from its channels and the space it follows, worked out from the rest pose
+	of the arm and the world matrices of the global control and the module socket:
+
+		space = ik.spaceBlend(ik.globalSpace(rest, global_world, socket), rest_local, weight)
+		target = ik.spaceControl(translate, rotate, space, socket)
+
+	Positions are (..., 3) arrays and matrices (..., 4, 4), row major with row vectors like maya. Every argument
+	broadcasts against the others. Nothing here reads the scene or uses scene.evaluator, the reference only agrees
+	with the built network when both do the same maths.
+
+	The solve follows the network step for step, including its quirks: the reach is clamped to at least one unit,
+	the law of cosines divides by 2.000001 times the bone lengths so straight arms don't hit acos(1) and the wrist
+	takes its rotation from the ik control through the transpose of the elbow matrix.
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+from ..scene import mmath
+
+
+class IkException(Exception):
+	pass
+
+
+AXES = ('X', '-X')
+
+# SimpleIkArm limits, see its stretchLimiter_clmp, stretch_blndA and limited_vec_clmp nodes
+MIN_REACH = 1.0
+MAX_STRETCH = 100.0
+COSINE_SCALE = 2.000001
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def solveTwoBone(base, target, pole, humerus, radius, stretch=0.0, scale=1.0, axis='X'):
+	"""
+	Solve a three joint chain aimed from base to target, bending towards pole.
+
+	:param base:  (..., 3) shoulder positions, the base control.
+	:param target:  (..., 4, 4) ik control world matrices, or (..., 3) positions for a wrist without rotation.
+	:param pole:  (..., 3) pole vector positions.
+	:param humerus:  (...) upper bone lengths.
+	:param radius:  (...) lower bone lengths.
+	:param stretch:  (...) 0 keeps bone lengths, 1 lets the chain stretch to reach target, blended in between.
+	:param scale:  (...) or (..., 3) socket scale, see socketScale().
+	:param axis:  `str` 'X' or '-X', the axis joints point down the chain.
+	:return:  (..., 3, 4, 4) world matrices of the three joints.
+	"""
+	np = _numpy()
+	if axis not in AXES:
+		raise IkException('--Axis is not one of {}: {}'.format(AXES, axis))
+	sign = 1.0 if axis == 'X' else -1.0
+
+	target = np.asarray(target, dtype=float)
+	if target.shape[-1] == 3:
+		target = composeMatrix(translate=target)
+	target_position = target[..., 3, :3]
+	base = np.asarray(base, dtype=float)
+	pole = np.asarray(pole, dtype=float)
+	humerus = np.asarray(humerus, dtype=float)
+	radius = np.asarray(radius, dtype=float)
+	scale = np.asarray(scale, dtype=float)
+	if scale.ndim == 0 or scale.shape[-1] != 3:
+		scale = np.stack([scale, scale, scale], axis=-1)
+
+	# reach and stretch, scaled lengths are compared against the control distance
+	distance = np.linalg.norm(target_position - base, axis=-1)
+	base_length = (humerus + radius) * scale[..., 0]
+	reach = _clamp(np, distance, MIN_REACH, base_length) / scale[..., 0]
+	factor = _clamp(np, distance / base_length, 1.0, 1.0 + (MAX_STRETCH - 1.0) * np.asarray(stretch, dtype=float))
+
+	# law of cosines, the shoulder opens from the aim vector and the elbow bends back from straight
+	shoulder_cos = (humerus * humerus + reach * reach - radius * radius) / (reach * (COSINE_SCALE * humerus))
+	elbow_cos = (radius * radius + humerus * humerus - reach * reach) / ((COSINE_SCALE * humerus) * radius)
+	shoulder_angle = np.degrees(np.arccos(np.clip(shoulder_cos, -1.0, 1.0)))
+	elbow_angle = np.degrees(np.arccos(np.clip(elbow_cos, -1.0, 1.0))) - 180.0
+
+	aim = aimMatrix(base, target_position, pole, axis)
+	shoulder = np.matmul(composeMatrix(rotate=_yRotation(np, shoulder_angle), scale=scale), aim)
+
+	elbow_translate = np.stack(np.broadcast_arrays(humerus * factor * sign, 0.0, 0.0), axis=-1)
+	elbow = np.matmul(composeMatrix(elbow_translate, _yRotation(np, elbow_angle)), shoulder)
+
+	# wrist keeps the control's world rotation
+	wrist_rotation = np.matmul(target[..., :3, :3], np.swapaxes(elbow[..., :3, :3], -1, -2))
+	wrist_translate = np.stack(np.broadcast_arrays(radius * factor * sign, 0.0, 0.0), axis=-1)
+	wrist = np.matmul(_matrix(np, wrist_translate, wrist_rotation), elbow)
+
+	return np.stack(np.broadcast_arrays(shoulder, elbow, wrist), axis=-3)
+# end def solveTwoBone():
+
+
+def aimMatrix(base, target, pole, axis='X'):
+	"""
+	Shoulder frame before the shoulder angle, x aims at target and z lies in the plane of base, target and pole.
+
+	:param base:  (..., 3) shoulder positions.
+	:param target:  (..., 3) target positions.
+	:param pole:  (..., 3) pole vector positions.
+	:param axis:  `str` 'X' or '-X', with -X the x axis aims away from target.
+	:return:  (..., 4, 4) matrices at base.
+	"""
+	np = _numpy()
+	base = np.asarray(base, dtype=float)
+	aim = np.asarray(target, dtype=float) - base
+	pole_vector = np.asarray(pole, dtype=float) - base
+	if axis == '-X':
+		aim = -aim
+		up = _normalize(np, np.cross(*np.broadcast_arrays(pole_vector, aim)))
+	else:
+		up = _normalize(np, np.cross(*np.broadcast_arrays(aim, pole_vector)))
+	aim = _normalize(np, aim)
+	side = np.cross(*np.broadcast_arrays(aim, up))
+	return _matrix(np, base, np.stack(np.broadcast_arrays(aim, up, side), axis=-2))
+# end def aimMatrix():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def composeMatrix(translate=None, rotate=None, scale=None):
+	"""
+	Local matrices of transforms without pivots, joint orients or shear, eg; controls.
+
+	:param translate:  (..., 3)
+	:param rotate:  (..., 3) xyz euler angles in degrees or (..., 3, 3) rotation matrices.
+	:param scale:  (..., 3)
+	:return:  (..., 4, 4) matrices, scale * rotate * translate.
+	"""
+	np = _numpy()
+	rotation = np.eye(3)
+	if rotate is not None:
+		rotation = np.asarray(rotate, dtype=float)
+		if rotation.shape[-2:] != (3, 3):
+			rotation = _eulerXYZ(np, rotation)
+	if scale is not None:
+		rotation = np.asarray(scale, dtype=float)[..., :, None] * rotation
+	return _matrix(np, np.zeros(3) if translate is None else translate, rotation)
+# end def composeMatrix():
+
+
+def socketScale(socket):
+	"""
+	Scale the module socket passes on to its controls and joints, the lengths of its axes. Mirrored sockets have a
+	negative x scale.
+
+	:param socket:  (..., 4, 4) socket world matrices.
+	:return:  (..., 3) scale.
+	"""
+	np = _numpy()
+	socket = np.asarray(socket, dtype=float)
+	scale = np.linalg.norm(socket[..., :3, :3], axis=-1)
+	scale[..., 0] *= np.where(np.linalg.det(socket[..., :3, :3]) < 0.0, -1.0, 1.0)
+	return scale
+# end def socketScale():
+
+
+def globalSpace(rest, world, socket):
+	"""
+	Space of the ik control at spaceBlend 0, where its rest pose is carried along by the global control.
+
+	:param rest:  (4, 4) world matrix of the ik control when the arm was built, its wrist joint.
+	:param world:  (..., 4, 4) world matrices of the global control, the module's global plug.
+	:param socket:  (..., 4, 4) world matrices of the module socket, the space of the module controls.
+	:return:  (..., 4, 4) matrices in the space of the module controls.
+	"""
+	np = _numpy()
+	return np.matmul(np.matmul(np.asarray(rest, dtype=float), world), np.linalg.inv(socket))
+# end def globalSpace():
+
+
+def spaceBlend(global_space, local_space, weight, use_blend_matrix=False):
+	"""
+	Space of the ik control, blended the way utils.matrixBlend() sets it up.
+
+	:param global_space:  (..., 4, 4) space at weight 0, see globalSpace().
+	:param local_space:  (..., 4, 4) space at weight 1, the control's rest matrix in the space of the module controls.
+	:param weight:  (...) spaceBlend values.
+	:param use_blend_matrix:  `bool` Blend like a blendMatrix node, translate, scale and shear are interpolated and
+							  rotation slerped. Otherwise the weighted sum of a wtAddMatrix.
+	:return:  (..., 4, 4) matrices.
+	"""
+	np = _numpy()
+	global_space = np.asarray(global_space, dtype=float)
+	local_space = np.asarray(local_space, dtype=float)
+	weight = np.asarray(weight, dtype=float)
+	if not use_blend_matrix:
+		return global_space * (1.0 - weight)[..., None, None] + local_space * weight[..., None, None]
+
+	lerp = lambda a, b: a + (b - a) * weight[..., None]
+	rotation_a, scale_a, shear_a = _orthogonalize(np, global_space)
+	rotation_b, scale_b, shear_b = _orthogonalize(np, local_space)
+	rotation = _fromQuaternion(np, _slerp(np, _toQuaternion(np, rotation_a), _toQuaternion(np, rotation_b), weight))
+	shear_a, shear_b = [_shearMatrix(np, shear) for shear in (shear_a, shear_b)]
+	upper = lerp(scale_a, scale_b)[..., :, None] * np.matmul(
+		shear_a + (shear_b - shear_a) * weight[..., None, None], rotation)
+	return _matrix(np, lerp(global_space[..., 3, :3], local_space[..., 3, :3]), upper)
+# end def spaceBlend():
+
+
+def spaceControl(translate, rotate, space, socket, null_scale=1.0):
+	"""
+	World matrices of a control whose null takes its translate and rotate from space, eg; the ik control. Scale and
+	shear of space are dropped, the null keeps its own scale.
+
+	:param translate:  (..., 3) control translate.
+	:param rotate:  (..., 3) control rotate, xyz euler angles in degrees.
+	:param space:  (..., 4, 4) space of the null, see spaceBlend().
+	:param socket:  (..., 4, 4) world matrices of the module socket, the null's parent.
+	:param null_scale:  (...) or (..., 3) scale of the null.
+	:return:  (..., 4, 4) matrices.
+	"""
+	np = _numpy()
+	space = np.asarray(space, dtype=float)
+	null_scale = np.asarray(null_scale, dtype=float)
+	if null_scale.ndim == 0 or null_scale.shape[-1] != 3:
+		null_scale = np.stack([null_scale, null_scale, null_scale], axis=-1)
+	null = composeMatrix(space[..., 3, :3], _orthogonalize(np, space)[0], null_scale)
+	return np.matmul(np.matmul(composeMatrix(translate, rotate), null), socket)
+# end def spaceControl():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def _numpy():
+	np = mmath.numpyModule()
+	if np is None:
+		raise IkException('--numpy is required to solve ik.')
+	return np
+# end def _numpy():
+
+
+def _clamp(np, value, low, high):
+	# same order as the evaluator's clamp node, low wins when the limits cross
+	return np.where(value < low, low, np.where(value > high, high, value))
+# end def _clamp():
+
+
+def _normalize(np, vector):
+	length = np.linalg.norm(vector, axis=-1)[..., None]
+	return vector / np.where(length == 0.0, 1.0, length)
+# end def _normalize():
+
+
+def _matrix(np, translate, upper):
+	"""
+	(..., 4, 4) matrices from (..., 3) translations and (..., 3, 3) upper rows.
+	"""
+	translate = np.asarray(translate, dtype=float)
+	upper = np.asarray(upper, dtype=float)
+	shape = np.broadcast(translate[..., 0], upper[..., 0, 0]).shape
+	matrix = np.zeros(shape + (4, 4))
+	matrix[..., :3, :3] = upper
+	matrix[..., 3, :3] = translate
+	matrix[..., 3, 3] = 1.0
+	return matrix
+# end def _matrix():
+
+
+def _axisRotation(np, angle, axis):
+	"""
+	(..., 3, 3) rotations by angle degrees about one axis, for row vectors.
+	"""
+	radians = np.radians(np.asarray(angle, dtype=float))
+	cos, sin = np.cos(radians), np.sin(radians)
+	first, second = [(1, 2), (2, 0), (0, 1)][axis]
+	rotation = np.zeros(np.shape(radians) + (3, 3))
+	rotation[..., axis, axis] = 1.0
+	rotation[..., first, first] = cos
+	rotation[..., second, second] = cos
+	rotation[..., first, second] = sin
+	rotation[..., second, first] = -sin
+	return rotation
+# end def _axisRotation():
+
+
+def _yRotation(np, angle):
+	return _axisRotation(np, angle, 1)
+# end def _yRotation():
+
+
+def _eulerXYZ(np, rotate):
+	# x is applied first, row vectors multiply on the right
+	return np.matmul(
+		np.matmul(_axisRotation(np, rotate[..., 0], 0), _axisRotation(np, rotate[..., 1], 1)),
+		_axisRotation(np, rotate[..., 2], 2))
+# end def _eulerXYZ():
+
+
+def _orthogonalize(np, matrix):
+	"""
+	Split the upper rows of matrices into scale * shear * rotation, rows are made orthogonal in x, y, z order.
+	:return:  (rotation (..., 3, 3), scale (..., 3), shear (..., 3) xy, xz, yz)
+	"""
+	rows = [matrix[..., i, :3] for i in range(3)]
+	axes, scale, projections = [], [], []
+	for i, row in enumerate(rows):
+		for axis in axes:
+			projection = np.sum(rows[i] * axis, axis=-1)
+			projections.append((i, projection))
+			row = row - projection[..., None] * axis
+		length = np.linalg.norm(row, axis=-1)
+		if i == 0:
+			length = length * np.where(np.linalg.det(matrix[..., :3, :3]) < 0.0, -1.0, 1.0)
+		scale.append(length)
+		axes.append(row / np.where(length == 0.0, 1.0, length)[..., None])
+
+	# projections are xy, xz, yz, sheared rows are scaled along with the rest of their row
+	shear = [projection / np.where(scale[i] == 0.0, 1.0, scale[i]) for i, projection in projections]
+	return np.stack(axes, axis=-2), np.stack(scale, axis=-1), np.stack(shear, axis=-1)
+# end def _orthogonalize():
+
+
+def _shearMatrix(np, shear):
+	matrix = np.zeros(shear.shape[:-1] + (3, 3))
+	matrix[..., [0, 1, 2], [0, 1, 2]] = 1.0
+	matrix[..., 1, 0] = shear[..., 0]
+	matrix[..., 2, 0] = shear[..., 1]
+	matrix[..., 2, 1] = shear[..., 2]
+	return matrix
+# end def _shearMatrix():
+
+
+def _toQuaternion(np, rotation):
+	"""
+	(..., 4) w, x, y, z unit quaternions of row vector rotations, from the largest diagonal term for precision.
+	"""
+	m = rotation
+	trace = m[..., 0, 0] + m[..., 1, 1] + m[..., 2, 2]
+	candidates = np.stack([
+		np.stack([1.0 + trace, m[..., 1, 2] - m[..., 2, 1], m[..., 2, 0] - m[..., 0, 2],
+				  m[..., 0, 1] - m[..., 1, 0]], -1),
+		np.stack([m[..., 1, 2] - m[..., 2, 1], 1.0 + 2.0 * m[..., 0, 0] - trace, m[..., 0, 1] + m[..., 1, 0],
+				  m[..., 2, 0] + m[..., 0, 2]], -1),
+		np.stack([m[..., 2, 0] - m[..., 0, 2], m[..., 0, 1] + m[..., 1, 0], 1.0 + 2.0 * m[..., 1, 1] - trace,
+				  m[..., 1, 2] + m[..., 2, 1]], -1),
+		np.stack([m[..., 0, 1] - m[..., 1, 0], m[..., 2, 0] + m[..., 0, 2], m[..., 1, 2] + m[..., 2, 1],
+				  1.0 + 2.0 * m[..., 2, 2] - trace], -1),
+	], axis=-2)
+	largest = np.argmax(np.stack([trace, m[..., 0, 0], m[..., 1, 1], m[..., 2, 2]], -1), axis=-1)
+	quaternion = np.take_along_axis(candidates, largest[..., None, None], axis=-2)[..., 0, :]
+	return _normalize(np, quaternion)
+# end def _toQuaternion():
+
+
+def _fromQuaternion(np, quaternion):
+	w, x, y, z = [quaternion[..., i] for i in range(4)]
+	return np.stack([
+		np.stack([1.0 - 2.0 * (y * y + z * z), 2.0 * (x * y + w * z), 2.0 * (x * z - w * y)], -1),
+		np.stack([2.0 * (x * y - w * z), 1.0 - 2.0 * (x * x + z * z), 2.0 * (y * z + w * x)], -1),
+		np.stack([2.0 * (x * z + w * y), 2.0 * (y * z - w * x), 1.0 - 2.0 * (x * x + y * y)], -1),
+	], axis=-2)
+# end def _fromQuaternion():
+
+
+def _slerp(np, start, end, weight):
+	# shortest way round, nearly equal rotations are interpolated linearly
+	cos = np.sum(start * end, axis=-1)
+	end = np.where((cos < 0.0)[..., None], -end, end)
+	angle = np.arccos(np.clip(np.abs(cos), 0.0, 1.0))
+	sin = np.sin(angle)
+	linear = sin < 1e-9
+	sin = np.where(linear, 1.0, sin)
+	start_weight = np.where(linear, 1.0 - weight, np.sin((1.0 - weight) * angle) / sin)
+	end_weight = np.where(linear, weight, np.sin(weight * angle) / sin)
+	return _normalize(np, start_weight[..., None] * start + end_weight[..., None] * end)
+# end def _slerp():
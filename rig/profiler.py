@@ -0,0 +1,192 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	PROFILER.PY
+	Opt-in build profiling. Records wall time, nodes created, connections made and attributes set for every
+	module and build phase while a BuildProfiler is active:
+
+		with profiler.BuildProfiler() as prof:
+			builder.batchBuild()
+		print(prof.summary(limit=20))
+		prof.save('C:/temp/build_profile.json')
+
+	When no profiler is active the builder runs phases exactly as before, scene backends only check whether a
+	counter is set on each edit.
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+import collections
+import contextlib
+import json
+import timeit
+
+from .. import scene
+from ..scene import stats
+
+
+class ProfilerException(Exception):
+	pass
+
+
+_ACTIVE = []
+
+PHASES = ['registerModule', 'preBuild', 'build', 'postBuild', 'encapsulate']
+
+# recorded edits are applied once per phase after every module has run, their cost is reported under this name
+COMMIT = '<commit>'
+
+_FIELDS = ('time', 'nodes', 'connections', 'sets')
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def active():
+	"""
+	Innermost BuildProfiler currently recording.
+	:return:  `BuildProfiler` or None
+	"""
+	return _ACTIVE[-1] if _ACTIVE else None
+# end def active():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+class BuildProfiler(object):
+
+	def __init__(self):
+		self.records = collections.OrderedDict()
+		self.total = 0.0
+		self._counter = None
+		self._backend = None
+		self._start = None
+	# end def __init__():
+
+	def __enter__(self):
+		if _ACTIVE:
+			raise ProfilerException('--A BuildProfiler is already recording.')
+		_ACTIVE.append(self)
+		self._backend = scene.getBackend()
+		self._counter = stats.start()
+		self._backend.startCounting()
+		self._start = timeit.default_timer()
+		return self
+	# end def __enter__():
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.total += timeit.default_timer() - self._start
+		self._backend.stopCounting()
+		stats.stop()
+		_ACTIVE.remove(self)
+		return False
+	# end def __exit__():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	@contextlib.contextmanager
+	def measure(self, module, phase):
+		"""
+		Add time and edit counts of the wrapped code to the record for module and phase.
+		:param module:  `str` Module name.
+		:param phase:  `str` Build phase.
+		"""
+		counter = self._counter
+		nodes, connections, sets = counter.snapshot()
+		start = timeit.default_timer()
+		try:
+			yield
+		finally:
+			elapsed = timeit.default_timer() - start
+			record = self.records.get((module, phase))
+			if record is None:
+				record = self.records[(module, phase)] = dict.fromkeys(_FIELDS, 0)
+			record['time'] += elapsed
+			record['nodes'] += counter.nodes - nodes
+			record['connections'] += counter.connections - connections
+			record['sets'] += counter.sets - sets
+	# end def measure():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												results
+	# ------------------------------------------------------------------------------------------------------------------
+	def totals(self):
+		"""
+		:return:  `Dict` of fields summed over every record, time is the time spent inside build phases.
+		"""
+		totals = dict.fromkeys(_FIELDS, 0)
+		for record in self.records.values():
+			for field in _FIELDS:
+				totals[field] += record[field]
+		return totals
+	# end def totals():
+
+	def report(self):
+		"""
+		Json compatible report of the profiled build.
+		:return:  `Dict` with 'total', 'phases', 'modules' and 'records' keys.
+		"""
+		phases = collections.OrderedDict()
+		modules = collections.OrderedDict()
+		for (module, phase), record in self.records.items():
+			for key, group in ((phase, phases), (module, modules)):
+				summed = group.get(key)
+				if summed is None:
+					summed = group[key] = dict.fromkeys(_FIELDS, 0)
+				for field in _FIELDS:
+					summed[field] += record[field]
+
+		totals = self.totals()
+		totals['wall'] = self.total
+
+		records = []
+		for (module, phase), record in self.records.items():
+			entry = collections.OrderedDict([('module', module), ('phase', phase)])
+			entry.update((field, record[field]) for field in _FIELDS)
+			records.append(entry)
+
+		return collections.OrderedDict([
+			('backend', self._backend.name if self._backend else None),
+			('total', totals),
+			('phases', phases),
+			('modules', modules),
+			('records', records),
+		])
+	# end def report():
+
+	def save(self, path):
+		"""
+		Write report() to a json file.
+		:param path:  `str` File path.
+		:return:  `str` path
+		"""
+		with open(path, 'w') as f:
+			json.dump(self.report(), f, indent=4)
+		return path
+	# end def save():
+
+	def summary(self, sort='time', limit=None):
+		"""
+		Table of records, most expensive first.
+		:param sort:  `str` Field to sort by, one of 'time', 'nodes', 'connections', 'sets'.
+		:param limit:  `int` Only list this many records.
+		:return:  `str`
+		"""
+		if sort not in _FIELDS:
+			raise ProfilerException('--Invalid sort field: {}. Use one of: {}'.format(sort, _FIELDS))
+
+		rows = sorted(self.records.items(), key=lambda item: item[1][sort], reverse=True)
+		if limit is not None:
+			rows = rows[:limit]
+
+		line = '{:<32}{:<16}{:>12}{:>8}{:>8}{:>8}'
+		lines = [line.format('module', 'phase', 'time (ms)', 'nodes', 'conns', 'sets'), '-' * 84]
+		for (module, phase), record in rows:
+			lines.append(line.format(
+				module, phase, '{:.3f}'.format(record['time'] * 1000),
+				record['nodes'], record['connections'], record['sets']))
+
+		totals = self.totals()
+		lines.append('-' * 84)
+		lines.append(line.format(
+			'total', '', '{:.3f}'.format(totals['time'] * 1000),
+			totals['nodes'], totals['connections'], totals['sets']))
+		return '\n'.join(lines)
+	# end def summary():
+# end class BuildProfiler():
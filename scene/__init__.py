@@ -0,0 +1,112 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	SCENE
+	Scene access for rigbot. Code imports `pm` from here instead of pymel.core, calls are forwarded to the active
+	backend:
+
+		'pymel'		:	maya through pymel (default, see user.prefs['scene-backend'])
+		'cmds'		:	maya, string api through maya.cmds so utilities build no PyNodes
+		'memory'	:	pure python in-memory scene, builds run headless without maya
+
+	Every backend also implements the string api in base.SceneBackend, get it with getBackend().
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+from .. import user
+
+
+class SceneException(Exception):
+	pass
+
+
+_BACKENDS = {}
+_ACTIVE_BACKEND = []
+
+
+def _makePymel():
+	from .pymelscene import PymelScene
+	return PymelScene()
+# end def _makePymel():
+
+
+def _makeCmds():
+	from .cmdsscene import CmdsScene
+	return CmdsScene()
+# end def _makeCmds():
+
+
+def _makeMemory():
+	from .pmcompat import MemoryBackend
+	return MemoryBackend()
+# end def _makeMemory():
+
+
+_FACTORIES = {
+	'pymel': _makePymel,
+	'cmds': _makeCmds,
+	'memory': _makeMemory,
+}
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def registerBackend(name, factory):
+	"""
+	Register a scene backend factory.
+	:param name:  `str` Backend name.
+	:param factory:  Callable returning a new backend instance.
+	:return:  None
+	"""
+	_FACTORIES[name] = factory
+	_BACKENDS.pop(name, None)
+# end def registerBackend():
+
+
+def setBackend(name, fresh=False):
+	"""
+	Set active scene backend.
+	:param name:  `str` Registered backend name.
+	:param fresh:  `bool` Make a new instance instead of reusing the existing one, for memory this is a new scene.
+	:return:  Backend instance.
+	"""
+	if name not in _FACTORIES:
+		raise SceneException('--Unknown scene backend: {}. Available: {}'.format(name, sorted(_FACTORIES)))
+	if fresh or name not in _BACKENDS:
+		if name in _BACKENDS:
+			# callbacks of the replaced instance would outlive it
+			registry.reset(_BACKENDS[name])
+		_BACKENDS[name] = _FACTORIES[name]()
+	_ACTIVE_BACKEND[:] = [_BACKENDS[name]]
+	return _BACKENDS[name]
+# end def setBackend():
+
+
+def getBackend():
+	"""
+	Get active scene backend, defaults to user.prefs['scene-backend'].
+	:return:  Backend instance.
+	"""
+	if not _ACTIVE_BACKEND:
+		setBackend(user.prefs['scene-backend'])
+	return _ACTIVE_BACKEND[0]
+# end def getBackend():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+class _PmProxy(object):
+	"""
+	Module like object forwarding to the active backend's pymel.core compatible namespace.
+	"""
+
+	def __getattr__(self, name):
+		return getattr(getBackend().pm, name)
+	# end def __getattr__():
+# end class _PmProxy():
+
+
+pm = _PmProxy()
+
+
+from .modifier import GraphModifier, NodeHandle, PlugHandle, ModifierException, active, current
+from .registry import NodeRegistry
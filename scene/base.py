@@ -0,0 +1,284 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	BASE.PY
+	Scene backend interface. Besides the pymel.core compatible `pm` namespace used by modules, every backend
+	implements a maya.cmds style string api so hot utilities can work on node names without building PyNodes.
+
+	Node and plug arguments accept anything that converts to a name with str(): strings, PyNodes, handles.
+	Returned nodes and plugs are always names, compound values are returned as tuples and matrices as flat
+	lists of 16 floats.
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+class SceneBackendException(Exception):
+	pass
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+class SceneBackend(object):
+
+	name = None
+
+	# reading an output plug computes its node, otherwise outputs hold whatever was last set on them
+	evaluates = True
+
+	EVENTS = ('nodeAdded', 'nodeRemoved', 'nameChanged', 'nameReleased', 'parentChanged', 'sceneChanged')
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												namespaces
+	# ------------------------------------------------------------------------------------------------------------------
+	@property
+	def pm(self):
+		"""
+		pymel.core compatible namespace.
+		"""
+		raise NotImplementedError('--{} does not implement pm.'.format(self.__class__.__name__))
+	# end def pm():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												graph modifier
+	# ------------------------------------------------------------------------------------------------------------------
+	def nativeNode(self, node):
+		"""
+		Backend reference for an existing node, used by GraphModifier handles.
+		"""
+		raise NotImplementedError
+	# end def nativeNode():
+
+	def nodeName(self, native):
+		raise NotImplementedError
+	# end def nodeName():
+
+	def nativeAlive(self, native):
+		"""
+		:return:  `bool` False once the node of a backend reference is deleted.
+		"""
+		raise NotImplementedError
+	# end def nativeAlive():
+
+	def wrap(self, native):
+		"""
+		pm node object for a backend reference.
+		"""
+		raise NotImplementedError
+	# end def wrap():
+
+	def applyEdits(self, ops):
+		"""
+		Apply recorded GraphModifier edits in bulk.
+		"""
+		raise NotImplementedError
+	# end def applyEdits():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												profiling
+	# ------------------------------------------------------------------------------------------------------------------
+	def startCounting(self):
+		"""
+		Called when a scene.stats counter starts. Backends that can't report every edit themselves hook into the
+		scene here, default does nothing.
+		"""
+		pass
+	# end def startCounting():
+
+	def stopCounting(self):
+		pass
+	# end def stopCounting():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												events
+	# ------------------------------------------------------------------------------------------------------------------
+	def addCallback(self, event, func, type=None, native=False):
+		"""
+		Call func(name) when the scene changes, used to invalidate caches of scene structure.
+
+		:param event:  `str` One of EVENTS:
+						'nodeAdded'		:	after a node is created
+						'nodeRemoved'	:	before a node is deleted
+						'nameChanged'	:	after a node is renamed
+						'nameReleased'	:	after a node is renamed, with the name it had before
+						'parentChanged'	:	after a dag node is parented
+						'sceneChanged'	:	after a new scene is made or opened, name is None
+		:param func:  Callable taking the node name.
+		:param type:  `str` Only call for nodes of this type, inherited types match.
+		:param native:  `bool` Call func with the native node reference instead, see nativeNode(). Saves naming
+						every node when the callback only keeps them.
+		:return:  Callback id for removeCallback().
+		"""
+		raise NotImplementedError
+	# end def addCallback():
+
+	def removeCallback(self, callback_id):
+		raise NotImplementedError
+	# end def removeCallback():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												traversal
+	# ------------------------------------------------------------------------------------------------------------------
+	def iterDependencyGraph(self, root, up_stream=False, breadth_first=False, prune=None):
+		"""
+		Native node level dependency graph iterator, used by scene.traverse when asked for. Backends without one
+		return None and the python traversal is used instead.
+
+		:param root:  `str` Node to start from, not yielded.
+		:param up_stream:  `bool` Iterate upstream instead of downstream.
+		:param breadth_first:  `bool` Breadth first instead of depth first.
+		:param prune:  Callable taking a node name, True stops the iteration going past that node.
+		:return:  Generator of node names or None.
+		"""
+		return None
+	# end def iterDependencyGraph():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												nodes
+	# ------------------------------------------------------------------------------------------------------------------
+	def objExists(self, name):
+		raise NotImplementedError
+	# end def objExists():
+
+	def nodeType(self, name):
+		raise NotImplementedError
+	# end def nodeType():
+
+	def nodeTypeExists(self, type_name):
+		"""
+		:param type_name:  `str` Node type, eg; 'blendMatrix'.
+		:return:  `bool` True if nodes of this type can be made, eg; the maya version or a loaded plugin has it.
+		"""
+		raise NotImplementedError
+	# end def nodeTypeExists():
+
+	def ls(self, names=None, type=None):
+		"""
+		:param names:  `List` of nodes to filter, every node in the scene if None. Missing nodes are skipped.
+		:param type:  `str` or `List` of node types to keep, inherited types match.
+		:return:  `List` of names.
+		"""
+		raise NotImplementedError
+	# end def ls():
+
+	def listRelatives(self, name, parent=False, allDescendents=False, shapes=False, type=None):
+		raise NotImplementedError
+	# end def listRelatives():
+
+	def createNode(self, node_type, name=None, parent=None):
+		raise NotImplementedError
+	# end def createNode():
+
+	def delete(self, *names):
+		raise NotImplementedError
+	# end def delete():
+
+	def rename(self, name, new_name):
+		raise NotImplementedError
+	# end def rename():
+
+	def parent(self, child, parent=None, relative=False, shape=False, world=False):
+		raise NotImplementedError
+	# end def parent():
+
+	def select(self, *names, **kwargs):
+		raise NotImplementedError
+	# end def select():
+
+	def lockNode(self, name, lock=True):
+		raise NotImplementedError
+	# end def lockNode():
+
+	def xform(self, target, query=False, translation=None, rotation=None, matrix=None, worldSpace=False):
+		raise NotImplementedError
+	# end def xform():
+
+	def getWorldMatrices(self, names):
+		"""
+		World matrices of many dag nodes in one query.
+		:param names:  `List` of dag node names.
+		:return:  `List` of flat 16 value tuples, in the order of names.
+		"""
+		return [tuple(self.xform(name, query=True, matrix=True, worldSpace=True)) for name in names]
+	# end def getWorldMatrices():
+
+	def getCurvePoints(self, shape):
+		"""
+		Every control point of a nurbsCurve in one query, object space.
+		:param shape:  nurbsCurve shape.
+		:return:  `List` of (x, y, z) tuples.
+		"""
+		raise NotImplementedError
+	# end def getCurvePoints():
+
+	def setCurvePoints(self, shape, points):
+		"""
+		Set control points of a nurbsCurve in one edit, object space.
+		:param shape:  nurbsCurve shape.
+		:param points:  `List` of (x, y, z), one per control point starting at index 0.
+		:return:  None
+		"""
+		raise NotImplementedError
+	# end def setCurvePoints():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												attributes
+	# ------------------------------------------------------------------------------------------------------------------
+	def attributeExists(self, name, attr):
+		raise NotImplementedError
+	# end def attributeExists():
+
+	def attributeType(self, plug, node_type=None):
+		"""
+		Type of an attribute from its definition, the plug is never evaluated. Matrix attributes are 'matrix' whether
+		they are matrix or typed matrix attributes.
+		:param plug:  `str` 'node.attr', elements and child attributes are fine.
+		:param node_type:  `str` Look the attribute up on this node type instead, plug only needs to end with the
+							attribute name. For nodes that don't exist yet, eg; recorded on a GraphModifier.
+		:return:  `str` eg; 'matrix', 'double', 'double3', 'bool', 'enum', 'message'.
+		"""
+		raise NotImplementedError
+	# end def attributeType():
+
+	def listAttr(self, name, userDefined=False):
+		"""
+		:return:  `List` of attribute names.
+		"""
+		raise NotImplementedError
+	# end def listAttr():
+
+	def getAttr(self, plug, **kwargs):
+		raise NotImplementedError
+	# end def getAttr():
+
+	def setAttr(self, plug, *values, **kwargs):
+		"""
+		:param kwargs:  lock, keyable, channelBox, type as in maya.cmds.setAttr, long names only.
+		"""
+		raise NotImplementedError
+	# end def setAttr():
+
+	def addAttr(self, name, **kwargs):
+		raise NotImplementedError
+	# end def addAttr():
+
+	def deleteAttr(self, plug):
+		raise NotImplementedError
+	# end def deleteAttr():
+
+	def connectAttr(self, source, destination, force=False):
+		raise NotImplementedError
+	# end def connectAttr():
+
+	def disconnectAttr(self, source, destination):
+		raise NotImplementedError
+	# end def disconnectAttr():
+
+	def listConnections(self, name, source=True, destination=True, plugs=False, type=None, connections=False):
+		"""
+		:param name:  Node or plug, a plug only lists its own connections.
+		:param connections:  `bool` Return (plug on name, connected plug) pairs instead, plugs is ignored.
+		:return:  `List` of names, plugs or pairs.
+		"""
+		raise NotImplementedError
+	# end def listConnections():
+# end class SceneBackend():
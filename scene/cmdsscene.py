@@ -0,0 +1,167 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	CMDSSCENE.PY
+	Thin maya backend, the string api goes straight to maya.cmds so no PyNodes are built on hot paths.
+	Modules still get pymel through `pm`, it is only imported the first time something asks for it.
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+import importlib
+
+from . import stats
+from .pymelscene import PymelScene, _flags
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+class CmdsScene(PymelScene):
+
+	name = 'cmds'
+
+	def __init__(self):
+		super(CmdsScene, self).__init__()
+		self._cmds = None
+	# end def __init__():
+
+	@property
+	def cmds(self):
+		if self._cmds is None:
+			self._cmds = importlib.import_module('maya.cmds')
+		return self._cmds
+	# end def cmds():
+
+	def _undoEnabled(self):
+		return self.cmds.undoInfo(query=True, state=True)
+	# end def _undoEnabled():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												string api
+	# ------------------------------------------------------------------------------------------------------------------
+	def objExists(self, name):
+		return self.cmds.objExists(str(name))
+	# end def objExists():
+
+	def nodeType(self, name):
+		return self.cmds.nodeType(str(name))
+	# end def nodeType():
+
+	def _queryNodeType(self, type_name):
+		return self.cmds.nodeType(type_name, isTypeName=True, derived=True)
+	# end def _queryNodeType():
+
+	def ls(self, names=None, type=None):
+		if names is not None:
+			if not names:
+				return []
+			return self.cmds.ls([str(n) for n in names], **_flags(type=type)) or []
+		return self.cmds.ls(**_flags(type=type)) or []
+	# end def ls():
+
+	def listRelatives(self, name, parent=False, allDescendents=False, shapes=False, type=None):
+		return self.cmds.listRelatives(
+			str(name), **_flags(parent=parent, allDescendents=allDescendents, shapes=shapes, type=type)) or []
+	# end def listRelatives():
+
+	def createNode(self, node_type, name=None, parent=None):
+		return self.cmds.createNode(node_type, **_flags(name=name, parent=parent and str(parent)))
+	# end def createNode():
+
+	def delete(self, *names):
+		if names:
+			self.cmds.delete([str(n) for n in names])
+	# end def delete():
+
+	def rename(self, name, new_name):
+		return self.cmds.rename(str(name), new_name)
+	# end def rename():
+
+	def parent(self, child, parent=None, relative=False, shape=False, world=False):
+		world = world or parent is None
+		args = [str(child)] if world else [str(child), str(parent)]
+		result = self.cmds.parent(*args, **_flags(relative=relative, shape=shape, world=world))
+		return result[0] if result else str(child)
+	# end def parent():
+
+	def select(self, *names, **kwargs):
+		self.cmds.select([str(n) for n in names], **kwargs)
+	# end def select():
+
+	def lockNode(self, name, lock=True):
+		self.cmds.lockNode(str(name), lock=lock)
+	# end def lockNode():
+
+	def xform(self, target, query=False, translation=None, rotation=None, matrix=None, worldSpace=False):
+		if matrix is not None and matrix is not True:
+			matrix = [float(v) for v in matrix]
+		return self.cmds.xform(str(target), **_flags(
+			query=query, translation=translation, rotation=rotation, matrix=matrix, worldSpace=worldSpace))
+	# end def xform():
+
+	def getCurvePoints(self, shape):
+		count = self.cmds.getAttr('{}.controlPoints'.format(shape), size=True)
+		if not count:
+			return []
+		return self.cmds.getAttr('{}.controlPoints[0:{}]'.format(shape, count - 1))
+	# end def getCurvePoints():
+
+	def setCurvePoints(self, shape, points):
+		if points:
+			flat = [float(v) for point in points for v in point]
+			self.cmds.setAttr('{}.controlPoints[0:{}]'.format(shape, len(points) - 1), *flat)
+			if stats.counter is not None:
+				stats.counter.sets += 1
+	# end def setCurvePoints():
+
+	def attributeExists(self, name, attr):
+		return self.cmds.attributeQuery(attr, node=str(name), exists=True)
+	# end def attributeExists():
+
+	def _queryAttributeType(self, name, **kwargs):
+		return self.cmds.attributeQuery(name, attributeType=True, **kwargs)
+	# end def _queryAttributeType():
+
+	def listAttr(self, name, userDefined=False):
+		return self.cmds.listAttr(str(name), **_flags(userDefined=userDefined)) or []
+	# end def listAttr():
+
+	def getAttr(self, plug, **kwargs):
+		value = self.cmds.getAttr(str(plug), **kwargs)
+		# compound attributes come back as [(x, y, z)]
+		if isinstance(value, list) and len(value) == 1 and isinstance(value[0], tuple):
+			return value[0]
+		return value
+	# end def getAttr():
+
+	def setAttr(self, plug, *values, **kwargs):
+		self.cmds.setAttr(str(plug), *values, **kwargs)
+		if values and stats.counter is not None:
+			stats.counter.sets += 1
+	# end def setAttr():
+
+	def addAttr(self, name, **kwargs):
+		self.cmds.addAttr(str(name), **kwargs)
+	# end def addAttr():
+
+	def deleteAttr(self, plug):
+		self.cmds.deleteAttr(str(plug))
+	# end def deleteAttr():
+
+	def connectAttr(self, source, destination, force=False):
+		self.cmds.connectAttr(str(source), str(destination), force=force)
+	# end def connectAttr():
+
+	def disconnectAttr(self, source, destination):
+		self.cmds.disconnectAttr(str(source), str(destination))
+	# end def disconnectAttr():
+
+	def listConnections(self, name, source=True, destination=True, plugs=False, type=None, connections=False):
+		if connections:
+			flat = self.cmds.listConnections(
+				str(name), source=source, destination=destination, plugs=True, connections=True,
+				**_flags(type=type)) or []
+			return list(zip(flat[::2], flat[1::2]))
+		return self.cmds.listConnections(
+			str(name), source=source, destination=destination, plugs=plugs, **_flags(type=type)) or []
+	# end def listConnections():
+# end class CmdsScene():
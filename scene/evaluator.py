@@ -0,0 +1,786 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	EVALUATOR.PY
+	Offline evaluation of built rig networks, no maya required. The graph driving some output plugs is read once
+	through the scene backend string api, then evaluated with numpy for a whole batch of poses in one go:
+
+		ev = evaluator.GraphEvaluator(
+			['L_arm_output.RB_Output[2]'], inputs=['L_arm_ik_ctrl.translate', 'L_arm_ik_ctrl.stretch'])
+		result = ev.evaluate({'L_arm_ik_ctrl.translate': poses})	# poses is an (N, 3) array
+		result['L_arm_output.RB_Output[2]']							# (N, 4, 4) array
+
+	Values are batched along their leading axes: scalars are (N,), compounds (N, 3) and matrices (N, 4, 4), row
+	major with row vectors like maya. Angles are degrees, the same as getAttr. Inputs that aren't given keep their
+	scene value, which is broadcast against the batch.
+
+	Attribute definitions come from scene.schema, node types need an entry in NODE_FUNCTIONS or be transforms.
+	Transform pivots are ignored, the same as the memory scene.
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+import collections
+import functools
+import re
+
+from . import getBackend, mmath, schema
+from .optimize import PURE_NODES
+
+
+class EvaluatorException(Exception):
+	pass
+
+
+ROTATE_ORDERS = ('xyz', 'yzx', 'zxy', 'xzy', 'yxz', 'zyx')
+
+_DAG_MATRICES = ('matrix', 'xformMatrix', 'inverseMatrix', 'worldMatrix', 'worldInverseMatrix', 'parentMatrix',
+				 'parentInverseMatrix')
+
+_COMPONENT = re.compile(r'^(\w+)(\[\d+\])?$')
+_ELEMENT = re.compile(r'^(\w+)\[(\d+)\]')
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# 												MATH
+# ----------------------------------------------------------------------------------------------------------------------
+def _numpy():
+	np = mmath.numpyModule()
+	if np is None:
+		raise EvaluatorException('--numpy is required to evaluate rig networks.')
+	return np
+# end def _numpy():
+
+
+def _enum(np, value):
+	"""
+	Enum and bool inputs pick code paths, they have to be the same for the whole batch.
+	"""
+	value = np.asarray(value)
+	first = value.flat[0]
+	if value.size > 1 and not (value == first).all():
+		raise EvaluatorException('--Enum inputs can not change across a batch.')
+	return int(round(first))
+# end def _enum():
+
+
+def _identity(np, shape=()):
+	return np.broadcast_to(np.eye(4), tuple(shape) + (4, 4))
+# end def _identity():
+
+
+def _axisRotation(np, axis, degrees):
+	"""
+	Row vector rotation matrices about one axis.
+	:return:  (..., 3, 3) array.
+	"""
+	radians = np.radians(degrees)
+	c, s = np.cos(radians), np.sin(radians)
+	m = np.zeros(np.shape(degrees) + (3, 3))
+	i, j = [(1, 2), (2, 0), (0, 1)][axis]
+	m[..., axis, axis] = 1.0
+	m[..., i, i] = c
+	m[..., j, j] = c
+	m[..., i, j] = s
+	m[..., j, i] = -s
+	return m
+# end def _axisRotation():
+
+
+def eulerToMatrix(np, rotate, order=0):
+	"""
+	:param rotate:  (..., 3) euler angles in degrees.
+	:param order:  `int` Index in ROTATE_ORDERS.
+	:return:  (..., 3, 3) rotation matrices.
+	"""
+	rotate = np.asarray(rotate, dtype=float)
+	axes = ['xyz'.index(a) for a in ROTATE_ORDERS[order]]
+	matrices = [_axisRotation(np, axis, rotate[..., axis]) for axis in axes]
+	return np.matmul(np.matmul(matrices[0], matrices[1]), matrices[2])
+# end def eulerToMatrix():
+
+
+def matrixToEuler(np, rotation, order=0):
+	"""
+	:param rotation:  (..., 3, 3) rotation matrices without scale.
+	:param order:  `int` Index in ROTATE_ORDERS.
+	:return:  (..., 3) euler angles in degrees.
+	"""
+	axes = ['xyz'.index(a) for a in ROTATE_ORDERS[order]]
+	# other orders are xyz in a permuted frame, odd permutations flip the rotation direction
+	r = rotation[..., axes, :][..., :, axes]
+	sign = 1.0 if ROTATE_ORDERS[order] in ('xyz', 'yzx', 'zxy') else -1.0
+
+	ry = np.arcsin(np.clip(-r[..., 0, 2], -1.0, 1.0))
+	gimbal = np.abs(np.cos(ry)) <= 1e-9
+	rx = np.where(gimbal, np.arctan2(-r[..., 2, 1], r[..., 1, 1]), np.arctan2(r[..., 1, 2], r[..., 2, 2]))
+	rz = np.where(gimbal, 0.0, np.arctan2(r[..., 0, 1], r[..., 0, 0]))
+
+	rotate = np.empty(np.shape(rx) + (3,))
+	for axis, angle in zip(axes, (rx, ry, rz)):
+		rotate[..., axis] = np.degrees(angle) * sign
+	return rotate
+# end def matrixToEuler():
+
+
+def quatToMatrix(np, quat):
+	"""
+	:param quat:  (..., 4) x, y, z, w quaternions.
+	:return:  (..., 3, 3) row vector rotation matrices.
+	"""
+	quat = np.asarray(quat, dtype=float)
+	quat = quat / np.linalg.norm(quat, axis=-1)[..., None]
+	x, y, z, w = [quat[..., i] for i in range(4)]
+	m = np.empty(np.shape(x) + (3, 3))
+	m[..., 0, 0] = 1.0 - 2.0 * (y * y + z * z)
+	m[..., 0, 1] = 2.0 * (x * y + z * w)
+	m[..., 0, 2] = 2.0 * (x * z - y * w)
+	m[..., 1, 0] = 2.0 * (x * y - z * w)
+	m[..., 1, 1] = 1.0 - 2.0 * (x * x + z * z)
+	m[..., 1, 2] = 2.0 * (y * z + x * w)
+	m[..., 2, 0] = 2.0 * (x * z + y * w)
+	m[..., 2, 1] = 2.0 * (y * z - x * w)
+	m[..., 2, 2] = 1.0 - 2.0 * (x * x + y * y)
+	return m
+# end def quatToMatrix():
+
+
+def matrixToQuat(np, rotation):
+	"""
+	:param rotation:  (..., 3, 3) rotation matrices without scale.
+	:return:  (..., 4) x, y, z, w quaternions.
+	"""
+	r = rotation
+	d0, d1, d2 = r[..., 0, 0], r[..., 1, 1], r[..., 2, 2]
+	quat = np.empty(np.shape(d0) + (4,))
+	quat[..., 0] = 0.5 * np.sqrt(np.maximum(0.0, 1.0 + d0 - d1 - d2)) * np.sign(r[..., 1, 2] - r[..., 2, 1])
+	quat[..., 1] = 0.5 * np.sqrt(np.maximum(0.0, 1.0 - d0 + d1 - d2)) * np.sign(r[..., 2, 0] - r[..., 0, 2])
+	quat[..., 2] = 0.5 * np.sqrt(np.maximum(0.0, 1.0 - d0 - d1 + d2)) * np.sign(r[..., 0, 1] - r[..., 1, 0])
+	quat[..., 3] = 0.5 * np.sqrt(np.maximum(0.0, 1.0 + d0 + d1 + d2))
+	return quat
+# end def matrixToQuat():
+
+
+def composeMatrix(np, translate=None, rotation=None, scale=None, shear=None):
+	"""
+	scale * shear * rotation * translate.
+	:param translate:  (..., 3)
+	:param rotation:  (..., 3, 3) rotation matrices.
+	:param scale:  (..., 3)
+	:param shear:  (..., 3) xy, xz, yz.
+	:return:  (..., 4, 4) matrices.
+	"""
+	upper = np.eye(3) if rotation is None else np.asarray(rotation, dtype=float)
+	if shear is not None:
+		shear = np.asarray(shear, dtype=float)
+		shear_matrix = np.zeros(shear.shape[:-1] + (3, 3))
+		shear_matrix[..., [0, 1, 2], [0, 1, 2]] = 1.0
+		shear_matrix[..., 1, 0] = shear[..., 0]
+		shear_matrix[..., 2, 0] = shear[..., 1]
+		shear_matrix[..., 2, 1] = shear[..., 2]
+		upper = np.matmul(shear_matrix, upper)
+	if scale is not None:
+		upper = np.asarray(scale, dtype=float)[..., :, None] * upper
+	if translate is None:
+		translate = np.zeros(3)
+	translate = np.asarray(translate, dtype=float)
+
+	shape = np.broadcast(upper[..., 0, 0], translate[..., 0]).shape
+	m = np.zeros(shape + (4, 4))
+	m[..., :3, :3] = upper
+	m[..., 3, :3] = translate
+	m[..., 3, 3] = 1.0
+	return m
+# end def composeMatrix():
+
+
+def decomposeMatrix(np, matrix):
+	"""
+	Split matrices into translate, rotation, scale and shear, the inverse of composeMatrix(). Rows are made
+	orthogonal in x, y, z order like maya, what is taken off a row is its shear.
+	:param matrix:  (..., 4, 4)
+	:return:  (translate (..., 3), rotation (..., 3, 3), scale (..., 3), shear (..., 3))
+	"""
+	matrix = np.asarray(matrix, dtype=float)
+	rows = matrix[..., :3, :3]
+	safe = lambda value: np.where(value == 0.0, 1.0, value)
+	dot = lambda a, b: np.sum(a * b, axis=-1)
+
+	x, y, z = rows[..., 0, :], rows[..., 1, :], rows[..., 2, :]
+	scale_x = np.linalg.norm(x, axis=-1) * np.where(np.linalg.det(rows) < 0.0, -1.0, 1.0)
+	axis_x = x / safe(scale_x)[..., None]
+
+	xy = dot(y, axis_x)
+	y = y - xy[..., None] * axis_x
+	scale_y = np.linalg.norm(y, axis=-1)
+	axis_y = y / safe(scale_y)[..., None]
+
+	xz, yz = dot(z, axis_x), dot(z, axis_y)
+	z = z - xz[..., None] * axis_x - yz[..., None] * axis_y
+	scale_z = np.linalg.norm(z, axis=-1)
+	axis_z = z / safe(scale_z)[..., None]
+
+	rotation = np.stack([axis_x, axis_y, axis_z], axis=-2)
+	scale = np.stack([scale_x, scale_y, scale_z], axis=-1)
+	shear = np.stack([xy / safe(scale_y), xz / safe(scale_z), yz / safe(scale_z)], axis=-1)
+	return matrix[..., 3, :3], rotation, scale, shear
+# end def decomposeMatrix():
+
+
+def _slerp(np, q0, q1, weight):
+	dot = np.sum(q0 * q1, axis=-1)
+	q1 = np.where((dot < 0.0)[..., None], -q1, q1)
+	dot = np.abs(dot)
+	angle = np.arccos(np.clip(dot, -1.0, 1.0))
+	sin = np.sin(angle)
+	close = sin < 1e-9
+	safe = np.where(close, 1.0, sin)
+	w0 = np.where(close, 1.0 - weight, np.sin((1.0 - weight) * angle) / safe)
+	w1 = np.where(close, weight, np.sin(weight * angle) / safe)
+	return w0[..., None] * q0 + w1[..., None] * q1
+# end def _slerp():
+
+
+def blendMatrices(
+		np, matrix_a, matrix_b, translate_weight, rotate_weight=None, scale_weight=None, shear_weight=None):
+	"""
+	Blend matrices the way a blendMatrix node does, translate, scale and shear are interpolated and rotation
+	slerped.
+	:param matrix_a:  (..., 4, 4) matrices at weight 0.
+	:param matrix_b:  (..., 4, 4) matrices at weight 1.
+	:param translate_weight:  (...) weights, rotate_weight, scale_weight and shear_weight are the same if None.
+	:return:  (..., 4, 4) matrices.
+	"""
+	rotate_weight = translate_weight if rotate_weight is None else rotate_weight
+	scale_weight = translate_weight if scale_weight is None else scale_weight
+	shear_weight = translate_weight if shear_weight is None else shear_weight
+
+	translate_a, rotation_a, scale_a, shear_a = decomposeMatrix(np, matrix_a)
+	translate_b, rotation_b, scale_b, shear_b = decomposeMatrix(np, matrix_b)
+	lerp = lambda a, b, w: a + (b - a) * np.asarray(w)[..., None]
+	return composeMatrix(
+		np,
+		lerp(translate_a, translate_b, translate_weight),
+		quatToMatrix(np, _slerp(np, matrixToQuat(np, rotation_a), matrixToQuat(np, rotation_b), rotate_weight)),
+		lerp(scale_a, scale_b, scale_weight),
+		lerp(shear_a, shear_b, shear_weight))
+# end def blendMatrices():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# 												NODE FUNCTIONS
+# ----------------------------------------------------------------------------------------------------------------------
+def _elements(inputs, multi, child=''):
+	"""
+	Values of a multi attribute, in index order.
+	"""
+	found = []
+	for attr, value in inputs.items():
+		match = _ELEMENT.match(attr)
+		if match is not None and match.group(1) == multi and attr[match.end():] == child:
+			found.append((int(match.group(2)), value))
+	return [value for _, value in sorted(found, key=lambda item: item[0])]
+# end def _elements():
+
+
+def _multMatrix(np, inputs):
+	matrices = _elements(inputs, 'matrixIn')
+	if not matrices:
+		return {'matrixSum': np.eye(4)}
+	return {'matrixSum': functools.reduce(np.matmul, matrices)}
+# end def _multMatrix():
+
+
+def _wtAddMatrix(np, inputs):
+	matrices = _elements(inputs, 'wtMatrix', '.matrixIn')
+	weights = _elements(inputs, 'wtMatrix', '.weightIn')
+	result = np.zeros((4, 4))
+	for matrix, weight in zip(matrices, weights):
+		result = result + np.asarray(weight)[..., None, None] * matrix
+	return {'matrixSum': result}
+# end def _wtAddMatrix():
+
+
+def _inverseMatrix(np, inputs):
+	return {'outputMatrix': np.linalg.inv(inputs['inputMatrix'])}
+# end def _inverseMatrix():
+
+
+def _transposeMatrix(np, inputs):
+	return {'outputMatrix': np.swapaxes(inputs['inputMatrix'], -1, -2)}
+# end def _transposeMatrix():
+
+
+def _decomposeMatrix(np, inputs):
+	translate, rotation, scale, shear = decomposeMatrix(np, inputs['inputMatrix'])
+	return {
+		'outputTranslate': translate,
+		'outputRotate': matrixToEuler(np, rotation, _enum(np, inputs['inputRotateOrder'])),
+		'outputScale': scale,
+		'outputShear': shear,
+		'outputQuat': matrixToQuat(np, rotation),
+	}
+# end def _decomposeMatrix():
+
+
+def _composeMatrix(np, inputs):
+	if _enum(np, inputs['useEulerRotation']):
+		rotation = eulerToMatrix(np, inputs['inputRotate'], _enum(np, inputs['inputRotateOrder']))
+	else:
+		rotation = quatToMatrix(np, inputs['inputQuat'])
+	return {'outputMatrix': composeMatrix(
+		np, inputs['inputTranslate'], rotation, inputs['inputScale'], inputs['inputShear'])}
+# end def _composeMatrix():
+
+
+def _fourByFourMatrix(np, inputs):
+	values = [inputs['in{}{}'.format(r, c)] for r in range(4) for c in range(4)]
+	values = np.stack(np.broadcast_arrays(*values), axis=-1)
+	return {'output': values.reshape(values.shape[:-1] + (4, 4))}
+# end def _fourByFourMatrix():
+
+
+def _pickMatrix(np, inputs):
+	translate, rotation, scale, shear = decomposeMatrix(np, inputs['inputMatrix'])
+	return {'outputMatrix': composeMatrix(
+		np,
+		translate if _enum(np, inputs['useTranslate']) else None,
+		rotation if _enum(np, inputs['useRotate']) else None,
+		scale if _enum(np, inputs['useScale']) else None,
+		shear if _enum(np, inputs['useShear']) else None)}
+# end def _pickMatrix():
+
+
+def _blendMatrix(np, inputs):
+	result = inputs['inputMatrix']
+	envelope = np.asarray(inputs['envelope'])
+	for index in range(len(_elements(inputs, 'target', '.targetMatrix'))):
+		target = dict(
+			(attr, _elements(inputs, 'target', '.' + attr)[index]) for attr in
+			('targetMatrix', 'useMatrix', 'weight', 'scaleWeight', 'translateWeight', 'rotateWeight', 'shearWeight'))
+		if _enum(np, target['useMatrix']):
+			raise EvaluatorException('--blendMatrix targets with useMatrix are not supported.')
+		weight = envelope * target['weight']
+		result = blendMatrices(
+			np, result, target['targetMatrix'], weight * target['translateWeight'],
+			weight * target['rotateWeight'], weight * target['scaleWeight'], weight * target['shearWeight'])
+	return {'outputMatrix': result}
+# end def _blendMatrix():
+
+
+def _vectorProduct(np, inputs):
+	operation = _enum(np, inputs['operation'])
+	normalize = _enum(np, inputs['normalizeOutput'])
+	input1, input2 = inputs['input1'], inputs['input2']
+
+	def unit(vector):
+		length = np.linalg.norm(vector, axis=-1)[..., None]
+		return vector / np.where(length == 0.0, 1.0, length)
+	# end def unit():
+
+	if operation == 1:
+		if normalize:
+			input1, input2 = unit(input1), unit(input2)
+		dot = np.sum(input1 * input2, axis=-1)
+		return {'output': np.stack([dot, dot, dot], axis=-1)}
+
+	if operation == 0:
+		output = np.asarray(input1)
+	elif operation == 2:
+		output = np.cross(*np.broadcast_arrays(input1, input2))
+	else:
+		matrix = np.asarray(inputs['matrix'])
+		output = np.matmul(np.asarray(input1)[..., None, :], matrix[..., :3, :3])[..., 0, :]
+		if operation == 4:
+			output = output + matrix[..., 3, :3]
+	return {'output': unit(output) if normalize else output}
+# end def _vectorProduct():
+
+
+def _plusMinusAverage(np, inputs):
+	operation = _enum(np, inputs['operation'])
+	outputs = {}
+	for multi, output, shape in [('input1D', 'output1D', ()), ('input2D', 'output2D', (2,)),
+								 ('input3D', 'output3D', (3,))]:
+		values = _elements(inputs, multi)
+		if not values:
+			outputs[output] = np.zeros(shape)
+		elif operation == 0:
+			outputs[output] = values[0]
+		elif operation == 2:
+			outputs[output] = values[0] - sum(values[1:], np.zeros(shape))
+		else:
+			outputs[output] = sum(values, np.zeros(shape))
+			if operation == 3:
+				outputs[output] = outputs[output] / float(len(values))
+	return outputs
+# end def _plusMinusAverage():
+
+
+def _multiplyDivide(np, inputs):
+	operation = _enum(np, inputs['operation'])
+	input1, input2 = np.asarray(inputs['input1']), np.asarray(inputs['input2'])
+	if operation == 0:
+		output = input1
+	elif operation == 1:
+		output = input1 * input2
+	elif operation == 2:
+		output = input1 / input2
+	else:
+		output = np.power(input1, input2)
+	return {'output': output}
+# end def _multiplyDivide():
+
+
+def _clamp(np, inputs):
+	value, low, high = inputs['input'], inputs['min'], inputs['max']
+	return {'output': np.where(value < low, low, np.where(value > high, high, value))}
+# end def _clamp():
+
+
+def _blendTwoAttr(np, inputs):
+	values = _elements(inputs, 'input')
+	if not values:
+		return {'output': np.zeros(())}
+	if len(values) == 1:
+		return {'output': values[0]}
+	blender = inputs['attributesBlender']
+	return {'output': values[0] * (1.0 - blender) + values[1] * blender}
+# end def _blendTwoAttr():
+
+
+def _animBlendNodeAdditive(np, inputs):
+	if _enum(np, inputs['accumulationMode']):
+		raise EvaluatorException('--Only additive animBlend accumulation is supported.')
+	return {'output': inputs['inputA'] * inputs['weightA'] + inputs['inputB'] * inputs['weightB']}
+# end def _animBlendNodeAdditive():
+
+
+def _distanceBetween(np, inputs):
+	points = []
+	for point, matrix in [('point1', 'inMatrix1'), ('point2', 'inMatrix2')]:
+		matrix = np.asarray(inputs[matrix])
+		position = np.matmul(np.asarray(inputs[point])[..., None, :], matrix[..., :3, :3])[..., 0, :]
+		points.append(position + matrix[..., 3, :3])
+	return {'distance': np.linalg.norm(points[1] - points[0], axis=-1)}
+# end def _distanceBetween():
+
+
+# node type: function(numpy, {input attribute: value}) -> {output attribute: value}, inputs are listed in PURE_NODES
+NODE_FUNCTIONS = {
+	'addDoubleLinear': lambda np, i: {'output': i['input1'] + i['input2']},
+	'animBlendNodeAdditiveDA': _animBlendNodeAdditive,
+	'blendMatrix': _blendMatrix,
+	'blendTwoAttr': _blendTwoAttr,
+	'clamp': _clamp,
+	'composeMatrix': _composeMatrix,
+	'decomposeMatrix': _decomposeMatrix,
+	'distanceBetween': _distanceBetween,
+	'fourByFourMatrix': _fourByFourMatrix,
+	'inverseMatrix': _inverseMatrix,
+	'math_Acos': lambda np, i: {'output': np.degrees(np.arccos(np.clip(i['input'], -1.0, 1.0)))},
+	'multDoubleLinear': lambda np, i: {'output': i['input1'] * i['input2']},
+	'multMatrix': _multMatrix,
+	'multiplyDivide': _multiplyDivide,
+	'pickMatrix': _pickMatrix,
+	'plusMinusAverage': _plusMinusAverage,
+	'reverse': lambda np, i: {'output': 1.0 - np.asarray(i['input'])},
+	'transposeMatrix': _transposeMatrix,
+	'vectorProduct': _vectorProduct,
+	'wtAddMatrix': _wtAddMatrix,
+}
+
+
+def _localMatrix(np, joint, translate, rotate, rotate_order, scale, shear, rotate_axis, joint_orient=None,
+				 inverse_scale=None, scale_compensate=None):
+	rotation = eulerToMatrix(np, rotate, _enum(np, rotate_order))
+	rotation = np.matmul(eulerToMatrix(np, rotate_axis), rotation)
+	if joint:
+		rotation = np.matmul(rotation, eulerToMatrix(np, joint_orient))
+		if _enum(np, scale_compensate):
+			rotation = rotation / np.asarray(inverse_scale)[..., None, :]
+	return composeMatrix(np, translate, rotation, scale, shear)
+# end def _localMatrix():
+
+
+def _worldMatrix(np, local, offset, inherits, parent=None):
+	world = np.matmul(local, offset)
+	if parent is None:
+		return world
+	return np.where(np.asarray(inherits, dtype=bool)[..., None, None], np.matmul(world, parent), world)
+# end def _worldMatrix():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+class GraphEvaluator(object):
+
+	def __init__(self, outputs, inputs=None):
+		"""
+		Read the graph driving outputs from the scene.
+		:param outputs:  `List` of plugs to evaluate.
+		:param inputs:  `List` of plugs to vary, eg; control channels. Inputs override incoming connections so
+						they can also cut the graph, eg; at a module input.
+		"""
+		self.np = _numpy()
+		self.backend = getBackend()
+
+		self._types = {}
+		self._parents = {}
+		self._slots = {}
+		self._steps = []
+		self._compiling = set()
+
+		self.inputs = collections.OrderedDict()
+		for plug in inputs or []:
+			self.inputs[self._normalize(plug)] = None
+		for plug in self.inputs:
+			self._compile(plug)
+
+		self.outputs = collections.OrderedDict((self._normalize(plug), None) for plug in outputs)
+		for plug in self.outputs:
+			self.outputs[plug] = self._compile(plug)
+
+		# shapes without batch axes, from the scene values
+		results = self._run({})
+		self._shapes = dict(
+			(plug, self.np.shape(results[slot]))
+			for plugs in (self.inputs, self.outputs) for plug, slot in plugs.items())
+	# end def __init__():
+
+	def __len__(self):
+		return len(self._steps)
+	# end def __len__():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												evaluation
+	# ------------------------------------------------------------------------------------------------------------------
+	def evaluate(self, values=None):
+		"""
+		Evaluate outputs for a batch of input values.
+		:param values:  `Dict` of input plug: array of values, batched along leading axes, eg; (N, 3) for N
+						translations. Inputs not given keep their scene value.
+		:return:  `OrderedDict` of output plug: array, with the batch shape of the inputs.
+		"""
+		np = self.np
+		overrides = {}
+		batch = ()
+		for plug, value in (values or {}).items():
+			normalized = self._normalize(plug)
+			if normalized not in self.inputs:
+				raise EvaluatorException('--Not an input of this evaluator: {}'.format(plug))
+			value = np.asarray(value, dtype=float)
+			rank = len(self._shapes[normalized])
+			if value.shape[value.ndim - rank:] != self._shapes[normalized]:
+				raise EvaluatorException('--Values of {} need a shape ending in {}'.format(
+					plug, self._shapes[normalized]))
+			value_batch = value.shape[:value.ndim - rank]
+			if batch and value_batch and value_batch != batch:
+				raise EvaluatorException('--Input batch shapes differ: {} and {}'.format(batch, value_batch))
+			batch = batch or value_batch
+			overrides[self.inputs[normalized]] = value
+
+		results = self._run(overrides)
+		outputs = collections.OrderedDict()
+		for plug, slot in self.outputs.items():
+			outputs[plug] = np.array(np.broadcast_to(results[slot], batch + self._shapes[plug]))
+		return outputs
+	# end def evaluate():
+
+	def _run(self, overrides):
+		"""
+		:param overrides:  `Dict` of slot: value used instead of computing it.
+		:return:  `List` of slot values.
+		"""
+		results = [None] * len(self._steps)
+		for slot, (function, args) in enumerate(self._steps):
+			if slot in overrides:
+				results[slot] = overrides[slot]
+			else:
+				results[slot] = function(*[results[arg] for arg in args])
+		return results
+	# end def _run():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												compile
+	# ------------------------------------------------------------------------------------------------------------------
+	def _step(self, function, *args):
+		self._steps.append((function, args))
+		return len(self._steps) - 1
+	# end def _step():
+
+	def _constant(self, value):
+		return self._step(lambda: value)
+	# end def _constant():
+
+	def _nodeType(self, node):
+		if node not in self._types:
+			node_type = self.backend.nodeType(node)
+			self._types[node] = schema.NODE_TYPES.get(node_type)
+		return self._types[node]
+	# end def _nodeType():
+
+	def _spec(self, node, attr):
+		node_type = self._nodeType(node)
+		if node_type is None:
+			return None
+		match = _COMPONENT.match(attr.split('.')[-1])
+		return node_type.attr(match.group(1)) if match else None
+	# end def _spec():
+
+	def _normalize(self, plug):
+		"""
+		Long attribute names, the names connections are listed with.
+		"""
+		node, path = str(plug).split('.', 1)
+		node_type = self._nodeType(node)
+		if node_type is None:
+			return str(plug)
+		components = []
+		for component in path.split('.'):
+			match = _COMPONENT.match(component)
+			spec = node_type.attr(match.group(1)) if match else None
+			components.append(spec.name + (match.group(2) or '') if spec is not None else component)
+		return '{}.{}'.format(node, '.'.join(components))
+	# end def _normalize():
+
+	def _compile(self, plug, up=True, cut=True):
+		"""
+		Slot computing a plug, steps it depends on are added first.
+		:param up:  `bool` Child plugs may take their value from their parent.
+		:param cut:  `bool` Inputs of the evaluator stop the graph, False to compile what drives the input.
+		"""
+		if cut and plug in self.inputs:
+			# the scene value of an input is overridden when evaluating
+			if self.inputs[plug] is None:
+				self.inputs[plug] = self._compile(plug, cut=False)
+			return self.inputs[plug]
+		if plug in self._slots:
+			return self._slots[plug]
+		if plug in self._compiling:
+			raise EvaluatorException('--Cycle in graph at: {}'.format(plug))
+		self._compiling.add(plug)
+		try:
+			slot = self._compilePlug(plug, up)
+		finally:
+			self._compiling.discard(plug)
+		self._slots[plug] = slot
+		return slot
+	# end def _compile():
+
+	def _compilePlug(self, plug, up):
+		np = self.np
+		sources = self.backend.listConnections(plug, destination=False, plugs=True)
+		if sources:
+			return self._compile(self._normalize(sources[0]))
+
+		node, attr = plug.split('.', 1)
+		spec = self._spec(node, attr)
+
+		if up and spec is not None and spec.parent is not None:
+			# children take their value from a parent that is computed, connected or an input
+			parent = '{}.{}'.format(node, attr.rsplit('.', 1)[0] if '.' in attr else spec.parent.name)
+			if spec.output or parent in self.inputs or self._isConnected(parent):
+				index = spec.parent.children.index(spec)
+				parent_slot = self._compile(parent)
+				return self._step(lambda value: np.asarray(value)[..., index], parent_slot)
+
+		if spec is not None and spec.output:
+			node_type = self._nodeType(node)
+			if node_type.transform and spec.name in _DAG_MATRICES:
+				return self._compileDag(node, spec.name)
+			if node_type.name in NODE_FUNCTIONS:
+				node_slot = self._compileNode(node)
+				return self._step(lambda outputs: outputs[spec.name], node_slot)
+			raise EvaluatorException('--No evaluator for node type: {}'.format(node_type.name))
+
+		if spec is not None and spec.children:
+			children = [
+				self._compile('{}.{}'.format(node, self._childPath(attr, child)), up=False) for child in spec.children]
+			return self._step(lambda *values: np.stack(np.broadcast_arrays(*values), axis=-1), *children)
+
+		value = self.backend.getAttr(plug)
+		if isinstance(value, (list, tuple)):
+			value = np.array(value, dtype=float)
+			if value.size == 16:
+				value = value.reshape(4, 4)
+		elif isinstance(value, (bool, int, float)):
+			value = np.array(float(value))
+		else:
+			raise EvaluatorException('--Can not evaluate plug: {}'.format(plug))
+		return self._constant(value)
+	# end def _compilePlug():
+
+	def _isConnected(self, plug):
+		# connections are listed for children too, only ones to the plug itself count
+		connections = self.backend.listConnections(plug, destination=False, plugs=True, connections=True)
+		return any(self._normalize(destination) == plug for destination, _ in connections)
+	# end def _isConnected():
+
+	@staticmethod
+	def _childPath(attr, child):
+		# children of plain compounds are named on their own, eg; translateX, elements keep their parent path
+		if '[' in attr or '.' in attr:
+			return '{}.{}'.format(attr, child.name)
+		return child.name
+	# end def _childPath():
+
+	def _compileNode(self, node):
+		key = node + '.'
+		if key in self._slots:
+			return self._slots[key]
+
+		attrs = []
+		for attr in PURE_NODES[self._nodeType(node).name]:
+			if '[*]' not in attr:
+				attrs.append(attr)
+				continue
+			multi, child = attr.split('[*]', 1)
+			indices = set(self.backend.getAttr('{}.{}'.format(node, multi), multiIndices=True) or [])
+			for connected in self.backend.listConnections(node, destination=False, plugs=True, connections=True):
+				match = _ELEMENT.match(connected[0].split('.', 1)[1])
+				if match is not None and match.group(1) == multi:
+					indices.add(int(match.group(2)))
+			attrs += ['{}[{}]{}'.format(multi, i, child) for i in sorted(indices)]
+
+		slots = [self._compile('{}.{}'.format(node, attr)) for attr in attrs]
+		function = NODE_FUNCTIONS[self._nodeType(node).name]
+		np = self.np
+		slot = self._step(lambda *values: function(np, dict(zip(attrs, values))), *slots)
+		self._slots[key] = slot
+		return slot
+	# end def _compileNode():
+
+	def _compileDag(self, node, name):
+		np = self.np
+		if name in ('matrix', 'xformMatrix'):
+			joint = self._nodeType(node).isA('joint')
+			attrs = ['translate', 'rotate', 'rotateOrder', 'scale', 'shear', 'rotateAxis']
+			if joint:
+				attrs += ['jointOrient', 'inverseScale', 'segmentScaleCompensate']
+			slots = [self._compile('{}.{}'.format(node, attr)) for attr in attrs]
+			return self._step(lambda *values: _localMatrix(np, joint, *values), *slots)
+
+		if name == 'inverseMatrix':
+			return self._step(np.linalg.inv, self._compile(node + '.matrix'))
+		if name == 'worldInverseMatrix':
+			return self._step(np.linalg.inv, self._compile(node + '.worldMatrix[0]'))
+		if name == 'parentInverseMatrix':
+			return self._step(np.linalg.inv, self._compile(node + '.parentMatrix[0]'))
+
+		if node not in self._parents:
+			parents = self.backend.listRelatives(node, parent=True)
+			self._parents[node] = parents[0] if parents else None
+		parent = self._parents[node]
+
+		if name == 'parentMatrix':
+			if parent is None:
+				return self._constant(np.eye(4))
+			return self._compile(parent + '.worldMatrix[0]')
+
+		args = [self._compile(node + '.matrix'), self._compile(node + '.offsetParentMatrix'),
+				self._compile(node + '.inheritsTransform')]
+		if parent is not None:
+			args.append(self._compile(parent + '.worldMatrix[0]'))
+		return self._step(lambda *values: _worldMatrix(np, *values), *args)
+	# end def _compileDag():
+# end class GraphEvaluator():
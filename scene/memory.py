@@ -0,0 +1,1157 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	MEMORY.PY
+	Pure python in-memory stand-in for a maya scene. Stores nodes, dag hierarchy, attribute values and
+	connections so rigbot can build, and be timed, headless. Exposes a maya.cmds like string api.
+
+	Only what rigbot needs is modelled: dag/world matrices are computed from transform attributes, every other
+	output attribute simply returns its stored value.
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+import fnmatch
+import math
+import re
+
+from . import schema, mmath, stats
+
+
+class MemorySceneError(RuntimeError):
+	pass
+
+
+class MayaNodeError(MemorySceneError):
+	pass
+
+
+class MayaAttributeError(MemorySceneError, AttributeError):
+	pass
+
+
+class MayaAttributeEnumError(MayaAttributeError):
+	pass
+
+
+_TOKEN = re.compile(r'^([A-Za-z_][A-Za-z0-9_]*)(?:\[(\d+)\])?$')
+_TRAILING_DIGITS = re.compile(r'(\d*)$')
+_COMPONENT = re.compile(r'^(.+)\.(cv|ep)\[(\d+)\]$')
+
+_DAG_MATRICES = ('matrix', 'inverseMatrix', 'worldMatrix', 'worldInverseMatrix', 'parentMatrix',
+				'parentInverseMatrix', 'xformMatrix')
+
+# plug key prefixes localMatrix() and worldMatrix() read, edits to them dirty cached world matrices
+_LOCAL_ATTRS = ('translate', 'rotate', 'scale', 'jointOrient', 'offsetParentMatrix', 'inheritsTransform')
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+class MNode(object):
+	"""
+	Single node record. Everything is keyed by canonical plug key (see MemoryScene.plugKey).
+	"""
+
+	__slots__ = (
+		'name', 'type', 'lookup', 'dynamic', 'parent', 'children', 'values', 'locked', 'flags', 'indices',
+		'inputs', 'outputs', 'nodeLocked', 'members', 'alive'
+	)
+
+	def __init__(self, name, node_type):
+		self.name = name
+		self.type = node_type
+		self.lookup = node_type.lookup
+		self.dynamic = []
+		self.parent = None
+		self.children = []
+		self.values = {}
+		self.locked = set()
+		self.flags = {}
+		self.indices = {}
+		self.inputs = {}
+		self.outputs = {}
+		self.nodeLocked = False
+		self.members = None
+		self.alive = True
+	# end def __init__():
+
+	def __repr__(self):
+		return 'MNode({})'.format(self.name)
+	# end def __repr__():
+# end class MNode():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+class MemoryScene(object):
+
+	def __init__(self):
+		self.nodes = []
+		self._byName = {}
+		self._selection = []
+		self._keyCache = {}
+		self._callbacks = {}
+		self._callbackId = 0
+		# MNode: world matrix, see worldMatrix()
+		self._worldCache = {}
+	# end def __init__():
+
+	def __len__(self):
+		return len(self.nodes)
+	# end def __len__():
+
+	def clear(self):
+		"""
+		Empty the scene, equivalent of file -new.
+		:return:  None
+		"""
+		for node in self.nodes:
+			node.alive = False
+		self.nodes = []
+		self._byName = {}
+		self._selection = []
+		self._worldCache = {}
+		if self._callbacks:
+			self._emit('sceneChanged')
+	# end def clear():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												events
+	# ------------------------------------------------------------------------------------------------------------------
+	def addCallback(self, event, func, type=None, native=False):
+		"""
+		Stand-in for maya scene messages, see SceneBackend.addCallback().
+		:return:  `int` callback id
+		"""
+		self._callbackId += 1
+		self._callbacks[self._callbackId] = (event, func, type, native)
+		return self._callbackId
+	# end def addCallback():
+
+	def removeCallback(self, callback_id):
+		self._callbacks.pop(callback_id, None)
+	# end def removeCallback():
+
+	def _emit(self, event, node=None, name=None):
+		# name is only given for names the node no longer has
+		for callback_event, func, node_type, native in list(self._callbacks.values()):
+			if callback_event != event:
+				continue
+			if node is not None:
+				if node_type is not None and not node.type.isA(node_type):
+					continue
+				if native:
+					func(node)
+					continue
+				if name is None:
+					name = self.nameOf(node)
+			func(name)
+	# end def _emit():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												node lookup
+	# ------------------------------------------------------------------------------------------------------------------
+	def find(self, name):
+		"""
+		Get node record from name, path or node record.
+		:param name:  `str` short name, `|` separated full or partial path or `MNode`.
+		:return:  `MNode` or None
+		"""
+		if isinstance(name, MNode):
+			return name if name.alive else None
+
+		name = str(name)
+		if '|' in name and not name.startswith('|'):
+			# partial path, like maya it matches the end of full paths
+			parts = name.split('|')
+			matches = [
+				n for n in self._byName.get(parts[-1], ()) if self.fullPath(n).split('|')[-len(parts):] == parts]
+			if len(matches) > 1:
+				raise MayaNodeError('--More than one object matches name: {}'.format(name))
+			return matches[0] if matches else None
+
+		if '|' in name:
+			node = None
+			for part in name.strip('|').split('|'):
+				siblings = node.children if node is not None else self._byName.get(part, [])
+				node = next(
+					(n for n in siblings if n.name == part and (node is not None or n.parent is None)), None)
+				if node is None:
+					return None
+			return node
+
+		matches = self._byName.get(name)
+		if not matches:
+			return None
+		if len(matches) > 1:
+			raise MayaNodeError('--More than one object matches name: {}'.format(name))
+		return matches[0]
+	# end def find():
+
+	def node(self, name):
+		node = self.find(name)
+		if node is None:
+			raise MayaNodeError('--No object matches name: {}'.format(name))
+		return node
+	# end def node():
+
+	def nameOf(self, node):
+		"""
+		Shortest unique name of node, short name unless another node shares it.
+		"""
+		if len(self._byName.get(node.name, ())) < 2:
+			return node.name
+		path = [node.name]
+		parent = node.parent
+		while parent is not None:
+			path.insert(0, parent.name)
+			parent = parent.parent
+			candidate = '|'.join(path)
+			if self._uniqueFrom(candidate, node):
+				return candidate
+		return '|' + '|'.join(path)
+	# end def nameOf():
+
+	def _uniqueFrom(self, partial, node):
+		tail = partial.split('|')
+		count = 0
+		for other in self._byName.get(node.name, ()):
+			if self.fullPath(other).split('|')[-len(tail):] == tail:
+				count += 1
+		return count == 1
+	# end def _uniqueFrom():
+
+	def fullPath(self, node):
+		node = self.node(node)
+		path = [node.name]
+		parent = node.parent
+		while parent is not None:
+			path.insert(0, parent.name)
+			parent = parent.parent
+		return '|' + '|'.join(path)
+	# end def fullPath():
+
+	def objExists(self, name):
+		name = str(name)
+		if ('*' in name or '?' in name) and '.' not in name and '|' not in name:
+			# short name patterns, like maya
+			return any(fnmatch.fnmatchcase(other, name) for other in self._byName)
+		try:
+			if '.' in name:
+				node_name, path = name.split('.', 1)
+				node = self.find(node_name)
+				return node is not None and self._specFor(node, path) is not None
+			return self.find(name) is not None
+		except MemorySceneError:
+			return True
+	# end def objExists():
+
+	def nodeType(self, name):
+		return self.node(name).type.name
+	# end def nodeType():
+
+	def isType(self, name, type_name):
+		return self.node(name).type.isA(type_name)
+	# end def isType():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												node creation
+	# ------------------------------------------------------------------------------------------------------------------
+	def _uniqueName(self, name, parent=None, ignore=None):
+		def clashes(candidate):
+			for other in self._byName.get(candidate, ()):
+				if other is ignore:
+					continue
+				if not other.type.dag or other.parent is parent:
+					return True
+			return False
+		# end def clashes():
+
+		if not clashes(name):
+			return name
+
+		digits = _TRAILING_DIGITS.search(name).group(1)
+		base = name[:len(name) - len(digits)] if digits else name
+		index = int(digits) + 1 if digits else 1
+		while clashes('{}{}'.format(base, index)):
+			index += 1
+		return '{}{}'.format(base, index)
+	# end def _uniqueName():
+
+	def createNode(self, node_type, name=None, parent=None):
+		"""
+		Create node, names are made unique the same way maya increments them.
+		:param node_type:  `str` Node type.
+		:param name:  `str` Requested node name.
+		:param parent:  Parent for dag nodes.
+		:return:  `MNode`
+		"""
+		type_info = schema.getNodeType(node_type)
+		parent_node = self.node(parent) if parent is not None else None
+
+		if type_info.shape and parent_node is None:
+			parent_node = self.createNode('transform', name='transform1')
+
+		if name is None:
+			name = node_type + '1'
+		name = self._uniqueName(name, parent_node)
+
+		node = MNode(name, type_info)
+		self.nodes.append(node)
+		if stats.counter is not None:
+			stats.counter.nodes += 1
+		self._byName.setdefault(name, []).append(node)
+
+		if parent_node is not None:
+			node.parent = parent_node
+			parent_node.children.append(node)
+			if type_info.isA('joint') and parent_node.type.isA('joint'):
+				self.connectAttr((parent_node, 'scale'), (node, 'inverseScale'))
+
+		if self._callbacks:
+			self._emit('nodeAdded', node)
+		return node
+	# end def createNode():
+
+	def delete(self, *names):
+		"""
+		Delete nodes, dag nodes take their descendants with them.
+		"""
+		for name in names:
+			node = self.find(name)
+			if node is None:
+				continue
+			for child in list(node.children):
+				self.delete(child)
+			self._remove(node)
+	# end def delete():
+
+	def _remove(self, node):
+		if self._callbacks:
+			self._emit('nodeRemoved', node)
+		for key, source in list(node.inputs.items()):
+			self._disconnect(source[0], source[1], node, key)
+		for key, destinations in list(node.outputs.items()):
+			for dst_node, dst_key in list(destinations):
+				self._disconnect(node, key, dst_node, dst_key)
+
+		self._worldCache.pop(node, None)
+		if node.parent is not None:
+			node.parent.children.remove(node)
+		self._byName[node.name].remove(node)
+		if not self._byName[node.name]:
+			del self._byName[node.name]
+		self.nodes.remove(node)
+		if node in self._selection:
+			self._selection.remove(node)
+		node.alive = False
+	# end def _remove():
+
+	def rename(self, name, new_name):
+		node = self.node(name)
+		new_name = self._uniqueName(new_name, node.parent, ignore=node)
+		self._byName[node.name].remove(node)
+		if not self._byName[node.name]:
+			del self._byName[node.name]
+		old_name, node.name = node.name, new_name
+		self._byName.setdefault(new_name, []).append(node)
+		if self._callbacks:
+			self._emit('nameChanged', node)
+			self._emit('nameReleased', node, name=old_name)
+		return node
+	# end def rename():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												dag hierarchy
+	# ------------------------------------------------------------------------------------------------------------------
+	def parent(self, child, parent=None, relative=False, shape=False, world=False):
+		"""
+		Re-parent dag node. Keeps world transform unless relative.
+		:param child:  Node to parent.
+		:param parent:  New parent, None or world=True parents to world.
+		:param relative:  Keep local transform values instead of world.
+		:param shape:  Child is a shape being moved to another transform.
+		:return:  `MNode` child
+		"""
+		node = self.node(child)
+		new_parent = None if world or parent is None else self.node(parent)
+
+		if node.parent is new_parent:
+			return node
+
+		ancestor = new_parent
+		while ancestor is not None:
+			if ancestor is node:
+				raise MemorySceneError('--Can not parent {} to its own descendant.'.format(node.name))
+			ancestor = ancestor.parent
+
+		world_matrix = None
+		if node.type.transform and not relative:
+			world_matrix = self.worldMatrix(node)
+
+		if node.parent is not None:
+			node.parent.children.remove(node)
+			if node.type.isA('joint') and node.parent.type.isA('joint'):
+				self._disconnect(node.parent, 'scale', node, 'inverseScale')
+
+		self._dirtyWorld(node)
+		node.parent = new_parent
+		if new_parent is not None:
+			new_parent.children.append(node)
+			if node.type.isA('joint') and new_parent.type.isA('joint'):
+				self.connectAttr((new_parent, 'scale'), (node, 'inverseScale'), force=True)
+
+		unique = self._uniqueName(node.name, new_parent, ignore=node)
+		if unique != node.name:
+			self.rename(node, unique)
+
+		if world_matrix is not None:
+			parent_inverse = mmath.invert(self.worldMatrix(new_parent)) if new_parent is not None else None
+			local = mmath.multiply(world_matrix, parent_inverse) if parent_inverse else world_matrix
+			self.setLocalMatrix(node, local)
+
+		if self._callbacks:
+			self._emit('parentChanged', node)
+		return node
+	# end def parent():
+
+	def listRelatives(self, name, parent=False, allDescendents=False, shapes=False, type=None):
+		"""
+		List dag relatives. allDescendents are returned deepest first, same as maya.
+		:return:  `List` of MNode
+		"""
+		node = self.node(name)
+		if parent:
+			return [node.parent] if node.parent is not None else []
+
+		if allDescendents:
+			ordered = []
+			stack = list(reversed(node.children))
+			while stack:
+				this_node = stack.pop()
+				ordered.append(this_node)
+				stack.extend(reversed(this_node.children))
+			result = list(reversed(ordered))
+		else:
+			result = list(node.children)
+
+		if shapes:
+			result = [n for n in result if n.type.shape]
+		if type:
+			result = self._filterType(result, type)
+		return result
+	# end def listRelatives():
+
+	def ls(self, names=None, type=None, selection=False):
+		if selection:
+			nodes = list(self._selection)
+		elif names is None:
+			nodes = list(self.nodes)
+		else:
+			nodes = []
+			seen = set()
+			for name in names:
+				node = self.find(name)
+				if node is not None and id(node) not in seen:
+					seen.add(id(node))
+					nodes.append(node)
+		if type:
+			nodes = self._filterType(nodes, type)
+		return nodes
+	# end def ls():
+
+	@staticmethod
+	def _filterType(nodes, type):
+		types = [type] if isinstance(type, basestring) else list(type)
+		return [n for n in nodes if any(n.type.isA(t) for t in types)]
+	# end def _filterType():
+
+	def select(self, *names, **kwargs):
+		if kwargs.get('deselect', kwargs.get('d', False)) and not names:
+			self._selection = []
+			return
+		if kwargs.get('clear', kwargs.get('cl', False)):
+			self._selection = []
+			return
+		nodes = [self.node(n) for n in names]
+		if kwargs.get('add', False):
+			self._selection.extend(n for n in nodes if n not in self._selection)
+		elif kwargs.get('deselect', kwargs.get('d', False)):
+			self._selection = [n for n in self._selection if n not in nodes]
+		else:
+			self._selection = nodes
+	# end def select():
+
+	def lockNode(self, name, lock=True):
+		self.node(name).nodeLocked = lock
+	# end def lockNode():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												plugs
+	# ------------------------------------------------------------------------------------------------------------------
+	def _specFor(self, node, path):
+		try:
+			return self.plugKey(node, path)[1]
+		except MayaAttributeError:
+			return None
+	# end def _specFor():
+
+	def plugKey(self, node, path):
+		"""
+		Canonical key for an attribute path on a node. Only multi attributes and the leaf appear in the key so
+		'drawOverride.overrideColorRGB' and 'overrideColorRGB' address the same value, while
+		'wtMatrix[0].m' becomes 'wtMatrix[0].matrixIn'.
+
+		:param node:  `MNode`
+		:param path:  `str` attribute path, long or short names.
+		:return:  `tuple` of key string and AttrSpec
+		"""
+		cache_key = (node.type.name, path)
+		if not node.dynamic:
+			cached = self._keyCache.get(cache_key)
+			if cached is not None:
+				return cached
+
+		spec = None
+		indices = {}
+		for token in path.split('.'):
+			match = _TOKEN.match(token)
+			if match is None:
+				raise MayaAttributeError('--Invalid attribute path: {}.{}'.format(node.name, path))
+			spec = node.lookup.get(match.group(1))
+			if spec is None:
+				raise MayaAttributeError('--{} has no attribute: {}'.format(node.name, match.group(1)))
+			if match.group(2) is not None:
+				indices[spec.name] = int(match.group(2))
+
+		parts = []
+		for ancestor in spec.ancestors():
+			if ancestor.multi:
+				if ancestor.name not in indices:
+					raise MayaAttributeError(
+						'--Missing array index for {} in {}.{}'.format(ancestor.name, node.name, path))
+				parts.append('{}[{}]'.format(ancestor.name, indices[ancestor.name]))
+
+		leaf = spec.name
+		if spec.multi:
+			if spec.name in indices:
+				leaf = '{}[{}]'.format(spec.name, indices[spec.name])
+			elif spec.output and spec.name in _DAG_MATRICES + ('worldSpace', 'worldPosition'):
+				leaf = '{}[0]'.format(spec.name)
+		parts.append(leaf)
+
+		result = ('.'.join(parts), spec)
+		if not node.dynamic:
+			self._keyCache[cache_key] = result
+		return result
+	# end def plugKey():
+
+	def resolve(self, plug):
+		"""
+		Resolve plug to node, key and spec.
+		:param plug:  `str` 'node.attr' or `tuple` of (node, attr path).
+		:return:  `tuple` (MNode, key, AttrSpec)
+		"""
+		if isinstance(plug, tuple):
+			node, path = plug
+			node = self.node(node)
+		else:
+			plug = str(plug)
+			if '.' not in plug:
+				raise MayaAttributeError('--Not an attribute: {}'.format(plug))
+			node_name, path = plug.split('.', 1)
+			node = self.node(node_name)
+		key, spec = self.plugKey(node, path)
+		return node, key, spec
+	# end def resolve():
+
+	def plugName(self, node, key):
+		return '{}.{}'.format(self.nameOf(node), key)
+	# end def plugName():
+
+	@staticmethod
+	def _isElement(key, spec):
+		return spec.multi and key.endswith(']')
+	# end def _isElement():
+
+	@staticmethod
+	def childKey(key, spec, child):
+		parts = key.split('.')
+		if not spec.multi:
+			parts = parts[:-1]
+		parts.append(child.name)
+		return '.'.join(parts)
+	# end def childKey():
+
+	@staticmethod
+	def parentKey(key, spec):
+		parts = key.split('.')[:-1]
+		parent = spec.parent
+		if not parent.multi:
+			parts.append(parent.name)
+		return '.'.join(parts)
+	# end def parentKey():
+
+	def _touch(self, node, key):
+		# track logical indices in use for every array in key
+		if '[' not in key:
+			return
+		prefix = []
+		for part in key.split('.'):
+			if part.endswith(']'):
+				name, index = part[:-1].split('[')
+				node.indices.setdefault('.'.join(prefix + [name]), set()).add(int(index))
+			prefix.append(part)
+	# end def _touch():
+
+	def multiIndices(self, plug):
+		node, key, spec = self.resolve(plug)
+		return sorted(node.indices.get(key, ()))
+	# end def multiIndices():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												attribute values
+	# ------------------------------------------------------------------------------------------------------------------
+	def getAttr(self, plug, lock=False, size=False, asString=False, settable=False, keyable=False,
+				channelBox=False, multiIndices=False):
+		"""
+		maya.cmds style getAttr. Matrices are returned as flat tuples, compounds as tuples.
+		"""
+		node, key, spec = self.resolve(plug)
+
+		if lock:
+			return key in node.locked
+		if size:
+			return self._size(node, key, spec)
+		if multiIndices:
+			return sorted(node.indices.get(key, ()))
+		if settable:
+			return key not in node.locked and key not in node.inputs
+		if keyable:
+			return node.flags.get(key, {}).get('keyable', spec.keyable)
+		if channelBox:
+			return node.flags.get(key, {}).get('channelBox', False)
+
+		value = self.value(node, key, spec)
+		if asString and spec.enums:
+			return spec.enums[int(value)]
+		return value
+	# end def getAttr():
+
+	def _size(self, node, key, spec):
+		if node.type.isA('nurbsCurve') and spec.name == 'controlPoints':
+			return len(node.indices.get('controlPoints', ()))
+		indices = node.indices.get(key)
+		return (max(indices) + 1) if indices else 0
+	# end def _size():
+
+	def value(self, node, key, spec):
+		"""
+		Value of plug following incoming connections and computing dag matrices.
+		"""
+		source = node.inputs.get(key)
+		if source is not None:
+			return self.value(*source)
+
+		if spec.children:
+			return tuple(self.value(node, self.childKey(key, spec, child), child) for child in spec.children)
+
+		child_spec, child_key, path = spec, key, []
+		while child_spec.parent is not None:
+			path.insert(0, child_spec.parent.children.index(child_spec))
+			child_key = self.parentKey(child_key, child_spec)
+			child_spec = child_spec.parent
+			parent_source = node.inputs.get(child_key)
+			if parent_source is not None:
+				value = self.value(*parent_source)
+				for index in path:
+					value = value[index]
+				return value
+
+		key_spec = node.lookup.get(key.split('[')[0])
+		if key_spec is not None and key_spec.name in _DAG_MATRICES and node.type.dag:
+			return self._dagMatrix(node, key_spec.name)
+
+		if spec.multi and not self._isElement(key, spec):
+			return [self.value(node, '{}[{}]'.format(key, i), spec) for i in sorted(node.indices.get(key, ()))]
+
+		return node.values.get(key, spec.default)
+	# end def value():
+
+	def setAttr(self, plug, *values, **kwargs):
+		"""
+		maya.cmds style setAttr, also handles lock, keyable and channelBox flags.
+		"""
+		lock = kwargs.pop('lock', kwargs.pop('l', None))
+		keyable = kwargs.pop('keyable', kwargs.pop('k', None))
+		channel_box = kwargs.pop('channelBox', kwargs.pop('cb', None))
+		kwargs.pop('type', None)
+
+		node, key, spec = self.resolve(plug)
+
+		if values:
+			if key in node.locked and lock is not False:
+				raise MemorySceneError('--The attribute is locked and cannot be set: {}'.format(plug))
+			if key in node.inputs:
+				raise MemorySceneError('--The attribute is connected and cannot be set: {}'.format(plug))
+			self._store(node, key, spec, values)
+			if stats.counter is not None:
+				stats.counter.sets += 1
+
+		if lock is not None:
+			if lock:
+				node.locked.add(key)
+			else:
+				node.locked.discard(key)
+		if keyable is not None:
+			node.flags.setdefault(key, {})['keyable'] = bool(keyable)
+		if channel_box is not None:
+			node.flags.setdefault(key, {})['channelBox'] = bool(channel_box)
+	# end def setAttr():
+
+	def _store(self, node, key, spec, values):
+		self._dirtyPlug(node, key)
+		if len(values) == 1:
+			values = values[0]
+
+		if spec.isMatrix:
+			node.values[key] = tuple(mmath.Matrix(values).values)
+		elif spec.children:
+			flat = mmath._flatten([values]) if spec.isNumeric else list(values)
+			if len(flat) != len(spec.children):
+				raise MemorySceneError('--Expected {} values for {}'.format(len(spec.children), key))
+			for child, child_value in zip(spec.children, flat):
+				self._store(node, self.childKey(key, spec, child), child, (child_value,))
+			return
+		elif spec.enums and isinstance(values, basestring):
+			if values not in spec.enums:
+				raise MayaAttributeEnumError('--Enum value {} not in: {}'.format(values, spec.enums))
+			node.values[key] = spec.enums.index(values)
+		elif spec.type in ('bool', 'enum', 'long', 'short', 'byte'):
+			node.values[key] = int(values)
+		elif spec.type in schema.NUMERIC_TYPES:
+			node.values[key] = float(values)
+		else:
+			node.values[key] = values
+		self._touch(node, key)
+	# end def _store():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												connections
+	# ------------------------------------------------------------------------------------------------------------------
+	def connectAttr(self, source, destination, force=False):
+		src_node, src_key, src_spec = self.resolve(source)
+		dst_node, dst_key, dst_spec = self.resolve(destination)
+
+		if dst_key in dst_node.locked:
+			raise MemorySceneError('--Destination attribute is locked: {}'.format(destination))
+
+		existing = dst_node.inputs.get(dst_key)
+		if existing is not None:
+			if existing[0] is src_node and existing[1] == src_key:
+				return
+			if not force:
+				raise MemorySceneError('--{} is already connected to {}'.format(
+					self.plugName(dst_node, dst_key), self.plugName(existing[0], existing[1])))
+			self._disconnect(existing[0], existing[1], dst_node, dst_key)
+
+		self._dirtyPlug(dst_node, dst_key)
+		dst_node.inputs[dst_key] = (src_node, src_key, src_spec)
+		src_node.outputs.setdefault(src_key, []).append((dst_node, dst_key))
+		if stats.counter is not None:
+			stats.counter.connections += 1
+		self._touch(src_node, src_key)
+		self._touch(dst_node, dst_key)
+	# end def connectAttr():
+
+	def disconnectAttr(self, source, destination):
+		src_node, src_key, _ = self.resolve(source)
+		dst_node, dst_key, _ = self.resolve(destination)
+		if not self._disconnect(src_node, src_key, dst_node, dst_key):
+			raise MemorySceneError('--{} is not connected to {}'.format(source, destination))
+	# end def disconnectAttr():
+
+	def _disconnect(self, src_node, src_key, dst_node, dst_key):
+		src_node = self.find(src_node) if not isinstance(src_node, MNode) else src_node
+		existing = dst_node.inputs.get(dst_key)
+		if existing is None or existing[0] is not src_node or existing[1] != src_key:
+			return False
+		self._dirtyPlug(dst_node, dst_key)
+		del dst_node.inputs[dst_key]
+		destinations = src_node.outputs.get(src_key, [])
+		if (dst_node, dst_key) in destinations:
+			destinations.remove((dst_node, dst_key))
+		if not destinations:
+			src_node.outputs.pop(src_key, None)
+		return True
+	# end def _disconnect():
+
+	def isConnected(self, source, destination):
+		src_node, src_key, _ = self.resolve(source)
+		dst_node, dst_key, _ = self.resolve(destination)
+		existing = dst_node.inputs.get(dst_key)
+		return existing is not None and existing[0] is src_node and existing[1] == src_key
+	# end def isConnected():
+
+	def connections(self, name, source=True, destination=True):
+		"""
+		Connections on node or plug as list of ((node, key), (other node, other key)) pairs.
+		:param name:  Node or plug.
+		:param source:  Include incoming connections.
+		:param destination:  Include outgoing connections.
+		:return:  `List`
+		"""
+		if isinstance(name, tuple) or '.' in str(name):
+			node, key, _ = self.resolve(name)
+			match = lambda k: k == key or k.startswith(key + '.') or k.startswith(key + '[')
+		else:
+			node = self.node(name)
+			match = lambda k: True
+
+		result = []
+		if source:
+			for dst_key, src in node.inputs.items():
+				if match(dst_key):
+					result.append(((node, dst_key), (src[0], src[1])))
+		if destination:
+			for src_key, destinations in node.outputs.items():
+				if match(src_key):
+					for dst in destinations:
+						result.append(((node, src_key), dst))
+		return result
+	# end def connections():
+
+	def listConnections(self, name, source=True, destination=True, plugs=False, type=None, connections=False):
+		"""
+		maya.cmds style listConnections, returns node names or plug names. With connections, returns
+		(plug, connected plug) pairs instead of the flat list maya returns.
+		"""
+		result = []
+		for (this, this_key), (other, other_key) in self.connections(name, source=source, destination=destination):
+			if type and not other.type.isA(type):
+				continue
+			if connections:
+				result.append((self.plugName(this, this_key), self.plugName(other, other_key)))
+			else:
+				result.append(self.plugName(other, other_key) if plugs else self.nameOf(other))
+		return result
+	# end def listConnections():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												dynamic attributes
+	# ------------------------------------------------------------------------------------------------------------------
+	def addAttr(self, name, longName=None, **kwargs):
+		"""
+		maya.cmds style addAttr for single (non compound) attributes.
+		"""
+		node = self.node(name)
+		long_name = longName or kwargs.pop('ln', kwargs.pop('longName', None))
+		if long_name is None:
+			raise MemorySceneError('--addAttr requires a long name.')
+		if long_name in node.lookup:
+			raise MemorySceneError('--Attribute already exists: {}.{}'.format(node.name, long_name))
+
+		at = kwargs.pop('attributeType', kwargs.pop('at', None))
+		data_type = kwargs.pop('dataType', kwargs.pop('dt', None))
+		at = at or data_type or 'double'
+		enum_names = kwargs.pop('enumName', kwargs.pop('en', None))
+		default = kwargs.pop('defaultValue', kwargs.pop('dv', None))
+		keyable = kwargs.pop('keyable', kwargs.pop('k', False))
+		multi = kwargs.pop('multi', kwargs.pop('m', False))
+		short = kwargs.pop('shortName', kwargs.pop('sn', None))
+		nice = kwargs.pop('niceName', kwargs.pop('nn', None))
+		min_value = kwargs.pop('minValue', kwargs.pop('min', None))
+		max_value = kwargs.pop('maxValue', kwargs.pop('max', None))
+
+		enums = None
+		if enum_names is not None:
+			enums = []
+			for item in enum_names.split(':'):
+				if '=' in item:
+					label, index = item.rsplit('=', 1)
+					enums.extend([''] * (int(index) - len(enums)))
+					item = label
+				enums.append(item)
+
+		spec = schema.AttrSpec(long_name, at=at, short=short, multi=bool(multi), enums=enums,
+								keyable=bool(keyable), dynamic=True)
+		if default is not None and not spec.children:
+			spec.default = int(default) if at in ('bool', 'enum', 'long', 'short', 'byte') else (
+				float(default) if at in schema.NUMERIC_TYPES else default)
+		spec.min = min_value
+		spec.max = max_value
+		spec.niceName = nice
+
+		if not node.dynamic:
+			node.lookup = dict(node.lookup)
+		node.dynamic.append(spec)
+		node.lookup[long_name] = spec
+		if short:
+			node.lookup.setdefault(short, spec)
+		return spec
+	# end def addAttr():
+
+	def deleteAttr(self, plug):
+		node, key, spec = self.resolve(plug)
+		if not spec.dynamic:
+			raise MemorySceneError('--Can only delete dynamic attributes: {}'.format(plug))
+		for conn_key in [k for k in node.inputs if k == key or k.startswith(key + '[')]:
+			source = node.inputs[conn_key]
+			self._disconnect(source[0], source[1], node, conn_key)
+		for conn_key in [k for k in node.outputs if k == key or k.startswith(key + '[')]:
+			for dst_node, dst_key in list(node.outputs[conn_key]):
+				self._disconnect(node, conn_key, dst_node, dst_key)
+		for value_key in [k for k in node.values if k == key or k.startswith(key + '[')]:
+			del node.values[value_key]
+		node.locked.discard(key)
+		node.flags.pop(key, None)
+		node.indices.pop(key, None)
+		node.dynamic.remove(spec)
+		node.lookup = dict(node.lookup)
+		for name, other in list(node.lookup.items()):
+			if other is spec:
+				del node.lookup[name]
+	# end def deleteAttr():
+
+	def listAttr(self, name, userDefined=False):
+		node = self.node(name)
+		if userDefined:
+			return [spec.name for spec in node.dynamic]
+		names = []
+		for spec in node.lookup.values():
+			if spec.name not in names:
+				names.append(spec.name)
+		return names
+	# end def listAttr():
+
+	def attributeType(self, plug, node_type=None):
+		"""
+		Attribute type from metadata only, never evaluates the plug.
+		"""
+		if node_type is None:
+			return self.resolve(plug)[2].type
+		name = str(plug).split('.')[-1].split('[')[0]
+		spec = schema.getNodeType(node_type).attr(name)
+		if spec is None:
+			raise MayaAttributeError('--{} has no attribute: {}'.format(node_type, name))
+		return spec.type
+	# end def attributeType():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												transforms
+	# ------------------------------------------------------------------------------------------------------------------
+	def _vector(self, node, name):
+		key, spec = self.plugKey(node, name)
+		return self.value(node, key, spec)
+	# end def _vector():
+
+	def localMatrix(self, node):
+		node = self.node(node)
+		if not node.type.transform:
+			return mmath._IDENTITY
+		rotate = [math.radians(a) for a in self._vector(node, 'rotate')]
+		orient = None
+		if node.type.isA('joint'):
+			orient = [math.radians(a) for a in self._vector(node, 'jointOrient')]
+		local = mmath.compose(self._vector(node, 'translate'), rotate, self._vector(node, 'scale'), orient)
+
+		offset = self._vector(node, 'offsetParentMatrix')
+		if offset != mmath._IDENTITY:
+			local = mmath.multiply(local, offset)
+		return local
+	# end def localMatrix():
+
+	def setLocalMatrix(self, node, matrix, translate=True, rotate=True, scale=True):
+		"""
+		Set translate, rotate and scale from a local matrix, joint orient is kept.
+		"""
+		node = self.node(node)
+		offset = self._vector(node, 'offsetParentMatrix')
+		if offset != mmath._IDENTITY:
+			matrix = mmath.multiply(matrix, mmath.invert(offset))
+
+		position, rotation, scaling = mmath.decompose(matrix)
+		if node.type.isA('joint'):
+			orient = [math.radians(a) for a in self._vector(node, 'jointOrient')]
+			if any(orient):
+				rot_only = mmath.compose(rotate=rotation)
+				orient_inv = mmath.invert(mmath.compose(rotate=orient))
+				rotation = mmath.decompose(mmath.multiply(rot_only, orient_inv))[1]
+
+		for flag, name, value in [
+				(translate, 'translate', position),
+				(rotate, 'rotate', [math.degrees(a) for a in rotation]),
+				(scale, 'scale', scaling)]:
+			if not flag:
+				continue
+			key, spec = self.plugKey(node, name)
+			if key in node.inputs or key in node.locked:
+				continue
+			self._dirtyPlug(node, key)
+			for child, child_value in zip(spec.children, value):
+				if child.name not in node.inputs and child.name not in node.locked:
+					node.values[child.name] = float(child_value)
+	# end def setLocalMatrix():
+
+	def worldMatrix(self, node):
+		"""
+		World matrix of a dag node. Matrices are cached until a value, connection or parent they depend on changes,
+		so walking down a long chain doesn't recompute every ancestor.
+		"""
+		node = self.node(node)
+		cache = self._worldCache
+		chain = []
+		while node is not None and node not in cache:
+			chain.append(node)
+			node = node.parent
+		matrix = cache[node] if node is not None else mmath._IDENTITY
+
+		for this_node in reversed(chain):
+			if this_node.type.transform:
+				if not self._vector(this_node, 'inheritsTransform'):
+					matrix = mmath._IDENTITY
+				matrix = mmath.multiply(self.localMatrix(this_node), matrix)
+			cache[this_node] = matrix
+		return matrix
+	# end def worldMatrix():
+
+	def _dirtyPlug(self, node, key, seen=None):
+		# a plug changed, dirty world matrices reading it directly or through connections
+		if not self._worldCache:
+			return
+		seen = set() if seen is None else seen
+		if (node, key) in seen:
+			return
+		seen.add((node, key))
+		if key.startswith(_LOCAL_ATTRS):
+			self._dirtyWorld(node, seen)
+		self._dirtyOutputs(node, key, seen)
+	# end def _dirtyPlug():
+
+	def _dirtyOutputs(self, node, key, seen):
+		# compound parents and children of key read the changed value too
+		for out_key, destinations in list(node.outputs.items()):
+			if out_key.startswith(key) or key.startswith(out_key):
+				for dst_node, dst_key in list(destinations):
+					self._dirtyPlug(dst_node, dst_key, seen)
+	# end def _dirtyOutputs():
+
+	def _dirtyWorld(self, node, seen=None):
+		# node, its descendants and whatever reads their dag matrices. Ancestors are always cached before a node is,
+		# so nothing below an uncached node is cached, but the local matrix of node can be read without caching it
+		if not self._worldCache:
+			return
+		seen = set() if seen is None else seen
+		stack = [node]
+		while stack:
+			this_node = stack.pop()
+			cached = self._worldCache.pop(this_node, None) is not None
+			if cached:
+				stack.extend(this_node.children)
+			if cached or this_node is node:
+				for key in list(this_node.outputs):
+					if key.split('[')[0] in _DAG_MATRICES:
+						self._dirtyOutputs(this_node, key, seen)
+	# end def _dirtyWorld():
+
+	def _dagMatrix(self, node, name):
+		if name in ('matrix', 'xformMatrix'):
+			return self.localMatrix(node)
+		if name == 'inverseMatrix':
+			return mmath.invert(self.localMatrix(node))
+		if name == 'worldMatrix':
+			return self.worldMatrix(node)
+		if name == 'worldInverseMatrix':
+			return mmath.invert(self.worldMatrix(node))
+		parent_matrix = self.worldMatrix(node.parent) if node.parent is not None else mmath._IDENTITY
+		if name == 'parentMatrix':
+			return parent_matrix
+		return mmath.invert(parent_matrix)
+	# end def _dagMatrix():
+
+	def xform(self, target, query=False, translation=None, rotation=None, matrix=None, worldSpace=False):
+		"""
+		Subset of maya.cmds.xform for transforms and curve cvs ('shape.cv[i]').
+		Query one of translation / rotation / matrix by passing True, or set by passing a value.
+		"""
+		component = _COMPONENT.match(str(target))
+		if component is not None:
+			shape = self.node(component.group(1))
+			if shape.type.transform:
+				shape = next(c for c in shape.children if c.type.isA('nurbsCurve'))
+			index = int(component.group(3))
+			key = 'controlPoints[{}]'.format(index)
+			cp_spec = shape.lookup['controlPoints']
+			if query:
+				return list(self.value(shape, key, cp_spec))
+			point = translation
+			if rotation is not None:
+				rotate = mmath.compose(rotate=[math.radians(a) for a in rotation])
+				point = list(mmath.Vector(self.value(shape, key, cp_spec)) * mmath.Matrix(rotate))
+			if point is not None:
+				self._store(shape, key, cp_spec, tuple(point))
+			return None
+
+		node = self.node(target)
+		if query:
+			m = self.worldMatrix(node) if worldSpace else self.localMatrix(node)
+			if matrix:
+				return list(m)
+			if translation:
+				return list(m[12:15])
+			if rotation:
+				return [math.degrees(a) for a in mmath.decompose(m)[1]]
+			raise MemorySceneError('--xform query requires a flag.')
+
+		parent_inverse = None
+		if worldSpace and node.parent is not None:
+			parent_inverse = mmath.invert(self.worldMatrix(node.parent))
+
+		if matrix is not None:
+			m = tuple(mmath.Matrix(matrix).values)
+			if parent_inverse is not None:
+				m = mmath.multiply(m, parent_inverse)
+			self.setLocalMatrix(node, m)
+
+		if translation is not None:
+			if worldSpace:
+				world = list(self.worldMatrix(node))
+				world[12:15] = [float(v) for v in translation]
+				local = mmath.multiply(tuple(world), parent_inverse) if parent_inverse else tuple(world)
+				self.setLocalMatrix(node, local, rotate=False, scale=False)
+			else:
+				self.setAttr((node, 'translate'), *translation)
+
+		if rotation is not None:
+			self.setAttr((node, 'rotate'), *rotation)
+	# end def xform():
+
+	def curvePoints(self, name):
+		"""
+		Control points of a nurbsCurve in index order.
+		"""
+		shape = self.node(name)
+		spec = shape.lookup['controlPoints']
+		return [
+			self.value(shape, 'controlPoints[{}]'.format(i), spec)
+			for i in sorted(shape.indices.get('controlPoints', ()))
+		]
+	# end def curvePoints():
+
+	def setCurvePoints(self, name, points):
+		shape = self.node(name)
+		spec = shape.lookup['controlPoints']
+		for i, point in enumerate(points):
+			self._store(shape, 'controlPoints[{}]'.format(i), spec, (tuple(point),))
+		if points and stats.counter is not None:
+			stats.counter.sets += 1
+	# end def setCurvePoints():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												misc
+	# ------------------------------------------------------------------------------------------------------------------
+	def pluginLoaded(self, plugin):
+		"""
+		Every node type the stand-in knows about is always available.
+		"""
+		return True
+	# end def pluginLoaded():
+# end class MemoryScene():
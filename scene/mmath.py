@@ -0,0 +1,408 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	MMATH.PY
+	Pure python stand-ins for the pymel datatypes used by rigbot (Vector, Matrix, TransformationMatrix).
+	Matrices follow maya conventions: row major, row vectors, child world = local * parent world.
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+import math
+
+
+# numpy module once imported, it is imported on first use as importing it is most of rigbot's import time
+_NUMPY = []
+
+
+_IDENTITY = (
+	1.0, 0.0, 0.0, 0.0,
+	0.0, 1.0, 0.0, 0.0,
+	0.0, 0.0, 1.0, 0.0,
+	0.0, 0.0, 0.0, 1.0,
+)
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def numpyModule():
+	"""
+	numpy, imported the first time it is asked for.
+	:return:  numpy module or None if it is not installed.
+	"""
+	if not _NUMPY:
+		try:
+			import numpy
+		except ImportError:
+			numpy = None
+		_NUMPY.append(numpy)
+	return _NUMPY[0]
+# end def numpyModule():
+
+
+def _flatten(values):
+	"""
+	Flatten nested rows / matrices into a flat list of floats.
+	"""
+	flat = []
+	for value in values:
+		if isinstance(value, (list, tuple, Matrix, Vector)):
+			flat.extend(_flatten(value))
+		else:
+			flat.append(float(value))
+	return flat
+# end def _flatten():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+class Vector(object):
+
+	__slots__ = ('x', 'y', 'z')
+
+	def __init__(self, *args):
+		if len(args) == 1:
+			args = tuple(args[0])
+		if not args:
+			args = (0.0, 0.0, 0.0)
+		if len(args) != 3:
+			raise ValueError('--Vector expects 3 values, got: {}'.format(args))
+		self.x, self.y, self.z = [float(a) for a in args]
+	# end def __init__():
+
+	def __repr__(self):
+		return 'dt.Vector([{}, {}, {}])'.format(self.x, self.y, self.z)
+	# end def __repr__():
+
+	def __iter__(self):
+		return iter((self.x, self.y, self.z))
+	# end def __iter__():
+
+	def __len__(self):
+		return 3
+	# end def __len__():
+
+	def __getitem__(self, index):
+		return (self.x, self.y, self.z)[index]
+	# end def __getitem__():
+
+	def __eq__(self, other):
+		try:
+			return tuple(self) == tuple(other)
+		except TypeError:
+			return False
+	# end def __eq__():
+
+	def __ne__(self, other):
+		return not self.__eq__(other)
+	# end def __ne__():
+
+	def __add__(self, other):
+		return Vector(self.x + other[0], self.y + other[1], self.z + other[2])
+	# end def __add__():
+
+	def __sub__(self, other):
+		return Vector(self.x - other[0], self.y - other[1], self.z - other[2])
+	# end def __sub__():
+
+	def __neg__(self):
+		return Vector(-self.x, -self.y, -self.z)
+	# end def __neg__():
+
+	def __mul__(self, other):
+		# pymel convention: vector * vector is the dot product
+		if isinstance(other, (Vector, list, tuple)):
+			return self.x * other[0] + self.y * other[1] + self.z * other[2]
+		if isinstance(other, Matrix):
+			m = other.values
+			return Vector(
+				self.x * m[0] + self.y * m[4] + self.z * m[8],
+				self.x * m[1] + self.y * m[5] + self.z * m[9],
+				self.x * m[2] + self.y * m[6] + self.z * m[10],
+			)
+		return Vector(self.x * other, self.y * other, self.z * other)
+	# end def __mul__():
+
+	def __rmul__(self, other):
+		return self.__mul__(other)
+	# end def __rmul__():
+
+	def __div__(self, other):
+		return Vector(self.x / other, self.y / other, self.z / other)
+	# end def __div__():
+
+	__truediv__ = __div__
+
+	def __xor__(self, other):
+		# pymel convention: vector ^ vector is the cross product
+		return self.cross(other)
+	# end def __xor__():
+
+	def cross(self, other):
+		return Vector(
+			self.y * other[2] - self.z * other[1],
+			self.z * other[0] - self.x * other[2],
+			self.x * other[1] - self.y * other[0],
+		)
+	# end def cross():
+
+	def dot(self, other):
+		return self.x * other[0] + self.y * other[1] + self.z * other[2]
+	# end def dot():
+
+	def length(self):
+		return math.sqrt(self.dot(self))
+	# end def length():
+
+	def normal(self):
+		length = self.length()
+		if not length:
+			return Vector(self)
+		return self / length
+	# end def normal():
+# end class Vector():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+class Matrix(object):
+
+	__slots__ = ('values',)
+
+	def __init__(self, *args):
+		if not args:
+			self.values = _IDENTITY
+			return
+		flat = _flatten(args)
+		if len(flat) != 16:
+			raise ValueError('--Matrix expects 16 values, got {}.'.format(len(flat)))
+		self.values = tuple(flat)
+	# end def __init__():
+
+	def __repr__(self):
+		return 'dt.Matrix({})'.format([list(row) for row in self])
+	# end def __repr__():
+
+	def __iter__(self):
+		v = self.values
+		return iter([v[0:4], v[4:8], v[8:12], v[12:16]])
+	# end def __iter__():
+
+	def __len__(self):
+		return 4
+	# end def __len__():
+
+	def __getitem__(self, index):
+		if isinstance(index, tuple):
+			return self.values[index[0] * 4 + index[1]]
+		return list(self)[index]
+	# end def __getitem__():
+
+	def __eq__(self, other):
+		if isinstance(other, Matrix):
+			return self.values == other.values
+		try:
+			return self.values == tuple(_flatten(other))
+		except TypeError:
+			return False
+	# end def __eq__():
+
+	def __ne__(self, other):
+		return not self.__eq__(other)
+	# end def __ne__():
+
+	def __hash__(self):
+		return hash(self.values)
+	# end def __hash__():
+
+	def __mul__(self, other):
+		if not isinstance(other, Matrix):
+			return Matrix([v * other for v in self.values])
+		return Matrix(multiply(self.values, other.values))
+	# end def __mul__():
+
+	def inverse(self):
+		return Matrix(invert(self.values))
+	# end def inverse():
+
+	def transpose(self):
+		v = self.values
+		return Matrix([v[c * 4 + r] for r in range(4) for c in range(4)])
+	# end def transpose():
+
+	def isEquivalent(self, other, tol=1e-10):
+		return all(abs(a - b) <= tol for a, b in zip(self.values, Matrix(other).values))
+	# end def isEquivalent():
+
+	@property
+	def translate(self):
+		return Vector(self.values[12:15])
+	# end def translate():
+# end class Matrix():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+class TransformationMatrix(Matrix):
+
+	__slots__ = ()
+
+	def asRotateMatrix(self):
+		"""
+		Rotation part of this matrix with scale and translation removed.
+		:return:  `Matrix`
+		"""
+		return Matrix(compose(rotate=decompose(self.values)[1]))
+	# end def asRotateMatrix():
+
+	def getTranslation(self, space='transform'):
+		return Vector(self.values[12:15])
+	# end def getTranslation():
+
+	def getRotation(self):
+		return Vector([math.degrees(a) for a in decompose(self.values)[1]])
+	# end def getRotation():
+
+	def getScale(self, space='transform'):
+		return list(decompose(self.values)[2])
+	# end def getScale():
+# end class TransformationMatrix():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# 												MATRIX FUNCTIONS
+# ----------------------------------------------------------------------------------------------------------------------
+def multiply(a, b):
+	"""
+	Multiply two flat 16 value matrices.
+	:param a:  First matrix, flat tuple.
+	:param b:  Second matrix, flat tuple.
+	:return:  `tuple` flat result.
+	"""
+	return tuple(
+		a[r] * b[c] + a[r + 1] * b[c + 4] + a[r + 2] * b[c + 8] + a[r + 3] * b[c + 12]
+		for r in (0, 4, 8, 12) for c in (0, 1, 2, 3)
+	)
+# end def multiply():
+
+
+def invert(m):
+	"""
+	Invert flat 16 value matrix with gauss-jordan elimination.
+	:param m:  Matrix to invert, flat tuple.
+	:return:  `tuple` flat result.
+	"""
+	rows = [list(m[i:i + 4]) + [1.0 if i // 4 == j else 0.0 for j in range(4)] for i in (0, 4, 8, 12)]
+
+	for col in range(4):
+		pivot = max(range(col, 4), key=lambda r: abs(rows[r][col]))
+		if abs(rows[pivot][col]) < 1e-15:
+			raise ZeroDivisionError('--Matrix is singular and can not be inverted.')
+		rows[col], rows[pivot] = rows[pivot], rows[col]
+
+		scalar = rows[col][col]
+		rows[col] = [v / scalar for v in rows[col]]
+
+		for r in range(4):
+			if r != col and rows[r][col]:
+				factor = rows[r][col]
+				rows[r] = [v - factor * p for v, p in zip(rows[r], rows[col])]
+
+	return tuple(v for row in rows for v in row[4:])
+# end def invert():
+
+
+def rotationMatrix(rotate):
+	"""
+	Rotation matrix for xyz rotate order, angles in radians.
+	:param rotate:  x, y, z angles.
+	:return:  `tuple` of 9 values, upper 3x3 of a row major matrix.
+	"""
+	cx, cy, cz = [math.cos(a) for a in rotate]
+	sx, sy, sz = [math.sin(a) for a in rotate]
+	return (
+		cy * cz, cy * sz, -sy,
+		sx * sy * cz - cx * sz, sx * sy * sz + cx * cz, sx * cy,
+		cx * sy * cz + sx * sz, cx * sy * sz - sx * cz, cx * cy,
+	)
+# end def rotationMatrix():
+
+
+def compose(translate=(0.0, 0.0, 0.0), rotate=(0.0, 0.0, 0.0), scale=(1.0, 1.0, 1.0), orient=None):
+	"""
+	Compose a flat matrix from transform components, scale * rotate * orient * translate.
+	:param translate:  Translation.
+	:param rotate:  xyz euler rotation in radians.
+	:param scale:  Scale.
+	:param orient:  Optional joint orient in radians, applied after rotate.
+	:return:  `tuple` flat matrix.
+	"""
+	r = rotationMatrix(rotate)
+	if orient is not None and any(orient):
+		o = rotationMatrix(orient)
+		r = tuple(
+			r[row] * o[col] + r[row + 1] * o[col + 3] + r[row + 2] * o[col + 6]
+			for row in (0, 3, 6) for col in (0, 1, 2)
+		)
+	sx, sy, sz = scale
+	return (
+		r[0] * sx, r[1] * sx, r[2] * sx, 0.0,
+		r[3] * sy, r[4] * sy, r[5] * sy, 0.0,
+		r[6] * sz, r[7] * sz, r[8] * sz, 0.0,
+		translate[0], translate[1], translate[2], 1.0,
+	)
+# end def compose():
+
+
+def decompose(m):
+	"""
+	Decompose a flat matrix to translate, xyz euler rotate (radians) and scale. Shear is ignored.
+	:param m:  Matrix, flat tuple.
+	:return:  `tuple` of (translate, rotate, scale)
+	"""
+	rows = [m[0:3], m[4:7], m[8:11]]
+	scale = [math.sqrt(sum(v * v for v in row)) for row in rows]
+
+	det = (
+		m[0] * (m[5] * m[10] - m[6] * m[9])
+		- m[1] * (m[4] * m[10] - m[6] * m[8])
+		+ m[2] * (m[4] * m[9] - m[5] * m[8])
+	)
+	if det < 0:
+		scale[0] = -scale[0]
+
+	r = [[v / s if s else 0.0 for v in row] for row, s in zip(rows, scale)]
+
+	sy = max(-1.0, min(1.0, -r[0][2]))
+	ry = math.asin(sy)
+	if abs(math.cos(ry)) > 1e-9:
+		rx = math.atan2(r[1][2], r[2][2])
+		rz = math.atan2(r[0][1], r[0][0])
+	else:
+		rx = math.atan2(-r[2][1], r[1][1])
+		rz = 0.0
+
+	return tuple(m[12:15]), (rx, ry, rz), tuple(scale)
+# end def decompose():
+
+
+def transformPoints(points, matrix):
+	"""
+	Multiply points by a matrix (point * matrix), one array operation when numpy is available.
+	:param points:  `List` of [x, y, z].
+	:param matrix:  4x4 `Matrix`, nested rows or flat list of 16 values.
+	:return:  `List` of (x, y, z) tuples.
+	"""
+	if not len(points):
+		return []
+
+	m = [float(v) for row in matrix for v in row] if len(matrix) == 4 else [float(v) for v in matrix]
+
+	numpy = numpyModule()
+	if numpy is None:
+		return [(
+			x * m[0] + y * m[4] + z * m[8] + m[12],
+			x * m[1] + y * m[5] + z * m[9] + m[13],
+			x * m[2] + y * m[6] + z * m[10] + m[14],
+		) for x, y, z in points]
+
+	m = numpy.array(m, dtype=float).reshape(4, 4)
+	result = numpy.asarray(points, dtype=float).dot(m[:3, :3]) + m[3, :3]
+	return [tuple(p) for p in result.tolist()]
+# end def transformPoints():
@@ -0,0 +1,323 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	MODIFIER.PY
+	Record-then-commit graph edits. Nodes, connections and attribute values are recorded on a GraphModifier and
+	applied by the active scene backend in one bulk operation, the same way an MDGModifier works.
+
+	Recorded nodes are returned as handles that can be connected and set like PyNodes before they exist:
+
+		with scene.GraphModifier() as graph:
+			dcmp = graph.createNode('decomposeMatrix', n='arm_dcmpM')
+			graph.node(ctrl).worldMatrix[0] >> dcmp.inputMatrix
+			dcmp.outputTranslate >> graph.node(jnt).translate
+		# everything above is created and connected here
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+from . import getBackend, registry
+
+
+class ModifierException(Exception):
+	pass
+
+
+_ACTIVE = []
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def active():
+	"""
+	Innermost GraphModifier currently recording.
+	:return:  `GraphModifier` or None
+	"""
+	return _ACTIVE[-1] if _ACTIVE else None
+# end def active():
+
+
+def current():
+	"""
+	Modifier that utilities should record into, the active one or an immediate modifier when nothing is recording
+	so utilities still work when called outside of a build.
+	:return:  `GraphModifier`
+	"""
+	graph = active()
+	if graph is None:
+		graph = GraphModifier(immediate=True)
+	return graph
+# end def current():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+class NodeHandle(object):
+	"""
+	Stand-in for a node that is created by, or used in, a GraphModifier.
+	"""
+
+	__slots__ = ('_backend', '_type', '_requested', '_existing', '_native')
+
+	def __init__(self, backend, node_type=None, name=None, existing=None):
+		self._backend = backend
+		self._type = node_type
+		self._requested = name
+		self._existing = existing
+		self._native = None
+	# end def __init__():
+
+	def __str__(self):
+		return self.name()
+	# end def __str__():
+
+	def __repr__(self):
+		return 'NodeHandle({})'.format(self.name())
+	# end def __repr__():
+
+	def __getattr__(self, name):
+		if name.startswith('__'):
+			raise AttributeError(name)
+		return PlugHandle(self, name)
+	# end def __getattr__():
+
+	def attr(self, name):
+		return PlugHandle(self, name)
+	# end def attr():
+
+	def setAttr(self, name, *values, **kwargs):
+		if kwargs:
+			raise ModifierException('--Unsupported setAttr flags for recorded edit: {}'.format(kwargs))
+		current().setAttr(PlugHandle(self, name), *values)
+	# end def setAttr():
+
+	def nodeType(self):
+		if self._type is None:
+			self._type = self.pynode().nodeType()
+		return self._type
+	# end def nodeType():
+
+	def isCommitted(self):
+		return self._existing is not None or self._native is not None
+	# end def isCommitted():
+
+	def native(self):
+		"""
+		Backend specific node reference, only available once the node exists.
+		"""
+		if self._native is None:
+			if self._existing is None:
+				raise ModifierException('--Node has not been committed yet: {}'.format(self._requested))
+			self._native = self._backend.nativeNode(self._existing)
+		return self._native
+	# end def native():
+
+	def name(self):
+		if self._existing is not None:
+			return str(self._existing)
+		if self._native is None:
+			return self._requested or self._type
+		return self._backend.nodeName(self._native)
+	# end def name():
+
+	def pynode(self):
+		"""
+		Node object of the active backend (PyNode with pymel) for the committed node.
+		"""
+		if isinstance(self._existing, basestring):
+			return self._backend.pm.PyNode(self._existing)
+		if self._existing is not None:
+			return self._existing
+		return self._backend.wrap(self.native())
+	# end def pynode():
+# end class NodeHandle():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+class PlugHandle(object):
+	"""
+	Attribute path on a NodeHandle. Supports the pymel operators used in rigbot: >>, [] and .set().
+	"""
+
+	__slots__ = ('_node', '_path')
+
+	def __init__(self, node, path):
+		self._node = node
+		self._path = path
+	# end def __init__():
+
+	def __str__(self):
+		return '{}.{}'.format(self._node.name(), self._path)
+	# end def __str__():
+
+	def __repr__(self):
+		return 'PlugHandle({})'.format(self)
+	# end def __repr__():
+
+	def __getattr__(self, name):
+		if name.startswith('__'):
+			raise AttributeError(name)
+		return PlugHandle(self._node, '{}.{}'.format(self._path, name))
+	# end def __getattr__():
+
+	def __getitem__(self, index):
+		return PlugHandle(self._node, '{}[{}]'.format(self._path, index))
+	# end def __getitem__():
+
+	def __rshift__(self, other):
+		current().connectAttr(self, other)
+	# end def __rshift__():
+
+	def __lshift__(self, other):
+		current().connectAttr(other, self)
+	# end def __lshift__():
+
+	def attr(self, name):
+		return self.__getattr__(name)
+	# end def attr():
+
+	def node(self):
+		return self._node
+	# end def node():
+
+	@property
+	def path(self):
+		return self._path
+	# end def path():
+
+	def set(self, *values):
+		current().setAttr(self, *values)
+	# end def set():
+
+	def get(self, **kwargs):
+		if not self._node.isCommitted():
+			raise ModifierException('--Can not query plug before its node is committed: {}'.format(self))
+		return self._node._backend.pm.PyNode(str(self)).get(**kwargs)
+	# end def get():
+# end class PlugHandle():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+class GraphModifier(object):
+	"""
+	Records node creation, connections and attribute values, applied in bulk by the scene backend on doIt().
+
+	Nodes recorded here must be DG nodes, dag edits (parenting, groups, curves) stay immediate.
+	Use as a context manager to record for the duration of a block and commit on exit.
+	"""
+
+	def __init__(self, immediate=False, backend=None):
+		"""
+		:param immediate:  `bool` Apply every edit as it is recorded instead of on doIt().
+		:param backend:  Scene backend to apply edits with, default is the active backend.
+		"""
+		self.backend = backend or getBackend()
+		self.immediate = immediate
+		self._ops = []
+	# end def __init__():
+
+	def __len__(self):
+		return len(self._ops)
+	# end def __len__():
+
+	def __enter__(self):
+		_ACTIVE.append(self)
+		return self
+	# end def __enter__():
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		_ACTIVE.remove(self)
+		if exc_type is None:
+			self.doIt()
+		else:
+			self._ops = []
+		return False
+	# end def __exit__():
+
+	def _record(self, op):
+		if self.immediate:
+			self.backend.applyEdits([op])
+		else:
+			self._ops.append(op)
+	# end def _record():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	def node(self, node):
+		"""
+		Get handle for an existing node so it can take part in recorded connections.
+		:param node:  `PyNode`, `str` or `NodeHandle`.
+		:return:  `NodeHandle`
+		"""
+		if isinstance(node, NodeHandle):
+			return node
+		if isinstance(node, PlugHandle):
+			return node.node()
+		if isinstance(node, basestring):
+			node = self.backend.pm.PyNode(node)
+		return NodeHandle(self.backend, existing=node)
+	# end def node():
+
+	def plug(self, plug):
+		"""
+		Get handle for a plug.
+		:param plug:  `Attribute`, `str` 'node.attr' or `PlugHandle`.
+		:return:  `PlugHandle`
+		"""
+		if isinstance(plug, PlugHandle):
+			return plug
+		if isinstance(plug, basestring):
+			# names are resolved when the edit is applied, no node object is built for them here
+			node_name, path = plug.split('.', 1)
+			return PlugHandle(NodeHandle(self.backend, existing=node_name), path)
+		return PlugHandle(NodeHandle(self.backend, existing=plug.node()), str(plug).split('.', 1)[1])
+	# end def plug():
+
+	def createNode(self, node_type, **kwargs):
+		"""
+		Record a new DG node.
+		:param node_type:  `str` Node type.
+		:param kwargs:  name | n: `str` Node name.
+		:return:  `NodeHandle`
+		"""
+		name = kwargs.pop('name', kwargs.pop('n', None))
+		if kwargs:
+			raise ValueError('--Unknown argument(s): {}'.format(kwargs))
+		handle = NodeHandle(self.backend, node_type=node_type, name=name)
+		node_registry = registry.active()
+		if node_registry is not None:
+			node_registry.add(handle)
+		self._record(('create', handle))
+		return handle
+	# end def createNode():
+
+	def connectAttr(self, source, destination, force=True):
+		"""
+		Record connection, forced by default the same as pymel's >> operator.
+		"""
+		self._record(('connect', self.plug(source), self.plug(destination), force))
+	# end def connectAttr():
+
+	def setAttr(self, plug, *values):
+		self._record(('set', self.plug(plug), values))
+	# end def setAttr():
+
+	def destinations(self, source):
+		"""
+		Plugs driven from source by connections recorded here and not committed yet.
+		:param source:  Plug.
+		:return:  `List` of `PlugHandle`
+		"""
+		source = str(self.plug(source))
+		return [op[2] for op in self._ops if op[0] == 'connect' and str(op[1]) == source]
+	# end def destinations():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	def doIt(self):
+		"""
+		Apply all recorded edits in one bulk operation.
+		:return:  `int` number of edits applied.
+		"""
+		ops, self._ops = self._ops, []
+		if ops:
+			self.backend.applyEdits(ops)
+		return len(ops)
+	# end def doIt():
+# end class GraphModifier():
@@ -0,0 +1,364 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	OPTIMIZE.PY
+	Graph optimizer passes over the scene backend string api, run on nodes once they are built:
+
+		# {duplicate: node kept in its place}
+		removed = optimize.mergeDuplicates(module.registry.names())
+
+	mergeDuplicates() is common-subexpression elimination. Utility nodes of the same type with the same input
+	connections and settings compute the same result, the first one is kept and outputs of the others are moved
+	onto it. Merging can make nodes further down stream identical too, they are checked again until nothing
+	changes.
+
+	foldConstants() bakes the outputs of nodes with constant inputs into the attributes they drive and
+	removeDeadNodes() deletes nodes whose outputs don't reach anything else, eg; the folded nodes:
+
+		optimize.foldConstants(nodes)
+		optimize.removeDeadNodes(nodes)
+
+	Only node types in PURE_NODES are optimized, their results depend on nothing but their input attributes. Input
+	values are read for plugs without incoming connections only, so nothing up stream is evaluated. Folding is the
+	exception, it reads the outputs it bakes so it needs a backend that evaluates nodes.
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+import collections
+import re
+
+from . import getBackend, schema
+
+
+class OptimizeException(Exception):
+	pass
+
+
+# node type: input attributes its result depends on, '[*]' for every element of a multi attribute
+PURE_NODES = {
+	'addDoubleLinear': ['input1', 'input2'],
+	'animBlendNodeAdditiveDA': ['inputA', 'inputB', 'weightA', 'weightB', 'accumulationMode'],
+	'blendMatrix': [
+		'inputMatrix', 'envelope', 'target[*].targetMatrix', 'target[*].useMatrix', 'target[*].weight',
+		'target[*].scaleWeight', 'target[*].translateWeight', 'target[*].rotateWeight', 'target[*].shearWeight'],
+	'blendTwoAttr': ['input[*]', 'attributesBlender'],
+	'clamp': ['min', 'max', 'input'],
+	'composeMatrix': [
+		'inputTranslate', 'inputRotate', 'inputScale', 'inputShear', 'inputQuat', 'inputRotateOrder',
+		'useEulerRotation'],
+	'condition': ['operation', 'firstTerm', 'secondTerm', 'colorIfTrue', 'colorIfFalse'],
+	'decomposeMatrix': ['inputMatrix', 'inputRotateOrder'],
+	'distanceBetween': ['point1', 'inMatrix1', 'point2', 'inMatrix2'],
+	'fourByFourMatrix': ['in{}{}'.format(r, c) for r in range(4) for c in range(4)],
+	'inverseMatrix': ['inputMatrix'],
+	'math_Acos': ['input'],
+	'multDoubleLinear': ['input1', 'input2'],
+	'multMatrix': ['matrixIn[*]'],
+	'multiplyDivide': ['operation', 'input1', 'input2'],
+	'pickMatrix': ['inputMatrix', 'useTranslate', 'useRotate', 'useScale', 'useShear'],
+	'plusMinusAverage': ['operation', 'input1D[*]', 'input2D[*]', 'input3D[*]'],
+	'reverse': ['input'],
+	'transposeMatrix': ['inputMatrix'],
+	'unitConversion': ['input', 'conversionFactor'],
+	'vectorProduct': ['operation', 'input1', 'input2', 'matrix', 'normalizeOutput'],
+	'wtAddMatrix': ['wtMatrix[*].matrixIn', 'wtMatrix[*].weightIn'],
+}
+
+# input values closer than this are the same, matches utils.matrixConstraint()
+TOLERANCE = 1e-5
+
+_COMPONENT = re.compile(r'^(\w+)(\[\d+\])?$')
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def mergeDuplicates(nodes, types=None, share=None, tolerance=TOLERANCE, delete=True):
+	"""
+	Merge nodes that compute the same result.
+
+	:param nodes:  `List` of node names to optimize, eg; nodes of a built module. Nodes listed first are kept.
+	:param types:  `List` of node types to merge, every type in PURE_NODES if None.
+	:param share:  Callable (kept node, duplicate) -> `bool`, whether duplicate may be replaced by kept node. eg; to
+					stop one module from driving another it doesn't depend on. Every duplicate may be if None.
+	:param tolerance:  `float` Input values closer than this are the same.
+	:param delete:  `bool` Delete duplicates, otherwise they are left without outputs.
+	:return:  `OrderedDict` of duplicate: node kept in its place.
+	"""
+	backend = getBackend()
+	nodes = _candidates(backend, nodes, types)
+	candidates = set(nodes)
+	queue = collections.deque(nodes)
+	queued = set(nodes)
+
+	# node: signature, signature: first node with it
+	signatures = {}
+	kept = {}
+	removed = collections.OrderedDict()
+
+	while queue:
+		node = queue.popleft()
+		queued.discard(node)
+		if node in removed:
+			continue
+
+		previous = signatures.pop(node, None)
+		if previous is not None and kept.get(previous) == node:
+			del kept[previous]
+
+		signature = _signature(backend, node, tolerance)
+		if signature is None:
+			continue
+		keep = kept.get(signature)
+		if keep is None:
+			kept[signature] = node
+			signatures[node] = signature
+			continue
+		if share is not None and not share(keep, node):
+			continue
+
+		for destination in _moveOutputs(backend, node, keep):
+			# nodes fed by the kept node may be duplicates now
+			other = destination.split('.', 1)[0]
+			if other in candidates and other not in queued and other not in removed:
+				queued.add(other)
+				queue.append(other)
+		removed[node] = keep
+
+	if delete and removed:
+		backend.delete(*removed)
+	return removed
+# end def mergeDuplicates():
+
+
+def foldConstants(nodes, types=None):
+	"""
+	Bake results of constant nodes into the attributes they drive. Nodes are constant when every incoming
+	connection comes from another constant node, eg; a blendTwoAttr with literal inputs. Constant nodes are left
+	without outputs, remove them with removeDeadNodes(). Locked destinations stay connected.
+
+	:param nodes:  `List` of node names to optimize.
+	:param types:  `List` of node types that can be folded, every type in PURE_NODES if None.
+	:return:  `OrderedDict` of destination plug: value baked into it.
+	"""
+	backend = getBackend()
+	if not backend.evaluates:
+		raise OptimizeException('--The {} backend does not evaluate nodes, constants can not be folded.'.format(
+			backend.name))
+
+	nodes = [node for node in _candidates(backend, nodes, types) if not _isTagged(backend, node)]
+	sources = dict((node, set(backend.listConnections(node, destination=False))) for node in nodes)
+
+	constant = set()
+	changed = True
+	while changed:
+		changed = False
+		for node in nodes:
+			if node not in constant and sources[node].issubset(constant):
+				constant.add(node)
+				changed = True
+
+	# read everything first, disconnecting may dirty the nodes
+	edits = []
+	for node in nodes:
+		if node not in constant:
+			continue
+		for plug, destination in backend.listConnections(node, source=False, plugs=True, connections=True):
+			if destination.split('.', 1)[0] in constant or backend.getAttr(destination, lock=True):
+				continue
+			edits.append((plug, destination, backend.getAttr(plug)))
+
+	baked = collections.OrderedDict()
+	for plug, destination, value in edits:
+		backend.disconnectAttr(plug, destination)
+		_setValue(backend, destination, value)
+		baked[destination] = value
+	return baked
+# end def foldConstants():
+
+
+def removeDeadNodes(nodes, types=None, delete=True):
+	"""
+	Remove nodes whose outputs reach nothing but other dead nodes. Every node that isn't optimized keeps the nodes
+	driving it, eg; joints, controls and containers publishing a plug.
+
+	:param nodes:  `List` of node names to optimize.
+	:param types:  `List` of node types that can be removed, every type in PURE_NODES if None.
+	:param delete:  `bool` Delete dead nodes, otherwise only return them.
+	:return:  `List` of dead nodes.
+	"""
+	backend = getBackend()
+	nodes = [node for node in _candidates(backend, nodes, types) if not _isTagged(backend, node)]
+	candidates = set(nodes)
+
+	# live nodes mark the candidates driving them live in turn
+	live = set()
+	stack = []
+	sources = {}
+	for node in nodes:
+		sources[node] = [s for s in backend.listConnections(node, destination=False) if s in candidates]
+		if any(d not in candidates for d in backend.listConnections(node, source=False)):
+			live.add(node)
+			stack.append(node)
+	while stack:
+		for source in sources[stack.pop()]:
+			if source not in live:
+				live.add(source)
+				stack.append(source)
+
+	dead = [node for node in nodes if node not in live]
+	if delete and dead:
+		backend.delete(*dead)
+	return dead
+# end def removeDeadNodes():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def _candidates(backend, nodes, types):
+	"""
+	Nodes of optimized types, in order without repeats.
+	"""
+	types = set(types if types is not None else PURE_NODES)
+	unknown = types.difference(PURE_NODES)
+	if unknown:
+		raise OptimizeException('--No input attributes known for node types: {}'.format(sorted(unknown)))
+
+	nodes = [str(node) for node in nodes]
+	typed = set(backend.ls(nodes, type=list(types)))
+	candidates = []
+	for node in nodes:
+		if node in typed:
+			typed.discard(node)
+			candidates.append(node)
+	return candidates
+# end def _candidates():
+
+
+def _isTagged(backend, node):
+	"""
+	User attributes may be used by tools to find this exact node, it is left alone.
+	"""
+	return bool(backend.listAttr(node, userDefined=True))
+# end def _isTagged():
+
+
+def _signature(backend, node, tolerance):
+	"""
+	Everything the result of a node depends on.
+	:return:  `tuple` or None if the node can't be merged.
+	"""
+	if _isTagged(backend, node):
+		return None
+
+	node_type = backend.nodeType(node)
+	inputs = sorted(
+		(plug.split('.', 1)[1], source) for plug, source in
+		backend.listConnections(node, destination=False, plugs=True, connections=True))
+	connected = set(attr for attr, _ in inputs)
+
+	values = []
+	for attr in _expand(backend, node, PURE_NODES[node_type]):
+		for plug in _unconnected(node_type, attr, connected):
+			values.append((plug, _freeze(backend.getAttr('{}.{}'.format(node, plug)), tolerance)))
+
+	return node_type, tuple(inputs), tuple(values)
+# end def _signature():
+
+
+def _expand(backend, node, attrs):
+	"""
+	Input attributes with '[*]' replaced by each existing element.
+	"""
+	expanded = []
+	for attr in attrs:
+		if '[*]' not in attr:
+			expanded.append(attr)
+			continue
+		multi, child = attr.split('[*]', 1)
+		indices = backend.getAttr('{}.{}'.format(node, multi), multiIndices=True) or []
+		expanded += ['{}[{}]{}'.format(multi, i, child) for i in indices]
+	return expanded
+# end def _expand():
+
+
+def _unconnected(node_type, attr, connected):
+	"""
+	Plugs of attr without incoming connections. Compounds with connected children are split into their children,
+	reading the whole compound would evaluate the connected ones up stream.
+	:return:  `List` of attribute paths, [attr] when nothing in it is connected.
+	"""
+	if _isConnected(attr, connected):
+		return []
+	children = _children(node_type, attr)
+	plugs = []
+	for child in children:
+		plugs += _unconnected(node_type, child, connected)
+	if plugs == children:
+		return [attr]
+	return plugs
+# end def _unconnected():
+
+
+def _children(node_type, attr):
+	"""
+	Paths of the children of a compound attribute, named like connections are listed, eg; input1X, target[0].weight.
+	"""
+	match = _COMPONENT.match(attr.split('.')[-1])
+	try:
+		spec = schema.getNodeType(node_type).attr(match.group(1)) if match else None
+	except schema.SchemaException:
+		return []
+	if spec is None or (spec.multi and not match.group(2)):
+		return []
+	if '[' in attr or '.' in attr:
+		return ['{}.{}'.format(attr, child.name) for child in spec.children]
+	return [child.name for child in spec.children]
+# end def _children():
+
+
+def _isConnected(attr, connected):
+	"""
+	The attribute or an attribute it is part of has an incoming connection.
+	"""
+	while True:
+		if attr in connected:
+			return True
+		split = max(attr.rfind('.'), attr.rfind('['))
+		if split == -1:
+			return False
+		attr = attr[:split]
+# end def _isConnected():
+
+
+def _freeze(value, tolerance):
+	"""
+	Hashable value, floats are snapped to tolerance.
+	"""
+	if isinstance(value, (list, tuple)):
+		return tuple(_freeze(v, tolerance) for v in value)
+	if isinstance(value, float):
+		return int(round(value / tolerance))
+	return value
+# end def _freeze():
+
+
+def _setValue(backend, plug, value):
+	if backend.attributeType(plug) == 'matrix':
+		backend.setAttr(plug, *value, type='matrix')
+	elif isinstance(value, (list, tuple)):
+		backend.setAttr(plug, *value)
+	else:
+		backend.setAttr(plug, value)
+# end def _setValue():
+
+
+def _moveOutputs(backend, node, keep):
+	"""
+	Connect the outputs of node from the same plugs of keep instead.
+	:return:  `List` of destination plugs that moved.
+	"""
+	destinations = []
+	for plug, destination in backend.listConnections(node, source=False, plugs=True, connections=True):
+		backend.connectAttr('{}.{}'.format(keep, plug.split('.', 1)[1]), destination, force=True)
+		destinations.append(destination)
+	return destinations
+# end def _moveOutputs():
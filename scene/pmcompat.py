@@ -0,0 +1,1031 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	PMCOMPAT.PY
+	pymel.core compatible facade over the in-memory scene. Implements the subset of PyNode / Attribute / command
+	behaviour rigbot relies on so modules written against pymel run unchanged without maya.
+	Also holds the 'memory' scene backend built on top of it.
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+import math
+
+from . import memory, mmath, schema
+from .base import SceneBackend
+
+
+_CIRCLE_POINTS = [
+	(0.783612, -0.783612), (0.0, -1.108194), (-0.783612, -0.783612), (-1.108194, 0.0),
+	(-0.783612, 0.783612), (0.0, 1.108194), (0.783612, 0.783612), (1.108194, 0.0),
+]
+
+
+def _flattenArgs(args):
+	flat = []
+	for item in args:
+		if isinstance(item, (list, tuple, set)):
+			flat.extend(_flattenArgs(item))
+		elif item is not None:
+			flat.append(item)
+	return flat
+# end def _flattenArgs():
+
+
+def _flag(kwargs, long_name, short_name, default=None):
+	return kwargs.pop(long_name, kwargs.pop(short_name, default))
+# end def _flag():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+class Attribute(object):
+
+	__slots__ = ('_node', '_path', '_pm')
+
+	def __init__(self, node, path, pm):
+		self._node = node
+		self._path = path
+		self._pm = pm
+	# end def __init__():
+
+	# plug reference understood by the memory scene, avoids re-resolving node names
+	@property
+	def _ref(self):
+		return self._node, self._path
+	# end def _ref():
+
+	def __str__(self):
+		return '{}.{}'.format(self._pm.scene.nameOf(self._node), self._path)
+	# end def __str__():
+
+	def __repr__(self):
+		return "Attribute('{}')".format(self)
+	# end def __repr__():
+
+	def __eq__(self, other):
+		if isinstance(other, Attribute):
+			scene = self._pm.scene
+			return other._node is self._node and \
+				scene.plugKey(self._node, self._path)[0] == scene.plugKey(other._node, other._path)[0]
+		return str(self) == str(other)
+	# end def __eq__():
+
+	def __ne__(self, other):
+		return not self.__eq__(other)
+	# end def __ne__():
+
+	def __hash__(self):
+		return hash((id(self._node), self._pm.scene.plugKey(self._node, self._path)[0]))
+	# end def __hash__():
+
+	def __getattr__(self, name):
+		if name.startswith('__'):
+			raise AttributeError(name)
+		path = '{}.{}'.format(self._path, name)
+		if self._pm.scene._specFor(self._node, path) is None:
+			raise memory.MayaAttributeError('--{} has no attribute: {}'.format(self, name))
+		return Attribute(self._node, path, self._pm)
+	# end def __getattr__():
+
+	def __getitem__(self, index):
+		return Attribute(self._node, '{}[{}]'.format(self._path, index), self._pm)
+	# end def __getitem__():
+
+	def elementByLogicalIndex(self, index):
+		return self[index]
+	# end def elementByLogicalIndex():
+
+	def __rshift__(self, other):
+		self._pm.connectAttr(self, other, force=True)
+	# end def __rshift__():
+
+	def __lshift__(self, other):
+		self._pm.connectAttr(other, self, force=True)
+	# end def __lshift__():
+
+	def __floordiv__(self, other):
+		self._pm.disconnectAttr(self, other)
+	# end def __floordiv__():
+
+	def connect(self, other, force=False, **kwargs):
+		self._pm.connectAttr(self, other, force=force)
+	# end def connect():
+
+	def disconnect(self, other=None):
+		if other is not None:
+			self._pm.disconnectAttr(self, other)
+			return
+		scene = self._pm.scene
+		for (node, key), (other, other_key) in scene.connections(self._ref):
+			if not scene._disconnect(other, other_key, node, key):
+				scene._disconnect(node, key, other, other_key)
+	# end def disconnect():
+
+	def node(self):
+		return self._pm._wrap(self._node)
+	# end def node():
+
+	plugNode = node
+
+	def name(self):
+		return str(self)
+	# end def name():
+
+	def attrName(self, longName=False):
+		return self._path.split('.')[-1].split('[')[0]
+	# end def attrName():
+
+	def plugAttr(self, longName=False):
+		return self._pm.scene.plugKey(self._node, self._path)[0]
+	# end def plugAttr():
+
+	def longName(self, fullPath=False):
+		return self._pm.scene.plugKey(self._node, self._path)[1].name
+	# end def longName():
+
+	def index(self):
+		if not self._path.endswith(']'):
+			raise TypeError('--{} is not an array element.'.format(self))
+		return int(self._path.rsplit('[', 1)[1][:-1])
+	# end def index():
+
+	def type(self):
+		return self._pm.scene.plugKey(self._node, self._path)[1].type
+	# end def type():
+
+	def isMulti(self):
+		return self._pm.scene.plugKey(self._node, self._path)[1].multi
+	# end def isMulti():
+
+	def isCompound(self):
+		return self._pm.scene.plugKey(self._node, self._path)[1].isCompound
+	# end def isCompound():
+
+	def exists(self):
+		return self._node.alive and self._pm.scene._specFor(self._node, self._path) is not None
+	# end def exists():
+
+	def get(self, **kwargs):
+		return self._pm.getAttr(self, **kwargs)
+	# end def get():
+
+	def set(self, *values, **kwargs):
+		self._pm.setAttr(self, *values, **kwargs)
+	# end def set():
+
+	def lock(self):
+		self._pm.scene.setAttr(self._ref, lock=True)
+	# end def lock():
+
+	def unlock(self):
+		self._pm.scene.setAttr(self._ref, lock=False)
+	# end def unlock():
+
+	def isLocked(self):
+		return self._pm.scene.getAttr(self._ref, lock=True)
+	# end def isLocked():
+
+	def getNumElements(self):
+		return len(self._pm.scene.multiIndices(self._ref))
+	# end def getNumElements():
+
+	def iterDescendants(self):
+		spec = self._pm.scene.plugKey(self._node, self._path)[1]
+		for child in spec.children:
+			yield Attribute(self._node, '{}.{}'.format(self._path, child.name), self._pm)
+	# end def iterDescendants():
+
+	def getChildren(self):
+		return list(self.iterDescendants())
+	# end def getChildren():
+
+	def _connected(self, source, destination, plugs, type):
+		result = []
+		for _, (other, other_key) in self._pm.scene.connections(self._ref, source=source, destination=destination):
+			if type and not other.type.isA(type):
+				continue
+			result.append(Attribute(other, other_key, self._pm) if plugs else self._pm._wrap(other))
+		return result
+	# end def _connected():
+
+	def inputs(self, plugs=False, p=False, type=None):
+		return self._connected(True, False, plugs or p, type)
+	# end def inputs():
+
+	def outputs(self, plugs=False, p=False, type=None):
+		return self._connected(False, True, plugs or p, type)
+	# end def outputs():
+
+	def listConnections(self, source=True, destination=True, plugs=False, p=False, type=None):
+		return self._connected(source, destination, plugs or p, type)
+	# end def listConnections():
+
+	def isConnectedTo(self, other, ignoreUnitConversion=False, checkLocalArray=False, checkOtherArray=False):
+		other = self._pm._plugRef(other)
+		return self._pm.scene.isConnected(self._ref, other) or self._pm.scene.isConnected(other, self._ref)
+	# end def isConnectedTo():
+# end class Attribute():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+class DependNode(object):
+
+	__slots__ = ('_node', '_pm')
+
+	def __init__(self, node, pm):
+		self._node = node
+		self._pm = pm
+	# end def __init__():
+
+	def __str__(self):
+		return self._pm.scene.nameOf(self._node)
+	# end def __str__():
+
+	__unicode__ = __str__
+
+	def __repr__(self):
+		return "nt.{}{}('{}')".format(self._node.type.name[0].upper(), self._node.type.name[1:], self)
+	# end def __repr__():
+
+	def __eq__(self, other):
+		if isinstance(other, DependNode):
+			return other._node is self._node
+		if isinstance(other, basestring):
+			return str(self) == other
+		return False
+	# end def __eq__():
+
+	def __ne__(self, other):
+		return not self.__eq__(other)
+	# end def __ne__():
+
+	def __hash__(self):
+		return hash(id(self._node))
+	# end def __hash__():
+
+	def __add__(self, other):
+		return str(self) + other
+	# end def __add__():
+
+	def __radd__(self, other):
+		return other + str(self)
+	# end def __radd__():
+
+	def __getattr__(self, name):
+		if name.startswith('__'):
+			raise AttributeError(name)
+		if self._pm.scene._specFor(self._node, name) is None:
+			raise memory.MayaAttributeError('--{} has no attribute or method: {}'.format(self, name))
+		return Attribute(self._node, name, self._pm)
+	# end def __getattr__():
+
+	def attr(self, name):
+		if self._pm.scene._specFor(self._node, name) is None:
+			raise memory.MayaAttributeError('--{} has no attribute: {}'.format(self, name))
+		return Attribute(self._node, name, self._pm)
+	# end def attr():
+
+	def hasAttr(self, name, checkShape=True):
+		return self._pm.scene._specFor(self._node, name) is not None
+	# end def hasAttr():
+
+	def getAttr(self, name, *args, **kwargs):
+		return self.attr(name).get(*args, **kwargs)
+	# end def getAttr():
+
+	def setAttr(self, name, *values, **kwargs):
+		self._pm.setAttr(Attribute(self._node, name, self._pm), *values, **kwargs)
+	# end def setAttr():
+
+	def addAttr(self, name, **kwargs):
+		self._pm.addAttr(self, ln=name, **kwargs)
+	# end def addAttr():
+
+	def deleteAttr(self, name):
+		self._pm.scene.deleteAttr((self._node, name))
+	# end def deleteAttr():
+
+	def listAttr(self, ud=False, userDefined=False, **kwargs):
+		names = self._pm.scene.listAttr(self._node, userDefined=(ud or userDefined))
+		return [Attribute(self._node, name, self._pm) for name in names]
+	# end def listAttr():
+
+	def name(self):
+		return str(self)
+	# end def name():
+
+	def nodeName(self):
+		return self._node.name
+	# end def nodeName():
+
+	def nodeType(self):
+		return self._node.type.name
+	# end def nodeType():
+
+	type = nodeType
+
+	def isType(self, type_name):
+		return self._node.type.isA(type_name)
+	# end def isType():
+
+	def exists(self):
+		return self._node.alive
+	# end def exists():
+
+	def node(self):
+		return self
+	# end def node():
+
+	def rename(self, new_name):
+		return self._pm.rename(self, new_name)
+	# end def rename():
+
+	def listConnections(self, source=True, destination=True, plugs=False, p=False, type=None, **kwargs):
+		result = []
+		connections = self._pm.scene.connections(self._node, source=source, destination=destination)
+		for _, (other, other_key) in connections:
+			if type and not other.type.isA(type):
+				continue
+			result.append(Attribute(other, other_key, self._pm) if (plugs or p) else self._pm._wrap(other))
+		return result
+	# end def listConnections():
+
+	def inputs(self, plugs=False, p=False, type=None):
+		return self.listConnections(source=True, destination=False, plugs=plugs or p, type=type)
+	# end def inputs():
+
+	def outputs(self, plugs=False, p=False, type=None):
+		return self.listConnections(source=False, destination=True, plugs=plugs or p, type=type)
+	# end def outputs():
+
+	def lock(self):
+		self._pm.scene.lockNode(self._node, lock=True)
+	# end def lock():
+
+	def unlock(self):
+		self._pm.scene.lockNode(self._node, lock=False)
+	# end def unlock():
+# end class DependNode():
+
+
+def _strMethod(method_name):
+	def method(self, *args, **kwargs):
+		return getattr(str(self), method_name)(*args, **kwargs)
+	method.__name__ = method_name
+	return method
+# end def _strMethod():
+
+
+# PyNodes behave like strings in pymel, forward the str methods rigbot uses
+for _method_name in ('split', 'rsplit', 'replace', 'endswith', 'startswith', 'count', 'find', 'lower', 'upper',
+					'strip', 'partition', 'rpartition', 'format', '__contains__', '__len__'):
+	setattr(DependNode, _method_name, _strMethod(_method_name))
+
+
+class Container(DependNode):
+
+	__slots__ = ()
+
+	def addNode(self, nodes, **kwargs):
+		nodes = [self._pm._mnode(n) for n in _flattenArgs([nodes])]
+		if self._node.members is None:
+			self._node.members = []
+		for node in nodes:
+			if node not in self._node.members and node is not self._node:
+				self._node.members.append(node)
+	# end def addNode():
+
+	def removeNode(self, nodes):
+		for node in [self._pm._mnode(n) for n in _flattenArgs([nodes])]:
+			if self._node.members and node in self._node.members:
+				self._node.members.remove(node)
+	# end def removeNode():
+
+	def getNodeList(self):
+		return [self._pm._wrap(n) for n in (self._node.members or []) if n.alive]
+	# end def getNodeList():
+# end class Container():
+
+
+class DagNode(DependNode):
+
+	__slots__ = ()
+
+	def shortName(self):
+		return str(self)
+	# end def shortName():
+
+	partialPathName = shortName
+
+	def longName(self):
+		return self._pm.scene.fullPath(self._node)
+	# end def longName():
+
+	fullPath = longName
+
+	def getParent(self):
+		parent = self._node.parent
+		return self._pm._wrap(parent) if parent is not None else None
+	# end def getParent():
+
+	def getChildren(self, ad=False, allDescendents=False, type=None, shapes=False, **kwargs):
+		nodes = self._pm.scene.listRelatives(
+			self._node, allDescendents=(ad or allDescendents), type=type, shapes=shapes)
+		return [self._pm._wrap(n) for n in nodes]
+	# end def getChildren():
+
+	def listRelatives(self, parent=False, p=False, children=False, c=False, ad=False, allDescendents=False,
+					shapes=False, s=False, type=None, **kwargs):
+		nodes = self._pm.scene.listRelatives(
+			self._node, parent=(parent or p), allDescendents=(ad or allDescendents), shapes=(shapes or s),
+			type=type)
+		return [self._pm._wrap(n) for n in nodes]
+	# end def listRelatives():
+
+	def setParent(self, *args, **kwargs):
+		new_parent = args[0] if args else None
+		self._pm.parent(self, new_parent, world=(new_parent is None), **kwargs)
+		return self
+	# end def setParent():
+# end class DagNode():
+
+
+class Transform(DagNode):
+
+	__slots__ = ()
+
+	def getShapes(self, **kwargs):
+		return [self._pm._wrap(n) for n in self._node.children if n.type.shape]
+	# end def getShapes():
+
+	def getShape(self, **kwargs):
+		shapes = self.getShapes()
+		return shapes[0] if shapes else None
+	# end def getShape():
+
+	def getMatrix(self, worldSpace=False, ws=False):
+		scene = self._pm.scene
+		matrix = scene.worldMatrix(self._node) if (worldSpace or ws) else scene.localMatrix(self._node)
+		return mmath.Matrix(matrix)
+	# end def getMatrix():
+
+	def setMatrix(self, matrix, worldSpace=False, ws=False):
+		self._pm.xform(self, m=matrix, ws=(worldSpace or ws))
+	# end def setMatrix():
+
+	def getTranslation(self, space='object', ws=False):
+		world = ws or space == 'world'
+		return mmath.Vector(self._pm.xform(self, q=True, t=True, ws=world))
+	# end def getTranslation():
+
+	def setTranslation(self, vector, space='object', ws=False):
+		self._pm.xform(self, t=vector, ws=(ws or space == 'world'))
+	# end def setTranslation():
+# end class Transform():
+
+
+class Joint(Transform):
+
+	__slots__ = ()
+# end class Joint():
+
+
+class Shape(DagNode):
+
+	__slots__ = ()
+# end class Shape():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+class PmCompat(object):
+	"""
+	Namespace standing in for `pymel.core` bound to a memory scene.
+	"""
+
+	MayaNodeError = memory.MayaNodeError
+	MayaAttributeError = memory.MayaAttributeError
+	MayaAttributeEnumError = memory.MayaAttributeEnumError
+	MayaObjectError = memory.MayaNodeError
+
+	datatypes = mmath
+	dt = mmath
+
+	Attribute = Attribute
+	DependNode = DependNode
+	DagNode = DagNode
+	Transform = Transform
+	Joint = Joint
+
+	def __init__(self, scene):
+		self.scene = scene
+	# end def __init__():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												wrapping
+	# ------------------------------------------------------------------------------------------------------------------
+	def _wrap(self, node):
+		node_type = node.type
+		if node_type.isA('joint'):
+			cls = Joint
+		elif node_type.transform:
+			cls = Transform
+		elif node_type.shape:
+			cls = Shape
+		elif node_type.isA('container'):
+			cls = Container
+		else:
+			cls = DependNode
+		return cls(node, self)
+	# end def _wrap():
+
+	def _mnode(self, item):
+		if isinstance(item, DependNode):
+			return item._node
+		if isinstance(item, Attribute):
+			return item._node
+		if hasattr(item, 'mnode'):
+			return item.mnode()
+		return self.scene.node(str(item))
+	# end def _mnode():
+
+	def _plugRef(self, plug):
+		if isinstance(plug, Attribute):
+			return plug._ref
+		return str(plug)
+	# end def _plugRef():
+
+	def PyNode(self, name):
+		if isinstance(name, (DependNode, Attribute)):
+			return name
+		name = str(name)
+		if '.' in name:
+			node_name, path = name.split('.', 1)
+			node = self.scene.node(node_name)
+			if self.scene._specFor(node, path) is None:
+				raise memory.MayaAttributeError('--No attribute: {}'.format(name))
+			return Attribute(node, path, self)
+		return self._wrap(self.scene.node(name))
+	# end def PyNode():
+
+	def _wrapValue(self, value, plug):
+		spec = self.scene.resolve(self._plugRef(plug))[2]
+		if spec.isMatrix and not (spec.multi and isinstance(value, list)):
+			return mmath.Matrix(value)
+		if spec.isCompound and spec.isNumeric and len(spec.children) == 3 and isinstance(value, tuple):
+			return mmath.Vector(value)
+		return value
+	# end def _wrapValue():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												attributes
+	# ------------------------------------------------------------------------------------------------------------------
+	def getAttr(self, plug, **kwargs):
+		flags = {
+			'lock': _flag(kwargs, 'lock', 'l', False),
+			'size': _flag(kwargs, 'size', 's', False),
+			'asString': kwargs.pop('asString', False),
+			'settable': _flag(kwargs, 'settable', 'se', False),
+			'keyable': _flag(kwargs, 'keyable', 'k', False),
+			'channelBox': _flag(kwargs, 'channelBox', 'cb', False),
+			'multiIndices': _flag(kwargs, 'multiIndices', 'mi', False),
+		}
+		value = self.scene.getAttr(self._plugRef(plug), **flags)
+		if any(flags.values()):
+			return value
+		return self._wrapValue(value, plug)
+	# end def getAttr():
+
+	def setAttr(self, plug, *values, **kwargs):
+		kwargs.pop('type', None)
+		kwargs.pop('typ', None)
+		if kwargs.pop('force', False):
+			pass
+		self.scene.setAttr(self._plugRef(plug), *values, **kwargs)
+	# end def setAttr():
+
+	def connectAttr(self, source, destination, force=False, f=False, **kwargs):
+		self.scene.connectAttr(self._plugRef(source), self._plugRef(destination), force=(force or f))
+	# end def connectAttr():
+
+	def disconnectAttr(self, source, destination=None):
+		if destination is None:
+			Attribute.disconnect(self.PyNode(source))
+			return
+		self.scene.disconnectAttr(self._plugRef(source), self._plugRef(destination))
+	# end def disconnectAttr():
+
+	def addAttr(self, node, **kwargs):
+		long_name = _flag(kwargs, 'longName', 'ln', None)
+		self.scene.addAttr(self._mnode(node), long_name, **kwargs)
+	# end def addAttr():
+
+	def listConnections(self, target, **kwargs):
+		return self.PyNode(target).listConnections(**kwargs)
+	# end def listConnections():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												nodes
+	# ------------------------------------------------------------------------------------------------------------------
+	def objExists(self, name):
+		if isinstance(name, DependNode):
+			return name._node.alive
+		if isinstance(name, Attribute):
+			return name.exists()
+		return self.scene.objExists(name)
+	# end def objExists():
+
+	def createNode(self, node_type, n=None, name=None, p=None, parent=None, ss=False, skipSelect=False, **kwargs):
+		parent = parent or p
+		node = self.scene.createNode(
+			node_type, name=(name or n), parent=self._mnode(parent) if parent is not None else None)
+		return self._wrap(node)
+	# end def createNode():
+
+	def delete(self, *args, **kwargs):
+		self.scene.delete(*[self._mnode(n) for n in _flattenArgs(args) if self.objExists(n)])
+	# end def delete():
+
+	def rename(self, node, new_name, **kwargs):
+		return self._wrap(self.scene.rename(self._mnode(node), str(new_name)))
+	# end def rename():
+
+	def nodeType(self, node, **kwargs):
+		return self._mnode(node).type.name
+	# end def nodeType():
+
+	def ls(self, *args, **kwargs):
+		node_type = _flag(kwargs, 'type', 'typ', None)
+		selection = _flag(kwargs, 'selection', 'sl', False)
+		names = _flattenArgs(args)
+		if not names and not selection:
+			nodes = self.scene.ls(type=node_type)
+		else:
+			nodes = self.scene.ls(
+				[self._mnode(n) if isinstance(n, DependNode) else n for n in names] if names else None,
+				type=node_type, selection=selection)
+		return [self._wrap(n) for n in nodes]
+	# end def ls():
+
+	def select(self, *args, **kwargs):
+		self.scene.select(*[self._mnode(n) for n in _flattenArgs(args)], **kwargs)
+	# end def select():
+
+	def selected(self, **kwargs):
+		return self.ls(sl=True, **kwargs)
+	# end def selected():
+
+	def lockNode(self, node, lock=True, l=None, **kwargs):
+		self.scene.lockNode(self._mnode(node), lock=lock if l is None else l)
+	# end def lockNode():
+
+	def pluginInfo(self, plugin, query=False, q=False, loaded=False, l=False, **kwargs):
+		return self.scene.pluginLoaded(plugin)
+	# end def pluginInfo():
+
+	def loadPlugin(self, plugin, **kwargs):
+		return None
+	# end def loadPlugin():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												dag
+	# ------------------------------------------------------------------------------------------------------------------
+	def parent(self, *args, **kwargs):
+		world = _flag(kwargs, 'world', 'w', False)
+		relative = _flag(kwargs, 'relative', 'r', False)
+		shape = _flag(kwargs, 'shape', 's', False)
+		nodes = _flattenArgs(args)
+
+		if world:
+			children, new_parent = nodes, None
+		else:
+			children, new_parent = nodes[:-1], nodes[-1]
+			new_parent = self._mnode(new_parent)
+
+		result = []
+		for child in children:
+			node = self.scene.parent(self._mnode(child), new_parent, relative=relative, shape=shape, world=world)
+			result.append(self._wrap(node))
+		return result
+	# end def parent():
+
+	def group(self, *args, **kwargs):
+		name = _flag(kwargs, 'name', 'n', 'group1')
+		empty = _flag(kwargs, 'empty', 'em', False)
+		parent = _flag(kwargs, 'parent', 'p', None)
+		world = _flag(kwargs, 'world', 'w', False)
+		nodes = [] if empty else [self._mnode(n) for n in _flattenArgs(args)]
+
+		if parent is None and nodes and not world:
+			parents = set(id(n.parent) for n in nodes)
+			if len(parents) == 1 and nodes[0].parent is not None:
+				parent = nodes[0].parent
+
+		grp = self.scene.createNode(
+			'transform', name=name, parent=self._mnode(parent) if parent is not None else None)
+		for node in nodes:
+			self.scene.parent(node, grp)
+		return self._wrap(grp)
+	# end def group():
+
+	def joint(self, *args, **kwargs):
+		name = _flag(kwargs, 'name', 'n', 'joint1')
+		position = _flag(kwargs, 'position', 'p', None)
+		radius = _flag(kwargs, 'radius', 'rad', None)
+
+		selection = self.scene.ls(selection=True, type='joint')
+		parent = selection[0] if selection else None
+
+		jnt = self.scene.createNode('joint', name=name, parent=parent)
+		if position is not None:
+			self.scene.xform(jnt, translation=position, worldSpace=True)
+		if radius is not None:
+			self.scene.setAttr((jnt, 'radius'), radius)
+		self.scene.select(jnt)
+		return self._wrap(jnt)
+	# end def joint():
+
+	def _makeCurve(self, name, points, degree, form, periodic_overlap=0):
+		transform = self.scene.createNode('transform', name=name)
+		shape = self.scene.createNode('nurbsCurve', name=transform.name + 'Shape', parent=transform)
+
+		shape.values['degree'] = degree
+		shape.values['form'] = form
+		shape.values['spans'] = len(points) - (0 if periodic_overlap else degree)
+		all_points = list(points) + list(points[:periodic_overlap])
+		for i, point in enumerate(all_points):
+			self.scene.setAttr((shape, 'controlPoints[{}]'.format(i)), *[float(v) for v in point])
+		return transform
+	# end def _makeCurve():
+
+	def curve(self, *args, **kwargs):
+		name = _flag(kwargs, 'name', 'n', 'curve1')
+		degree = _flag(kwargs, 'degree', 'd', 3)
+		points = _flag(kwargs, 'point', 'p', [])
+		periodic = _flag(kwargs, 'periodic', 'per', False)
+		transform = self._makeCurve(name, points, degree, 2 if periodic else 0)
+		return self._wrap(transform)
+	# end def curve():
+
+	def circle(self, *args, **kwargs):
+		name = _flag(kwargs, 'name', 'n', 'nurbsCircle1')
+		radius = _flag(kwargs, 'radius', 'r', 1.0)
+		normal = list(_flag(kwargs, 'normal', 'nr', (0, 0, 1)))
+		for i, axis in enumerate('xyz'):
+			value = _flag(kwargs, 'normal' + axis.upper(), 'nr' + axis, None)
+			if value is not None:
+				normal[i] = value
+
+		axis = max(range(3), key=lambda i: abs(normal[i]))
+		points = []
+		for a, b in _CIRCLE_POINTS:
+			point = [0.0, 0.0, 0.0]
+			plane = [i for i in range(3) if i != axis]
+			if axis == 1:
+				plane = [0, 2]
+			point[plane[0]] = a * radius
+			point[plane[1]] = b * radius
+			points.append(point)
+
+		transform = self._makeCurve(name, points, 3, 2, periodic_overlap=3)
+		return [self._wrap(transform), None]
+	# end def circle():
+
+	def spaceLocator(self, *args, **kwargs):
+		name = _flag(kwargs, 'name', 'n', 'locator1')
+		transform = self.scene.createNode('transform', name=name)
+		self.scene.createNode('locator', name=transform.name + 'Shape', parent=transform)
+		return self._wrap(transform)
+	# end def spaceLocator():
+
+	def xform(self, target, **kwargs):
+		query = _flag(kwargs, 'query', 'q', False)
+		translation = _flag(kwargs, 'translation', 't', None)
+		rotation = _flag(kwargs, 'rotation', 'ro', None)
+		matrix = _flag(kwargs, 'matrix', 'm', None)
+		world_space = _flag(kwargs, 'worldSpace', 'ws', False)
+
+		if isinstance(target, DependNode):
+			target = target._node
+		elif not isinstance(target, memory.MNode):
+			target = str(target)
+		return self.scene.xform(
+			target, query=query, translation=translation, rotation=rotation, matrix=matrix, worldSpace=world_space)
+	# end def xform():
+
+	def matchTransform(self, node, target, **kwargs):
+		position = _flag(kwargs, 'position', 'pos', False)
+		rotation = _flag(kwargs, 'rotation', 'rot', False)
+		scale = _flag(kwargs, 'scale', 'scl', False)
+		if not (position or rotation or scale):
+			position = rotation = scale = True
+
+		scene = self.scene
+		node = self._mnode(node)
+		current_t, current_r, current_s = mmath.decompose(scene.worldMatrix(node))
+		target_t, target_r, target_s = mmath.decompose(scene.worldMatrix(self._mnode(target)))
+
+		world = mmath.compose(
+			target_t if position else current_t,
+			target_r if rotation else current_r,
+			target_s if scale else current_s,
+		)
+		if node.parent is not None:
+			world = mmath.multiply(world, mmath.invert(scene.worldMatrix(node.parent)))
+		scene.setLocalMatrix(node, world, translate=position, rotate=rotation, scale=scale)
+	# end def matchTransform():
+# end class PmCompat():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+class MemoryBackend(SceneBackend):
+	"""
+	Scene backend running on a MemoryScene, no maya required.
+	"""
+
+	name = 'memory'
+
+	evaluates = False
+
+	def __init__(self, scene=None):
+		self.scene = scene if scene is not None else memory.MemoryScene()
+		self._pm = PmCompat(self.scene)
+	# end def __init__():
+
+	@property
+	def pm(self):
+		return self._pm
+	# end def pm():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												events
+	# ------------------------------------------------------------------------------------------------------------------
+	def addCallback(self, event, func, type=None, native=False):
+		if event not in self.EVENTS:
+			raise memory.MemorySceneError('--Unknown scene event: {}'.format(event))
+		return self.scene.addCallback(event, func, type=type, native=native)
+	# end def addCallback():
+
+	def removeCallback(self, callback_id):
+		self.scene.removeCallback(callback_id)
+	# end def removeCallback():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												graph modifier
+	# ------------------------------------------------------------------------------------------------------------------
+	def nativeNode(self, node):
+		return self._pm._mnode(node)
+	# end def nativeNode():
+
+	def nodeName(self, native):
+		return self.scene.nameOf(native)
+	# end def nodeName():
+
+	def nativeAlive(self, native):
+		return native.alive
+	# end def nativeAlive():
+
+	def wrap(self, native):
+		return self._pm._wrap(native)
+	# end def wrap():
+
+	def applyEdits(self, ops):
+		"""
+		Apply recorded GraphModifier edits, nodes first then connections and values in recorded order.
+		:param ops:  `List` of recorded edits.
+		:return:  None
+		"""
+		scene = self.scene
+		for op in ops:
+			if op[0] == 'create':
+				handle = op[1]
+				handle._native = scene.createNode(handle._type, name=handle._requested)
+
+		for op in ops:
+			if op[0] == 'connect':
+				source, destination = op[1], op[2]
+				scene.connectAttr(
+					(source.node().native(), source.path), (destination.node().native(), destination.path),
+					force=op[3])
+			elif op[0] == 'set':
+				scene.setAttr((op[1].node().native(), op[1].path), *op[2])
+	# end def applyEdits():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												string api
+	# ------------------------------------------------------------------------------------------------------------------
+	def _names(self, nodes):
+		return [self.scene.nameOf(n) for n in nodes]
+	# end def _names():
+
+	def objExists(self, name):
+		return self.scene.objExists(name)
+	# end def objExists():
+
+	def nodeType(self, name):
+		return self.scene.nodeType(str(name))
+	# end def nodeType():
+
+	def nodeTypeExists(self, type_name):
+		return type_name in schema.NODE_TYPES
+	# end def nodeTypeExists():
+
+	def ls(self, names=None, type=None):
+		if names is not None:
+			names = [str(n) for n in names]
+		return self._names(self.scene.ls(names, type=type))
+	# end def ls():
+
+	def listRelatives(self, name, parent=False, allDescendents=False, shapes=False, type=None):
+		return self._names(self.scene.listRelatives(
+			str(name), parent=parent, allDescendents=allDescendents, shapes=shapes, type=type))
+	# end def listRelatives():
+
+	def createNode(self, node_type, name=None, parent=None):
+		node = self.scene.createNode(node_type, name=name, parent=str(parent) if parent is not None else None)
+		return self.scene.nameOf(node)
+	# end def createNode():
+
+	def delete(self, *names):
+		self.scene.delete(*[str(n) for n in names])
+	# end def delete():
+
+	def rename(self, name, new_name):
+		return self.scene.nameOf(self.scene.rename(str(name), new_name))
+	# end def rename():
+
+	def parent(self, child, parent=None, relative=False, shape=False, world=False):
+		node = self.scene.parent(
+			str(child), str(parent) if parent is not None else None, relative=relative, shape=shape, world=world)
+		return self.scene.nameOf(node)
+	# end def parent():
+
+	def select(self, *names, **kwargs):
+		self.scene.select(*[str(n) for n in names], **kwargs)
+	# end def select():
+
+	def lockNode(self, name, lock=True):
+		self.scene.lockNode(str(name), lock=lock)
+	# end def lockNode():
+
+	def xform(self, target, query=False, translation=None, rotation=None, matrix=None, worldSpace=False):
+		return self.scene.xform(
+			str(target), query=query, translation=translation, rotation=rotation, matrix=matrix,
+			worldSpace=worldSpace)
+	# end def xform():
+
+	def getWorldMatrices(self, names):
+		return [self.scene.worldMatrix(str(name)) for name in names]
+	# end def getWorldMatrices():
+
+	def getCurvePoints(self, shape):
+		return self.scene.curvePoints(str(shape))
+	# end def getCurvePoints():
+
+	def setCurvePoints(self, shape, points):
+		self.scene.setCurvePoints(str(shape), points)
+	# end def setCurvePoints():
+
+	def attributeExists(self, name, attr):
+		return self.scene._specFor(self.scene.node(str(name)), attr) is not None
+	# end def attributeExists():
+
+	def attributeType(self, plug, node_type=None):
+		return self.scene.attributeType(str(plug), node_type=node_type)
+	# end def attributeType():
+
+	def listAttr(self, name, userDefined=False):
+		return self.scene.listAttr(str(name), userDefined=userDefined)
+	# end def listAttr():
+
+	def getAttr(self, plug, **kwargs):
+		value = self.scene.getAttr(str(plug), **kwargs)
+		if isinstance(value, tuple) and len(value) == 16:
+			return list(value)
+		return value
+	# end def getAttr():
+
+	def setAttr(self, plug, *values, **kwargs):
+		self.scene.setAttr(str(plug), *values, **kwargs)
+	# end def setAttr():
+
+	def addAttr(self, name, **kwargs):
+		self.scene.addAttr(str(name), **kwargs)
+	# end def addAttr():
+
+	def deleteAttr(self, plug):
+		self.scene.deleteAttr(str(plug))
+	# end def deleteAttr():
+
+	def connectAttr(self, source, destination, force=False):
+		self.scene.connectAttr(str(source), str(destination), force=force)
+	# end def connectAttr():
+
+	def disconnectAttr(self, source, destination):
+		self.scene.disconnectAttr(str(source), str(destination))
+	# end def disconnectAttr():
+
+	def listConnections(self, name, source=True, destination=True, plugs=False, type=None, connections=False):
+		return self.scene.listConnections(
+			str(name), source=source, destination=destination, plugs=plugs, type=type, connections=connections)
+	# end def listConnections():
+# end class MemoryBackend():
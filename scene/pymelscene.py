@@ -0,0 +1,529 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	PYMELSCENE.PY
+	Maya scene backend. Commands go through pymel, recorded graph edits are applied with maya.api.OpenMaya
+	MDGModifiers so a whole build phase costs two doIt() calls instead of one command per edit. Modifiers bypass
+	the undo queue so they are only used while undo is off, eg; batch builds in mayapy. With undo on recorded
+	edits are applied with commands and a build can still be undone.
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+import importlib
+
+from . import stats
+from .base import SceneBackend
+
+
+class PymelSceneException(Exception):
+	pass
+
+
+# callback node type: MFn type, name and dag messages are filtered on the MObject before it is named
+_MFN_TYPES = {'joint': 'kJoint', 'transform': 'kTransform', 'dagNode': 'kDagNode'}
+
+
+def _plainValue(value):
+	"""
+	Convert pymel datatypes to the plain values the string api returns.
+	"""
+	type_name = type(value).__name__
+	if type_name in ('Matrix', 'TransformationMatrix', 'FloatMatrix'):
+		return [float(v) for row in value for v in row]
+	if type_name in ('Vector', 'Point', 'FloatVector', 'Color', 'EulerRotation'):
+		return tuple(value)
+	return value
+# end def _plainValue():
+
+
+def _flags(**kwargs):
+	"""
+	Only pass flags that were actually given, maya commands reject None values.
+	"""
+	return dict((k, v) for k, v in kwargs.items() if v is not None and v is not False)
+# end def _flags():
+
+
+def _countNode(node, client_data):
+	if stats.counter is not None:
+		stats.counter.nodes += 1
+# end def _countNode():
+
+
+def _countConnection(source, destination, made, client_data):
+	if made and stats.counter is not None:
+		stats.counter.connections += 1
+# end def _countConnection():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+class PymelScene(SceneBackend):
+
+	name = 'pymel'
+
+	def __init__(self):
+		self._pm = None
+		self._om2 = None
+		self._callbacks = []
+		# node types known to exist, maya can't unload them while rigbot runs
+		self._nodeTypes = set()
+	# end def __init__():
+
+	@property
+	def pm(self):
+		# pymel is slow to import so only pay for it on first use
+		if self._pm is None:
+			self._pm = importlib.import_module('pymel.core')
+		return self._pm
+	# end def pm():
+
+	@property
+	def om2(self):
+		if self._om2 is None:
+			self._om2 = importlib.import_module('maya.api.OpenMaya')
+		return self._om2
+	# end def om2():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												node handles
+	# ------------------------------------------------------------------------------------------------------------------
+	def nativeNode(self, node):
+		"""
+		MObjectHandle for an existing node.
+		:param node:  `PyNode` or `str`
+		:return:  `MObjectHandle`
+		"""
+		selection = self.om2.MSelectionList()
+		selection.add(str(node))
+		return self.om2.MObjectHandle(selection.getDependNode(0))
+	# end def nativeNode():
+
+	def nodeName(self, native):
+		return self._mobjectName(native.object())
+	# end def nodeName():
+
+	def nativeAlive(self, native):
+		return native.isValid() and native.isAlive()
+	# end def nativeAlive():
+
+	def wrap(self, native):
+		return self.pm.PyNode(self.nodeName(native))
+	# end def wrap():
+
+	def _plug(self, plug_handle):
+		selection = self.om2.MSelectionList()
+		selection.add(str(plug_handle))
+		return selection.getPlug(0)
+	# end def _plug():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												profiling
+	# ------------------------------------------------------------------------------------------------------------------
+	def startCounting(self):
+		"""
+		Count created nodes and connections with DG callbacks so pymel commands are counted too. Values are only
+		counted when they go through the string api or a GraphModifier, pymel Attribute.set() is not.
+		"""
+		if self._callbacks:
+			return
+		om2 = self.om2
+		self._callbacks = [
+			om2.MDGMessage.addNodeAddedCallback(_countNode, 'dependNode'),
+			om2.MDGMessage.addConnectionCallback(_countConnection),
+		]
+	# end def startCounting():
+
+	def stopCounting(self):
+		if self._callbacks:
+			self.om2.MMessage.removeCallbacks(self._callbacks)
+			self._callbacks = []
+	# end def stopCounting():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												events
+	# ------------------------------------------------------------------------------------------------------------------
+	def addCallback(self, event, func, type=None, native=False):
+		"""
+		Register maya api messages for a scene event, see SceneBackend.addCallback().
+		:return:  `List` of MCallbackIds
+		"""
+		om2 = self.om2
+		reference = om2.MObjectHandle if native else self._mobjectName
+
+		def named(mobject, *args):
+			func(reference(mobject))
+		# end def named():
+
+		# name and dag messages can't filter by type themselves
+		function_set = getattr(om2.MFn, _MFN_TYPES[type]) if type in _MFN_TYPES else None
+
+		def matches(mobject):
+			# the name changed message fires for every node in the scene, skip other types before naming them
+			if function_set is not None:
+				return mobject.hasFn(function_set)
+			return type is None or type in self.pm.nodeType(self._mobjectName(mobject), inherited=True)
+		# end def matches():
+
+		def notify(mobject, *args):
+			if matches(mobject):
+				func(reference(mobject))
+		# end def notify():
+
+		def released(mobject, previous, *args):
+			# nodes named as they are made have no previous name
+			if previous and matches(mobject):
+				func(previous)
+		# end def released():
+
+		if event == 'nodeAdded':
+			return [om2.MDGMessage.addNodeAddedCallback(named, type or 'dependNode')]
+		if event == 'nodeRemoved':
+			return [om2.MDGMessage.addNodeRemovedCallback(named, type or 'dependNode')]
+		if event == 'nameChanged':
+			return [om2.MNodeMessage.addNameChangedCallback(om2.MObject.kNullObj, notify)]
+		if event == 'nameReleased':
+			return [om2.MNodeMessage.addNameChangedCallback(om2.MObject.kNullObj, released)]
+		if event == 'parentChanged':
+			return [om2.MDagMessage.addParentAddedCallback(lambda child, parent, data: notify(child.node()))]
+		if event == 'sceneChanged':
+			return [
+				om2.MSceneMessage.addCallback(message, lambda data: func(None))
+				for message in (om2.MSceneMessage.kAfterNew, om2.MSceneMessage.kAfterOpen)]
+		raise PymelSceneException('--Unknown scene event: {}'.format(event))
+	# end def addCallback():
+
+	def removeCallback(self, callback_id):
+		self.om2.MMessage.removeCallbacks(callback_id)
+	# end def removeCallback():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												traversal
+	# ------------------------------------------------------------------------------------------------------------------
+	def iterDependencyGraph(self, root, up_stream=False, breadth_first=False, prune=None):
+		om2 = self.om2
+		iterator = om2.MItDependencyGraph(
+			self.nativeNode(root).object(),
+			om2.MFn.kInvalid,
+			om2.MItDependencyGraph.kUpstream if up_stream else om2.MItDependencyGraph.kDownstream,
+			om2.MItDependencyGraph.kBreadthFirst if breadth_first else om2.MItDependencyGraph.kDepthFirst,
+			om2.MItDependencyGraph.kNodeLevel)
+		return self._iterNative(iterator, prune)
+	# end def iterDependencyGraph():
+
+	def _iterNative(self, iterator, prune):
+		# first node is the root
+		iterator.next()
+		while not iterator.isDone():
+			name = self._mobjectName(iterator.currentNode())
+			if prune is not None and prune(name):
+				iterator.prune()
+			else:
+				yield name
+			iterator.next()
+	# end def _iterNative():
+
+	def _mobjectName(self, mobject):
+		if mobject.hasFn(self.om2.MFn.kDagNode):
+			return self.om2.MFnDagNode(mobject).partialPathName()
+		return self.om2.MFnDependencyNode(mobject).name()
+	# end def _mobjectName():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												graph edits
+	# ------------------------------------------------------------------------------------------------------------------
+	def applyEdits(self, ops):
+		"""
+		Apply recorded GraphModifier edits. Nodes are created and named in a first modifier so the second can find
+		plugs by name, connections and values are then applied in the order they were recorded.
+
+		Modifier edits bypass the undo queue, while undo is on edits are applied with undoable commands instead.
+
+		:param ops:  `List` of recorded edits.
+		:return:  None
+		"""
+		if self._undoEnabled():
+			self._applyCommands(ops)
+			return
+
+		om2 = self.om2
+
+		create_mod = om2.MDGModifier()
+		created = []
+		for op in ops:
+			if op[0] == 'create':
+				handle = op[1]
+				node = create_mod.createNode(handle._type)
+				if handle._requested:
+					create_mod.renameNode(node, handle._requested)
+				created.append((handle, node))
+		if created:
+			create_mod.doIt()
+			for handle, node in created:
+				handle._native = om2.MObjectHandle(node)
+
+		edit_mod = om2.MDGModifier()
+		for op in ops:
+			if op[0] == 'connect':
+				source, destination = self._plug(op[1]), self._plug(op[2])
+				if destination.isDestination:
+					if not op[3]:
+						raise PymelSceneException('--{} is already connected.'.format(op[2]))
+					edit_mod.disconnect(destination.source(), destination)
+				edit_mod.connect(source, destination)
+			elif op[0] == 'set':
+				self._setPlug(edit_mod, self._plug(op[1]), op[2])
+				if stats.counter is not None:
+					stats.counter.sets += 1
+		edit_mod.doIt()
+	# end def applyEdits():
+
+	def _undoEnabled(self):
+		return self.pm.undoInfo(query=True, state=True)
+	# end def _undoEnabled():
+
+	def _applyCommands(self, ops):
+		"""
+		Apply recorded edits one command at a time through the string api, in the same order as applyEdits().
+		:param ops:  `List` of recorded edits.
+		:return:  None
+		"""
+		for op in ops:
+			if op[0] == 'create':
+				handle = op[1]
+				handle._native = self.nativeNode(self.createNode(handle._type, name=handle._requested))
+
+		for op in ops:
+			if op[0] == 'connect':
+				if not op[3] and self.listConnections(op[2], source=True, destination=False):
+					raise PymelSceneException('--{} is already connected.'.format(op[2]))
+				self.connectAttr(op[1], op[2], force=op[3])
+			elif op[0] == 'set':
+				values = [_plainValue(v) for v in op[2]]
+				if len(values) == 1 and isinstance(values[0], (list, tuple)):
+					values = list(values[0])
+				if self.attributeType(op[1]) == 'matrix':
+					flat = [float(v) for row in values for v in row] if len(values) == 4 else values
+					self.setAttr(op[1], *flat, type='matrix')
+				else:
+					self.setAttr(op[1], *values)
+	# end def _applyCommands():
+
+	def _setPlug(self, modifier, plug, values):
+		om2 = self.om2
+		if len(values) == 1:
+			values = values[0]
+
+		attribute = plug.attribute()
+		if self._isMatrixAttribute(attribute):
+			flat = [float(v) for row in values for v in row] if len(values) == 4 else [float(v) for v in values]
+			modifier.newPlugValue(plug, om2.MFnMatrixData().create(om2.MMatrix(flat)))
+
+		elif plug.isCompound:
+			for i, value in enumerate(values):
+				self._setPlug(modifier, plug.child(i), (value,))
+
+		elif attribute.hasFn(om2.MFn.kUnitAttribute):
+			unit_type = om2.MFnUnitAttribute(attribute).unitType()
+			if unit_type == om2.MFnUnitAttribute.kAngle:
+				modifier.newPlugValueMAngle(plug, om2.MAngle(values, om2.MAngle.uiUnit()))
+			elif unit_type == om2.MFnUnitAttribute.kDistance:
+				modifier.newPlugValueMDistance(plug, om2.MDistance(values, om2.MDistance.uiUnit()))
+			else:
+				modifier.newPlugValueDouble(plug, values)
+
+		elif attribute.hasFn(om2.MFn.kEnumAttribute):
+			modifier.newPlugValueInt(plug, int(values))
+
+		elif attribute.hasFn(om2.MFn.kNumericAttribute):
+			numeric_type = om2.MFnNumericAttribute(attribute).numericType()
+			if numeric_type == om2.MFnNumericData.kBoolean:
+				modifier.newPlugValueBool(plug, bool(values))
+			elif numeric_type in (
+					om2.MFnNumericData.kByte, om2.MFnNumericData.kChar, om2.MFnNumericData.kShort,
+					om2.MFnNumericData.kInt):
+				modifier.newPlugValueInt(plug, int(values))
+			else:
+				modifier.newPlugValueDouble(plug, float(values))
+
+		else:
+			raise PymelSceneException('--Unsupported attribute type for recorded set: {}'.format(plug.name()))
+	# end def _setPlug():
+
+	def _isMatrixAttribute(self, attribute):
+		om2 = self.om2
+		return attribute.hasFn(om2.MFn.kMatrixAttribute) or (
+			attribute.hasFn(om2.MFn.kTypedAttribute) and
+			om2.MFnTypedAttribute(attribute).attrType() == om2.MFnData.kMatrix)
+	# end def _isMatrixAttribute():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												string api
+	# ------------------------------------------------------------------------------------------------------------------
+	def objExists(self, name):
+		return self.pm.objExists(str(name))
+	# end def objExists():
+
+	def nodeType(self, name):
+		return self.pm.nodeType(str(name))
+	# end def nodeType():
+
+	def nodeTypeExists(self, type_name):
+		if type_name in self._nodeTypes:
+			return True
+		try:
+			self._queryNodeType(type_name)
+		except RuntimeError:
+			return False
+		self._nodeTypes.add(type_name)
+		return True
+	# end def nodeTypeExists():
+
+	def _queryNodeType(self, type_name):
+		return self.pm.nodeType(type_name, isTypeName=True, derived=True)
+	# end def _queryNodeType():
+
+	def ls(self, names=None, type=None):
+		if names is not None:
+			if not names:
+				return []
+			return [str(n) for n in self.pm.ls([str(n) for n in names], **_flags(type=type))]
+		return [str(n) for n in self.pm.ls(**_flags(type=type))]
+	# end def ls():
+
+	def listRelatives(self, name, parent=False, allDescendents=False, shapes=False, type=None):
+		relatives = self.pm.listRelatives(
+			str(name), **_flags(parent=parent, allDescendents=allDescendents, shapes=shapes, type=type))
+		return [str(n) for n in relatives]
+	# end def listRelatives():
+
+	def createNode(self, node_type, name=None, parent=None):
+		return str(self.pm.createNode(node_type, **_flags(name=name, parent=parent and str(parent))))
+	# end def createNode():
+
+	def delete(self, *names):
+		if names:
+			self.pm.delete([str(n) for n in names])
+	# end def delete():
+
+	def rename(self, name, new_name):
+		return str(self.pm.rename(str(name), new_name))
+	# end def rename():
+
+	def parent(self, child, parent=None, relative=False, shape=False, world=False):
+		args = [str(child)] if (world or parent is None) else [str(child), str(parent)]
+		result = self.pm.parent(*args, **_flags(relative=relative, shape=shape, world=(world or parent is None)))
+		return str(result[0]) if result else str(child)
+	# end def parent():
+
+	def select(self, *names, **kwargs):
+		self.pm.select([str(n) for n in names], **kwargs)
+	# end def select():
+
+	def lockNode(self, name, lock=True):
+		self.pm.lockNode(str(name), lock=lock)
+	# end def lockNode():
+
+	def xform(self, target, query=False, translation=None, rotation=None, matrix=None, worldSpace=False):
+		result = self.pm.xform(str(target), **_flags(
+			query=query, translation=translation, rotation=rotation, matrix=matrix, worldSpace=worldSpace))
+		return list(result) if query else None
+	# end def xform():
+
+	def getWorldMatrices(self, names):
+		if not names:
+			return []
+		om2 = self.om2
+		selection = om2.MSelectionList()
+		# a selection list merges repeated nodes
+		index = {}
+		for name in map(str, names):
+			if name not in index:
+				index[name] = len(index)
+				selection.add(name)
+		return [tuple(selection.getDagPath(index[str(name)]).inclusiveMatrix()) for name in names]
+	# end def getWorldMatrices():
+
+	def getCurvePoints(self, shape):
+		count = self.pm.getAttr('{}.controlPoints'.format(shape), size=True)
+		if not count:
+			return []
+		return [tuple(p) for p in self.pm.getAttr('{}.controlPoints[0:{}]'.format(shape, count - 1))]
+	# end def getCurvePoints():
+
+	def setCurvePoints(self, shape, points):
+		if points:
+			flat = [float(v) for point in points for v in point]
+			self.pm.setAttr('{}.controlPoints[0:{}]'.format(shape, len(points) - 1), *flat)
+			if stats.counter is not None:
+				stats.counter.sets += 1
+	# end def setCurvePoints():
+
+	def attributeExists(self, name, attr):
+		return self.pm.attributeQuery(attr, node=str(name), exists=True)
+	# end def attributeExists():
+
+	def attributeType(self, plug, node_type=None):
+		om2 = self.om2
+		plug = str(plug)
+		name = plug.split('.')[-1].split('[')[0]
+		if node_type is not None:
+			attribute = om2.MNodeClass(node_type).attribute(name)
+		else:
+			selection = om2.MSelectionList()
+			selection.add(plug)
+			attribute = selection.getPlug(0).attribute()
+
+		if attribute.isNull():
+			raise PymelSceneException('--{} has no attribute: {}'.format(node_type or plug, name))
+		if self._isMatrixAttribute(attribute):
+			return 'matrix'
+		if node_type is not None:
+			return self._queryAttributeType(name, type=node_type)
+		return self._queryAttributeType(name, node=plug.split('.', 1)[0])
+	# end def attributeType():
+
+	def _queryAttributeType(self, name, **kwargs):
+		return self.pm.attributeQuery(name, attributeType=True, **kwargs)
+	# end def _queryAttributeType():
+
+	def listAttr(self, name, userDefined=False):
+		return [str(a) for a in (self.pm.listAttr(str(name), **_flags(userDefined=userDefined)) or [])]
+	# end def listAttr():
+
+	def getAttr(self, plug, **kwargs):
+		return _plainValue(self.pm.getAttr(str(plug), **kwargs))
+	# end def getAttr():
+
+	def setAttr(self, plug, *values, **kwargs):
+		self.pm.setAttr(str(plug), *values, **kwargs)
+		if values and stats.counter is not None:
+			stats.counter.sets += 1
+	# end def setAttr():
+
+	def addAttr(self, name, **kwargs):
+		self.pm.addAttr(str(name), **kwargs)
+	# end def addAttr():
+
+	def deleteAttr(self, plug):
+		self.pm.deleteAttr(str(plug))
+	# end def deleteAttr():
+
+	def connectAttr(self, source, destination, force=False):
+		self.pm.connectAttr(str(source), str(destination), force=force)
+	# end def connectAttr():
+
+	def disconnectAttr(self, source, destination):
+		self.pm.disconnectAttr(str(source), str(destination))
+	# end def disconnectAttr():
+
+	def listConnections(self, name, source=True, destination=True, plugs=False, type=None, connections=False):
+		if connections:
+			pairs = self.pm.listConnections(
+				str(name), source=source, destination=destination, plugs=True, connections=True, **_flags(type=type))
+			return [(str(this), str(other)) for this, other in pairs]
+		connections = self.pm.listConnections(
+			str(name), source=source, destination=destination, plugs=plugs, **_flags(type=type))
+		return [str(c) for c in connections]
+	# end def listConnections():
+# end class PymelScene():
@@ -0,0 +1,134 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	REGISTRY.PY
+	Records every node created while a NodeRegistry is active, whether it was made by a command or recorded on a
+	GraphModifier. Modules keep one per build so their nodes are known without walking the graph:
+
+		with module.registry:
+			module.build()
+		module.registry.names()
+
+	Nodes are kept as backend references so renames don't lose them, nodes deleted later are skipped.
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+from . import getBackend
+
+
+class RegistryException(Exception):
+	pass
+
+
+_ACTIVE = []
+
+# (backend, callback id) of the nodeAdded callback feeding the active registry
+_LISTENER = []
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def active():
+	"""
+	Innermost NodeRegistry currently recording.
+	:return:  `NodeRegistry` or None
+	"""
+	return _ACTIVE[-1] if _ACTIVE else None
+# end def active():
+
+
+def _listen(backend):
+	if _LISTENER and _LISTENER[0][0] is backend:
+		return
+	reset()
+	_LISTENER[:] = [(backend, backend.addCallback('nodeAdded', _nodeAdded, native=True))]
+# end def _listen():
+
+
+def reset(backend=None):
+	"""
+	Remove the nodeAdded callback, it is added again when a registry is next entered.
+	:param backend:  Only remove it if it listens to this backend, any backend if None.
+	:return:  None
+	"""
+	if _LISTENER and (backend is None or _LISTENER[0][0] is backend):
+		_LISTENER[0][0].removeCallback(_LISTENER[0][1])
+		del _LISTENER[:]
+# end def reset():
+
+
+def _nodeAdded(native):
+	if _ACTIVE:
+		_ACTIVE[-1].add(native)
+# end def _nodeAdded():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+class NodeRegistry(object):
+
+	def __init__(self, backend=None):
+		"""
+		:param backend:  Scene backend the nodes are created in, the active one if None.
+		"""
+		self.backend = backend if backend is not None else getBackend()
+		self._items = []
+	# end def __init__():
+
+	def __enter__(self):
+		_listen(self.backend)
+		_ACTIVE.append(self)
+		return self
+	# end def __enter__():
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		_ACTIVE.remove(self)
+		return False
+	# end def __exit__():
+
+	def __len__(self):
+		return len(self._items)
+	# end def __len__():
+
+	def __contains__(self, item):
+		"""
+		:param item:  `NodeHandle` or backend node reference, compared by identity.
+		"""
+		return any(item is other for other in self._items)
+	# end def __contains__():
+
+	def add(self, item):
+		"""
+		:param item:  Backend node reference or GraphModifier `NodeHandle`.
+		:return:  None
+		"""
+		self._items.append(item)
+	# end def add():
+
+	def clear(self):
+		self._items = []
+	# end def clear():
+
+	def names(self, type=None):
+		"""
+		Names of recorded nodes that still exist, in creation order.
+		:param type:  `str` or `List` of node types to keep, inherited types match.
+		:return:  `List` of names.
+		"""
+		backend = self.backend
+		names = []
+		seen = set()
+		for item in self._items:
+			native = getattr(item, '_native', item)
+			# handles of recorded nodes that were never committed
+			if native is None or not backend.nativeAlive(native):
+				continue
+			name = backend.nodeName(native)
+			if name not in seen:
+				seen.add(name)
+				names.append(name)
+
+		if type is not None:
+			names = backend.ls(names, type=type)
+		return names
+	# end def names():
+# end class NodeRegistry():
@@ -0,0 +1,481 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	SCHEMA.PY
+	Static attribute metadata for the node types rigbot creates. Used by the in-memory scene to store values
+	and connections without maya, and anywhere a plug's type needs resolving without evaluating it.
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+class SchemaException(Exception):
+	pass
+
+
+NUMERIC_TYPES = ('double', 'doubleLinear', 'doubleAngle', 'float', 'bool', 'enum', 'long', 'short', 'byte', 'time')
+
+
+class AttrSpec(object):
+
+	__slots__ = (
+		'name', 'short', 'type', 'default', 'multi', 'children', 'parent', 'output', 'enums', 'min', 'max',
+		'niceName', 'keyable', 'dynamic'
+	)
+
+	def __init__(
+				self, name, at='double', short=None, default=None, multi=False, children=(), output=False,
+				enums=None, keyable=False, dynamic=False):
+		self.name = name
+		self.short = short
+		self.type = at
+		self.multi = multi
+		self.children = list(children)
+		self.parent = None
+		self.output = output
+		self.enums = enums
+		self.min = None
+		self.max = None
+		self.niceName = None
+		self.keyable = keyable
+		self.dynamic = dynamic
+
+		for child in self.children:
+			child.parent = self
+			child.output = child.output or output
+
+		if default is None and not self.children:
+			default = _defaultFor(at)
+		self.default = default
+	# end def __init__():
+
+	def __repr__(self):
+		return 'AttrSpec({}, {})'.format(self.name, self.type)
+	# end def __repr__():
+
+	@property
+	def isCompound(self):
+		return bool(self.children)
+	# end def isCompound():
+
+	@property
+	def isMatrix(self):
+		return self.type == 'matrix'
+	# end def isMatrix():
+
+	@property
+	def isNumeric(self):
+		return self.type in NUMERIC_TYPES or (
+			self.isCompound and all(child.isNumeric for child in self.children))
+	# end def isNumeric():
+
+	def ancestors(self):
+		"""
+		Compound parents of this attribute, outermost first.
+		:return:  `List` of AttrSpec
+		"""
+		chain = []
+		parent = self.parent
+		while parent is not None:
+			chain.insert(0, parent)
+			parent = parent.parent
+		return chain
+	# end def ancestors():
+
+	def iterSpecs(self):
+		yield self
+		for child in self.children:
+			for spec in child.iterSpecs():
+				yield spec
+	# end def iterSpecs():
+# end class AttrSpec():
+
+
+def _defaultFor(at):
+	if at == 'matrix':
+		return (
+			1.0, 0.0, 0.0, 0.0,
+			0.0, 1.0, 0.0, 0.0,
+			0.0, 0.0, 1.0, 0.0,
+			0.0, 0.0, 0.0, 1.0,
+		)
+	if at in ('bool', 'enum', 'long', 'short', 'byte'):
+		return 0
+	if at in ('string', 'message', 'nurbsCurve'):
+		return None
+	return 0.0
+# end def _defaultFor():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# 												SPEC HELPERS
+# ----------------------------------------------------------------------------------------------------------------------
+def _a(name, at='double', short=None, dv=None, output=False, multi=False, enums=None, keyable=False):
+	return AttrSpec(name, at=at, short=short, default=dv, output=output, multi=multi, enums=enums, keyable=keyable)
+# end def _a():
+
+
+def _v(name, short=None, at='double', dv=(0.0, 0.0, 0.0), suffixes='XYZ', output=False, multi=False, keyable=False):
+	"""
+	Three child numeric compound, eg; translate -> translateX, translateY, translateZ.
+	"""
+	children = [
+		AttrSpec(
+			name + suffix, at=at, short=(short + suffix.lower()) if short else None, default=default,
+			keyable=keyable)
+		for suffix, default in zip(suffixes, dv)
+	]
+	return AttrSpec(name, at=at + '3', short=short, children=children, output=output, multi=multi)
+# end def _v():
+
+
+def _c(name, children, short=None, multi=False, output=False):
+	return AttrSpec(name, at='compound', short=short, children=children, multi=multi, output=output)
+# end def _c():
+
+
+def _m(name, short=None, output=False, multi=False):
+	return AttrSpec(name, at='matrix', short=short, output=output, multi=multi)
+# end def _m():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+class NodeType(object):
+
+	def __init__(self, name, inherits=None, attrs=(), dag=False, shape=False, transform=False):
+		self.name = name
+		self.inherits = inherits
+		self.attrs = list(attrs)
+		self.dag = dag or (inherits is not None and inherits.dag)
+		self.shape = shape or (inherits is not None and inherits.shape)
+		self.transform = transform or (inherits is not None and inherits.transform)
+
+		self.lookup = dict(inherits.lookup) if inherits is not None else {}
+		for top in self.attrs:
+			for spec in top.iterSpecs():
+				self.lookup[spec.name] = spec
+				if spec.short:
+					self.lookup.setdefault(spec.short, spec)
+	# end def __init__():
+
+	def __repr__(self):
+		return 'NodeType({})'.format(self.name)
+	# end def __repr__():
+
+	def isA(self, type_name):
+		node_type = self
+		while node_type is not None:
+			if node_type.name == type_name:
+				return True
+			node_type = node_type.inherits
+		return False
+	# end def isA():
+
+	def hierarchy(self):
+		names = []
+		node_type = self
+		while node_type is not None:
+			names.insert(0, node_type.name)
+			node_type = node_type.inherits
+		return names
+	# end def hierarchy():
+
+	def attr(self, name):
+		return self.lookup.get(name)
+	# end def attr():
+# end class NodeType():
+
+
+NODE_TYPES = {}
+
+
+def register(name, inherits=None, attrs=(), **kwargs):
+	"""
+	Register node type metadata.
+	:param name:  `str` Maya node type name.
+	:param inherits:  `str` Name of already registered parent type.
+	:param attrs:  `List` of top level AttrSpec.
+	:return:  `NodeType`
+	"""
+	parent = NODE_TYPES[inherits] if inherits else None
+	node_type = NodeType(name, inherits=parent, attrs=attrs, **kwargs)
+	NODE_TYPES[name] = node_type
+	return node_type
+# end def register():
+
+
+def getNodeType(name):
+	try:
+		return NODE_TYPES[name]
+	except KeyError:
+		raise SchemaException('--Unknown node type: {}'.format(name))
+# end def getNodeType():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# 												NODE TYPES
+# ----------------------------------------------------------------------------------------------------------------------
+_ONE = (1.0, 1.0, 1.0)
+
+register('node', attrs=[
+	_a('message', 'message', short='msg'),
+	_a('nodeState', 'enum', short='nds', enums=['Normal', 'HasNoEffect', 'Blocking', 'Waiting-Normal']),
+	_a('caching', 'bool', short='cch'),
+	_a('frozen', 'bool', short='fzn'),
+])
+
+register('container', 'node', attrs=[
+	_c('publishedNodeInfo', [
+		_a('publishedNode', 'message', short='pnod'),
+		_a('isHierarchicalNode', 'bool', short='ihn'),
+		_a('publishedNodeType', 'string', short='pntp'),
+	], short='pni', multi=True),
+	_a('iconName', 'string', short='icn'),
+	_a('blackBox', 'bool', short='bbx'),
+	_a('rmbCommand', 'string', short='rmc'),
+])
+
+register('dagNode', 'node', dag=True, attrs=[
+	_a('visibility', 'bool', short='v', dv=1, keyable=True),
+	_a('intermediateObject', 'bool', short='io'),
+	_a('template', 'bool', short='tmp'),
+	_a('lodVisibility', 'bool', short='lodv', dv=1),
+	_a('hiddenInOutliner', 'bool', short='hio'),
+	_a('useOutlinerColor', 'bool', short='uoc'),
+	_v('outlinerColor', short='oc', at='float', suffixes='RGB'),
+	_c('drawOverride', [
+		_a('overrideDisplayType', 'enum', short='ovdt'),
+		_a('overrideLevelOfDetail', 'enum', short='ovlod'),
+		_a('overrideShading', 'bool', short='ovs', dv=1),
+		_a('overrideTexturing', 'bool', short='ovt', dv=1),
+		_a('overridePlayback', 'bool', short='ovp', dv=1),
+		_a('overrideEnabled', 'bool', short='ove'),
+		_a('overrideVisibility', 'bool', short='ovv', dv=1),
+		_a('overrideColor', 'enum', short='ovc'),
+		_a('overrideRGBColors', 'bool', short='ovrgbf'),
+		_c('overrideColorRGB', [
+			_a('overrideColorR', 'float', short='ovcr'),
+			_a('overrideColorG', 'float', short='ovcg'),
+			_a('overrideColorB', 'float', short='ovcb'),
+		], short='ovrgb'),
+	], short='do'),
+	_m('matrix', short='m', output=True),
+	_m('inverseMatrix', short='im', output=True),
+	_m('worldMatrix', short='wm', output=True, multi=True),
+	_m('worldInverseMatrix', short='wim', output=True, multi=True),
+	_m('parentMatrix', short='pm', output=True, multi=True),
+	_m('parentInverseMatrix', short='pim', output=True, multi=True),
+])
+
+register('transform', 'dagNode', transform=True, attrs=[
+	_v('translate', short='t', at='doubleLinear', keyable=True),
+	_v('rotate', short='r', at='doubleAngle', keyable=True),
+	_a('rotateOrder', 'enum', short='ro', enums=['xyz', 'yzx', 'zxy', 'xzy', 'yxz', 'zyx']),
+	_v('scale', short='s', dv=_ONE, keyable=True),
+	_v('shear', short='sh', suffixes=('XY', 'XZ', 'YZ')),
+	_v('rotatePivot', short='rp', at='doubleLinear'),
+	_v('scalePivot', short='sp', at='doubleLinear'),
+	_v('rotateAxis', short='ra', at='doubleAngle'),
+	_a('inheritsTransform', 'bool', short='it', dv=1),
+	_m('offsetParentMatrix', short='opm'),
+	_m('xformMatrix', short='xm', output=True),
+	_a('displayHandle', 'bool', short='dh'),
+	_a('displayLocalAxis', 'bool', short='dla'),
+])
+
+register('joint', 'transform', attrs=[
+	_v('jointOrient', short='jo', at='doubleAngle'),
+	_a('segmentScaleCompensate', 'bool', short='ssc', dv=1),
+	_v('inverseScale', short='is', dv=_ONE),
+	_a('radius', short='radi', dv=1.0),
+	_a('drawStyle', 'enum', short='ds', enums=['Bone', 'Multi-child as Box', 'None', 'Joint']),
+	_v('preferredAngle', short='pa', at='doubleAngle'),
+	_a('side', 'enum', short='sd'),
+	_a('type', 'enum', short='typ'),
+	_a('drawLabel', 'bool', short='dl'),
+])
+
+register('shape', 'dagNode', shape=True)
+
+register('nurbsCurve', 'shape', attrs=[
+	_a('lineWidth', 'float', short='lw', dv=-1.0),
+	_a('form', 'enum', short='f', enums=['Open', 'Closed', 'Periodic'], output=True),
+	_a('spans', 'long', short='sp', output=True),
+	_a('degree', 'long', short='d', dv=1, output=True),
+	_c('controlPoints', [
+		_a('xValue', 'doubleLinear', short='xv'),
+		_a('yValue', 'doubleLinear', short='yv'),
+		_a('zValue', 'doubleLinear', short='zv'),
+	], short='cp', multi=True),
+	AttrSpec('create', at='nurbsCurve', short='cr'),
+	AttrSpec('local', at='nurbsCurve', short='l', output=True),
+	AttrSpec('worldSpace', at='nurbsCurve', short='ws', output=True, multi=True),
+])
+
+register('locator', 'shape', attrs=[
+	_v('localPosition', short='lp', at='doubleLinear'),
+	_v('localScale', short='los', dv=_ONE),
+	_v('worldPosition', short='wp', at='doubleLinear', output=True, multi=True),
+])
+
+# utility nodes --------------------------------------------------------------------------------------------------------
+register('multMatrix', 'node', attrs=[
+	_m('matrixIn', short='i', multi=True),
+	_m('matrixSum', short='o', output=True),
+])
+
+register('decomposeMatrix', 'node', attrs=[
+	_m('inputMatrix', short='imat'),
+	_a('inputRotateOrder', 'enum', short='ro'),
+	_v('outputTranslate', short='ot', at='doubleLinear', output=True),
+	_v('outputRotate', short='or', at='doubleAngle', output=True),
+	_v('outputScale', short='os', dv=_ONE, output=True),
+	_v('outputShear', short='osh', output=True),
+	_c('outputQuat', [
+		_a('outputQuatX', short='oqx'), _a('outputQuatY', short='oqy'),
+		_a('outputQuatZ', short='oqz'), _a('outputQuatW', short='oqw', dv=1.0),
+	], short='oq', output=True),
+])
+
+register('composeMatrix', 'node', attrs=[
+	_v('inputTranslate', short='it', at='doubleLinear'),
+	_v('inputRotate', short='ir', at='doubleAngle'),
+	_v('inputScale', short='is', dv=_ONE),
+	_v('inputShear', short='ish'),
+	_c('inputQuat', [
+		_a('inputQuatX', short='iqx'), _a('inputQuatY', short='iqy'),
+		_a('inputQuatZ', short='iqz'), _a('inputQuatW', short='iqw', dv=1.0),
+	], short='iq'),
+	_a('inputRotateOrder', 'enum', short='iro'),
+	_a('useEulerRotation', 'bool', short='uer', dv=1),
+	_m('outputMatrix', short='omat', output=True),
+])
+
+register('inverseMatrix', 'node', attrs=[
+	_m('inputMatrix', short='imat'),
+	_m('outputMatrix', short='omat', output=True),
+])
+
+register('transposeMatrix', 'node', attrs=[
+	_m('inputMatrix', short='imat'),
+	_m('outputMatrix', short='omat', output=True),
+])
+
+register('wtAddMatrix', 'node', attrs=[
+	_c('wtMatrix', [_m('matrixIn', short='m'), _a('weightIn', short='w')], short='wtm', multi=True),
+	_m('matrixSum', short='o', output=True),
+])
+
+register('fourByFourMatrix', 'node', attrs=[
+	_a('in{}{}'.format(r, c), short='i{}{}'.format(r, c), dv=1.0 if r == c else 0.0)
+	for r in range(4) for c in range(4)
+] + [_m('output', short='o', output=True)])
+
+register('blendMatrix', 'node', attrs=[
+	_m('inputMatrix', short='imat'),
+	_a('envelope', short='env', dv=1.0),
+	_c('target', [
+		_m('targetMatrix', short='tmat'),
+		_a('useMatrix', 'bool', short='umat'),
+		_a('weight', short='wgt', dv=1.0),
+		_a('scaleWeight', short='sclw', dv=1.0),
+		_a('translateWeight', short='tw', dv=1.0),
+		_a('rotateWeight', short='rw', dv=1.0),
+		_a('shearWeight', short='shw', dv=1.0),
+	], short='tgt', multi=True),
+	_m('outputMatrix', short='omat', output=True),
+])
+
+register('pickMatrix', 'node', attrs=[
+	_m('inputMatrix', short='imat'),
+	_a('useTranslate', 'bool', short='ut', dv=1),
+	_a('useRotate', 'bool', short='ur', dv=1),
+	_a('useScale', 'bool', short='us', dv=1),
+	_a('useShear', 'bool', short='ush', dv=1),
+	_m('outputMatrix', short='omat', output=True),
+])
+
+register('vectorProduct', 'node', attrs=[
+	_a('operation', 'enum', short='op', dv=1, enums=['No Operation', 'Dot Product', 'Cross Product',
+														'Vector Matrix Product', 'Point Matrix Product']),
+	_v('input1', short='i1'),
+	_v('input2', short='i2'),
+	_m('matrix', short='m'),
+	_a('normalizeOutput', 'bool', short='no'),
+	_v('output', short='o', output=True),
+])
+
+register('plusMinusAverage', 'node', attrs=[
+	_a('operation', 'enum', short='op', dv=1, enums=['No operation', 'Sum', 'Subtract', 'Average']),
+	_a('input1D', short='i1', multi=True),
+	_c('input2D', [_a('input2Dx', short='i2x'), _a('input2Dy', short='i2y')], short='i2', multi=True),
+	_v('input3D', short='i3', suffixes='xyz', multi=True),
+	_a('output1D', short='o1', output=True),
+	_c('output2D', [_a('output2Dx', short='o2x'), _a('output2Dy', short='o2y')], short='o2', output=True),
+	_v('output3D', short='o3', suffixes='xyz', output=True),
+])
+
+register('multiplyDivide', 'node', attrs=[
+	_a('operation', 'enum', short='op', dv=1, enums=['No operation', 'Multiply', 'Divide', 'Power']),
+	_v('input1', short='i1'),
+	_v('input2', short='i2', dv=_ONE),
+	_v('output', short='o', output=True),
+])
+
+register('multDoubleLinear', 'node', attrs=[
+	_a('input1', short='i1', dv=1.0),
+	_a('input2', short='i2', dv=1.0),
+	_a('output', short='o', output=True),
+])
+
+register('addDoubleLinear', 'node', attrs=[
+	_a('input1', short='i1'),
+	_a('input2', short='i2'),
+	_a('output', short='o', output=True),
+])
+
+register('clamp', 'node', attrs=[
+	_v('min', short='mn', suffixes='RGB'),
+	_v('max', short='mx', suffixes='RGB'),
+	_v('input', short='ip', suffixes='RGB'),
+	_v('output', short='op', suffixes='RGB', output=True),
+])
+
+register('reverse', 'node', attrs=[
+	_v('input', short='i'),
+	_v('output', short='o', output=True),
+])
+
+register('blendTwoAttr', 'node', attrs=[
+	_a('input', short='i', multi=True),
+	_a('attributesBlender', short='ab'),
+	_a('current', 'long', short='c'),
+	_a('output', short='o', output=True),
+])
+
+register('distanceBetween', 'node', attrs=[
+	_v('point1', short='p1', at='doubleLinear'),
+	_m('inMatrix1', short='im1'),
+	_v('point2', short='p2', at='doubleLinear'),
+	_m('inMatrix2', short='im2'),
+	_a('distance', 'doubleLinear', short='d', output=True),
+])
+
+register('animBlendNodeAdditiveDA', 'node', attrs=[
+	_a('inputA', 'doubleAngle', short='ia'),
+	_a('inputB', 'doubleAngle', short='ib'),
+	_a('weightA', short='wa', dv=1.0),
+	_a('weightB', short='wb', dv=1.0),
+	_a('accumulationMode', 'enum', short='am'),
+	_a('output', 'doubleAngle', short='o', output=True),
+])
+
+register('math_Acos', 'node', attrs=[
+	_a('input', short='i'),
+	_a('output', 'doubleAngle', short='o', output=True),
+])
+
+register('skinCluster', 'node', attrs=[
+	_m('matrix', short='ma', multi=True),
+	_m('bindPreMatrix', short='pm', multi=True),
+])
@@ -0,0 +1,53 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	STATS.PY
+	Scene edit counters for build profiling. Backends report nodes created, connections made and attributes set
+	here, whether the edit came from a command or a GraphModifier. Nothing is counted unless a counter is active,
+	disabled cost is one check per edit.
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+# active EditCounter, None when not counting
+counter = None
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+class EditCounter(object):
+
+	__slots__ = ('nodes', 'connections', 'sets')
+
+	def __init__(self):
+		self.nodes = 0
+		self.connections = 0
+		self.sets = 0
+	# end def __init__():
+
+	def snapshot(self):
+		return self.nodes, self.connections, self.sets
+	# end def snapshot():
+# end class EditCounter():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def start():
+	"""
+	Start counting with a new counter.
+	:return:  `EditCounter`
+	"""
+	global counter
+	counter = EditCounter()
+	return counter
+# end def start():
+
+
+def stop():
+	"""
+	Stop counting, the last counter keeps its totals.
+	:return:  None
+	"""
+	global counter
+	counter = None
+# end def stop():
@@ -0,0 +1,177 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	TRAVERSE.PY
+	Dependency graph traversal over the scene backend string api, the python equivalent of MItDependencyGraph.
+
+		# every dg node driven by the module input, without going through dag nodes
+		for node in traverse.iterGraph('spine_input', prune_type='dagNode'):
+			...
+
+		# connections between the nodes, eg; for graph rewriting tools
+		for source, destination in traverse.iterGraph('spine_input', plugs=True):
+			...
+
+	Each node is visited once. Nodes are tracked in a set and the frontier is a deque, so a traversal costs one
+	listConnections per visited node.
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+import collections
+import itertools
+
+from . import getBackend
+
+
+class TraverseException(Exception):
+	pass
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def iterGraph(roots, up_stream=False, down_stream=True, breadth_first=False, plugs=False, type=None,
+			  prune_type=None, depth=None, stop=None, include_roots=False, native=False):
+	"""
+	Iterate nodes connected to roots.
+
+	:param roots:  Node, plug or `List` of them to start from. Plugs only follow their own connections on the first
+					step, later steps follow every connection of a node.
+	:param up_stream:  `bool` Follow incoming connections.
+	:param down_stream:  `bool` Follow outgoing connections.
+	:param breadth_first:  `bool` Visit nearest nodes first instead of depth first.
+	:param plugs:  `bool` Yield every (source plug, destination plug) connection between traversed nodes instead of
+					nodes.
+	:param type:  `str` or `List` of node types to yield, other nodes are still traversed.
+	:param prune_type:  `str` or `List` of node types not to yield or traverse past.
+	:param depth:  `int` Number of connections to follow away from roots, unlimited if None.
+	:param stop:  Node or `List` of nodes not to yield or traverse past.
+	:param include_roots:  `bool` Also yield the root nodes.
+	:param native:  `bool` Use the backend's native iterator when it has one, only for node level depth first or
+					breadth first iteration in a single direction without depth limit.
+	:yield:  `str` node names or (`str`, `str`) plug pairs.
+	"""
+	if not (up_stream or down_stream):
+		raise TraverseException('--Traversal needs up_stream and/or down_stream.')
+
+	backend = getBackend()
+	roots = [str(root) for root in _asList(roots)]
+	stop = set(str(node) for node in _asList(stop))
+
+	if native and not plugs and depth is None and up_stream != down_stream:
+		nodes = _iterNative(backend, roots, up_stream, breadth_first, type, prune_type, stop, include_roots)
+		if nodes is not None:
+			return nodes
+
+	return _iterGraph(
+		backend, roots, up_stream, down_stream, breadth_first, plugs, type, prune_type, depth, stop, include_roots)
+# end def iterGraph():
+
+
+def listGraph(roots, **kwargs):
+	"""
+	iterGraph() as a list.
+	"""
+	return list(iterGraph(roots, **kwargs))
+# end def listGraph():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def _asList(items):
+	if items is None:
+		return []
+	if isinstance(items, (list, tuple, set, frozenset)):
+		return list(items)
+	return [items]
+# end def _asList():
+
+
+def _isType(backend, node, types):
+	return bool(backend.ls([node], type=types))
+# end def _isType():
+
+
+def _iterGraph(backend, roots, up_stream, down_stream, breadth_first, plugs, type, prune_type, depth, stop,
+			   include_roots):
+	root_nodes = set(root.split('.', 1)[0] for root in roots)
+	visited = set()
+	edges = set() if (plugs and up_stream and down_stream) else None
+	frontier = collections.deque((root, 0) for root in roots)
+	pop = frontier.popleft if breadth_first else frontier.pop
+
+	while frontier:
+		item, level = pop()
+		node = item.split('.', 1)[0]
+		# a plug root is also visited as its node later on
+		if item == node:
+			if node in visited:
+				continue
+			visited.add(node)
+
+			if node in root_nodes:
+				if include_roots and not plugs and (type is None or _isType(backend, node, type)):
+					yield node
+			elif not plugs and (type is None or _isType(backend, node, type)):
+				yield node
+
+		if depth is not None and level >= depth:
+			continue
+
+		if plugs:
+			connections = []
+			if up_stream:
+				connections += [
+					((other, this), other) for this, other in
+					backend.listConnections(item, destination=False, connections=True)]
+			if down_stream:
+				connections += [
+					((this, other), other) for this, other in
+					backend.listConnections(item, source=False, connections=True)]
+		else:
+			connections = [
+				(None, other) for other in backend.listConnections(item, source=up_stream, destination=down_stream)]
+
+		# reversed so depth first pops connections in order
+		for connection, other in reversed(connections):
+			other = other.split('.', 1)[0]
+			if other in stop or (prune_type and _isType(backend, other, prune_type)):
+				continue
+
+			if plugs:
+				if edges is not None:
+					if connection in edges:
+						continue
+					edges.add(connection)
+				yield connection
+
+			if other not in visited:
+				frontier.append((other, level + 1))
+# end def _iterGraph():
+
+
+def _iterNative(backend, roots, up_stream, breadth_first, type, prune_type, stop, include_roots):
+	def prune(node):
+		return node in stop or bool(prune_type and _isType(backend, node, prune_type))
+	# end def prune():
+
+	iterators = []
+	for root in roots:
+		iterator = backend.iterDependencyGraph(root, up_stream=up_stream, breadth_first=breadth_first, prune=prune)
+		if iterator is None:
+			return None
+		iterators.append(iterator)
+
+	return _chainNative(backend, roots, iterators, type, include_roots)
+# end def _iterNative():
+
+
+def _chainNative(backend, roots, iterators, type, include_roots):
+	visited = set()
+	for root, iterator in zip(roots, iterators):
+		nodes = itertools.chain([root], iterator) if include_roots else iterator
+		for node in nodes:
+			if node in visited:
+				continue
+			visited.add(node)
+			if type is None or _isType(backend, node, type):
+				yield node
+# end def _chainNative():
@@ -0,0 +1,219 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	SKELETON.PY
+	Cached index of the scaffold skeleton: joint -> module root, module root -> chain and name -> node. The index is
+	built on first query and kept until the scene backend reports that a joint was added, deleted, renamed or
+	parented, so tools that keep asking for scaffolds don't walk the skeleton every time.
+
+	Module roots are tagged with attributes after their joints are made, attribute changes are not watched so code
+	that tags or untags module roots calls invalidate().
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+from . import user, scene
+
+
+_INDEX = []
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def index():
+	"""
+	Skeleton index of the active scene backend, made when first asked for or when the backend changes.
+	:return:  `SkeletonIndex`
+	"""
+	backend = scene.getBackend()
+	if _INDEX and _INDEX[0].backend is backend:
+		return _INDEX[0]
+	if _INDEX:
+		_INDEX[0].detach()
+	_INDEX[:] = [SkeletonIndex(backend)]
+	return _INDEX[0]
+# end def index():
+
+
+def invalidate():
+	"""
+	Invalidate the active index, if there is one.
+	:return:  None
+	"""
+	if _INDEX:
+		_INDEX[0].invalidate()
+# end def invalidate():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def walk(root, nested=True):
+	"""
+	Depth first walk over joints by name, partitions joints into module chains in one pass. Joints belong to the
+	closest module root above them, ownership is tracked by node so duplicate short names are fine.
+
+	:param root: Joint to start from.
+	:param nested: `bool` Also walk into module roots below root, False only returns the chain of root.
+	:return: `List` of chains of joint names, each starting with its module root.
+	"""
+	backend = scene.getBackend()
+	root = str(root)
+
+	chains = []
+	stack = [(root, None)]
+	while stack:
+		jnt, chain = stack.pop()
+		if backend.attributeExists(jnt, 'RB_MODULE_ROOT'):
+			if jnt != root and not nested:
+				continue
+			chain = [jnt]
+			chains.append(chain)
+		elif chain is not None:
+			chain.append(jnt)
+
+		children = backend.listRelatives(jnt, type='joint')
+		# reversed so children are popped in order
+		stack.extend((child, chain) for child in reversed(children))
+
+	return chains
+# end def walk():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+class SkeletonIndex(object):
+
+	WATCH = ('nodeAdded', 'nodeRemoved', 'nameChanged', 'parentChanged')
+
+	def __init__(self, backend=None):
+		"""
+		:param backend:  Scene backend to index, the active one if None.
+		"""
+		self.backend = backend if backend is not None else scene.getBackend()
+		self.builds = 0
+
+		self._chains = None
+		self._byRoot = {}
+		self._owners = {}
+		self._nodes = {}
+		self._callbacks = []
+		self.attach()
+	# end def __init__():
+
+	def __contains__(self, name):
+		self._build()
+		return str(name) in self._owners
+	# end def __contains__():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												invalidation
+	# ------------------------------------------------------------------------------------------------------------------
+	def attach(self):
+		"""
+		Listen for joint changes on the backend.
+		:return:  None
+		"""
+		if self._callbacks:
+			return
+		for event in self.WATCH:
+			self._callbacks.append(self.backend.addCallback(event, self._changed, type='joint'))
+		self._callbacks.append(self.backend.addCallback('sceneChanged', self._changed))
+	# end def attach():
+
+	def detach(self):
+		"""
+		Stop listening, the index is invalid from here on and rebuilt on every query.
+		:return:  None
+		"""
+		for callback_id in self._callbacks:
+			self.backend.removeCallback(callback_id)
+		self._callbacks = []
+		self.invalidate()
+	# end def detach():
+
+	def _changed(self, name):
+		self.invalidate()
+	# end def _changed():
+
+	def invalidate(self):
+		self._chains = None
+		self._byRoot = {}
+		self._owners = {}
+		self._nodes = {}
+	# end def invalidate():
+
+	@property
+	def valid(self):
+		return self._chains is not None
+	# end def valid():
+
+	def _build(self):
+		if self._chains is not None and self._callbacks:
+			return
+
+		root = user.prefs['root-joint']
+		chains = walk(root) if self.backend.objExists(root) else []
+
+		self._byRoot = dict((chain[0], chain) for chain in chains)
+		self._owners = dict((jnt, chain[0]) for chain in chains for jnt in chain)
+		self._chains = chains
+		self.builds += 1
+	# end def _build():
+
+	# ------------------------------------------------------------------------------------------------------------------
+	# 												queries
+	# ------------------------------------------------------------------------------------------------------------------
+	def chains(self):
+		"""
+		:return:  `List` of module chains as joint names, depth first from the root joint.
+		"""
+		self._build()
+		return [list(chain) for chain in self._chains]
+	# end def chains():
+
+	def moduleRoots(self):
+		"""
+		:return:  `List` of module root names.
+		"""
+		self._build()
+		return [chain[0] for chain in self._chains]
+	# end def moduleRoots():
+
+	def chain(self, module_root):
+		"""
+		:param module_root:  Module root joint.
+		:return:  `List` of joint names starting with module_root or None if it is not a module root.
+		"""
+		self._build()
+		chain = self._byRoot.get(str(module_root))
+		return list(chain) if chain is not None else None
+	# end def chain():
+
+	def moduleRoot(self, joint):
+		"""
+		:param joint:  Skeleton joint.
+		:return:  `str` name of the module root owning joint, or None.
+		"""
+		self._build()
+		return self._owners.get(str(joint))
+	# end def moduleRoot():
+
+	def node(self, name):
+		"""
+		pm node of a joint, made once per joint until the skeleton changes. Works for any joint in the scene and
+		does not need the chains to be built.
+		:param name:  `str` Joint name.
+		:return:  `PyNode` or None if there is no joint with that name.
+		"""
+		name = str(name)
+		node = self._nodes.get(name)
+		if node is None:
+			if not self.backend.ls([name], type='joint'):
+				return None
+			node = self.backend.pm.PyNode(name)
+			if self._callbacks:
+				self._nodes[name] = node
+		return node
+	# end def node():
+
+	def nodes(self, names):
+		return [self.node(name) for name in names]
+	# end def nodes():
+# end class SkeletonIndex():
@@ -0,0 +1,69 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	TESTS
+	Headless tests on the memory scene backend, run from the folder containing rigbot:
+
+		python -m unittest discover -s rigbot/tests -t .
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+import copy
+import sys
+import unittest
+
+try:
+	from StringIO import StringIO
+except ImportError:
+	from io import StringIO
+
+from .. import scene, user, utils
+from ..rig import builder
+
+
+class MemorySceneTest(unittest.TestCase):
+	"""
+	Every test starts in a fresh memory scene with the default prefs.
+	"""
+
+	def setUp(self):
+		self._prefs = copy.deepcopy(user.prefs)
+		self._debug, user.debug = user.debug, False
+		scene.setBackend('memory', fresh=True)
+		self.backend = scene.getBackend()
+		self.pm = scene.pm
+	# end def setUp():
+
+	def tearDown(self):
+		user.prefs.clear()
+		user.prefs.update(self._prefs)
+		user.debug = self._debug
+	# end def tearDown():
+
+	def makeRig(self):
+		"""
+		Root with an ik arm, a space switch spine and a fk tail socketed to the spine.
+		:return:  `PyNode` root joint.
+		"""
+		root = utils.makeRoot()
+		arm = builder.Scaffold.make(n='L_arm', l=3, mt='SimpleIkArm', s=root)
+		arm.translate.set(3.0, 4.0, 5.0)
+		spine = builder.Scaffold.make(n='spine', l=4, mt='SpaceSwitchChain', s=root)
+		builder.Scaffold.make(n='tail', l=5, mt='SimpleFk', s=spine)
+		return root
+	# end def makeRig():
+
+	def quietly(self, func, *args, **kwargs):
+		"""
+		Call func with stdout captured.
+		:return:  `tuple` of (func result, printed text).
+		"""
+		stdout, sys.stdout = sys.stdout, StringIO()
+		try:
+			result = func(*args, **kwargs)
+			return result, sys.stdout.getvalue()
+		finally:
+			sys.stdout = stdout
+	# end def quietly():
+# end class MemorySceneTest():
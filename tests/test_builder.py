@@ -0,0 +1,99 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	TEST_BUILDER.PY
+	Incremental builds and dismantling.
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+from . import MemorySceneTest
+from .. import data, user
+from ..rig import builder
+
+
+class TestIncrementalBuild(MemorySceneTest):
+
+	def test_fullBuildSkipsFingerprints(self):
+		self.makeRig()
+		self.quietly(builder.batchBuild)
+		self.assertEqual(builder.getBuiltFingerprint('L_arm'), (None, None))
+	# end def test_fullBuildSkipsFingerprints():
+
+	def test_fullBuildStoresFingerprintsWithPref(self):
+		user.prefs['store-fingerprints'] = True
+		self.makeRig()
+		self.quietly(builder.batchBuild)
+		_, printed = self.quietly(builder.batchBuild, incremental=True)
+		self.assertIn('0 of 3 modules changed', printed)
+	# end def test_fullBuildStoresFingerprintsWithPref():
+
+	def test_unchangedModulesAreSkipped(self):
+		self.makeRig()
+		self.quietly(builder.batchBuild, incremental=True)
+		nodes = set(self.backend.ls())
+
+		_, printed = self.quietly(builder.batchBuild, incremental=True)
+		self.assertIn('0 of 3 modules changed', printed)
+		self.assertEqual(set(self.backend.ls()), nodes)
+	# end def test_unchangedModulesAreSkipped():
+
+	def test_changesDirtyDownstreamModules(self):
+		self.makeRig()
+		self.quietly(builder.batchBuild, incremental=True)
+		nodes = set(self.backend.ls())
+
+		builder.dismantleModules(['spine'])
+		self.pm.PyNode('spine_02_BIND').translateY.set(3.0)
+		_, printed = self.quietly(builder.batchBuild, incremental=True)
+
+		# tail is socketed to the spine
+		self.assertIn('2 of 3 modules changed', printed)
+		self.assertEqual(set(self.backend.ls()), nodes)
+	# end def test_changesDirtyDownstreamModules():
+# end class TestIncrementalBuild():
+
+
+class TestDismantle(MemorySceneTest):
+
+	def test_scaffoldAttrsAreRestored(self):
+		self.makeRig()
+		backend = self.backend
+		backend.addAttr('tail_02_BIND', longName='RB_twist', attributeType='double')
+		backend.setAttr('tail_02_BIND.RB_twist', 2.0, lock=True)
+		self.quietly(builder.batchBuild)
+
+		# anything the build or a user does to the scaffold after the build started
+		backend.setAttr('tail_02_BIND.RB_twist', 5.0, lock=False)
+		backend.setAttr('L_arm_01_BIND.RB_include_end_joint', False)
+		builder.dismantleModules()
+
+		self.assertEqual(backend.getAttr('tail_02_BIND.RB_twist'), 2.0)
+		self.assertTrue(backend.getAttr('tail_02_BIND.RB_twist', lock=True))
+		self.assertTrue(backend.getAttr('L_arm_01_BIND.RB_include_end_joint'))
+	# end def test_scaffoldAttrsAreRestored():
+
+	def test_displayShapeColour(self):
+		self.makeRig()
+		colour = lambda: tuple(self.backend.getAttr('L_arm_displayShape.overrideColorRGB'))
+		created = colour()
+		expected = data.Colours.get_value(user.prefs['default-jnt-colour'], space=user.prefs['viewport-colour-space'])
+		for value, default in zip(created, expected):
+			self.assertAlmostEqual(value, default)
+
+		self.quietly(builder.batchBuild)
+		builder.dismantleModules()
+		self.assertEqual(colour(), created)
+	# end def test_displayShapeColour():
+
+	def test_dismantleRemovesRig(self):
+		self.makeRig()
+		scaffold = set(self.backend.ls())
+		self.quietly(builder.batchBuild)
+		builder.dismantleModules()
+		# _Root is not dismantled
+		left = [n for n in set(self.backend.ls()) - scaffold if not n.startswith(('GOD', 'cog', 'modules'))]
+		self.assertEqual(left, [])
+		self.assertTrue(self.pm.PyNode('L_arm_01_BIND').getShape())
+	# end def test_dismantleRemovesRig():
+# end class TestDismantle():
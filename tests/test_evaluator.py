@@ -0,0 +1,123 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	TEST_EVALUATOR.PY
+	Offline evaluation of node networks and its matrix math.
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+import unittest
+
+from . import MemorySceneTest
+from ..rig import builder
+from ..scene import evaluator, mmath
+
+np = mmath.numpyModule()
+
+
+@unittest.skipIf(np is None, 'numpy is required to evaluate rig networks.')
+class TestMath(unittest.TestCase):
+
+	def setUp(self):
+		self.random = np.random.RandomState(0)
+	# end def setUp():
+
+	def test_eulerRoundTrip(self):
+		# middle axis away from gimbal lock, where angles aren't unique
+		rotate = self.random.uniform(-170.0, 170.0, (100, 3))
+		for order, axes in enumerate(evaluator.ROTATE_ORDERS):
+			rotate[:, 'xyz'.index(axes[1])] = self.random.uniform(-80.0, 80.0, 100)
+			rotation = evaluator.eulerToMatrix(np, rotate, order)
+			np.testing.assert_allclose(evaluator.matrixToEuler(np, rotation, order), rotate, atol=1e-8)
+	# end def test_eulerRoundTrip():
+
+	def test_eulerMatchesAxisRotations(self):
+		# xyz applies x first with row vectors
+		rotation = evaluator.eulerToMatrix(np, [90.0, 90.0, 0.0])
+		np.testing.assert_allclose(np.dot([0.0, 1.0, 0.0], rotation), [1.0, 0.0, 0.0], atol=1e-12)
+	# end def test_eulerMatchesAxisRotations():
+
+	def test_composeRoundTrip(self):
+		translate = self.random.uniform(-10.0, 10.0, (100, 3))
+		rotation = evaluator.eulerToMatrix(np, self.random.uniform(-180.0, 180.0, (100, 3)))
+		scale = self.random.uniform(0.1, 3.0, (100, 3))
+		# mirrored matrices come back with negative x scale
+		scale[:, 0] *= self.random.choice([-1.0, 1.0], 100)
+		shear = self.random.uniform(-1.0, 1.0, (100, 3))
+		matrix = evaluator.composeMatrix(np, translate, rotation, scale, shear)
+		for expected, result in zip((translate, rotation, scale, shear), evaluator.decomposeMatrix(np, matrix)):
+			np.testing.assert_allclose(result, expected, atol=1e-10)
+	# end def test_composeRoundTrip():
+
+	def test_quatRoundTrip(self):
+		rotation = evaluator.eulerToMatrix(np, self.random.uniform(-180.0, 180.0, (100, 3)))
+		np.testing.assert_allclose(
+			evaluator.quatToMatrix(np, evaluator.matrixToQuat(np, rotation)), rotation, atol=1e-10)
+	# end def test_quatRoundTrip():
+
+	def test_blendEnds(self):
+		a = evaluator.composeMatrix(
+			np, [1.0, 2.0, 3.0], evaluator.eulerToMatrix(np, [10.0, 20.0, 30.0]), [1.0, 2.0, 1.0])
+		b = evaluator.composeMatrix(np, [-4.0, 0.0, 1.0], evaluator.eulerToMatrix(np, [0.0, -45.0, 90.0]))
+		blended = evaluator.blendMatrices(np, a, b, np.array([0.0, 1.0]))
+		np.testing.assert_allclose(blended[0], a, atol=1e-10)
+		np.testing.assert_allclose(blended[1], b, atol=1e-10)
+	# end def test_blendEnds():
+# end class TestMath():
+
+
+@unittest.skipIf(np is None, 'numpy is required to evaluate rig networks.')
+class TestGraphEvaluator(MemorySceneTest):
+
+	def setUp(self):
+		super(TestGraphEvaluator, self).setUp()
+		for name in ['parent', 'child', 'target']:
+			self.backend.createNode('transform', name=name)
+		self.backend.parent('child', 'parent')
+		self.backend.setAttr('child.translate', 1.0, 2.0, 3.0)
+
+		self.backend.createNode('multiplyDivide', name='double_md')
+		self.backend.setAttr('double_md.input2', 2.0, 2.0, 2.0)
+		self.backend.connectAttr('parent.translate', 'double_md.input1')
+		self.backend.connectAttr('double_md.output', 'target.translate')
+	# end def setUp():
+
+	def test_evaluatesBatches(self):
+		ev = evaluator.GraphEvaluator(['target.translate', 'child.worldMatrix[0]'], inputs=['parent.translate'])
+		translate = np.random.RandomState(0).uniform(-10.0, 10.0, (50, 3))
+		result = ev.evaluate({'parent.translate': translate})
+
+		np.testing.assert_allclose(result['target.translate'], translate * 2.0)
+		self.assertEqual(result['child.worldMatrix[0]'].shape, (50, 4, 4))
+		np.testing.assert_allclose(result['child.worldMatrix[0]'][:, 3, :3], translate + [1.0, 2.0, 3.0])
+	# end def test_evaluatesBatches():
+
+	def test_keepsSceneValues(self):
+		self.backend.setAttr('parent.rotateZ', 90.0)
+		ev = evaluator.GraphEvaluator(['child.worldMatrix[0]'])
+		np.testing.assert_allclose(
+			ev.evaluate()['child.worldMatrix[0]'], np.reshape(self.backend.getAttr('child.worldMatrix[0]'), (4, 4)),
+			atol=1e-10)
+	# end def test_keepsSceneValues():
+
+	def test_rejectsOtherPlugs(self):
+		ev = evaluator.GraphEvaluator(['target.translate'], inputs=['parent.translate'])
+		self.assertRaises(evaluator.EvaluatorException, ev.evaluate, {'child.translate': np.zeros(3)})
+		self.assertRaises(evaluator.EvaluatorException, ev.evaluate, {'parent.translate': np.zeros(2)})
+	# end def test_rejectsOtherPlugs():
+
+	def test_evaluatesBuiltRig(self):
+		self.makeRig()
+		self.quietly(builder.batchBuild)
+		outputs = ['L_arm_output.RB_Output[{}]'.format(i) for i in range(3)]
+		ev = evaluator.GraphEvaluator(outputs, inputs=['L_arm_ik_ctrl.translate', 'L_arm_ik_ctrl.stretch'])
+
+		# pulled far past its reach the arm only gets longer when it stretches
+		poses = {'L_arm_ik_ctrl.translate': np.array([[100.0, 0.0, 0.0]] * 2), 'L_arm_ik_ctrl.stretch': [0.0, 1.0]}
+		result = ev.evaluate(poses)
+		self.assertEqual(result[outputs[2]].shape, (2, 4, 4))
+		lengths = np.linalg.norm(result[outputs[2]][:, 3, :3] - result[outputs[0]][:, 3, :3], axis=-1)
+		self.assertGreater(lengths[1], lengths[0] + 1.0)
+	# end def test_evaluatesBuiltRig():
+# end class TestGraphEvaluator():
@@ -0,0 +1,60 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	TEST_IK.PY
+	Reference two bone ik against built SimpleIkArm modules.
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+import unittest
+
+from . import MemorySceneTest
+from .. import user
+from ..benchmarks import ik as benchmark
+from ..rig import ik
+from ..scene import evaluator, mmath
+
+np = mmath.numpyModule()
+
+
+@unittest.skipIf(np is None, 'numpy is required to solve ik.')
+class TestReference(MemorySceneTest):
+
+	def compare(self):
+		errors = []
+		for name, rest in benchmark.buildArms().items():
+			comparison = benchmark.ArmComparison(name, rest)
+			poses = benchmark.samplePoses(name, 500)
+			errors.append(abs(comparison.evaluate(poses) - comparison.solve(comparison.inputs(poses))).max())
+		return errors
+	# end def compare():
+
+	def test_matchesNetwork(self):
+		for error in self.compare():
+			self.assertLess(error, benchmark.TOLERANCE)
+	# end def test_matchesNetwork():
+
+	def test_matchesBlendMatrixNetwork(self):
+		user.prefs['blend-matrix'] = True
+		for error in self.compare():
+			self.assertLess(error, benchmark.TOLERANCE)
+	# end def test_matchesBlendMatrixNetwork():
+
+	def test_stretchIsSampledContinuously(self):
+		stretch = benchmark.samplePoses('L_arm', 500)['L_arm_ik_ctrl.stretch']
+		self.assertGreater(len(np.unique(stretch)), 2)
+	# end def test_stretchIsSampledContinuously():
+
+	def test_blendMatrixSpace(self):
+		# blendMatrix interpolates scale and slerps rotation, the evaluator's blendMatrix node does the same
+		random = np.random.RandomState(0)
+		spaces = [
+			ik.composeMatrix(random.uniform(-5.0, 5.0, (50, 3)), random.uniform(-180.0, 180.0, (50, 3)),
+							 random.uniform(0.5, 2.0, (50, 3))) for _ in range(2)]
+		weight = random.uniform(0.0, 1.0, 50)
+		np.testing.assert_allclose(
+			ik.spaceBlend(spaces[0], spaces[1], weight, use_blend_matrix=True),
+			evaluator.blendMatrices(np, spaces[0], spaces[1], weight), atol=1e-9)
+	# end def test_blendMatrixSpace():
+# end class TestReference():
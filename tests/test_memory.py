@@ -0,0 +1,86 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	TEST_MEMORY.PY
+	Memory scene world matrix cache.
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+from . import MemorySceneTest
+from ..rig import builder
+
+
+class TestWorldMatrixCache(MemorySceneTest):
+
+	def setUp(self):
+		super(TestWorldMatrixCache, self).setUp()
+		self.scene = self.backend.scene
+	# end def setUp():
+
+	def assertFresh(self, name):
+		cached = self.scene.worldMatrix(name)
+		self.scene._worldCache.clear()
+		self.assertEqual(cached, self.scene.worldMatrix(name))
+	# end def assertFresh():
+
+	def makeChain(self, *names):
+		parent = None
+		for name in names:
+			parent = self.scene.createNode('transform', name=name, parent=parent)
+			self.backend.setAttr('{}.translateX'.format(name), 1.0)
+	# end def makeChain():
+
+	def test_setValue(self):
+		self.makeChain('a', 'b', 'c')
+		self.scene.worldMatrix('c')
+		self.backend.setAttr('a.rotateZ', 45.0)
+		self.assertFresh('c')
+	# end def test_setValue():
+
+	def test_connectedValue(self):
+		self.makeChain('a', 'b', 'c')
+		self.makeChain('driver')
+		self.backend.connectAttr('driver.translate', 'b.translate')
+		self.scene.worldMatrix('c')
+		self.backend.setAttr('driver.translateY', 3.0)
+		self.assertFresh('c')
+		self.backend.disconnectAttr('driver.translate', 'b.translate')
+		self.assertFresh('c')
+	# end def test_connectedValue():
+
+	def test_connectedMatrix(self):
+		self.makeChain('a', 'b')
+		self.makeChain('c', 'd')
+		self.backend.connectAttr('b.worldMatrix[0]', 'c.offsetParentMatrix')
+		self.scene.worldMatrix('d')
+		self.backend.setAttr('a.scaleY', 2.0)
+		self.assertFresh('d')
+	# end def test_connectedMatrix():
+
+	def test_connectedLocalMatrix(self):
+		self.makeChain('a')
+		self.makeChain('c', 'd')
+		self.backend.connectAttr('a.matrix', 'c.offsetParentMatrix')
+		self.scene.worldMatrix('d')
+		self.backend.setAttr('a.translateZ', 2.0)
+		self.assertFresh('d')
+	# end def test_connectedLocalMatrix():
+
+	def test_parent(self):
+		self.makeChain('a', 'b')
+		self.makeChain('c', 'd')
+		self.scene.worldMatrix('d')
+		self.scene.parent('c', 'b', relative=True)
+		self.assertFresh('d')
+	# end def test_parent():
+
+	def test_builtRig(self):
+		self.makeRig()
+		self.quietly(builder.batchBuild)
+		transforms = [node.name for node in self.scene.nodes if node.type.transform]
+		cached = [self.scene.worldMatrix(name) for name in transforms]
+		self.scene._worldCache.clear()
+		self.assertEqual(cached, [self.scene.worldMatrix(name) for name in transforms])
+	# end def test_builtRig():
+# end class TestWorldMatrixCache():
@@ -0,0 +1,60 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	TEST_MODIFIER.PY
+	Recorded graph edits.
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+from . import MemorySceneTest
+from .. import scene
+
+
+class TestGraphModifier(MemorySceneTest):
+
+	def setUp(self):
+		super(TestGraphModifier, self).setUp()
+		self.backend.createNode('transform', name='ctrl')
+		self.backend.createNode('transform', name='jnt')
+	# end def setUp():
+
+	def test_appliesEditsOnExit(self):
+		with scene.GraphModifier() as graph:
+			dcmp = graph.createNode('decomposeMatrix', n='arm_dcmpM')
+			graph.node('ctrl').worldMatrix[0] >> dcmp.inputMatrix
+			dcmp.outputTranslate >> graph.node('jnt').translate
+			dcmp.inputRotateOrder.set(2)
+			self.assertFalse(self.backend.objExists('arm_dcmpM'))
+			self.assertEqual(len(graph), 4)
+
+		self.assertTrue(dcmp.isCommitted())
+		self.assertEqual(self.backend.listConnections('jnt.translate', destination=False), ['arm_dcmpM'])
+		self.assertEqual(self.backend.getAttr('arm_dcmpM.inputRotateOrder'), 2)
+	# end def test_appliesEditsOnExit():
+
+	def test_discardsEditsOnError(self):
+		try:
+			with scene.GraphModifier() as graph:
+				graph.createNode('decomposeMatrix', n='arm_dcmpM')
+				raise RuntimeError
+		except RuntimeError:
+			pass
+		self.assertFalse(self.backend.objExists('arm_dcmpM'))
+		self.assertIsNone(scene.active())
+	# end def test_discardsEditsOnError():
+
+	def test_immediate(self):
+		graph = scene.GraphModifier(immediate=True)
+		graph.createNode('multMatrix', n='arm_multM')
+		self.assertTrue(self.backend.objExists('arm_multM'))
+		self.assertEqual(len(graph), 0)
+	# end def test_immediate():
+
+	def test_pendingDestinations(self):
+		with scene.GraphModifier() as graph:
+			graph.connectAttr('ctrl.translate', 'jnt.translate')
+			self.assertEqual([str(plug) for plug in graph.destinations('ctrl.translate')], ['jnt.translate'])
+		self.assertEqual(graph.destinations('ctrl.translate'), [])
+	# end def test_pendingDestinations():
+# end class TestGraphModifier():
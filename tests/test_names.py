@@ -0,0 +1,67 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	TEST_NAMES.PY
+	Unique name allocation.
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+from . import MemorySceneTest
+from .. import names
+from ..rig import builder
+
+
+class TestNameAllocator(MemorySceneTest):
+
+	def setUp(self):
+		super(TestNameAllocator, self).setUp()
+		self.names = names.allocator()
+	# end def setUp():
+
+	def test_numbersNames(self):
+		self.backend.createNode('transform', name='L_arm_ctrl')
+		self.assertEqual(self.names.allocate('L_arm', '_ctrl', count=3), ['L_arm1', 'L_arm2', 'L_arm3'])
+	# end def test_numbersNames():
+
+	def test_deletedNamesAreFree(self):
+		self.backend.createNode('transform', name='L_arm_ctrl')
+		self.backend.createNode('transform', name='L_arm1_ctrl')
+		self.assertEqual(self.names.unique('L_arm', '_*'), 'L_arm2')
+		self.backend.delete('L_arm_ctrl')
+		self.assertEqual(self.names.unique('L_arm', '_*'), 'L_arm')
+	# end def test_deletedNamesAreFree():
+
+	def test_renamedNamesAreFree(self):
+		self.backend.createNode('transform', name='L_arm_ctrl')
+		self.assertEqual(self.names.unique('L_arm', '_ctrl'), 'L_arm1')
+		self.backend.rename('L_arm_ctrl', 'R_arm_ctrl')
+		self.assertEqual(self.names.unique('L_arm', '_ctrl'), 'L_arm')
+		self.assertTrue(self.names.exists('R_arm', '_*'))
+	# end def test_renamedNamesAreFree():
+
+	def test_freedNamesOnlyResetTheirCounters(self):
+		self.assertEqual(self.names.allocate('L_arm', '_ctrl', count=4), ['L_arm', 'L_arm1', 'L_arm2', 'L_arm3'])
+		for name in ['L_arm_ctrl', 'L_arm1_ctrl', 'L_arm2_ctrl', 'L_arm3_ctrl', 'L_arm3_jnt', 'L_leg_ctrl']:
+			self.backend.createNode('transform', name=name)
+		# other names don't make the next name count up from the start again
+		self.backend.rename('L_leg_ctrl', 'R_leg_ctrl')
+		self.backend.delete('L_arm3_jnt')
+		self.assertEqual(self.names._next['L_arm']['_ctrl'], 4)
+
+		self.backend.delete('L_arm2_ctrl')
+		self.assertEqual(self.names._next['L_arm']['_ctrl'], 2)
+		self.assertEqual(self.names.unique('L_arm', '_ctrl'), 'L_arm2')
+		self.assertEqual(self.names.unique('L_arm', '_ctrl'), 'L_arm4')
+	# end def test_freedNamesOnlyResetTheirCounters():
+
+	def test_rebuildKeepsNames(self):
+		self.makeRig()
+		self.quietly(builder.batchBuild)
+		built = set(self.backend.ls())
+		builder.dismantleModules()
+		# _Root is kept, an incremental build only rebuilds the modules
+		self.quietly(builder.batchBuild, incremental=True)
+		self.assertEqual(set(self.backend.ls()), built)
+	# end def test_rebuildKeepsNames():
+# end class TestNameAllocator():
@@ -0,0 +1,125 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	TEST_OPTIMIZE.PY
+	Graph optimizer passes.
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+from . import MemorySceneTest
+from .. import user
+from ..rig import builder
+from ..scene import optimize
+
+
+class TestMergeDuplicates(MemorySceneTest):
+
+	def setUp(self):
+		super(TestMergeDuplicates, self).setUp()
+		self.backend.createNode('transform', name='source')
+		self.backend.createNode('transform', name='target')
+		for name in ['a_md', 'b_md']:
+			self.backend.createNode('multiplyDivide', name=name)
+			self.backend.connectAttr('source.translate', '{}.input1'.format(name))
+		self.backend.connectAttr('b_md.output', 'target.translate')
+	# end def setUp():
+
+	def test_mergesIdenticalNodes(self):
+		removed = optimize.mergeDuplicates(['a_md', 'b_md'])
+		self.assertEqual(dict(removed), {'b_md': 'a_md'})
+		self.assertFalse(self.backend.objExists('b_md'))
+		self.assertEqual(self.backend.listConnections('target.translate', destination=False), ['a_md'])
+	# end def test_mergesIdenticalNodes():
+
+	def test_keepsDifferentNodes(self):
+		self.backend.setAttr('b_md.input2Y', 2.0)
+		self.assertEqual(dict(optimize.mergeDuplicates(['a_md', 'b_md'])), {})
+	# end def test_keepsDifferentNodes():
+
+	def test_partlyConnectedCompounds(self):
+		for name in ['a_md', 'b_md']:
+			self.backend.connectAttr('source.rotateX', '{}.input2X'.format(name))
+
+		# connected children are compared by connection, the rest by value without reading the whole compound
+		read = []
+		getAttr = self.backend.getAttr
+
+		def recordingGetAttr(plug, *args, **kwargs):
+			read.append(plug)
+			return getAttr(plug, *args, **kwargs)
+		# end def recordingGetAttr():
+
+		self.backend.getAttr = recordingGetAttr
+		try:
+			self.backend.setAttr('b_md.input2Y', 2.0)
+			self.assertEqual(dict(optimize.mergeDuplicates(['a_md', 'b_md'])), {})
+			self.backend.setAttr('b_md.input2Y', 1.0)
+			self.assertEqual(dict(optimize.mergeDuplicates(['a_md', 'b_md'])), {'b_md': 'a_md'})
+		finally:
+			del self.backend.getAttr
+
+		self.assertIn('a_md.input2Y', read)
+		self.assertNotIn('a_md.input1', read)
+		self.assertNotIn('a_md.input2', read)
+		self.assertNotIn('a_md.input2X', read)
+	# end def test_partlyConnectedCompounds():
+# end class TestMergeDuplicates():
+
+
+class TestFoldConstants(MemorySceneTest):
+
+	def setUp(self):
+		super(TestFoldConstants, self).setUp()
+		self.backend.createNode('transform', name='target')
+		for name in ['live_md', 'upstream_md', 'dead_md', 'deadEnd_md', 'tagged_md']:
+			self.backend.createNode('multiplyDivide', name=name)
+		self.backend.connectAttr('upstream_md.output', 'live_md.input1')
+		self.backend.connectAttr('live_md.output', 'target.translate')
+		self.backend.connectAttr('dead_md.output', 'deadEnd_md.input1')
+		self.backend.addAttr('tagged_md', longName='RB_tag', attributeType='bool')
+		self.nodes = ['live_md', 'upstream_md', 'dead_md', 'deadEnd_md', 'tagged_md']
+	# end def setUp():
+
+	def test_removesDeadNodes(self):
+		self.assertEqual(optimize.removeDeadNodes(self.nodes), ['dead_md', 'deadEnd_md'])
+		self.assertEqual(self.backend.ls(self.nodes), ['live_md', 'upstream_md', 'tagged_md'])
+	# end def test_removesDeadNodes():
+
+	def test_listsDeadNodesWithoutDelete(self):
+		self.assertEqual(optimize.removeDeadNodes(self.nodes, delete=False), ['dead_md', 'deadEnd_md'])
+		self.assertEqual(len(self.backend.ls(self.nodes)), 5)
+	# end def test_listsDeadNodesWithoutDelete():
+
+	def test_foldNeedsEvaluatingBackend(self):
+		self.assertRaises(optimize.OptimizeException, optimize.foldConstants, self.nodes)
+	# end def test_foldNeedsEvaluatingBackend():
+
+	def test_foldedBuildKeepsOutputs(self):
+		user.prefs['fold-constants'] = True
+		self.makeRig()
+		_, printed = self.quietly(builder.batchBuild)
+		self.assertIn('only removing dead nodes', printed)
+		for plug in ['L_arm_output.RB_Output[2]', 'tail_output.RB_Output[4]']:
+			self.assertTrue(self.backend.listConnections(plug, destination=False))
+	# end def test_foldedBuildKeepsOutputs():
+# end class TestFoldConstants():
+
+
+class TestOptimizeBuild(MemorySceneTest):
+
+	def test_defaultBuildIsNotOptimized(self):
+		self.makeRig()
+		_, printed = self.quietly(builder.batchBuild)
+		self.assertNotIn('Optimizing', printed)
+	# end def test_defaultBuildIsNotOptimized():
+
+	def test_optimizedBuildKeepsOutputs(self):
+		user.prefs['optimize-graph'] = True
+		self.makeRig()
+		_, printed = self.quietly(builder.batchBuild)
+		self.assertIn('Optimizing', printed)
+		for plug in ['L_arm_output.RB_Output[2]', 'tail_output.RB_Output[4]']:
+			self.assertTrue(self.backend.listConnections(plug, destination=False))
+	# end def test_optimizedBuildKeepsOutputs():
+# end class TestOptimizeBuild():
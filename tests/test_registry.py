@@ -0,0 +1,45 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	TEST_REGISTRY.PY
+	NodeRegistry recording.
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+from . import MemorySceneTest
+from .. import scene
+from ..scene import registry
+
+
+class TestNodeRegistry(MemorySceneTest):
+
+	def test_recordsCommandsAndModifiers(self):
+		with scene.NodeRegistry() as nodes:
+			self.backend.createNode('transform', name='made')
+			with scene.GraphModifier() as graph:
+				graph.createNode('multMatrix', name='recorded')
+				graph.doIt()
+		self.backend.createNode('transform', name='outside')
+		self.assertEqual(nodes.names(), ['made', 'recorded'])
+	# end def test_recordsCommandsAndModifiers():
+
+	def test_renamedAndDeletedNodes(self):
+		with scene.NodeRegistry() as nodes:
+			self.backend.createNode('transform', name='first')
+			self.backend.createNode('transform', name='second')
+		self.backend.rename('first', 'renamed')
+		self.backend.delete('second')
+		self.assertEqual(nodes.names(), ['renamed'])
+	# end def test_renamedAndDeletedNodes():
+
+	def test_freshBackendRemovesCallback(self):
+		with scene.NodeRegistry():
+			pass
+		old = self.backend.scene
+		self.assertTrue(old._callbacks)
+		scene.setBackend('memory', fresh=True)
+		self.assertFalse(old._callbacks)
+		self.assertFalse(registry._LISTENER)
+	# end def test_freshBackendRemovesCallback():
+# end class TestNodeRegistry():
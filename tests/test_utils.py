@@ -0,0 +1,78 @@
+# ----------------------------------------------------------------------------------------------------------------------
+"""
+
+	TEST_UTILS.PY
+	Constraint and blend set ups.
+
+"""
+# ----------------------------------------------------------------------------------------------------------------------
+
+from . import MemorySceneTest
+from .. import scene, user, utils
+
+
+class TestMatrixConstraint(MemorySceneTest):
+
+	def setUp(self):
+		super(TestMatrixConstraint, self).setUp()
+		for name in ['parent', 'a', 'b']:
+			self.backend.createNode('transform', name=name)
+	# end def setUp():
+
+	def decomposes(self):
+		return self.backend.listConnections('parent.worldMatrix[0]', source=False, type='decomposeMatrix')
+	# end def decomposes():
+
+	def test_groupsAcrossRounding(self):
+		# either side of where tolerance 1e-5 rounds up
+		self.backend.setAttr('a.translateX', 0.49999e-5)
+		self.backend.setAttr('b.translateX', 0.50001e-5)
+		utils.matrixConstraint('parent', 'a', 'b')
+		self.assertEqual(len(self.backend.ls(type='multMatrix')), 1)
+	# end def test_groupsAcrossRounding():
+
+	def test_sharesDecomposeWithinModule(self):
+		with scene.NodeRegistry():
+			utils.matrixConstraint('parent', 'a', mo=False)
+			utils.matrixConstraint('parent', 'b', mo=False)
+		self.assertEqual(len(self.decomposes()), 1)
+	# end def test_sharesDecomposeWithinModule():
+
+	def test_keepsDecomposeOfOtherModules(self):
+		with scene.NodeRegistry():
+			utils.matrixConstraint('parent', 'a', mo=False)
+		with scene.NodeRegistry():
+			utils.matrixConstraint('parent', 'b', mo=False)
+		self.assertEqual(len(self.decomposes()), 2)
+	# end def test_keepsDecomposeOfOtherModules():
+# end class TestMatrixConstraint():
+
+
+class TestMatrixBlend(MemorySceneTest):
+
+	def setUp(self):
+		super(TestMatrixBlend, self).setUp()
+		self.backend.createNode('transform', name='a')
+		self.backend.createNode('transform', name='b')
+		self.backend.addAttr('b', longName='spaceBlend', attributeType='double')
+		self.pm.PyNode('b').spaceBlend.set(0.25)
+	# end def setUp():
+
+	def blend(self):
+		b = self.pm.PyNode('b')
+		return utils.matrixBlend(self.pm.PyNode('a').worldMatrix[0], b.worldMatrix[0], b.spaceBlend)
+	# end def blend():
+
+	def test_weightedAddByDefault(self):
+		output = self.blend()
+		self.assertEqual(str(output), 'b_blnd_wtAdM.matrixSum')
+		self.assertEqual(self.backend.ls(type='blendMatrix'), [])
+	# end def test_weightedAddByDefault():
+
+	def test_blendMatrixPref(self):
+		user.prefs['blend-matrix'] = True
+		output = self.blend()
+		self.assertEqual(str(output), 'b_blnd_blndM.outputMatrix')
+		self.assertEqual(self.backend.ls(type='wtAddMatrix'), [])
+	# end def test_blendMatrixPref():
+# end class TestMatrixBlend():
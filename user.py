@@ -30,11 +30,27 @@ prefs = \
 		'ctrl-suffix'			: 'ctrl',
 		'num-offset-ctrls'		: 0,
 		'default-line-width'	: 2,
+		'shape-cache-size'		: 256,
+		'controller-shape-files': [],
+		'module-packages'		: [],
+
+		# 'decompose' or 'offsetParentMatrix', see modules.ModuleBase.postBuild()
+		'joint-output-mode'		: 'decompose',
+		# blend spaces with blendMatrix nodes where maya has them instead of wtAddMatrix, see utils.matrixBlend()
+		'blend-matrix'			: False,
+		# merge duplicate utility nodes once modules are built, see rig.builder.optimizeModules()
+		'optimize-graph'		: False,
+		# bake constant nodes into the attributes they drive, see rig.builder.foldModules()
+		'fold-constants'		: False,
+		# fingerprint modules on every build, not only incremental ones, see rig.builder.batchBuild()
+		'store-fingerprints'	: False,
 
 		'left-prefix'			: 'L',
 		'right-prefix'			: 'R',
 
 		'viewport-colour-space'	: 'sRGB',
+
+		'scene-backend'			: 'pymel',
 	}
 
 # TODO: node naming convention pref? ^
@@ -7,11 +7,14 @@
 """
 # ----------------------------------------------------------------------------------------------------------------------
 
-import pymel.core as pm
+import collections
+import contextlib
+import itertools
 import math
 import os
 
-from . import user, data
+from . import user, data, scene, skeleton, names
+from .scene import pm, mmath, traverse
 
 
 class UtilsException(Exception):
@@ -53,11 +56,11 @@ def setOverrideColour(*args, **kwargs):
 	:param args: `PyNode` or `str` Node(s) to apply change.
 
 	:param kwargs:	colour | c: `str` or `[R,G,B]` Colour to set override.
-					colourSpace | cs: `str` default = 'sRGB', Colour space to use.
+					colourSpace | cs: `str` default = user.prefs['viewport-colour-space'], Colour space to use.
 	return None
 	"""
 	colour = kwargs.pop('colour', kwargs.pop('c', None))
-	colour_space = kwargs.pop('colourSpace', kwargs.pop('cs', 'sRGB'))
+	colour_space = kwargs.pop('colourSpace', kwargs.pop('cs', user.prefs['viewport-colour-space']))
 
 	if colour is None:
 		raise ValueError('--colour flag must be specified.')
@@ -65,29 +68,7 @@ def setOverrideColour(*args, **kwargs):
 	if kwargs:
 		raise ValueError('--Unknown argument(s): {}'.format(kwargs))
 
-	item_ls = makePyNodeList(args, type=['transform', 'joint', 'nurbsCurve', 'locator'])
-
-	if isinstance(colour, basestring):
-		colour = data.Colours.get_value(colour, space=colour_space)
-
-	for item in item_ls:
-		try:
-			shapes = item.getShapes()
-
-			# check to see if getShapes returned empty list
-			if shapes:
-				for shape in shapes:
-					shape.overrideEnabled.set(1)
-					shape.drawOverride.overrideRGBColors.set(1)
-					shape.drawOverride.overrideColorRGB.set(*colour)
-
-		except AttributeError:
-			pass
-
-		# currently just blanket colour every transform and shape
-		item.overrideEnabled.set(1)
-		item.drawOverride.overrideRGBColors.set(1)
-		item.drawOverride.overrideColorRGB.set(*colour)
+	setColours(override=[(args, colour)], colourSpace=colour_space)
 # end def setOverrideColour():
 
 
@@ -111,15 +92,135 @@ def setOutlinerColour(*args, **kwargs):
 	if kwargs:
 		raise ValueError('--Unknown argument(s): {}'.format(kwargs))
 
-	item_ls = makePyNodeList(args, type=['transform', 'joint', 'nurbsCurve', 'locator'])
+	setColours(outliner=[(args, colour)], outlinerColourSpace=colour_space)
+# end def setOutlinerColour():
 
-	if isinstance(colour, basestring):
-		colour = data.Colours.get_value(colour, space=colour_space)
 
-	for item in item_ls:
-		item.useOutlinerColor.set(1)
-		item.outlinerColor.set(*colour)
-# end def setOutlinerColour():
+# ----------------------------------------------------------------------------------------------------------------------
+_COLOUR_ATTRS = {
+	'override': (('overrideEnabled', 1), ('overrideRGBColors', 1), 'overrideColorRGB'),
+	'outliner': (('useOutlinerColor', 1), 'outlinerColor'),
+}
+
+
+def setColours(override=None, outliner=None, **kwargs):
+	"""
+	Bulk viewport override and outliner colouring. Nodes are grouped by colour, nodes already at their colour are
+	skipped and every change is applied in one batched edit.
+
+	Mappings are `dict` of node: colour or a `list` of (nodes, colour) pairs, where nodes can be a nested list.
+	When a node is given more than once the last colour wins, shapes given a colour of their own keep it over the
+	colour of their transform:
+
+		utils.setColours(override=[(chain, 'grey-blue'), (chain[0], 'light-orange')], outliner={chain[0]: 'pink'})
+
+	Inside colourBatch() the mappings are merged and only applied when the batch ends.
+
+	:param override:  Override colour mapping, applied to transforms and their shapes.
+	:param outliner:  Outliner colour mapping.
+	:param kwargs:	colourSpace | cs: `str` default = user.prefs['viewport-colour-space'], override colour space.
+					outlinerColourSpace | ocs: `str` default = 'sRGB', outliner colour space.
+	:return:  `int` number of nodes changed, 0 when deferred to a colour batch.
+	"""
+	colour_space = kwargs.pop('colourSpace', kwargs.pop('cs', user.prefs['viewport-colour-space']))
+	outliner_space = kwargs.pop('outlinerColourSpace', kwargs.pop('ocs', 'sRGB'))
+
+	if kwargs:
+		raise ValueError('--Unknown argument(s): {}'.format(kwargs))
+
+	requests = [
+		('override', override, colour_space),
+		('outliner', outliner, outliner_space),
+	]
+
+	if _COLOUR_BATCH:
+		batch = _COLOUR_BATCH[-1]
+		for mode, mapping, space in requests:
+			batch[mode].update(_colourMapping(mapping, space))
+		return 0
+
+	return _applyColours(dict((mode, _colourMapping(mapping, space)) for mode, mapping, space in requests))
+# end def setColours():
+
+
+def _colourMapping(mapping, colour_space):
+	"""
+	Resolve a colour mapping to an ordered dict of node name: (r, g, b), colour names are looked up once.
+	"""
+	result = collections.OrderedDict()
+	if not mapping:
+		return result
+
+	pairs = mapping.items() if isinstance(mapping, dict) else mapping
+	resolved = {}
+	for nodes, colour in pairs:
+		key = colour if isinstance(colour, basestring) else tuple(colour)
+		rgb = resolved.get(key)
+		if rgb is None:
+			if isinstance(colour, basestring):
+				colour = data.Colours.get_value(colour, space=colour_space)
+			rgb = resolved[key] = tuple(float(c) for c in colour)
+		for node in _flattenArgs([nodes]):
+			result[str(node)] = rgb
+	return result
+# end def _colourMapping():
+
+
+def _applyColours(requests):
+	backend = scene.getBackend()
+	graph = scene.GraphModifier()
+	changed = 0
+
+	for mode, mapping in requests.items():
+		if not mapping:
+			continue
+		flags, colour_attr = _COLOUR_ATTRS[mode][:-1], _COLOUR_ATTRS[mode][-1]
+
+		groups = collections.OrderedDict()
+		for node, rgb in mapping.items():
+			groups.setdefault(rgb, []).append(node)
+
+		for rgb, nodes in groups.items():
+			for item in makeNameList(nodes, type=['transform', 'joint', 'nurbsCurve', 'locator']):
+				targets = [item]
+				if mode == 'override':
+					# blanket colour the shapes of every transform, shapes given their own colour keep it
+					targets = [s for s in backend.listRelatives(item, shapes=True) if s not in mapping] + targets
+
+				for node in targets:
+					edits = [(attr, value) for attr, value in flags if backend.getAttr(node + '.' + attr) != value]
+					current = backend.getAttr(node + '.' + colour_attr)
+					if any(abs(a - b) > 1e-6 for a, b in zip(current, rgb)):
+						edits.append((colour_attr, rgb))
+					for attr, value in edits:
+						graph.setAttr(node + '.' + attr, *(value if isinstance(value, tuple) else (value,)))
+					changed += bool(edits)
+
+	graph.doIt()
+	return changed
+# end def _applyColours():
+
+
+_COLOUR_BATCH = []
+
+
+@contextlib.contextmanager
+def colourBatch():
+	"""
+	Collect every setColours / setOverrideColour / setOutlinerColour call made inside the block and apply them
+	together when it ends. Nodes deleted before then are skipped.
+
+		with utils.colourBatch():
+			batchBuild()
+	"""
+	batch = {'override': collections.OrderedDict(), 'outliner': collections.OrderedDict()}
+	_COLOUR_BATCH.append(batch)
+	try:
+		yield batch
+	finally:
+		_COLOUR_BATCH.remove(batch)
+	_applyColours(batch)
+# end def colourBatch():
 
 
 # ----------------------------------------------------------------------------------------------------------------------
@@ -132,30 +233,43 @@ def makePyNodeList(*args, **kwargs):
 	:return:
 	"""
 
-	obType = kwargs.get('type', None)
+	# only attempt PyNodes at this point, after the list has been filtered
+	return [pm.PyNode(x) for x in makeNameList(*args, **kwargs)]
+# end def makePyNodeList():
 
-	def makeListRecursive(passed_args, actual_list=None):
-		if actual_list is None:
-			actual_list = []
 
-		for item in passed_args:
-			if isinstance(item, list) or isinstance(item, tuple):
-				makeListRecursive(item, actual_list)
-			else:
-				actual_list.append(item)
+# ----------------------------------------------------------------------------------------------------------------------
+def makeNameList(*args, **kwargs):
+	"""
+	Return list of existing node names, same as makePyNodeList without building PyNodes.
 
-		return actual_list
-	# end def makeListRecursive():
+	:param args: list, tuple, nested list of string or PyNodes
+	:param kwargs: node 'type' filter
+	:return: `List` of `str`
+	"""
 
-	# only attempt PyNodes at this point, after the above list has been filtered
-	objects = [pm.PyNode(x) for x in makeListRecursive(args) if pm.objExists(x)]
+	obType = kwargs.get('type', None)
 
-	# filter by type
-	if obType:
-		objects = pm.ls(objects, type=obType)
+	# one ls call filters missing nodes and types together
+	return scene.getBackend().ls(_flattenArgs(args), type=obType)
+# end def makeNameList():
 
-	return objects
-# end def makePyNodeList():
+
+def _flattenArgs(passed_args, actual_list=None):
+	"""
+	Flatten nested lists / tuples of nodes.
+	"""
+	if actual_list is None:
+		actual_list = []
+
+	for item in passed_args:
+		if isinstance(item, list) or isinstance(item, tuple):
+			_flattenArgs(item, actual_list)
+		else:
+			actual_list.append(item)
+
+	return actual_list
+# end def _flattenArgs():
 
 
 # ----------------------------------------------------------------------------------------------------------------------
@@ -184,19 +298,22 @@ def makeAttr(ob, **kwargs):
 	if attr_name is None:
 		raise NameError('--Name not specified but is required to make an Attribute.')
 
+	backend = scene.getBackend()
+	plug = '{}.{}'.format(ob, attr_name)
+
 	# if already has attr then delete
-	if ob.hasAttr(attr_name):
+	if backend.attributeExists(ob, attr_name):
 		print('//Warning: Attribute already exists, overriding.')
-		pm.setAttr('{}.{}'.format(ob, attr_name), l=False)
-		ob.deleteAttr(attr_name)
+		backend.setAttr(plug, lock=False)
+		backend.deleteAttr(plug)
 
-	ob.addAttr(attr_name, **kwargs)
-	ob.setAttr(attr_name, l=lock)
+	backend.addAttr(ob, longName=attr_name, **kwargs)
+	backend.setAttr(plug, lock=bool(lock))
 
 	# channel box flag only set when attr is not keyable so this:
 	keyable = kwargs.pop('keyable', kwargs.pop('k', 1))
 	if not keyable and channel_box:
-		ob.setAttr(attr_name, cb=channel_box)
+		backend.setAttr(plug, channelBox=bool(channel_box))
 
 	return ob.attr(attr_name)
 # end def makeAttr():
@@ -217,30 +334,7 @@ def scaleCtrlShapes(*args, **kwargs):
 	if kwargs:
 		raise ValueError('--Unknown argument: {}'.format(kwargs))
 
-	ctrl_ls = makePyNodeList(args)
-
-	for ctrl in ctrl_ls:
-		shapes = ctrl.getChildren()
-		if ctrl.nodeType() == 'nurbsCurve':
-			shapes.append(ctrl)
-
-		for shape in shapes:
-			if 'nurbsCurve' in shape.nodeType():
-				curv_type = pm.getAttr('%s.form' % shape)
-				# if curve open get curve points
-				if curv_type == 0:
-					num_cv = pm.getAttr('%s.cp' % shape, s=1)
-				# else curve must be closed so get spans
-				else:
-					num_cv = pm.getAttr('%s.spans' % shape)
-				for i in xrange(num_cv):
-					cv_ws = pm.xform('{}.cv[{}]'.format(shape, i), t=True, q=True)
-					pm.xform(
-						'{}.cv[{}]'.format(shape, i),
-						t=[(cv_ws[0] * scale_mult), (cv_ws[1] * scale_mult), (cv_ws[2] * scale_mult)]
-					)
-				if line_width:
-					shape.lineWidth.set(line_width)
+	transformCtrlShapes(args, matrix=mmath.compose(scale=[scale_mult] * 3), line_width=line_width)
 # end def scaleCtrlShapes():
 
 
@@ -260,27 +354,65 @@ def rotateCtrlShapes(*args, **kwargs):
 	if kwargs:
 		raise ValueError('--Unknown argument: {}'.format(kwargs))
 
-	ctrl_ls = makePyNodeList(args)
+	result_rot = [math.radians(a * rot) for a in axis]
 
-	result_rot = [a * rot for a in axis]
+	transformCtrlShapes(args, matrix=mmath.compose(rotate=result_rot))
+# end def rotateCtrlShapes():
 
-	for ctrl in ctrl_ls:
-		shapes = ctrl.getChildren()
-		if ctrl.nodeType() == 'nurbsCurve':
-			shapes.append(ctrl)
 
+# ----------------------------------------------------------------------------------------------------------------------
+def transformCtrlShapes(*args, **kwargs):
+	"""
+	Transform ctrl shape cvs by a matrix in object space. All cvs of all shapes are read once, transformed together
+	and written back once per shape.
+
+	:param args:  Transform or nurbsCurve nodes to change
+	:param kwargs:  matrix | m: 4x4 `Matrix`, nested list or flat list of 16 values, row vector convention
+					line_width | lw: line width thickness, ignores if not specified
+	:return:  None
+	"""
+	matrix = kwargs.pop('matrix', kwargs.pop('m', None))
+	line_width = kwargs.pop('line_width', kwargs.pop('lw', None))
+
+	if kwargs:
+		raise ValueError('--Unknown argument: {}'.format(kwargs))
+
+	backend = scene.getBackend()
+	shapes = getCtrlShapes(args)
+
+	if matrix is not None:
+		shape_points = [backend.getCurvePoints(shape) for shape in shapes]
+		points = mmath.transformPoints([p for pts in shape_points for p in pts], matrix)
+
+		start = 0
+		for shape, pts in zip(shapes, shape_points):
+			backend.setCurvePoints(shape, points[start:start + len(pts)])
+			start += len(pts)
+
+	if line_width:
 		for shape in shapes:
-			if 'nurbsCurve' in shape.nodeType():
-				curv_type = pm.getAttr('%s.form' % shape)
-				# if curve open get curve points
-				if curv_type == 0:
-					num_cv = pm.getAttr('%s.cp' % shape, s=1)
-				# else curve must be closed so get spans
-				else:
-					num_cv = pm.getAttr('%s.spans' % shape)
-				for i in xrange(num_cv):
-					pm.xform('{}.cv[{}]'.format(shape, i), ro=result_rot)
-# end def rotateCtrlShapes():
+			backend.setAttr('{}.lineWidth'.format(shape), line_width)
+# end def transformCtrlShapes():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def getCtrlShapes(*args):
+	"""
+	Get nurbsCurve shapes of ctrls, curve shapes passed directly are included.
+
+	:param args:  Transform or nurbsCurve nodes
+	:return:  `List` of shape names
+	"""
+	backend = scene.getBackend()
+
+	shapes = []
+	for ctrl in makeNameList(args):
+		if backend.nodeType(ctrl) == 'nurbsCurve':
+			shapes.append(ctrl)
+		shapes.extend(backend.listRelatives(ctrl, type='nurbsCurve'))
+
+	return shapes
+# end def getCtrlShapes():
 
 
 # ----------------------------------------------------------------------------------------------------------------------
@@ -297,7 +429,8 @@ def lockHide(*args, **kwargs):
 						Also accepts any attr name with `bool` value eg; visibility = 1
 	:return: None
 	"""
-	objs = makePyNodeList(args)
+	backend = scene.getBackend()
+	objs = makeNameList(args)
 
 	to_lock = []
 	for item, axis in kwargs.items():
@@ -314,7 +447,7 @@ def lockHide(*args, **kwargs):
 
 	for ob in objs:
 		for attr in to_lock:
-			pm.setAttr('{}.{}'.format(ob, attr), lock=True, keyable=False, channelBox=False)
+			backend.setAttr('{}.{}'.format(ob, attr), lock=True, keyable=False, channelBox=False)
 # end def lockHide():
 
 
@@ -325,9 +458,10 @@ def parentByList(node_list):
 	:param node_list: list of nodes, or node string names
 	:return: None
 	"""
-	node_list = makePyNodeList(node_list)
+	backend = scene.getBackend()
+	node_list = makeNameList(node_list)
 	for i in range(len(node_list)-1):
-		pm.parent(node_list[i], node_list[i+1])
+		node_list[i] = backend.parent(node_list[i], node_list[i+1])
 # end def parentByList():
 
 
@@ -338,12 +472,13 @@ def cleanJointOrients(jnts):
 	:param jnts: list of joints
 	:return: None
 	"""
-	jnts = makePyNodeList(jnts, type='joint')
+	backend = scene.getBackend()
+	jnts = makeNameList(jnts, type='joint')
 
 	for jnt in jnts:
-		jnt_mtx = jnt.matrix.get()
-		jnt.jointOrient.set(0, 0, 0)
-		pm.xform(jnt, m=jnt_mtx)
+		jnt_mtx = backend.getAttr(jnt + '.matrix')
+		backend.setAttr(jnt + '.jointOrient', 0, 0, 0)
+		backend.xform(jnt, matrix=jnt_mtx)
 # end def cleanJointOrients():
 
 
@@ -354,14 +489,15 @@ def cleanScaleCompensate(jnts):
 	:param jnts: List of joints.
 	:return: None
 	"""
-	jnts = makePyNodeList(jnts, type='joint')
+	backend = scene.getBackend()
+	jnts = makeNameList(jnts, type='joint')
 
 	for jnt in jnts:
-		if not jnt.segmentScaleCompensate.get(lock=True):
-			jnt.segmentScaleCompensate.set(0, lock=True)
-		inv_scale_input = jnt.inverseScale.inputs(p=True)
+		if not backend.getAttr(jnt + '.segmentScaleCompensate', lock=True):
+			backend.setAttr(jnt + '.segmentScaleCompensate', 0, lock=True)
+		inv_scale_input = backend.listConnections(jnt + '.inverseScale', destination=False, plugs=True)
 		if inv_scale_input:
-			inv_scale_input[0] // jnt.inverseScale
+			backend.disconnectAttr(inv_scale_input[0], jnt + '.inverseScale')
 # end def cleanScaleCompensate():
 
 
@@ -373,37 +509,29 @@ def roundRotation(nodes, round_val=90):
 	:param round_val:  Value to round to.
 	:return:  None
 	"""
-	nodes = makePyNodeList(nodes)
+	backend = scene.getBackend()
+	nodes = makeNameList(nodes)
 
 	for node in nodes:
-		if node.rotate.get(settable=True):
-			for rotAxis in node.rotate.iterDescendants():
-				rotAxis.set(round(rotAxis.get() / round_val) * round_val)
+		if backend.getAttr(node + '.rotate', settable=True):
+			for axis in 'XYZ':
+				rot_axis = '{}.rotate{}'.format(node, axis)
+				backend.setAttr(rot_axis, round(backend.getAttr(rot_axis) / round_val) * round_val)
 # end def roundRotation():
 
 
 # ----------------------------------------------------------------------------------------------------------------------
 def iterDgNodes(root, up_stream=False, down_stream=False, end=None):
 	"""
-	Simplified version of MItDependencyGraph from api.
+	Simplified version of MItDependencyGraph from api, see scene.traverse.iterGraph() for the full set of options.
 	:param root:  `PyNode` None to start iteration from.
 	:param up_stream:  `bool` Traverse the graph upstream.
 	:param down_stream:  `bool` Traverse the graph downstream.
-	:param end:  `PyNode` Don't iterate past this node.
+	:param end:  `PyNode` or `List` of nodes not to iterate past.
 	:yield:  Pynode
 	"""
-	dirty = []
-	stack = root.listConnections(source=up_stream, destination=down_stream)
-
-	while stack:
-		this_node = stack.pop()
-		if this_node in dirty or this_node == end:
-			continue
-		dirty.append(this_node)
-
-		stack = stack + this_node.listConnections(source=up_stream, destination=down_stream)
-
-		yield this_node
+	for node in traverse.iterGraph(root, up_stream=up_stream, down_stream=down_stream, stop=end):
+		yield pm.PyNode(node)
 # end def iterDgNodes():
 
 
@@ -539,6 +667,17 @@ def positionUpVectorFromPoints(point_start, point_mid, point_end, magnitude=1.2)
 # 											MATRIX UTILITY FUNCTIONS
 # ----------------------------------------------------------------------------------------------------------------------
 
+def _isPlug(item):
+	"""
+	Check if item is an attribute plug, either a PyNode attribute or a recorded plug handle.
+	:param item:  Item to check.
+	:return:  `bool`
+	"""
+	return isinstance(item, scene.PlugHandle) or type(item).__name__ == 'Attribute'
+# end def _isPlug():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
 def matrixConstraint(parent_node, *args, **kwargs):
 	"""
 	Constrain a parent node to a child node or list of children nodes.
@@ -561,33 +700,48 @@ def matrixConstraint(parent_node, *args, **kwargs):
 						>inverseParent / ip:	Add an additional connection to the mult matrix to counter a parent node.
 												If passed node will use worldInverseMatrix of the node.
 												If passed attribute will use that attribute.
-
-	:return: None
+						>offsetParentMatrix / opm:	Drive children through their offset parent matrix, no decompose
+												nodes. Child translate, rotate, scale (and joint orient) are reset.
+												Can not skip channels. Default = False.
+						>tolerance / tol:		Children whose world matrices match within tolerance share nodes.
+												Default = 1e-5.
+
+	:return: Node driving the last group of children, decomposeMatrix or multMatrix in offset parent matrix mode.
+			 None if offset parent matrix mode connects the parent straight to the children.
 	"""
-	# Get name
-	name = kwargs.pop('name', kwargs.pop('n', parent_node.node()))
+	graph = scene.current()
+	backend = graph.backend
+
+	name = kwargs.pop('name', kwargs.pop('n', None))
 
 	# Get parent as attribute plug
 	if isinstance(parent_node, basestring):
 		parent_node = pm.PyNode(parent_node)
 
-	if type(parent_node).__name__ == 'Attribute':
-		parent_matrix = parent_node
+	if _isPlug(parent_node):
+		parent_matrix = graph.plug(parent_node)
 	else:
-		parent_matrix = parent_node.attr('worldMatrix[0]')
+		parent_matrix = graph.node(parent_node).attr('worldMatrix[0]')
+
+	if name is None:
+		name = parent_matrix.node()
 
 	# If inverse parent specified get it as attribute plug
 	inverse_parent = kwargs.pop('inverseParent', kwargs.pop('ip', None))
 	if inverse_parent:
-		if not type(inverse_parent).__name__ == 'Attribute':
-			inverse_parent = inverse_parent.attr('worldInverseMatrix')
+		if _isPlug(inverse_parent):
+			inverse_parent = graph.plug(inverse_parent)
+		else:
+			inverse_parent = graph.node(inverse_parent).attr('worldInverseMatrix')
 
-	children = makePyNodeList(args)
+	children = makeNameList(args)
 	if not children:
 		raise UtilsException('--Failed to provide any valid child nodes to constrain.')
 
 	# If maintain offset specified get it, else set to True by default.
 	maintain_offset = kwargs.pop('maintainOffset', kwargs.pop('mo', True))
+	offset_parent = kwargs.pop('offsetParentMatrix', kwargs.pop('opm', False))
+	tolerance = kwargs.pop('tolerance', kwargs.pop('tol', 1e-5))
 
 	target_axis = []
 	for key_names in [('skipTranslate', 'st'), ('skipRotate', 'sr'), ('skipScale', 'ss')]:
@@ -604,83 +758,191 @@ def matrixConstraint(parent_node, *args, **kwargs):
 		s = 's' if len(kwargs) > 1 else ''
 		raise TypeError('--Invalid flag{}: "{}"'.format(s, '", "'.join(kwargs.keys())))
 
+	if offset_parent and target_axis != ['xyz'] * 3:
+		raise UtilsException('--Can not skip channels when constraining through offsetParentMatrix.')
+
 	def connectDecomposeToNodes(decompose_node, child_nodes):
 		"""
 		Finalizes the constraint with connections into the child node(s).
 		"""
 		for target_node in child_nodes:
+			target_node = graph.node(target_node)
 			for j, transform in enumerate(['translate', 'rotate', 'scale']):
 				for single_axis in target_axis[j]:
-					pm.connectAttr(
-						'{}.output{}{}'.format(decompose_node, transform.title(), single_axis.capitalize()),
-						'{}.{}{}'.format(target_node, transform, single_axis.capitalize())
+					graph.connectAttr(
+						decompose_node.attr('output{}{}'.format(transform.title(), single_axis.capitalize())),
+						target_node.attr('{}{}'.format(transform, single_axis.capitalize())),
+						force=False
 					)
 	# end connectDecomposeToNodes():
 
+	def connectOffsetParentToNodes(matrix_plug, child_nodes):
+		"""
+		Drive the child node(s) local matrix with matrix_plug, their own transform is reset so it adds nothing.
+		"""
+		joints = set(backend.ls(child_nodes, type='joint'))
+		for target_node in child_nodes:
+			is_joint = target_node in joints
+			target_node = graph.node(target_node)
+			graph.setAttr(target_node.translate, 0.0, 0.0, 0.0)
+			graph.setAttr(target_node.rotate, 0.0, 0.0, 0.0)
+			graph.setAttr(target_node.scale, 1.0, 1.0, 1.0)
+			if is_joint:
+				graph.setAttr(target_node.jointOrient, 0.0, 0.0, 0.0)
+			graph.connectAttr(matrix_plug, target_node.offsetParentMatrix, force=False)
+	# end connectOffsetParentToNodes():
+
 	# if not maintaining offset, no complicated set up required, just connect worldMatrix to all children.
 	if not maintain_offset:
-		dcmp_m = pm.createNode('decomposeMatrix', n='{}_const_dcmpM'.format(name))
 		if inverse_parent is not None:
-			mult_m = pm.createNode('multMatrix', n='{}_const_multM'.format(name))
+			mult_m = graph.createNode('multMatrix', n='{}_const_multM'.format(name))
 			parent_matrix >> mult_m.matrixIn[0]
 			inverse_parent >> mult_m.matrixIn[1]
-			mult_m.matrixSum >> dcmp_m.inputMatrix
+			driver = mult_m.matrixSum
 		else:
-			parent_matrix >> dcmp_m.inputMatrix
+			mult_m = None
+			driver = parent_matrix
+
+		if offset_parent:
+			connectOffsetParentToNodes(driver, children)
+			return mult_m
+
+		dcmp_m = _findDecompose(graph, driver) if mult_m is None else None
+		if dcmp_m is None:
+			dcmp_m = graph.createNode('decomposeMatrix', n='{}_const_dcmpM'.format(name))
+			driver >> dcmp_m.inputMatrix
 		connectDecomposeToNodes(dcmp_m, children)
 		return
 
-	# Categorize the list of children into nested lists of children with the same world space.
+	# Group children with the same world space, within tolerance of the first matrix of a group.
+	world_matrices = []
 	children_categorized = []
-	matrix_tracker = []
-	for child in children:
-		this_world_matrix = child.worldMatrix[0].get()
-
-		if this_world_matrix in matrix_tracker:
-			# Current child matrix already exists, so append to the nested list of children.
-			child_index = matrix_tracker.index(this_world_matrix)
-			children_categorized[child_index].append(child)
-		else:
-			# Add new matrix to matrix_tracker and create a new nested list for children with the same matrix.
-			matrix_tracker.append(this_world_matrix)
-			children_categorized.append([child])
+	cells = {}
+	for child, world_matrix in zip(children, backend.getWorldMatrices(children)):
+		group = _matrixGroup(world_matrix, world_matrices, cells, tolerance)
+		if group == len(children_categorized):
+			children_categorized.append([])
+		children_categorized[group].append(child)
+
+	parent_inverse = mmath.invert(tuple(backend.getAttr(str(parent_matrix))))
 
 	# Create matrix constraint node network for each nested child.
+	driver = None
 	for i, nested_children in enumerate(children_categorized):
-		mult_m = pm.createNode('multMatrix', n='{}_{:02d}_const_multM'.format(name, i + 1))
-		offset_dcmp_m = pm.createNode('decomposeMatrix', n='{}_{:02d}_const_dcmpM'.format(name, i + 1))
+		mult_m = graph.createNode('multMatrix', n='{}_{:02d}_const_multM'.format(name, i + 1))
 
 		# Can just get the local offset from first child in list as they should all have same world space.
-		child_matrix = nested_children[0].worldMatrix[0].get()
-		offset_matrix = child_matrix * parent_matrix.get().inverse()
+		offset_matrix = mmath.multiply(world_matrices[i], parent_inverse)
 
 		mult_m.matrixIn[0].set(offset_matrix)
 		parent_matrix >> mult_m.matrixIn[1]
 		if inverse_parent is not None:
 			inverse_parent >> mult_m.matrixIn[2]
 
-		mult_m.matrixSum >> offset_dcmp_m.inputMatrix
+		if offset_parent:
+			connectOffsetParentToNodes(mult_m.matrixSum, nested_children)
+			driver = mult_m
+			continue
+
+		driver = graph.createNode('decomposeMatrix', n='{}_{:02d}_const_dcmpM'.format(name, i + 1))
+		mult_m.matrixSum >> driver.inputMatrix
 
-		connectDecomposeToNodes(offset_dcmp_m, nested_children)
-	return offset_dcmp_m
+		connectDecomposeToNodes(driver, nested_children)
+	return driver
 # end matrixConstraint():
 
 
+# every cell next to a quantized translation, including itself
+_NEIGHBOUR_CELLS = list(itertools.product((-1, 0, 1), repeat=3))
+
+
+def _matrixGroup(matrix, groups, cells, tolerance):
+	"""
+	Group a matrix is within tolerance of. Groups are found through their translation quantized to tolerance, the
+	neighbouring cells are searched too so matrices either side of a cell boundary still match.
+	:param matrix:  16 float world matrix.
+	:param groups:  `List` of the first matrix of every group, a new group is appended if none match.
+	:param cells:  `Dict` of quantized translation: `List` of group indices, updated with new groups.
+	:param tolerance:  `float` Largest difference of any element.
+	:return:  `int` group index.
+	"""
+	cell = tuple(int(math.floor(v / tolerance)) for v in matrix[12:15])
+	for offset in _NEIGHBOUR_CELLS:
+		for index in cells.get((cell[0] + offset[0], cell[1] + offset[1], cell[2] + offset[2]), ()):
+			if all(abs(a - b) <= tolerance for a, b in zip(matrix, groups[index])):
+				return index
+	groups.append(matrix)
+	cells.setdefault(cell, []).append(len(groups) - 1)
+	return len(groups) - 1
+# end def _matrixGroup():
+
+
+def _findDecompose(graph, plug):
+	"""
+	decomposeMatrix already driven by plug, recorded on graph or in the scene, so constraints to the same plug can
+	share it. While a module is built only its own nodes are shared, a node of another module goes away when that
+	module is dismantled.
+	:param graph:  `GraphModifier`
+	:param plug:  `PlugHandle` matrix plug.
+	:return:  `NodeHandle` or None
+	"""
+	node_registry = scene.registry.active()
+
+	for destination in graph.destinations(plug):
+		node = destination.node()
+		if destination.path == 'inputMatrix' and node.nodeType() == 'decomposeMatrix':
+			if node_registry is None or node in node_registry:
+				return node
+
+	if plug.node().isCommitted():
+		owned = None
+		for destination in graph.backend.listConnections(str(plug), source=False, plugs=True, type='decomposeMatrix'):
+			node, path = destination.split('.', 1)
+			if path != 'inputMatrix':
+				continue
+			if node_registry is not None:
+				owned = set(node_registry.names()) if owned is None else owned
+				if node not in owned:
+					continue
+			return graph.node(node)
+	return None
+# end def _findDecompose():
+
+
+def _isMatrixPlug(plug):
+	"""
+	Type check a plug from its attribute definition, the plug is never evaluated so upstream nodes aren't computed.
+	:param plug:  `PlugHandle` or `Attribute`
+	:return:  `bool`
+	"""
+	backend = scene.getBackend()
+	if isinstance(plug, scene.PlugHandle) and not plug.node().isCommitted():
+		# recorded nodes don't exist yet, look the attribute up on their node type
+		return backend.attributeType(plug.path, node_type=plug.node().nodeType()) == 'matrix'
+	return backend.attributeType(str(plug)) == 'matrix'
+# end def _isMatrixPlug():
+
+
 # TODO: this doesn't maintain offset hmmm should it?
-def matrixBlend(input_a, input_b, blend_attr, name=None):
+def matrixBlend(input_a, input_b, blend_attr, name=None, use_blend_matrix=None):
 	"""
-	Creates weighted add matrix set up for blending between matrices.
+	Creates set up for blending between matrices, reverse and wtAddMatrix nodes or a single blendMatrix node.
 
 	:param input_a:  `Attribute (Matrix)` or `Matrix` first input to blend.
 	:param input_b:  `Attribute (Matrix)` or `Matrix` second input to blend.
 	:param blend_attr:  `Attribute` blend from this attribute.
 	:param name:  `str` Prefix name for nodes, will use blend_attr node name by default.
+	:param use_blend_matrix:  `bool` Blend with a blendMatrix node, None follows user.prefs['blend-matrix'] where
+							  maya has the node type. blendMatrix blends translate, rotate, scale and shear
+							  separately so in-between values differ from wtAddMatrix's weighted sum.
 
-	return  `PyNode` of wtAddMatrix node
+	return  `PlugHandle` of blended matrix output, matrixSum or outputMatrix.
 	"""
+	graph = scene.current()
+
 	for input in [input_a, input_b]:
-		if type(input).__name__ == 'Attribute':
-			if not type(input.get()).__name__ == 'Matrix':
+		if _isPlug(input):
+			if not _isMatrixPlug(input):
 				raise TypeError('--Input attribute: {} is not a matrix plug'.format(input))
 		else:
 			if not type(input).__name__ == 'Matrix':
@@ -689,24 +951,32 @@ def matrixBlend(input_a, input_b, blend_attr, name=None):
 	if name is None:
 		name = '{}_blnd'.format(blend_attr.node())
 
-	rvrs = pm.createNode('reverse', n='{}_rvrs'.format(name))
-	wt_add = pm.createNode('wtAddMatrix', n='{}_wtAdM'.format(name))
+	if use_blend_matrix is None:
+		use_blend_matrix = user.prefs['blend-matrix'] and graph.backend.nodeTypeExists('blendMatrix')
 
-	if type(input_a).__name__ == 'Matrix':
-		wt_add.wtMatrix[0].m.set(input_a)
+	if use_blend_matrix:
+		blend = graph.createNode('blendMatrix', n='{}_blndM'.format(name))
+		plug_a = blend.inputMatrix
+		plug_b = blend.target[0].targetMatrix
+		graph.connectAttr(blend_attr, blend.target[0].weight)
+		output = blend.outputMatrix
 	else:
-		input_a >> wt_add.wtMatrix[0].m
-
-	if type(input_b).__name__ == 'Matrix':
-		wt_add.wtMatrix[1].m.set(input_b)
-	else:
-		input_b >> wt_add.wtMatrix[1].m
-
-	blend_attr >> rvrs.inputX
-	rvrs.outputX >> wt_add.wtMatrix[0].w
-	blend_attr >> wt_add.wtMatrix[1].w
+		rvrs = graph.createNode('reverse', n='{}_rvrs'.format(name))
+		blend = graph.createNode('wtAddMatrix', n='{}_wtAdM'.format(name))
+		plug_a = blend.wtMatrix[0].m
+		plug_b = blend.wtMatrix[1].m
+		graph.connectAttr(blend_attr, rvrs.inputX)
+		rvrs.outputX >> blend.wtMatrix[0].w
+		graph.connectAttr(blend_attr, blend.wtMatrix[1].w)
+		output = blend.matrixSum
+
+	for input, plug in [(input_a, plug_a), (input_b, plug_b)]:
+		if type(input).__name__ == 'Matrix':
+			plug.set(input)
+		else:
+			graph.connectAttr(input, plug)
 
-	return wt_add
+	return output
 # end def matrixBlend():
 
 
@@ -726,7 +996,7 @@ def getFilteredDir(folder, ignore_private=True):
 	main_dir = os.path.dirname(os.path.abspath(os.path.realpath(__file__)))
 
 	files = [
-		x.split('.')[0] for x in os.listdir(main_dir+'\\{}'.format(folder))
+		x.split('.')[0] for x in os.listdir(os.path.join(main_dir, folder))
 		if x.endswith('.py')
 		and not x.count('__init__')
 		and not x.endswith('Base.py')
@@ -744,18 +1014,20 @@ def makeRoot():
 
 	:return: root joint
 	"""
-	if pm.objExists(user.prefs['root-joint']):
-		root_jnt = pm.PyNode(user.prefs['root-joint'])
-	else:
+	root_jnt = skeleton.index().node(user.prefs['root-joint'])
+	if root_jnt is None:
 		pm.select(deselect=True)
 		root_jnt = pm.joint(n=user.prefs['root-joint'], radius=0.001)
 
-		ctrl = pm.curve(d=1, p=data.controllerShapes['locator'], n=(user.prefs['root-joint'] + '_display'))
-		scaleCtrlShapes(ctrl, scale_mult=1.43, line_width=3)
+		ctrl = pm.curve(
+			d=1, p=data.controllerShapes.points('locator', size=1.43), n=(user.prefs['root-joint'] + '_display'))
+		transformCtrlShapes(ctrl, line_width=3)
 
 		ctrl_shape = ctrl.getChildren()[0]
-		setOverrideColour(root_jnt, ctrl_shape, c=user.prefs['module-root-colour'])
-		setOutlinerColour(root_jnt, c=user.prefs['module-root-colour'])
+		setColours(
+			override={root_jnt: user.prefs['module-root-colour'], ctrl_shape: user.prefs['module-root-colour']},
+			outliner={root_jnt: user.prefs['module-root-colour']}
+		)
 
 		pm.parent(ctrl_shape, root_jnt, r=True, s=True)
 		pm.delete(ctrl)
@@ -771,8 +1043,7 @@ def makeRoot():
 
 		cog_place.drawStyle.set(1)
 		cog_place.radius.set(0.001)
-		setOverrideColour(cog_place, c='pink')
-		setOutlinerColour(cog_place, c='pink')
+		setColours(override={cog_place: 'pink'}, outliner={cog_place: 'pink'})
 
 		display = [pm.createNode('joint', n='cog_display_{:02d}'.format(i)) for i in range(2)]
 
@@ -789,13 +1060,36 @@ def makeRoot():
 		cleanScaleCompensate(display)
 		cleanScaleCompensate(cog_place)
 		lockHide(*display, r='xyz', s='xyz', t='xyz', v=1)
+		skeleton.invalidate()
 
 	return root_jnt
 # end def makeRoot():
 
 
 # ----------------------------------------------------------------------------------------------------------------------
-# TODO: This still fails when duplicate names but probably possible to make it work.
+def makeScaffoldDisplay(module_root, name):
+	"""
+	Display shape of a scaffold module root, made with new scaffolds and restored when a module is dismantled.
+	:param module_root:  `PyNode` Module root joint.
+	:param name:  `str` Module name.
+	:return:  `PyNode` display shape.
+	"""
+	curv = pm.curve(d=1, p=data.controllerShapes.points('locator', size=0.5), n=(name + '_display'))
+	transformCtrlShapes(curv, line_width=3)
+
+	shape = curv.getChildren()[0]
+	pm.parent(shape, module_root, r=True, s=True)
+	pm.delete(curv)
+
+	setColours(
+		override={shape: user.prefs['default-jnt-colour']},
+		outliner={module_root: user.prefs['module-root-colour']}
+	)
+	return shape
+# end def makeScaffoldDisplay():
+
+
+# ----------------------------------------------------------------------------------------------------------------------
 def getModuleChildren(modroot):
 	"""
 	Find all the child joints within a module.
@@ -803,66 +1097,45 @@ def getModuleChildren(modroot):
 	:param modroot: Module root.
 	:return: list of modules joints including module root.
 	"""
-
-	if pm.objExists(user.prefs['root-joint']):
-		root_jnt = pm.PyNode(user.prefs['root-joint'])
-	else:
+	if not pm.objExists(user.prefs['root-joint']):
 		raise UtilsException('--{}: does not exist!'.format(user.prefs['root-joint']))
 
-	flattened_jnts = root_jnt.getChildren(ad=True, type='joint')
-
-	module_roots = filter(lambda jnt: jnt.hasAttr('RB_MODULE_ROOT'), flattened_jnts)
-	short_mod_roots = map(lambda mod_r: mod_r.nodeName(), module_roots)
-
-	modname = modroot.shortName()
-
-	def filterChildren(jnt):
-		flat_hierarchy = jnt.fullPath().split('|')
+	index = skeleton.index()
+	chain = index.chain(modroot)
+	if chain is None:
+		# not under the root joint
+		return [pm.PyNode(jnt) for jnt in skeleton.walk(modroot, nested=False)[0]]
+	return index.nodes(chain)
+# end def getModuleChildren():
 
-		mod_index = 0
-		other_mod_index = []
-		for parent in flat_hierarchy:
-			if modname == parent:
-				mod_index = flat_hierarchy.index(parent)
-			else:
-				for s_modr in short_mod_roots:
-					if s_modr == parent:
-						other_mod_index.append(flat_hierarchy.index(parent))
 
-		if not other_mod_index:
-			return True
-		elif all(other_index < mod_index for other_index in other_mod_index):
-			return True
-		else:
-			return False
-	# end def filterChildren():
+def getModuleChains(root=None):
+	"""
+	Partition the skeleton into module chains, see skeleton.walk(). Chains under the root joint come from the cached
+	skeleton index.
 
-	mod_children = modroot.getChildren(ad=True, type='joint')
+	:param root: Joint to start from, defaults to user.prefs['root-joint'].
+	:return: `List` of chains, each a `List` of joints starting with its module root, in depth first order.
+	"""
+	if root is None:
+		if not pm.objExists(user.prefs['root-joint']):
+			raise UtilsException('--{}: does not exist!'.format(user.prefs['root-joint']))
+		index = skeleton.index()
+		return [index.nodes(chain) for chain in index.chains()]
 
-	children = filter(filterChildren, mod_children)
-	children.append(modroot)
-	children.reverse()
-
-	return children
-# end def getModuleChildren():
+	return [[pm.PyNode(jnt) for jnt in chain] for chain in skeleton.walk(root)]
+# end def getModuleChains():
 
 
 # ----------------------------------------------------------------------------------------------------------------------
 def makeNameUnique(name, suffix='_*'):
 	"""
-	Makes name unique in scene
+	Makes name unique in scene, see names.NameAllocator. The name is reserved so it stays unique until it is made.
 	:param name: (string) name to pad with numeral
 	:param suffix: (string) search suffix eg; _ctrl, _jnt, _*
 	:return: string padded name
 	"""
-
-	new_name = name
-	i = 1
-	while pm.objExists(new_name + suffix):
-		new_name = '{}{}'.format(name, i)
-		i += 1
-
-	return new_name
+	return names.allocator().unique(name, suffix)
 # end makeNameUnique():
 
 
@@ -916,14 +1189,12 @@ def getModuleNodes(module_grp):
 	if input is None or output is None:
 		raise TypeError('--Failed to find input and/or output nodes in hierarchy.')
 
-	module_nodes = {module_grp}
-	module_nodes |= set([x for x in iterDgNodes(input, down_stream=True, end=output)])
-	module_nodes |= set([x for x in iterDgNodes(output, up_stream=True, end=input)])
+	node_names = set(traverse.iterGraph(input, down_stream=True, stop=output))
+	node_names.update(traverse.iterGraph(output, up_stream=True, down_stream=False, stop=input))
 
-	for this_dag in module_dag:
-		if this_dag in module_nodes:
-			continue
-		module_nodes.add(this_dag)
+	module_nodes = {module_grp}
+	module_nodes.update(pm.PyNode(name) for name in node_names)
+	module_nodes.update(module_dag)
 
 	return module_nodes
 # end getModuleNodes():